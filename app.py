@@ -1,38 +1,19 @@
 import streamlit as st
 import pandas as pd
 import os
-import subprocess
-import sys
 from utils.style import apply_custom_style
-from typing import Any, cast
 
 
-def _normalize_code(code_val) -> str:
-    """Normalize distributor/order code to comparable string.
-    Handles numeric types, strings with commas, and Excel-style '123.0'.
-    """
-    if pd.isna(code_val):
-        return ''
-    s = str(code_val).strip()
-    s = s.replace(',', '').strip()
-    if s.endswith('.0'):
-        s = s[:-2]
-    try:
-        f = float(s)
-        if f.is_integer():
-            s = str(int(f))
-    except Exception:
-        pass
-
-    # 4자리 숫자 코드 유지(선행 0 보호). 예: '101' -> '0101'
-    if s.isdigit() and 0 < len(s) < 4:
-        s = s.zfill(4)
-    return s
-
 # Import utility modules from `utils` package
-from utils.market_size import calculate_market_size_by_subject
-from utils.market_size_v2 import calculate_market_size_by_subject_v2
-from utils.market_size_distributor import calculate_distributor_market_size, calculate_subject_market_by_distributor
+from utils.artifact_store import clear_artifacts
+from utils.common_filters import filter_cache
+from utils.data_pipeline import ARTIFACT_DIR, lazy_loaders, load_or_build_datasets, source_stamp
+from utils.distributor_directory import DistributorDirectory
+from utils.order_cube import count_schools, register_cube, rollup_orders
+from utils.order_index import register_index, select_rows
+from utils.page_profiler import PROFILE_SESSION_KEY, page_profiler
+from utils.profiling import StageTimer, load_history
+from utils.shared_data import SharedDataset, copy_frame, view
 
 # Grade sorting function for distributors
 def get_grade_order(grade):
@@ -66,6 +47,7 @@ if DEV_MODE:
         if st.button('♻️ Dev: 캐시 & 세션 초기화 (비관리자)', help='개발용: 캐시와 세션 상태를 초기화합니다.'):
             try:
                 st.cache_data.clear()
+                st.cache_resource.clear()
             except Exception:
                 pass
             # Clear common session keys used by the app
@@ -73,30 +55,42 @@ if DEV_MODE:
                 'total_df', 'order_df', 'order_df_original', 'order_df_target_filtered',
                 'target_df', 'product_df', 'distributor_df',
                 'market_analysis', 'market_size_by_level', 'distributor_market', 'subject_market_by_dist',
-                'code_to_official', 'official_to_code'
+                'code_to_official', 'official_to_code', 'distributor_directory', 'shared_dataset'
             ]:
                 if k in st.session_state:
                     del st.session_state[k]
             st.experimental_rerun()
 
 # 관리자용: 캐시/세션 초기화 도구 (배포에서 stale cache로 데이터가 비어 보이는 문제 대응)
+# (데이터 로드 기록은 로드가 끝난 뒤 같은 expander에 추가)
+admin_tools = None
 if bool(st.session_state.get('auth_ok', False)):
-    with st.sidebar.expander('🛠️ 관리자 도구', expanded=False):
-        if st.button('♻️ 데이터 캐시 초기화', help='st.cache_data 캐시를 지우고 데이터를 다시 로드합니다.'):
+    admin_tools = st.sidebar.expander('🛠️ 관리자 도구', expanded=False)
+    with admin_tools:
+        if st.button('♻️ 데이터 캐시 초기화', help='공유 데이터 캐시(st.cache_resource)와 사전 계산 아티팩트를 지우고 데이터를 다시 로드합니다.'):
             try:
                 st.cache_data.clear()
+                st.cache_resource.clear()
             except Exception:
                 pass
+            clear_artifacts(ARTIFACT_DIR)
+            filter_cache().clear()
             # 매핑/데이터 관련 세션 키 정리
             for k in [
                 'total_df', 'order_df', 'order_df_original', 'order_df_target_filtered',
                 'target_df', 'product_df', 'distributor_df',
                 'market_analysis', 'market_size_by_level', 'distributor_market', 'subject_market_by_dist',
-                'code_to_official', 'official_to_code'
+                'code_to_official', 'official_to_code', 'distributor_directory', 'shared_dataset'
             ]:
                 if k in st.session_state:
                     del st.session_state[k]
             st.rerun()
+        # 모든 페이지의 구간별 렌더 시간/DataFrame 복사 횟수 표시 + 느린 rerun 로그 (outputs/render_profile.jsonl)
+        st.session_state[PROFILE_SESSION_KEY] = st.checkbox(
+            '⏱️ 페이지 렌더 프로파일링',
+            value=st.session_state.get(PROFILE_SESSION_KEY, False),
+            help='페이지마다 구간별 렌더 시간을 사이드바에 표시하고, 느린 rerun을 outputs/render_profile.jsonl에 기록합니다.',
+        )
 
 # --- 관리자 PIN 기반 접근 제어 (업그레이드된 입력 모달) ---
 # 동작 요약:
@@ -182,285 +176,91 @@ if not st.session_state['auth_ok']:
     # Prevent further page rendering until auth_ok
     st.stop()
 
-# ---------------------------------------------------------
-# File Paths
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-TOTAL_FILE = os.path.join(BASE_DIR, "2025년도_학년별·학급별 학생수(초중고)_전체.csv")
-ORDER_FILE = os.path.join(BASE_DIR, "씨마스_22개정 주문현황_학교코드총판코드.csv")
-TARGET_FILE = os.path.join(BASE_DIR, "22개정 총판별 목표.csv")
-PRODUCT_FILE = os.path.join(BASE_DIR, "제품정보.csv")
-DISTRIBUTOR_FILE = os.path.join(BASE_DIR, "총판정보.csv")
-
-@st.cache_data
-def load_data():
-    """Load and cache all data files"""
-    # Load student data
-    try:
-        total_df = pd.read_csv(TOTAL_FILE, encoding='cp949')
-    except UnicodeDecodeError:
-        total_df = pd.read_csv(TOTAL_FILE, encoding='utf-8')
-    
-    # Load order data
-    # NOTE: 코드 컬럼은 str로 고정(배포 환경에서 dtype 추론으로 코드 포맷이 깨져 미매핑이 발생할 수 있음)
-    order_dtype: dict[str, Any] = {
-        '총판코드': str,
-        '정보공시학교코드': str,
-        '정보공시 학교코드': str,
-        '학교코드': str,
-    }
-    try:
-        order_df = pd.read_csv(ORDER_FILE, encoding='cp949', low_memory=False, dtype=cast(Any, order_dtype))
-    except UnicodeDecodeError:
-        order_df = pd.read_csv(ORDER_FILE, encoding='utf-8', low_memory=False, dtype=cast(Any, order_dtype))
-    
-    # Load target data
-    target_dtype: dict[str, Any] = {
-        '총판코드': str,
-    }
-    try:
-        target_df = pd.read_csv(TARGET_FILE, encoding='cp949', low_memory=False, dtype=cast(Any, target_dtype))
-    except UnicodeDecodeError:
-        try:
-            target_df = pd.read_csv(TARGET_FILE, encoding='utf-8', low_memory=False, dtype=cast(Any, target_dtype))
-        except:
-            target_df = pd.DataFrame()
-    
-    # Load product data
-    try:
-        product_df = pd.read_csv(PRODUCT_FILE, encoding='cp949')
-    except UnicodeDecodeError:
-        try:
-            product_df = pd.read_csv(PRODUCT_FILE, encoding='utf-8')
-        except:
-            product_df = pd.DataFrame()
-    
-    # Load distributor data
-    dist_dtype: dict[str, Any] = {
-        '숫자코드': str,
-        '총판코드': str,
-    }
-    try:
-        distributor_df = pd.read_csv(DISTRIBUTOR_FILE, encoding='cp949', low_memory=False, dtype=cast(Any, dist_dtype))
-    except UnicodeDecodeError:
-        try:
-            distributor_df = pd.read_csv(DISTRIBUTOR_FILE, encoding='utf-8', low_memory=False, dtype=cast(Any, dist_dtype))
-        except:
-            distributor_df = pd.DataFrame()
-
-    # Clean column names
-    total_df.columns = total_df.columns.str.strip()
-    order_df.columns = order_df.columns.str.strip()
-    if not target_df.empty:
-        target_df.columns = target_df.columns.str.strip()
-    if not product_df.empty:
-        product_df.columns = product_df.columns.str.strip()
-    if not distributor_df.empty:
-        distributor_df.columns = distributor_df.columns.str.strip()
-
-    # Ensure School Codes are strings
-    if '정보공시 학교코드' in total_df.columns:
-        total_df['정보공시 학교코드'] = total_df['정보공시 학교코드'].astype(str)
-    if '정보공시학교코드' in order_df.columns:
-        order_df['정보공시학교코드'] = order_df['정보공시학교코드'].astype(str)
-    
-    # Map distributor official names using distributor info (prefer outputs mapping if exists)
-    dist_code_map = {}
-    # If a precomputed mapping exists (script output), prefer it. If missing, attempt to auto-generate it.
-    def _ensure_outputs_map():
-        outputs_dir = os.path.join(BASE_DIR, 'outputs')
-        outputs_map_path = os.path.join(outputs_dir, 'distributor_code_mapping.csv')
-        if os.path.exists(outputs_map_path):
-            return outputs_map_path
-        # try to run the mapping script to generate outputs
-        script_path = os.path.join(BASE_DIR, 'scripts', 'generate_distributor_mapping.py')
-        if os.path.exists(script_path):
-            try:
-                subprocess.run([sys.executable, script_path, '--orders', ORDER_FILE, '--distributor', DISTRIBUTOR_FILE, '--out', outputs_dir], check=True, cwd=BASE_DIR)
-            except Exception:
-                # ignore errors; fallback to building from distributor_df
-                pass
-        return outputs_map_path
-
-    outputs_map_path = _ensure_outputs_map()
-    if os.path.exists(outputs_map_path):
-        try:
-            map_df = pd.read_csv(outputs_map_path, dtype=str)
-            # Expect columns: order_code, matched, official_code, official_name
-            if 'order_code' in map_df.columns and 'official_name' in map_df.columns:
-                for _, r in map_df[map_df['matched'].astype(str).str.lower() == 'true'].iterrows():
-                    code = _normalize_code(r['order_code'])
-                    name = str(r.get('official_name', '')).strip()
-                    if code and name:
-                        dist_code_map[code] = name
-        except Exception:
-            dist_code_map = {}
-
-    # If no outputs mapping, build from distributor_df using '숫자코드' preferred
-    if not dist_code_map and not distributor_df.empty and '총판명(공식)' in distributor_df.columns:
-        preferred = '숫자코드' if '숫자코드' in distributor_df.columns else ('총판코드' if '총판코드' in distributor_df.columns else None)
-        if preferred:
-            for _, row in distributor_df.iterrows():
-                official_name = row.get('총판명(공식)')
-                code_val = row.get(preferred)
-                if pd.isna(official_name) or pd.isna(code_val):
-                    continue
-                code_str = _normalize_code(code_val)
-                if code_str:
-                    dist_code_map[code_str] = str(official_name).strip()
-
-    # 주문 데이터 총판은 '총판코드' 컬럼을 정규화하여 매핑 (이름 기반 매핑 제거)
-    if '총판' in order_df.columns and '총판코드' in order_df.columns and dist_code_map:
-        order_df['총판코드_정규화'] = order_df['총판코드'].apply(lambda x: _normalize_code(x))
-        # Map strictly by numeric code -> official name. Do NOT fallback to 주문의 `총판` 명칭.
-        order_df['총판'] = order_df['총판코드_정규화'].map(dist_code_map)
-        # For unmapped codes, show a clear marker using the code (do not use original name)
-        order_df['총판'] = order_df.apply(
-            lambda r: (f"[미매핑:{r['총판코드_정규화']}]") if (pd.isna(r['총판']) or r['총판'] == '') and r['총판코드_정규화'] != '' else ("[코드없음]" if r['총판코드_정규화'] == '' else r['총판']),
-            axis=1
-        )
-        # 매핑 딕셔너리 세션 저장 (코드 -> 공식명, 공식명 -> 코드)
-        st.session_state['code_to_official'] = dist_code_map
-        st.session_state['official_to_code'] = {v: k for k, v in dist_code_map.items()}
-    
-    # Merge product info to add school level to subject names
-    if (not product_df.empty and '코드' in product_df.columns and '학교급' in product_df.columns
-            and '도서코드(교지명구분)' in order_df.columns):
-        # Create mapping from product code to school level
-        # 제품 코드를 6자리로 표준화 (제품정보.csv는 5자리 또는 6자리 숫자)
-        # 주문 데이터의 도서코드(교지명구분)는 이미 6자리이므로 문자열로만 변환
-        product_df = product_df.dropna(subset=['코드'])
-        product_df['코드'] = product_df['코드'].astype(int).astype(str).str.zfill(6)
-        order_df['도서코드(교지명구분)'] = order_df['도서코드(교지명구분)'].astype(str)
-
-        # Merge to get school level, subject name and target subject info (목표과목)
-        # Include '교과서명' so we can build 교과서명_구분 = [중등]/[고등] + 교과서명
-        merge_cols = ['코드', '학교급', '교과군', '교과서명']
-        if '2026 목표과목' in product_df.columns:
-            merge_cols.append('2026 목표과목')
-
-        product_merge = product_df[merge_cols].rename(columns={'교과군': '교과군_제품', '학교급': '제품_학교급'})
-
-        order_df = pd.merge(
-            order_df,
-            product_merge,
-            left_on='도서코드(교지명구분)',
-            right_on='코드',
-            how='left'
-        )
+@st.cache_resource(show_spinner="데이터를 불러오는 중...", max_entries=1)
+def load_data(stamp=None):
+    """Load all data files once per process
 
-        # Add school level to subject name for clarity (중등 정보 vs 고등 정보)
-        def add_school_level_to_subject(row):
-            # Prefer 제품의 학교급 (제품_학교급) from merged product data; fall back to 주문의 학교급
-            prod_level = row.get('제품_학교급') if '제품_학교급' in row.index else None
-            order_level = row.get('학교급') if '학교급' in row.index else None
-            school_level_val = prod_level if pd.notna(prod_level) else order_level
-            if pd.notna(school_level_val) and pd.notna(row.get('교과서명')):
-                school_level = str(school_level_val).strip()
-                subject = str(row['교과서명']).strip()
-
-                # 숫자 코드로 표기된 경우 처리 (예: 3=중학교, 4=고등학교)
-                try:
-                    lvl_num = int(school_level)
-                except Exception:
-                    lvl_num = None
-
-                if lvl_num == 3:
-                    return f'[중등] {subject}'
-                if lvl_num == 4:
-                    return f'[고등] {subject}'
-
-                # 문자열 표기인 경우 더 넓게 탐지
-                low = school_level.lower()
-                if '중' in low and '고' not in low:
-                    return f'[중등] {subject}'
-                if '고' in low:
-                    return f'[고등] {subject}'
-
-            return row.get('교과서명', '')
-
-        order_df['교과서명_구분'] = order_df.apply(add_school_level_to_subject, axis=1)
-        
-        # Add 학교급명 column (copy from 학교급) for consistency
-        if '학교급' in order_df.columns:
-            order_df['학교급명'] = order_df['학교급']
-    else:
-        # If product code missing in order data, fall back to original subject name
-        order_df['교과서명_구분'] = order_df.get('교과서명', '')
-    
-    # Add distributor grade for sorting (using already mapped official names)
-    if not distributor_df.empty and '총판명(공식)' in distributor_df.columns and '등급' in distributor_df.columns:
-        grade_map = {}
-        for _, row in distributor_df.iterrows():
-            if pd.notna(row.get('총판명(공식)')) and pd.notna(row.get('등급')):
-                grade_map[row['총판명(공식)']] = row['등급']
-        if '총판' in order_df.columns:
-            order_df['총판등급'] = order_df['총판'].map(grade_map)
-    
-    # Calculate accurate market size by subject (V2: 학교별 학년 추정)
-    market_analysis = calculate_market_size_by_subject_v2(order_df, total_df, product_df)
-    
-    # Fallback to V1 if V2 fails
-    if market_analysis.empty:
-        market_analysis = calculate_market_size_by_subject(order_df, total_df, product_df)
-    
-    # Calculate distributor market size (총판별 담당 학교 기준)
-    distributor_market = calculate_distributor_market_size(total_df, order_df, distributor_df)
-    
-    # Calculate subject market by distributor (총판별 과목별 시장 규모)
-    subject_market_by_dist = calculate_subject_market_by_distributor(total_df, order_df, product_df)
-    
-    # Calculate total market size by school level for comparison analysis
-    # 중등 = 중학교 1,2학년 / 고등 = 고등학교 1,2학년
-    market_size_by_level = {}
-    if not total_df.empty:
-        # 중학교 (학교급코드 = 3)
-        middle_schools = total_df[total_df['학교급코드'] == 3]
-        market_size_by_level['중등'] = middle_schools['1학년 학생수'].sum() + middle_schools['2학년 학생수'].sum()
-        
-        # 고등학교 (학교급코드 = 4)
-        high_schools = total_df[total_df['학교급코드'] == 4]
-        market_size_by_level['고등'] = high_schools['1학년 학생수'].sum() + high_schools['2학년 학생수'].sum()
-        
-        # 전체
-        market_size_by_level['전체'] = market_size_by_level['중등'] + market_size_by_level['고등']
+    outputs/artifacts에 같은 원본으로 만든 사전 계산 결과(scripts/build_artifacts.py
+    또는 이전 실행)가 있으면 그것을 읽고, 주문현황에 행만 덧붙여졌으면 추가분만 반영,
+    둘 다 아니면 계산 후 저장합니다.
+    파생 표(시장 규모, 목표과목 주문 등)는 처음 쓰는 페이지에서 읽거나 계산합니다.
+    결과는 모든 세션이 공유하므로 세션에는 view()로 만든 읽기 전용 뷰만 저장합니다.
+
+    단계별 시간/CPU/메모리는 load_history()에 기록합니다 (관리자 도구의 로드 워터폴).
+
+    Args:
+        stamp: source_stamp() 값 (원본 파일이 바뀌면 캐시를 새로 만들기 위한 키)
+    """
+    timer = StageTimer()
+    datasets, info = load_or_build_datasets(lazy=True, timer=timer)
+    school_codes = datasets['total_df']['정보공시 학교코드'] if '정보공시 학교코드' in datasets['total_df'].columns else None
+    with timer.stage('shared_dataset'):
+        directory = DistributorDirectory(datasets['distributor_df'], datasets.get('code_to_official'))
+        shared = SharedDataset(
+            datasets, meta={'distributor_directory': directory}, version=info['key'],
+            loaders=lazy_loaders(datasets, info, history=load_history()),
+        )
 
-    return total_df, order_df, target_df, product_df, distributor_df, market_analysis, market_size_by_level, distributor_market, subject_market_by_dist
+    # 필터/상세 모달용 차원별 역인덱스 (값 → 행 위치)와 차트용 사전 집계 큐브 (목표과목 주문은 읽을 때)
+    # 지금 있는 프레임은 이번 로드 기록에, 나중에 읽는 프레임은 따로 기록
+    loading = {'timer': timer}
+
+    def register_order_frame(name, df):
+        if name not in ('order_df', 'order_df_target_filtered'):
+            return
+        stage_timer = loading['timer'] or StageTimer()
+        with stage_timer.stage(f'register_index:{name}') as stage:
+            shared.indexes[name] = register_index(view(df))
+            stage.rows = len(df)
+        with stage_timer.stage(f'register_cube:{name}') as stage:
+            shared.cubes[name] = register_cube(view(df), schools=school_codes)
+            stage.rows = len(shared.cubes[name].cells)
+        if loading['timer'] is None:
+            load_history().record(f'인덱스/큐브: {name}', stage_timer, key=info['key'])
+
+    shared.on_load(register_order_frame)
+    loading['timer'] = None
+    load_history().record(
+        'load_data', timer, source=info['source'], key=info['key'],
+        rows=len(datasets['order_df']), pending=info['pending'],
+    )
+    return shared
 
 # Load data
 try:
-    total_df, order_df, target_df, product_df, distributor_df, market_analysis, market_size_by_level, distributor_market, subject_market_by_dist = load_data()
+    shared = load_data(source_stamp())
+    total_df = shared.view('total_df')
+    order_df = shared.view('order_df')
+    target_df = shared.view('target_df')
+    product_df = shared.view('product_df')
+    distributor_df = shared.view('distributor_df')
+    market_analysis = shared.view('market_analysis')
+    market_size_by_level = dict(shared.mapping('market_size_by_level'))
+    distributor_market = shared.view('distributor_market')
+    code_to_official = dict(shared.mapping('code_to_official'))
+
+    # 매핑 딕셔너리 세션 저장 (코드 -> 공식명, 공식명 -> 코드)
+    if code_to_official:
+        st.session_state['code_to_official'] = code_to_official
+        st.session_state['official_to_code'] = dict(shared.meta['distributor_directory'].official_to_code)
     
     # 🚨 중요: 목표 관련 페이지(목표 대비 달성률, 등급별 분석)에서만 목표과목 필터 사용
-    # 나머지 페이지는 전체 데이터 사용
-    
-    # 목표과목 컬럼 확인 (목표과목 또는 2026 목표과목)
-    target_col = None
-    if '목표과목' in order_df.columns:
-        target_col = '목표과목'
-    elif '2026 목표과목' in order_df.columns:
-        target_col = '2026 목표과목'
-    
-    # 목표과목 필터링된 데이터 생성 (목표 관련 페이지용)
-    if '학년도' in order_df.columns and target_col is not None:
-        order_df_target_filtered = order_df[
-            (order_df['학년도'] == 2026) & 
-            (order_df[target_col].isin(['목표과목1', '목표과목2']))
-        ].copy()
-    else:
-        order_df_target_filtered = order_df[order_df['학년도'] == 2026].copy() if '학년도' in order_df.columns else order_df.copy()
-    
+    # 나머지 페이지는 전체 데이터 사용 (목표과목 주문과 총판별 과목 시장은 해당 페이지가
+    # session_view()로 처음 꺼낼 때 계산 - 세션에는 공유 데이터셋만 저장)
+
     # Store in session state for access across pages
+    # (모두 공유 데이터의 뷰라 세션 수가 늘어도 주문 데이터는 프로세스에 한 벌만 유지)
+    st.session_state['shared_dataset'] = shared
     st.session_state['total_df'] = total_df
     st.session_state['order_df'] = order_df  # 🚨 전체 데이터를 기본으로 저장 (모든 페이지에서 사용)
-    st.session_state['order_df_original'] = order_df  # 원본 전체 데이터
-    st.session_state['order_df_target_filtered'] = order_df_target_filtered  # 목표과목 필터된 데이터 (목표 관련 페이지용)
+    st.session_state['order_df_original'] = shared.view('order_df')  # 원본 전체 데이터
     st.session_state['target_df'] = target_df
     st.session_state['product_df'] = product_df
     st.session_state['distributor_df'] = distributor_df
+    st.session_state['distributor_directory'] = shared.meta['distributor_directory']  # 총판 코드/공식명 조회 테이블
     st.session_state['market_analysis'] = market_analysis
     st.session_state['market_size_by_level'] = market_size_by_level  # Store market size by school level
     st.session_state['distributor_market'] = distributor_market  # Store distributor market size
-    st.session_state['subject_market_by_dist'] = subject_market_by_dist  # Store subject market by distributor
     st.session_state['sort_by_grade'] = sort_by_grade  # Store sorting function
 except FileNotFoundError as e:
     st.error(f"파일을 찾을 수 없습니다: {e}")
@@ -469,7 +269,72 @@ except Exception as e:
     st.error(f"데이터 로드 중 오류 발생: {e}")
     st.stop()
 
+
+def show_load_timings():
+    """최근 데이터 로드의 단계별 워터폴 + JSON 내보내기 (관리자 도구)"""
+    import plotly.graph_objects as go
+
+    st.markdown("**⏱️ 데이터 로드 기록**")
+    entries = load_history().entries()
+    if not entries:
+        st.caption("이 프로세스에서 기록된 로드가 없습니다.")
+        return
+
+    summary = pd.DataFrame([{
+        '시각': e['at'],
+        '구분': e['label'],
+        '출처': e.get('source', '-'),
+        '시간(초)': round(e['total_seconds'], 3),
+        '최대 RSS(MB)': round(e['peak_rss'] / 1e6, 1) if e.get('peak_rss') is not None else None,
+    } for e in reversed(entries)])  # 최근 것부터
+    st.dataframe(summary, hide_index=True, use_container_width=True)
+
+    newest = list(reversed(entries))
+    labels = [f"{e['at']} · {e['label']}" for e in newest]
+    # 기본은 가장 최근의 전체 로드(load_data)
+    default = next((i for i, e in enumerate(newest) if e['label'] == 'load_data'), 0)
+    choice = st.selectbox("워터폴", range(len(labels)), index=default, format_func=labels.__getitem__, key='admin_load_timing')
+    entry = newest[choice]
+    stages = entry['stages']
+    if stages:
+        names = [f"{'  ' * s.get('depth', 0)}{s['name']}" for s in stages]
+        hover = [
+            f"{s['name']}<br>시간 {s['seconds']:.3f}s · CPU {s.get('cpu_seconds') or 0:.3f}s"
+            f"<br>행 {s['rows'] if s['rows'] is not None else '-'}"
+            + (f"<br>최대 할당 +{s['peak_alloc_delta'] / 1e6:.1f}MB" if s.get('peak_alloc_delta') is not None else '')
+            for s in stages
+        ]
+        fig = go.Figure(go.Bar(
+            y=names,
+            x=[s['seconds'] for s in stages],
+            base=[s.get('start', 0.0) for s in stages],
+            orientation='h',
+            marker_color=['#1f77b4' if not s.get('depth') else '#9ecae1' for s in stages],
+            hovertext=hover,
+            hoverinfo='text',
+        ))
+        fig.update_layout(
+            height=max(200, 22 * len(stages) + 60),
+            margin=dict(l=0, r=0, t=10, b=0),
+            xaxis_title='초',
+            yaxis=dict(autorange='reversed'),
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.download_button(
+        label="📥 로드 기록 JSON",
+        data=load_history().to_json(),
+        file_name="load_timings.json",
+        mime="application/json",
+    )
+
+
+if admin_tools is not None:
+    with admin_tools:
+        show_load_timings()
+
 # Main Page - Dashboard
+profiler = page_profiler('app')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 st.title("📊 22개정 자사 실적표 조회 시스템")
 st.markdown("### 💼 Executive Dashboard")
 st.markdown("---")
@@ -490,13 +355,13 @@ if '학년도' in order_df.columns:
     )
     
     # 선택된 학년도 데이터 필터링
-    filtered_order = order_df[order_df['학년도'] == selected_year].copy()
+    filtered_order = select_rows(order_df, 학년도=selected_year)
     
     # 학년도별 비교 옵션
     if len(years) > 1:
         show_year_comparison = st.sidebar.checkbox("📊 학년도별 비교 보기", key='main_year_comparison')
 else:
-    filtered_order = order_df.copy()
+    filtered_order = copy_frame(order_df)
     selected_year = None
     show_year_comparison = False
 
@@ -522,7 +387,7 @@ with col3:
     # Calculate accurate overall share from market_analysis
     if not market_analysis.empty:
         # 선택된 학년도의 시장 규모 계산
-        year_market_analysis = market_analysis.copy()
+        year_market_analysis = copy_frame(market_analysis)
         if selected_year:
             # 학년도에 따라 시장 규모 재계산 필요 시 처리
             pass
@@ -540,7 +405,7 @@ with col4:
     total_schools = 0
     for col in preferred_cols:
         if col in filtered_order.columns:
-            total_schools = filtered_order[col].dropna().nunique()
+            total_schools = count_schools(filtered_order, column=col)
             break
     penetration_rate = (total_schools / total_df['학교명'].nunique() * 100) if not total_df.empty else 0
     st.metric("주문 학교 수", f"{total_schools:,}개교",
@@ -562,13 +427,13 @@ if show_year_comparison and len(years) > 1:
     # 모든 학년도 데이터 비교
     comparison_data = []
     for year in years:
-        year_data = order_df[order_df['학년도'] == year]
+        year_data = select_rows(order_df, 학년도=year)
         
         # 학교 수 계산
         year_schools = 0
         for col in preferred_cols:
             if col in year_data.columns:
-                year_schools = year_data[col].dropna().nunique()
+                year_schools = count_schools(year_data, column=col)
                 break
         
         comparison_data.append({
@@ -756,7 +621,7 @@ with tab1:
     with col1:
         st.subheader("📚 교과/과목별 TOP 10")
         subject_col = '교과서명_구분' if '교과서명_구분' in order_df.columns else '과목명'
-        subject_top = order_df.groupby(subject_col)['부수'].sum().sort_values(ascending=False).head(10)
+        subject_top = rollup_orders(order_df, subject_col).sort_values(ascending=False).head(10)
         
         fig = px.bar(
             x=subject_top.values,
@@ -778,7 +643,7 @@ with tab1:
         
     with col2:
         st.subheader("🗺️ 지역별 TOP 10")
-        region_top = order_df.groupby('시도교육청')['부수'].sum().sort_values(ascending=False).head(10)
+        region_top = rollup_orders(order_df, '시도교육청').sort_values(ascending=False).head(10)
         
         fig = px.bar(
             x=region_top.values,
@@ -799,7 +664,7 @@ with tab1:
 
 with tab2:
     if '학교급명' in order_df.columns:
-        school_level_stats = order_df.groupby('학교급명').agg({
+        school_level_stats = rollup_orders(order_df, '학교급명', {
             '부수': 'sum',
             '금액': 'sum' if '금액' in order_df.columns else 'count',
             '정보공시학교코드': 'nunique' if '정보공시학교코드' in order_df.columns else 'count',
@@ -913,7 +778,7 @@ with tab3:
         
         st.markdown("#### 📊 총판 효율성")
         if '총판' in order_df.columns:
-            dist_efficiency = order_df.groupby('총판').agg({
+            dist_efficiency = rollup_orders(order_df, '총판', {
                 '부수': 'sum',
                 '정보공시학교코드': 'nunique' if '정보공시학교코드' in order_df.columns else 'count'
             })
@@ -934,7 +799,8 @@ with tab3:
         
         st.markdown("#### 🎯 성장 기회")
         if '시도교육청' in order_df.columns:
-            region_penetration = order_df.groupby('시도교육청')['정보공시학교코드'].nunique() if '정보공시학교코드' in order_df.columns else order_df.groupby('시도교육청')['학교코드'].nunique()
+            school_code_col = '정보공시학교코드' if '정보공시학교코드' in order_df.columns else '학교코드'
+            region_penetration = rollup_orders(order_df, '시도교육청', {school_code_col: 'nunique'})[school_code_col]
             low_penetration = region_penetration.nsmallest(3)
             st.info(f"📌 진출 확대 지역: {', '.join(low_penetration.index[:3].tolist())}")
 
@@ -974,3 +840,5 @@ st.markdown("""
 
 st.markdown("---")
 st.caption("© 2025 CMASS - 22개정 실적 분석 시스템 | 📊 Data-Driven Decision Making")
+
+profiler.finish()
@@ -1,5 +1,7 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -8,15 +10,16 @@ import numpy as np
 
 st.set_page_config(page_title="본사담당자별 분석", page_icon="👤", layout="wide")
 apply_custom_style()
+profiler = page_profiler('10_👤_본사담당자별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'order_df' not in st.session_state or 'total_df' not in st.session_state:
     st.error("데이터를 불러올 수 없습니다. 메인 페이지로 돌아가주세요.")
     st.stop()
 
-order_df = st.session_state.get('order_df', pd.DataFrame()).copy()
-total_df = st.session_state.get('total_df', pd.DataFrame()).copy()
-product_df = st.session_state.get('product_df', pd.DataFrame()).copy()
+order_df = view(st.session_state.get('order_df', pd.DataFrame()))
+total_df = view(st.session_state.get('total_df', pd.DataFrame()))
+product_df = view(st.session_state.get('product_df', pd.DataFrame()))
 
 st.title("👤 본사담당자별 분석")
 st.markdown("---")
@@ -28,8 +31,9 @@ if '본사담당자(2025.09)' in total_df.columns and '정보공시 학교코드
     # 주문 데이터에 본사담당자 매핑
     school_code_col = '정보공시학교코드' if '정보공시학교코드' in order_df.columns else '학교코드'
     if school_code_col in order_df.columns:
+        # 주문현황에 같은 이름의 컬럼이 있으면 학생수 데이터 기준으로 바꿔 붙임 (_x/_y 충돌 방지)
         order_df = pd.merge(
-            order_df,
+            order_df.drop(columns=['본사담당자(2025.09)'], errors='ignore'),
             school_manager_map,
             left_on=school_code_col,
             right_on='정보공시 학교코드',
@@ -56,8 +60,8 @@ if '본사담당자(2025.09)' in total_df.columns and '정보공시 학교코드
         st.stop()
     
     # 필터링
-    filtered_total = total_df[total_df['본사담당자(2025.09)'].isin(selected_managers)].copy()
-    filtered_order = order_df[order_df['본사담당자(2025.09)'].isin(selected_managers)].copy()
+    filtered_total = copy_frame(total_df[total_df['본사담당자(2025.09)'].isin(selected_managers)])
+    filtered_order = copy_frame(order_df[order_df['본사담당자(2025.09)'].isin(selected_managers)])
     
     # ===== 전체 요약 통계 =====
     st.header("📊 전체 요약")
@@ -166,7 +170,7 @@ if '본사담당자(2025.09)' in total_df.columns and '정보공시 학교코드
         
         # 상세 테이블
         st.subheader("📋 담당자별 상세 통계")
-        display_df = summary_df.copy()
+        display_df = copy_frame(summary_df)
         st.dataframe(
             display_df.style.format({
                 '담당학교수': '{:,.0f}',
@@ -481,3 +485,5 @@ if '본사담당자(2025.09)' in total_df.columns and '정보공시 학교코드
 
 else:
     st.error("본사담당자 정보가 없습니다. 학생수 데이터에 '본사담당자(2025.09)' 컬럼이 필요합니다.")
+
+profiler.finish()
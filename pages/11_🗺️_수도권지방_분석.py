@@ -1,5 +1,7 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -9,14 +11,15 @@ from typing import cast
 
 st.set_page_config(page_title="수도권/지방 분석", page_icon="🗺️", layout="wide")
 apply_custom_style()
+profiler = page_profiler('11_🗺️_수도권지방_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'order_df' not in st.session_state or 'total_df' not in st.session_state:
     st.error("데이터를 불러올 수 없습니다. 메인 페이지로 돌아가주세요.")
     st.stop()
 
-order_df = st.session_state.get('order_df', pd.DataFrame()).copy()
-total_df = st.session_state.get('total_df', pd.DataFrame()).copy()
+order_df = view(st.session_state.get('order_df', pd.DataFrame()))
+total_df = view(st.session_state.get('total_df', pd.DataFrame()))
 
 st.title("🗺️ 수도권/지방 분석")
 st.markdown("---")
@@ -42,14 +45,14 @@ if '시도명' in order_df.columns:
     
     # 필터링
     if selected_region == '수도권':
-        filtered_order = order_df[order_df['지역구분'] == '수도권'].copy()
-        filtered_total = total_df[total_df['지역구분'] == '수도권'].copy() if '지역구분' in total_df.columns else total_df.copy()
+        filtered_order = copy_frame(order_df[order_df['지역구분'] == '수도권'])
+        filtered_total = copy_frame(total_df[total_df['지역구분'] == '수도권']) if '지역구분' in total_df.columns else copy_frame(total_df)
     elif selected_region == '지방':
-        filtered_order = order_df[order_df['지역구분'] == '지방'].copy()
-        filtered_total = total_df[total_df['지역구분'] == '지방'].copy() if '지역구분' in total_df.columns else total_df.copy()
+        filtered_order = copy_frame(order_df[order_df['지역구분'] == '지방'])
+        filtered_total = copy_frame(total_df[total_df['지역구분'] == '지방']) if '지역구분' in total_df.columns else copy_frame(total_df)
     else:
-        filtered_order = order_df.copy()
-        filtered_total = total_df.copy()
+        filtered_order = view(order_df)
+        filtered_total = view(total_df)
     
     school_code_col = '정보공시학교코드' if '정보공시학교코드' in filtered_order.columns else '학교코드'
     
@@ -317,7 +320,7 @@ if '시도명' in order_df.columns:
         
         # 효율성 테이블
         st.subheader("📊 효율성 지표 상세")
-        efficiency_df = comp_df[['구분', '학교당평균부수', '학교당평균금액', '시장점유율(%)', '평균단가']].copy()
+        efficiency_df = copy_frame(comp_df[['구분', '학교당평균부수', '학교당평균금액', '시장점유율(%)', '평균단가']])
         st.dataframe(
             efficiency_df.style.format({
                 '학교당평균부수': '{:.0f}',
@@ -593,3 +596,5 @@ if '시도명' in order_df.columns:
 
 else:
     st.error("시도명 정보가 없습니다. 데이터에 '시도명' 컬럼이 필요합니다.")
+
+profiler.finish()
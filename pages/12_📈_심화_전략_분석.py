@@ -1,5 +1,8 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, view
+from utils.cross_sell import co_occurrence, co_occurrence_matrix, top_pairs
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -9,23 +12,24 @@ from typing import cast
 
 st.set_page_config(page_title="심화 전략 분석", page_icon="📈", layout="wide")
 apply_custom_style()
+profiler = page_profiler('12_📈_심화_전략_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'order_df' not in st.session_state or 'total_df' not in st.session_state:
     st.error("데이터를 불러올 수 없습니다. 메인 페이지로 돌아가주세요.")
     st.stop()
 
-order_df = st.session_state.get('order_df', pd.DataFrame()).copy()
-total_df = st.session_state.get('total_df', pd.DataFrame()).copy()
-target_df = st.session_state.get('target_df', pd.DataFrame()).copy()
+order_df = view(st.session_state.get('order_df', pd.DataFrame()))
+total_df = view(st.session_state.get('total_df', pd.DataFrame()))
+target_df = view(st.session_state.get('target_df', pd.DataFrame()))
 
 st.title("📈 심화 전략 분석 (Advanced Analytics)")
 st.markdown("---")
 
 # 데이터 전처리 (연도별 분리)
 if '학년도' in order_df.columns:
-    df_2025 = order_df[order_df['학년도'].astype(str) == '2025'].copy()
-    df_2026 = order_df[order_df['학년도'].astype(str) == '2026'].copy()
+    df_2025 = copy_frame(order_df[order_df['학년도'].astype(str) == '2025'])
+    df_2026 = copy_frame(order_df[order_df['학년도'].astype(str) == '2026'])
     # 수치형 보장: 부수/금액 컬럼이 문자열일 수 있으므로 변환
     for df in (df_2025, df_2026):
         if '부수' in df.columns:
@@ -151,7 +155,7 @@ with tab2:
     churned_schools = schools_2025 - schools_2026
     
     if churned_schools:
-        churn_df = df_2025[df_2025[school_col].isin(churned_schools)].copy()
+        churn_df = copy_frame(df_2025[df_2025[school_col].isin(churned_schools)])
         
         # 학교별 요약
         churn_summary = churn_df.groupby([school_col, '학교명', '총판', '본사담당자(2025.09)']).agg({
@@ -171,7 +175,7 @@ with tab2:
             st.metric("이탈 예상 금액", f"{churn_amt_sum:,.0f}원")
             
             # 총판별 이탈
-            churn_by_dist = churn_summary['총판'].value_counts().head(10)
+            churn_by_dist = churn_summary['총판'].astype(object).value_counts().head(10)
             st.subheader("🚨 총판별 이탈 학교 수 (Top 10)")
             st.dataframe(churn_by_dist, use_container_width=True)
             
@@ -280,26 +284,13 @@ with tab4:
     st.markdown("특정 과목을 구매한 학교가 다른 과목도 구매했는지 분석합니다.")
     
     if '과목명' in order_df.columns:
-        # 학교별 구매 과목 리스트 생성
-        school_subjects = df_2026.groupby(school_col)['과목명'].unique().apply(list)
-        
-        # 과목 목록
-        all_subjects = sorted(df_2026['과목명'].unique())
-        
-        # Co-occurrence Matrix 생성
-        co_occurrence = pd.DataFrame(0, index=all_subjects, columns=all_subjects)
-        
-        for subjects in school_subjects:
-            for s1 in subjects:
-                for s2 in subjects:
-                    co_occurrence.loc[s1, s2] += 1
-        
-        # 자기 자신과의 관계는 제외 (또는 최대값으로 두어 스케일링)
-        # 여기서는 0으로 두어 다른 과목과의 관계 강조
-        np.fill_diagonal(co_occurrence.values, 0)
+        # (학교, 과목) 고유 쌍으로 동시 구매 학교 수를 한 번 계산해 히트맵과 추천에 함께 사용
+        # 자기 자신과의 관계는 0으로 두어 다른 과목과의 관계 강조
+        pair_counts = co_occurrence(df_2026, school_col, '과목명')
+        co_occurrence_df = co_occurrence_matrix(pair_counts)
         
         fig_heatmap = px.imshow(
-            co_occurrence,
+            co_occurrence_df,
             text_auto=True,
             color_continuous_scale='Viridis',
             title="과목 간 동시 구매 빈도 (2026년 기준)"
@@ -309,13 +300,18 @@ with tab4:
         
         st.markdown("### 💡 패키지 영업 추천")
         # 가장 강한 연관관계 찾기
-        pairs = co_occurrence.stack().reset_index()
-        pairs.columns = ['과목A', '과목B', '동시구매수']
-        pairs = pairs[pairs['과목A'] < pairs['과목B']] # 중복 제거
-        top_pairs = pairs.sort_values('동시구매수', ascending=False).head(5)
+        pair_stats = top_pairs(pair_counts, n=5)
         
-        for _, row in top_pairs.iterrows():
+        for _, row in pair_stats.iterrows():
             st.success(f"**{row['과목A']}** + **{row['과목B']}**: {row['동시구매수']}개 학교에서 함께 구매했습니다. 묶음 제안이 효과적일 수 있습니다.")
+        
+        if not pair_stats.empty:
+            st.caption("support: 전체 학교 중 두 과목을 함께 구매한 비율 · confidence(A→B): A 구매 학교 중 B도 구매한 비율 · lift: 1보다 크면 우연보다 자주 함께 구매")
+            st.dataframe(
+                pair_stats.style.format({'support': '{:.1%}', 'confidence(A→B)': '{:.1%}', 'confidence(B→A)': '{:.1%}', 'lift': '{:.2f}'}),
+                use_container_width=True,
+                hide_index=True,
+            )
 
 # 5. AI 인사이트 (Rule-based)
 with tab5:
@@ -352,3 +348,5 @@ with tab5:
 
     st.markdown("---")
     st.caption("※ 이 리포트는 규칙 기반 알고리즘에 의해 자동 생성되었습니다.")
+
+profiler.finish()
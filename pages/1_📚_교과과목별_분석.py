@@ -1,5 +1,9 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.order_cube import count_schools, rollup_orders
+from utils.order_index import select_rows
+from utils.shared_data import copy_frame, view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -11,6 +15,7 @@ from utils.common_filters import apply_common_filters, show_filter_summary
 
 st.set_page_config(page_title="교과/과목별 분석", page_icon="📚", layout="wide")
 apply_custom_style()
+profiler = page_profiler('1_📚_교과과목별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data from session state
 if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
@@ -18,7 +23,7 @@ if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
     st.stop()
 
 total_df = st.session_state['total_df']
-order_df = st.session_state['order_df'].copy()
+order_df = view(st.session_state['order_df'])
 market_analysis = st.session_state.get('market_analysis', pd.DataFrame())  # 시장 분석 데이터
 
 st.title("📚 교과/과목별 상세 분석")
@@ -61,7 +66,7 @@ def show_subject_detail(subject_name, book_code):
     
     # 해당 과목의 모든 주문 데이터
     book_code_col = '도서코드(교지명구분)' if '도서코드(교지명구분)' in st.session_state['order_df'].columns else '도서코드'
-    subject_orders = st.session_state['order_df'][st.session_state['order_df'][book_code_col] == book_code].copy()
+    subject_orders = select_rows(st.session_state['order_df'], {book_code_col: book_code})
     
     # 기본 통계
     col1, col2, col3, col4 = st.columns(4)
@@ -69,11 +74,12 @@ def show_subject_detail(subject_name, book_code):
         st.metric("총 주문 부수", f"{subject_orders['부수'].sum():,.0f}부")
     with col2:
         school_col = '정보공시학교코드' if '정보공시학교코드' in subject_orders.columns else '학교코드'
-        st.metric("주문 학교 수", f"{subject_orders[school_col].nunique():,}개")
+        school_count = count_schools(subject_orders, column=school_col)
+        st.metric("주문 학교 수", f"{school_count:,}개")
     with col3:
         st.metric("총 주문 금액", f"{subject_orders['금액'].sum():,.0f}원" if '금액' in subject_orders.columns else "N/A")
     with col4:
-        st.metric("학교당 평균", f"{subject_orders['부수'].sum() / subject_orders[school_col].nunique():.1f}부")
+        st.metric("학교당 평균", f"{subject_orders['부수'].sum() / school_count:.1f}부")
     
     st.markdown("---")
     
@@ -191,7 +197,7 @@ if '학교급명' in order_df.columns:
     selected_school_level = st.sidebar.selectbox("학교급 선택", school_levels)
     
     if selected_school_level != '전체':
-        order_df = order_df[order_df['학교급명'] == selected_school_level].copy()
+        order_df = select_rows(order_df, 학교급명=selected_school_level)
         st.sidebar.info(f"선택된 학교급: {selected_school_level}")
 
 # Apply common filters
@@ -231,7 +237,7 @@ with tab1:
     school_code_col = '정보공시학교코드' if '정보공시학교코드' in filtered_order_df.columns else '학교코드'
     
     if book_code_col in filtered_order_df.columns:
-        subject_stats = filtered_order_df.groupby(book_code_col).agg({
+        subject_stats = rollup_orders(filtered_order_df, book_code_col, {
             '부수': 'sum',
             '금액': 'sum' if '금액' in filtered_order_df.columns else 'count',
             school_code_col: 'nunique',
@@ -242,7 +248,7 @@ with tab1:
     else:
         # Fallback: 교과서명_구분으로 그룹화
         subject_col = '교과서명_구분' if '교과서명_구분' in filtered_order_df.columns else '과목명'
-        subject_stats = filtered_order_df.groupby(subject_col).agg({
+        subject_stats = rollup_orders(filtered_order_df, subject_col, {
             '부수': 'sum',
             '금액': 'sum' if '금액' in filtered_order_df.columns else 'count',
             school_code_col: 'nunique'
@@ -296,9 +302,9 @@ with tab1:
     if school_level_col:
         # 도서코드별로 학교급 매핑
         book_school_level = filtered_order_df.groupby('과목명')[school_level_col].first().to_dict()
-        subject_stats['학교급'] = subject_stats['과목명'].map(book_school_level).fillna('미분류')
+        subject_stats['학교급'] = subject_stats['과목명'].astype(object).map(book_school_level).fillna('미분류')
     else:
-        subject_stats['학교급'] = subject_stats['과목명'].apply(get_school_level_from_subject)
+        subject_stats['학교급'] = subject_stats['과목명'].astype(object).apply(get_school_level_from_subject)
     
     col1, col2 = st.columns([2, 1])
     
@@ -458,10 +464,10 @@ with tab3:
         
         if book_code_col:
             # 타입 통일 (문자열로 변환)
-            product_merge = product_df[['코드', '학교급', '교과군', '교과서명']].drop_duplicates().copy()
+            product_merge = copy_frame(product_df[['코드', '학교급', '교과군', '교과서명']].drop_duplicates())
             product_merge['코드'] = product_merge['코드'].astype(str)
             
-            filtered_order_copy = filtered_order_df.copy()
+            filtered_order_copy = copy_frame(filtered_order_df)
             filtered_order_copy[book_code_col] = filtered_order_copy[book_code_col].astype(str)
             
             # Merge with product data
@@ -473,9 +479,9 @@ with tab3:
                 how='left'
             )
         else:
-            order_with_level = filtered_order_df.copy()
+            order_with_level = copy_frame(filtered_order_df)
     else:
-        order_with_level = filtered_order_df.copy()
+        order_with_level = copy_frame(filtered_order_df)
     
     # School level comparison
     if '학교급명' in filtered_order_df.columns:
@@ -486,12 +492,12 @@ with tab3:
             # Statistics by school level
             school_code_col = '정보공시학교코드' if '정보공시학교코드' in filtered_order_df.columns else '학교코드'
             
-            level_stats = filtered_order_df[filtered_order_df['학교급명'].isin(middle_high)].groupby('학교급명').agg({
+            level_stats = rollup_orders(filtered_order_df, '학교급명', {
                 '부수': 'sum',
                 '금액': 'sum' if '금액' in filtered_order_df.columns else 'count',
                 '과목명': 'nunique',
                 school_code_col: 'nunique'
-            }).reset_index()
+            }, where={'학교급명': middle_high}).reset_index()
             level_stats.columns = ['학교급', '주문부수', '주문금액', '과목수', '학교수']
             
             # Display metrics
@@ -545,7 +551,7 @@ with tab3:
             st.markdown("---")
             st.subheader("📚 학교급별 과목 분석")
             
-            subject_by_level = filtered_order_df[filtered_order_df['학교급명'].isin(middle_high)].groupby(['학교급명', '과목명'])['부수'].sum().reset_index()
+            subject_by_level = rollup_orders(filtered_order_df, ['학교급명', '과목명'], where={'학교급명': middle_high}).reset_index()
             
             # Get top subjects for each level
             col1, col2 = st.columns(2)
@@ -595,7 +601,7 @@ with tab3:
             st.subheader("🗺️ 학교급별 지역 분포")
             
             if '시도교육청' in filtered_order_df.columns:
-                regional_level = filtered_order_df[filtered_order_df['학교급명'].isin(middle_high)].groupby(['시도교육청', '학교급명'])['부수'].sum().reset_index()
+                regional_level = rollup_orders(filtered_order_df, ['시도교육청', '학교급명'], where={'학교급명': middle_high}).reset_index()
                 
                 fig_regional = px.bar(
                     regional_level,
@@ -616,7 +622,7 @@ with tab3:
             st.subheader("📖 학교급별 교과군 비교")
             
             if '교과군' in filtered_order_df.columns:
-                group_level = filtered_order_df[filtered_order_df['학교급명'].isin(middle_high)].groupby(['교과군', '학교급명'])['부수'].sum().reset_index()
+                group_level = rollup_orders(filtered_order_df, ['교과군', '학교급명'], where={'학교급명': middle_high}).reset_index()
                 
                 # Heatmap
                 pivot_group_level = group_level.pivot(index='교과군', columns='학교급명', values='부수').fillna(0)
@@ -700,7 +706,7 @@ with tab4:
         if top_subjects_list:
             # 중복 컬럼 제거 (unique 적용)
             unique_subjects = list(dict.fromkeys(top_subjects_list))
-            pivot_data_filtered = pivot_data[unique_subjects].copy()
+            pivot_data_filtered = copy_frame(pivot_data[unique_subjects])
             
             fig_heatmap = px.imshow(
                 pivot_data_filtered,
@@ -795,7 +801,7 @@ with tab5:
         
         # Competition intensity
         st.markdown("#### 🔥 경쟁 강도 분석")
-        subject_stats_sorted = subject_stats.copy()
+        subject_stats_sorted = copy_frame(subject_stats)
         subject_stats_sorted['경쟁강도'] = subject_stats_sorted['학교수'] / subject_stats_sorted['주문부수'] * 10000
         high_competition = subject_stats_sorted.nsmallest(5, '경쟁강도')
         
@@ -836,3 +842,5 @@ with tab6:
 
 st.markdown("---")
 st.caption("📊 교과/과목별 분석 페이지")
+
+profiler.finish()
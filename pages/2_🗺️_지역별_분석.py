@@ -1,5 +1,10 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, view
+from utils.distributor_directory import directory_from_session
+from utils.order_cube import count_schools, rollup_orders
+from utils.order_index import select_rows
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -10,6 +15,7 @@ from utils.common_filters import apply_common_filters, show_filter_summary
 
 st.set_page_config(page_title="지역별 분석", page_icon="🗺️", layout="wide")
 apply_custom_style()
+profiler = page_profiler('2_🗺️_지역별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
@@ -23,31 +29,11 @@ market_analysis = st.session_state.get('market_analysis', pd.DataFrame())  # 시
 
 # Add distributor info to order data (시군구 정보 추가)
 if not distributor_df.empty and '총판명' in distributor_df.columns:
-    # Create mapping from distributor name to region info
-    dist_region_map = {}
-    for _, row in distributor_df.iterrows():
-        dist_name = str(row.get('총판명', ''))
-        if dist_name:
-            dist_region_map[dist_name] = {
-                '지역': row.get('지 역', ''),
-                '시도': row.get('시도', ''),
-                '시군구': row.get('시군구', ''),
-                '시군구2': row.get('시군구2', ''),
-                '등급': row.get('등급', '')
-            }
-    
-    # Match order data with distributor info
-    def get_region_info(dist_name, info_type):
-        if pd.isna(dist_name):
-            return None
-        for key, value in dist_region_map.items():
-            if key in str(dist_name) or str(dist_name) in key:
-                return value.get(info_type)
-        return None
-    
-    order_df['시군구'] = order_df['총판'].apply(lambda x: get_region_info(x, '시군구'))
-    order_df['시군구2'] = order_df['총판'].apply(lambda x: get_region_info(x, '시군구2'))
-    order_df['총판지역'] = order_df['총판'].apply(lambda x: get_region_info(x, '지역'))
+    # 총판별 지역 정보: 고유 총판마다 한 번만 찾고(공유 총판 조회 테이블에 메모) 행에는 map으로 펼침
+    region_info = directory_from_session(st.session_state).map_region(order_df['총판'], ['시군구', '시군구2', '지역'])
+    order_df['시군구'] = region_info['시군구']
+    order_df['시군구2'] = region_info['시군구2']
+    order_df['총판지역'] = region_info['지역']
 
 st.title("🗺️ 지역별 상세 분석")
 st.markdown("---")
@@ -60,9 +46,7 @@ def show_region_detail(region_name):
     
     # 해당 지역의 모든 주문 데이터
     region_col = '시도' if '시도' in st.session_state['order_df'].columns else '시도교육청'
-    region_orders = st.session_state['order_df'][
-        st.session_state['order_df'][region_col] == region_name
-    ].copy()
+    region_orders = select_rows(st.session_state['order_df'], {region_col: region_name})
     
     # 기본 통계
     col1, col2, col3, col4 = st.columns(4)
@@ -70,7 +54,7 @@ def show_region_detail(region_name):
         st.metric("총 주문 부수", f"{region_orders['부수'].sum():,.0f}부")
     with col2:
         school_col = '정보공시학교코드' if '정보공시학교코드' in region_orders.columns else '학교코드'
-        st.metric("주문 학교 수", f"{region_orders[school_col].nunique():,}개")
+        st.metric("주문 학교 수", f"{count_schools(region_orders, column=school_col):,}개")
     with col3:
         st.metric("총판 수", f"{region_orders['총판'].nunique():,}개" if '총판' in region_orders.columns else "N/A")
     with col4:
@@ -211,14 +195,14 @@ if '지역구분' in total_df.columns:
     selected_direction = st.sidebar.selectbox("지역 구분", region_directions)
     
     if selected_direction != '전체':
-        filtered_total_df = total_df[total_df['지역구분'] == selected_direction].copy()
-        filtered_order_df = order_df[order_df['지역구분'] == selected_direction].copy()
+        filtered_total_df = copy_frame(total_df[total_df['지역구분'] == selected_direction])
+        filtered_order_df = copy_frame(order_df[order_df['지역구분'] == selected_direction])
     else:
-        filtered_total_df = total_df.copy()
-        filtered_order_df = order_df.copy()
+        filtered_total_df = view(total_df)
+        filtered_order_df = view(order_df)
 else:
-    filtered_total_df = total_df.copy()
-    filtered_order_df = order_df.copy()
+    filtered_total_df = view(total_df)
+    filtered_order_df = view(order_df)
 
 # School Level Filter
 if '학교급명' in filtered_order_df.columns:
@@ -237,7 +221,7 @@ if '학교급명' in filtered_order_df.columns:
     selected_school_level = st.sidebar.selectbox("학교급 선택", school_levels)
     
     if selected_school_level != '전체':
-        filtered_order_df = filtered_order_df[filtered_order_df['학교급명'] == selected_school_level]
+        filtered_order_df = select_rows(filtered_order_df, 학교급명=selected_school_level)
         st.sidebar.info(f"선택된 학교급: {selected_school_level}")
         filtered_total_df = filtered_total_df[filtered_total_df.get('학교급명', filtered_total_df['학교급코드'].map({2: '초등학교', 3: '중학교', 4: '고등학교'})) == selected_school_level]
 
@@ -256,7 +240,7 @@ if '학교급코드' in filtered_total_df.columns:
     
     if selected_school != '전체':
         selected_code = [k for k, v in school_level_names.items() if v == selected_school][0]
-        filtered_total_df = filtered_total_df[filtered_total_df['학교급코드'] == selected_code].copy()
+        filtered_total_df = copy_frame(filtered_total_df[filtered_total_df['학교급코드'] == selected_code])
     
 # Subject Filter
 if '과목명' in filtered_order_df.columns:
@@ -264,7 +248,7 @@ if '과목명' in filtered_order_df.columns:
     selected_subject = st.sidebar.selectbox("과목 선택", subjects)
     
     if selected_subject != '전체':
-        filtered_order_df = filtered_order_df[filtered_order_df['과목명'] == selected_subject].copy()
+        filtered_order_df = select_rows(filtered_order_df, 과목명=selected_subject)
 
 st.sidebar.markdown("---")
 st.sidebar.info(f"📊 필터링된 학생: {filtered_total_df['학생수(계)'].sum():,.0f}명")
@@ -306,12 +290,12 @@ with tab1:
         region_schools_total = filtered_total_df.groupby('시도교육청')['정보공시 학교코드'].nunique().reset_index()
         region_schools_total.columns = ['시도교육청', '전체학교수']
         
-        region_orders = filtered_order_df.groupby('시도교육청')['부수'].sum().reset_index()
+        region_orders = rollup_orders(filtered_order_df, '시도교육청').reset_index()
         region_orders.columns = ['시도교육청', '주문부수']
         
         # 지역별 채택 학교 수 계산
         school_code_col = '정보공시학교코드' if '정보공시학교코드' in filtered_order_df.columns else '학교코드'
-        region_schools_adopted = filtered_order_df.groupby('시도교육청')[school_code_col].nunique().reset_index()
+        region_schools_adopted = rollup_orders(filtered_order_df, '시도교육청', {school_code_col: 'nunique'}).reset_index()
         region_schools_adopted.columns = ['시도교육청', '채택학교수']
         
         # 모든 통계 병합
@@ -527,7 +511,7 @@ with tab2:
     if '교육지원청' in filtered_total_df.columns and '교육지원청' in filtered_order_df.columns:
         # Education office statistics
         office_students = filtered_total_df.groupby(['시도교육청', '교육지원청'])['학생수(계)'].sum().reset_index()
-        office_orders = filtered_order_df.groupby(['시도교육청', '교육지원청'])['부수'].sum().reset_index()
+        office_orders = rollup_orders(filtered_order_df, ['시도교육청', '교육지원청']).reset_index()
         
         office_stats = pd.merge(
             office_students,
@@ -583,7 +567,7 @@ with tab3:
     # Check if we have city/county data
     if '시군구2' in order_df.columns and not order_df['시군구2'].isna().all():
         # Get orders with city/county info
-        city_orders = filtered_order_df[filtered_order_df['시군구2'].notna()].copy()
+        city_orders = copy_frame(filtered_order_df[filtered_order_df['시군구2'].notna()])
         
         if not city_orders.empty:
             # Aggregate by city/county
@@ -964,3 +948,5 @@ with tab5:
 
 st.markdown("---")
 st.caption("🗺️ 지역별 분석 페이지")
+
+profiler.finish()
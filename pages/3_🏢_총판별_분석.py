@@ -1,5 +1,9 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.order_cube import count_schools, rollup_orders
+from utils.order_index import select_rows
+from utils.shared_data import copy_frame, view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -11,6 +15,7 @@ from utils.common_filters import apply_common_filters, show_filter_summary
 
 st.set_page_config(page_title="총판별 분석", page_icon="🏢", layout="wide")
 apply_custom_style()
+profiler = page_profiler('3_🏢_총판별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
@@ -18,7 +23,7 @@ if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
     st.stop()
 
 total_df = st.session_state['total_df']
-order_df = st.session_state['order_df'].copy()
+order_df = view(st.session_state['order_df'])
 target_df = st.session_state.get('target_df', pd.DataFrame())  # 목표 데이터 로드
 distributor_df = st.session_state.get('distributor_df', pd.DataFrame())  # 총판 정보 로드
 
@@ -32,9 +37,7 @@ def show_distributor_detail(dist_name):
     st.subheader(f"🏢 {dist_name}")
     
     # 해당 총판의 모든 주문 데이터
-    dist_orders = st.session_state['order_df'][
-        st.session_state['order_df']['총판'] == dist_name
-    ].copy()
+    dist_orders = select_rows(st.session_state['order_df'], 총판=dist_name)
     
     # 기본 통계
     col1, col2, col3, col4 = st.columns(4)
@@ -42,7 +45,7 @@ def show_distributor_detail(dist_name):
         st.metric("총 주문 부수", f"{dist_orders['부수'].sum():,.0f}부")
     with col2:
         school_col = '정보공시학교코드' if '정보공시학교코드' in dist_orders.columns else '학교코드'
-        st.metric("담당 학교 수", f"{dist_orders[school_col].nunique():,}개")
+        st.metric("담당 학교 수", f"{count_schools(dist_orders, column=school_col):,}개")
     with col3:
         st.metric("총 주문 금액", f"{dist_orders['금액'].sum():,.0f}원" if '금액' in dist_orders.columns else "N/A")
     with col4:
@@ -143,6 +146,7 @@ def show_distributor_detail(dist_name):
         )
 
 # Apply common filters
+profiler.step('공통 필터')
 filtered_order_df = apply_common_filters(order_df)
 show_filter_summary(filtered_order_df, st.session_state['order_df'])
 
@@ -150,6 +154,7 @@ st.sidebar.markdown("---")
 st.sidebar.info(f"📊 필터링된 데이터: {len(filtered_order_df):,}건")
 
 # Main Metrics
+profiler.step('총판별 분석')
 if '총판' in filtered_order_df.columns:
     col1, col2, col3, col4 = st.columns(4)
     
@@ -174,16 +179,16 @@ if '총판' in filtered_order_df.columns:
     # Tab Layout
     tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs(["📊 총판별 현황", "🎯 목표 대비 실적", "📈 실적 비교", "🎯 성과 분석", "💡 효율성 분석", "🗺️ 시군구별 분석", "📋 상세 테이블"])
     
-    with tab1:
+    with tab1, profiler.section('📊 총판별 현황'):
         st.subheader("총판별 판매 현황")
         
         st.info("💡 **목표는 2026년도 기준**이므로, 2026년도 목표과목1·목표과목2 주문만 집계하여 달성률을 계산합니다.")
         
         # 🚨 원본 주문 데이터에서 직접 필터링 (세션 필터가 적용되지 않은 경우 대비)
         if 'order_df_original' in st.session_state:
-            source_df = st.session_state['order_df_original'].copy()
+            source_df = view(st.session_state['order_df_original'])
         else:
-            source_df = filtered_order_df.copy()
+            source_df = view(filtered_order_df)
         
         # 목표과목 컬럼 탐색
         target_col = None
@@ -198,12 +203,12 @@ if '총판' in filtered_order_df.columns:
         
         # 2026년도 + 목표과목1/2 필터 적용
         if '학년도' in source_df.columns:
-            filtered_order_2026 = source_df[
+            filtered_order_2026 = copy_frame(source_df[
                 (source_df['학년도'] == 2026) & 
                 (source_df[target_col].isin(['목표과목1', '목표과목2']))
-            ].copy()
+            ])
         else:
-            filtered_order_2026 = source_df[source_df[target_col].isin(['목표과목1', '목표과목2'])].copy()
+            filtered_order_2026 = copy_frame(source_df[source_df[target_col].isin(['목표과목1', '목표과목2'])])
         
         # Distributor statistics (전체 주문 데이터는 참고용)
         school_code_col = '정보공시학교코드' if '정보공시학교코드' in filtered_order_2026.columns else '학교코드'
@@ -237,7 +242,7 @@ if '총판' in filtered_order_df.columns:
                         return market_map[official_name]
                 return {'시장규모': 0, '주문부수': 0}
             
-            dist_stats['시장규모'] = dist_stats['총판'].apply(lambda x: get_market_data(x)['시장규모'])
+            dist_stats['시장규모'] = dist_stats['총판'].astype(object).apply(lambda x: get_market_data(x)['시장규모'])
             dist_stats['점유율(%)'] = dist_stats.apply(
                 lambda row: (row['주문부수'] / row['시장규모'] * 100) if row['시장규모'] > 0 else 0,
                 axis=1
@@ -251,7 +256,7 @@ if '총판' in filtered_order_df.columns:
         # 목표 데이터 병합 (목표1 + 목표2)
         if not target_df.empty and '총판명(공식)' in target_df.columns:
             # 목표1 부수와 목표2 부수 합산하여 전체 목표 계산
-            target_summary = target_df.copy()
+            target_summary = copy_frame(target_df)
             
             # 쉼표 제거 및 숫자 변환
             for col in ['목표과목1 부수', '목표과목2 부수', '전체목표 부수']:
@@ -267,7 +272,7 @@ if '총판' in filtered_order_df.columns:
             
             # 총판명으로 병합
             target_map = target_summary.groupby('총판명(공식)')['전체목표'].sum().to_dict()
-            dist_stats['목표부수'] = dist_stats['총판'].map(target_map).fillna(0)
+            dist_stats['목표부수'] = dist_stats['총판'].astype(object).map(target_map).fillna(0)
             dist_stats['달성률(%)'] = (dist_stats['주문부수'] / dist_stats['목표부수'] * 100).replace([float('inf'), -float('inf')], 0).fillna(0)
         else:
             dist_stats['목표부수'] = 0
@@ -345,7 +350,7 @@ if '총판' in filtered_order_df.columns:
         
         with col2:
             # Waterfall chart for top distributors
-            dist_waterfall = dist_stats.head(10).copy()
+            dist_waterfall = copy_frame(dist_stats.head(10))
             fig_waterfall = go.Figure(go.Waterfall(
                 name="주문량",
                 orientation="v",
@@ -358,11 +363,11 @@ if '총판' in filtered_order_df.columns:
             fig_waterfall.update_layout(title="TOP 10 총판 주문량 누적")
             st.plotly_chart(fig_waterfall, use_container_width=True)
     
-    with tab2:
+    with tab2, profiler.section('🎯 목표 대비 실적'):
         st.subheader("🎯 목표 대비 실적 분석")
         
         # 목표가 있는 총판만 필터링
-        target_dists = dist_stats[dist_stats['목표부수'] > 0].copy()
+        target_dists = copy_frame(dist_stats[dist_stats['목표부수'] > 0])
         
         if len(target_dists) > 0:
             col1, col2, col3, col4 = st.columns(4)
@@ -572,7 +577,7 @@ if '총판' in filtered_order_df.columns:
         else:
             st.warning("목표 데이터가 없습니다.")
     
-    with tab3:
+    with tab3, profiler.section('📈 실적 비교'):
         st.subheader("📈 총판 실적 비교")
         
         col1, col2 = st.columns(2)
@@ -616,7 +621,7 @@ if '총판' in filtered_order_df.columns:
         
         # Normalize metrics for radar chart
         metrics_to_compare = ['주문부수', '주문금액', '거래학교수', '취급과목수', '학교당평균']
-        normalized_data = top5_dists[metrics_to_compare].copy()
+        normalized_data = copy_frame(top5_dists[metrics_to_compare])
         for col in metrics_to_compare:
             max_val = normalized_data[col].max()
             normalized_data[col] = (normalized_data[col] / max_val) * 100 if max_val > 0 else 0
@@ -641,7 +646,7 @@ if '총판' in filtered_order_df.columns:
         )
         st.plotly_chart(fig_radar, use_container_width=True)
     
-    with tab4:
+    with tab4, profiler.section('🎯 성과 분석'):
         st.subheader("🎯 총판별 성과 심층 분석")
         
         # Performance ranking
@@ -747,7 +752,7 @@ if '총판' in filtered_order_df.columns:
         if '시도교육청' in filtered_order_df.columns:
             selected_dist = st.selectbox("총판 선택", dist_stats['총판'].tolist())
             
-            dist_regional = filtered_order_df[filtered_order_df['총판'] == selected_dist].groupby('시도교육청')['부수'].sum().reset_index()
+            dist_regional = rollup_orders(filtered_order_df, '시도교육청', where={'총판': selected_dist}).reset_index()
             dist_regional = dist_regional.sort_values('부수', ascending=False)
             
             col1, col2 = st.columns([2, 1])
@@ -775,7 +780,7 @@ if '총판' in filtered_order_df.columns:
                 )
                 st.plotly_chart(fig_pie, use_container_width=True)
     
-    with tab5:
+    with tab5, profiler.section('💡 효율성 분석'):
         st.subheader("� 총판 효율성 및 성장 분석")
         
         col1, col2 = st.columns(2)
@@ -810,7 +815,7 @@ if '총판' in filtered_order_df.columns:
             
             # Detailed efficiency table
             st.markdown("**효율성 상세 지표**")
-            efficiency_display = top_efficient[['총판', '학교당평균', '과목당평균부수', '효율성점수']].copy()
+            efficiency_display = copy_frame(top_efficient[['총판', '학교당평균', '과목당평균부수', '효율성점수']])
             st.dataframe(
                 efficiency_display.style.format({
                     '학교당평균': '{:.1f}',
@@ -902,7 +907,7 @@ if '총판' in filtered_order_df.columns:
                      delta=f"HHI: {hhi:.0f}",
                      help="HHI (Herfindahl-Hirschman Index): 시장 집중도 지표")
     
-    with tab6:
+    with tab6, profiler.section('🗺️ 시군구별 분석'):
         st.subheader("🗺️ 시군구별 총판 분석")
         
         # Extract region info from orders
@@ -1114,7 +1119,7 @@ if '총판' in filtered_order_df.columns:
             st.info("💡 시군구 정보가 없습니다. 시도 단위로 분석합니다.")
             
             # Fallback to 시도 level
-            sido_stats = filtered_order_df.groupby('시도교육청').agg({
+            sido_stats = rollup_orders(filtered_order_df, '시도교육청', {
                 '부수': 'sum',
                 '총판': 'nunique',
                 '정보공시학교코드' if '정보공시학교코드' in filtered_order_df.columns else '학교코드': 'nunique'
@@ -1137,7 +1142,7 @@ if '총판' in filtered_order_df.columns:
         else:
             st.warning("⚠️ 지역 정보가 없습니다.")
     
-    with tab7:
+    with tab7, profiler.section('📋 상세 테이블'):
         st.subheader("📋 총판별 상세 데이터")
         
         # Search
@@ -1180,3 +1185,5 @@ else:
 
 st.markdown("---")
 st.caption("🏢 총판별 분석 페이지")
+
+profiler.finish()
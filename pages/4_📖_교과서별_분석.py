@@ -1,11 +1,14 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
 st.set_page_config(page_title="교과서별 분석", page_icon="📖", layout="wide")
 apply_custom_style()
+profiler = page_profiler('4_📖_교과서별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'order_df' not in st.session_state:
@@ -53,11 +56,11 @@ if '교지명' in order_df.columns:
     selected_book_type = st.sidebar.selectbox("도서 유형", book_types)
     
     if selected_book_type != '전체':
-        filtered_df = order_df[order_df['교지명'] == selected_book_type].copy()
+        filtered_df = copy_frame(order_df[order_df['교지명'] == selected_book_type])
     else:
-        filtered_df = order_df.copy()
+        filtered_df = view(order_df)
 else:
-    filtered_df = order_df.copy()
+    filtered_df = view(order_df)
 
 # Subject Filter
 if '과목명' in filtered_df.columns:
@@ -125,9 +128,9 @@ with tab1:
         
         if school_level_col:
             book_school_level = filtered_df.groupby('과목명')[school_level_col].first().to_dict()
-            book_stats['학교급'] = book_stats['과목명'].map(book_school_level).fillna('미분류')
+            book_stats['학교급'] = book_stats['과목명'].astype(object).map(book_school_level).fillna('미분류')
         else:
-            book_stats['학교급'] = book_stats['과목명'].apply(get_school_level_from_subject)
+            book_stats['학교급'] = book_stats['과목명'].astype(object).apply(get_school_level_from_subject)
         
         book_stats = book_stats.sort_values('주문부수', ascending=False)
         
@@ -206,7 +209,7 @@ with tab2:
         with col2:
             # Box plot by subject
             if '과목명' in filtered_df.columns:
-                top_subjects = filtered_df['과목명'].value_counts().head(10).index.tolist()
+                top_subjects = filtered_df['과목명'].astype(object).value_counts().head(10).index.tolist()
                 price_by_subject = filtered_df[filtered_df['과목명'].isin(top_subjects)]
                 
                 fig_box = px.box(
@@ -356,7 +359,7 @@ with tab4:
         sort_by = st.selectbox("정렬 기준", ['주문부수', '주문금액', '정가', '주문학교수'])
     
     if 'book_stats' in locals():
-        display_data = book_stats.copy()
+        display_data = copy_frame(book_stats)
         
         if search_term:
             display_data = display_data[
@@ -389,3 +392,5 @@ with tab4:
 
 st.markdown("---")
 st.caption("📖 교과서별 분석 페이지")
+
+profiler.finish()
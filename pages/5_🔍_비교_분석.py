@@ -1,5 +1,10 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.shared_data import copy_frame
+from utils.page_profiler import page_profiler
+from utils.market_size_group import market_size_for_schools, school_market_sizes
+from utils.order_cube import rollup_orders
+from utils.order_index import select_rows
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -7,6 +12,7 @@ from plotly.subplots import make_subplots
 
 st.set_page_config(page_title="비교 분석", page_icon="🔍", layout="wide")
 apply_custom_style()
+profiler = page_profiler('5_🔍_비교_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
@@ -43,8 +49,8 @@ with tab1:
             region_b = st.selectbox("지역 B", regions, index=min(1, len(regions)-1))
         
         # Compare regions
-        data_a = order_df[order_df['시도교육청'] == region_a]
-        data_b = order_df[order_df['시도교육청'] == region_b]
+        data_a = select_rows(order_df, 시도교육청=region_a)
+        data_b = select_rows(order_df, 시도교육청=region_b)
         
         # Calculate market size for each region
         school_code_col = '정보공시학교코드' if '정보공시학교코드' in data_a.columns else '학교코드'
@@ -53,23 +59,9 @@ with tab1:
         
         # Calculate market size (중등/고등 1,2학년 학생수)
         if not total_df.empty:
-            schools_a_df = total_df[total_df['정보공시 학교코드'].isin(pd.Series(schools_a_codes).astype(str))]
-            market_a = 0
-            for _, school in schools_a_df.iterrows():
-                grade_code = school.get('학교급코드', 0)
-                if grade_code == 3:  # 중학교
-                    market_a += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-                elif grade_code == 4:  # 고등학교
-                    market_a += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-            
-            schools_b_df = total_df[total_df['정보공시 학교코드'].isin(pd.Series(schools_b_codes).astype(str))]
-            market_b = 0
-            for _, school in schools_b_df.iterrows():
-                grade_code = school.get('학교급코드', 0)
-                if grade_code == 3:  # 중학교
-                    market_b += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-                elif grade_code == 4:  # 고등학교
-                    market_b += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
+            school_sizes = school_market_sizes(total_df)
+            market_a = market_size_for_schools(schools_a_codes, school_sizes=school_sizes)
+            market_b = market_size_for_schools(schools_b_codes, school_sizes=school_sizes)
         else:
             market_a = market_b = 0
         
@@ -136,10 +128,10 @@ with tab1:
         st.subheader("과목별 비교")
         
         subject_col = '교과서명_구분' if '교과서명_구분' in data_a.columns else '과목명'
-        subject_a = data_a.groupby(subject_col)['부수'].sum().reset_index()
+        subject_a = rollup_orders(data_a, subject_col).reset_index()
         subject_a.columns = [subject_col, region_a]
         
-        subject_b = data_b.groupby(subject_col)['부수'].sum().reset_index()
+        subject_b = rollup_orders(data_b, subject_col).reset_index()
         subject_b.columns = [subject_col, region_b]
         
         comparison_df = pd.merge(subject_a, subject_b, on=subject_col, how='outer').fillna(0)
@@ -160,8 +152,8 @@ with tab1:
         with col2:
             dist_b = st.selectbox("총판 B", distributors, index=min(1, len(distributors)-1))
         
-        data_a = order_df[order_df['총판'] == dist_a]
-        data_b = order_df[order_df['총판'] == dist_b]
+        data_a = select_rows(order_df, 총판=dist_a)
+        data_b = select_rows(order_df, 총판=dist_b)
         
         # Calculate market size for each distributor
         school_code_col = '정보공시학교코드' if '정보공시학교코드' in data_a.columns else '학교코드'
@@ -170,23 +162,9 @@ with tab1:
         
         # Calculate market size
         if not total_df.empty:
-            schools_a_df = total_df[total_df['정보공시 학교코드'].isin(pd.Series(schools_a_codes).astype(str))]
-            market_a = 0
-            for _, school in schools_a_df.iterrows():
-                grade_code = school.get('학교급코드', 0)
-                if grade_code == 3:  # 중학교
-                    market_a += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-                elif grade_code == 4:  # 고등학교
-                    market_a += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-            
-            schools_b_df = total_df[total_df['정보공시 학교코드'].isin(pd.Series(schools_b_codes).astype(str))]
-            market_b = 0
-            for _, school in schools_b_df.iterrows():
-                grade_code = school.get('학교급코드', 0)
-                if grade_code == 3:  # 중학교
-                    market_b += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-                elif grade_code == 4:  # 고등학교
-                    market_b += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
+            school_sizes = school_market_sizes(total_df)
+            market_a = market_size_for_schools(schools_a_codes, school_sizes=school_sizes)
+            market_b = market_size_for_schools(schools_b_codes, school_sizes=school_sizes)
         else:
             market_a = market_b = 0
         
@@ -336,8 +314,8 @@ with tab2:
         )
         
         # Show top items for each dimension
-        top_dim1 = order_df.groupby(dim1)['부수'].sum().nlargest(15).index.tolist()
-        top_dim2 = order_df.groupby(dim2)['부수'].sum().nlargest(15).index.tolist()
+        top_dim1 = rollup_orders(order_df, dim1).nlargest(15).index.tolist()
+        top_dim2 = rollup_orders(order_df, dim2).nlargest(15).index.tolist()
         
         pivot_filtered = pivot.loc[top_dim1, top_dim2]
         
@@ -472,7 +450,7 @@ with tab4:
     with col2:
         # Log scale distribution
         if '부수' in order_df.columns:
-            order_df_temp = order_df[order_df['부수'] > 0].copy()
+            order_df_temp = copy_frame(order_df[order_df['부수'] > 0])
             fig_log = px.histogram(
                 order_df_temp,
                 x='부수',
@@ -496,7 +474,7 @@ with tab4:
     )
     
     if analysis_dim in order_df.columns:
-        pareto_data = order_df.groupby(analysis_dim)['부수'].sum().sort_values(ascending=False).reset_index()
+        pareto_data = rollup_orders(order_df, analysis_dim).sort_values(ascending=False).reset_index()
         pareto_data['누적합'] = pareto_data['부수'].cumsum()
         pareto_data['누적비율(%)'] = (pareto_data['누적합'] / pareto_data['부수'].sum()) * 100
         
@@ -530,3 +508,5 @@ with tab4:
 
 st.markdown("---")
 st.caption("🔍 비교 분석 페이지")
+
+profiler.finish()
@@ -1,5 +1,10 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.market_size_group import market_size_by_group
+from utils.distributor_code import normalize_codes
+from utils.distributor_directory import directory_from_session
+from utils.shared_data import copy_frame, session_view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -8,6 +13,7 @@ from typing import Mapping, Any, cast
 
 st.set_page_config(page_title="총판 비교분석", page_icon="🔄", layout="wide")
 apply_custom_style()
+profiler = page_profiler('6_🔄_총판_비교분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'total_df' not in st.session_state or 'order_df' not in st.session_state:
@@ -18,8 +24,19 @@ total_df = st.session_state['total_df']
 order_df = st.session_state['order_df']
 target_df = st.session_state.get('target_df', pd.DataFrame())
 distributor_df = st.session_state.get('distributor_df', pd.DataFrame())
+directory = directory_from_session(st.session_state)
 market_analysis = st.session_state.get('market_analysis', pd.DataFrame())  # 시장 분석 데이터
-subject_market_by_dist = st.session_state.get('subject_market_by_dist', pd.DataFrame())  # 총판별 과목 시장
+subject_market_by_dist = session_view('subject_market_by_dist', pd.DataFrame())  # 총판별 과목 시장 (처음 열 때 계산)
+
+
+def distributor_market_sizes(distributor_market):
+    """distributor_market의 {총판명(공식): 시장규모} (전체_시장규모, 없으면 시장규모 컬럼)"""
+    if distributor_market.empty or '총판명' not in distributor_market.columns:
+        return {}
+    market_col = next((c for c in ['전체_시장규모', '시장규모'] if c in distributor_market.columns), None)
+    if market_col is None:
+        return {}
+    return dict(zip(distributor_market['총판명'], distributor_market[market_col]))
 
 st.title("🔄 총판 비교 분석")
 st.markdown("---")
@@ -123,6 +140,11 @@ with tab1:
     else:
         filtered_order_2026 = filtered_order
     
+    # 선택된 총판별 시장 규모를 한 번에 계산 (거래 학교들의 중등/고등 1,2학년 학생수 합계)
+    market_sizes = market_size_by_group(filtered_order, '총판', total_df)
+    # 코드 → 등급 (같은 코드가 여러 행이면 총판정보의 첫 행, 기존 iloc[0] 규칙)
+    grade_by_code = directory.field_map('등급', by='code', keep='first')
+    
     for dist in selected_distributors:
         # 전체 데이터 (참고용)
         dist_data = filtered_order[filtered_order['총판'] == dist]
@@ -134,25 +156,8 @@ with tab1:
         school_code_col = '정보공시학교코드' if '정보공시학교코드' in dist_data.columns else '학교코드'
         subject_col = '교과서명_구분' if '교과서명_구분' in dist_data.columns else '교과서명'
         
-        # Calculate market size for this distributor's schools (담당 학교의 중등/고등 1,2학년 학생수)
-        school_codes = dist_data[school_code_col].unique() if school_code_col in dist_data.columns else []
-        
-        if not total_df.empty and len(school_codes) > 0:
-            dist_schools = total_df[total_df['정보공시 학교코드'].isin(pd.Series(school_codes).astype(str))]
-            if not dist_schools.empty:
-                # Calculate market size based on school level (중등=3, 고등=4)
-                # 중등 1,2학년 + 고등 1,2학년 학생수 합계
-                market_size = 0
-                for _, school in dist_schools.iterrows():
-                    grade_code = school.get('학교급코드', 0)
-                    if grade_code == 3:  # 중학교
-                        market_size += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-                    elif grade_code == 4:  # 고등학교
-                        market_size += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-            else:
-                market_size = 0
-        else:
-            market_size = 0
+        # Market size for this distributor's schools (담당 학교의 중등/고등 1,2학년 학생수)
+        market_size = int(market_sizes.get(dist, 0))
         
         stats = {
             '총판': dist,
@@ -166,28 +171,14 @@ with tab1:
         }
         stats['학교당평균'] = stats['주문부수'] / stats['거래학교수'] if stats['거래학교수'] > 0 else 0
         
-        # Get target and grade info from distributor_df (코드 기반 매칭)
+        # Get grade info from the shared distributor directory (코드 기반 매칭)
         if not distributor_df.empty:
             dist_rows = order_df[order_df['총판'] == dist]
             dist_code = None
             if '총판코드_정규화' in dist_rows.columns and not dist_rows.empty:
                 codes = dist_rows['총판코드_정규화'].dropna().astype(str)
                 dist_code = codes.mode().iloc[0] if not codes.empty else None
-            # distributor_df에서 코드 정규화 후 매칭
-            code_col = '총판코드' if '총판코드' in distributor_df.columns else ('숫자코드' if '숫자코드' in distributor_df.columns else None)
-            if code_col and dist_code is not None:
-                df_tmp = distributor_df.copy()
-                try:
-                    df_tmp['__code_norm'] = df_tmp[code_col].apply(lambda x: str(int(x)) if isinstance(x, (int,float)) and not pd.isna(x) and float(x).is_integer() else str(x).strip() if pd.notna(x) else '')
-                except Exception:
-                    df_tmp['__code_norm'] = df_tmp[code_col].astype(str).str.strip()
-                dist_info = df_tmp[df_tmp['__code_norm'] == dist_code]
-                if not dist_info.empty:
-                    stats['등급'] = dist_info.iloc[0].get('등급', '-')
-                else:
-                    stats['등급'] = '-'
-            else:
-                stats['등급'] = '-'
+            stats['등급'] = grade_by_code.get(dist_code, '-') if dist_code is not None else '-'
         else:
             stats['등급'] = '-'
         
@@ -201,11 +192,8 @@ with tab1:
                 dist_code = codes.mode().iloc[0] if not codes.empty else None
             code_col = '총판코드' if '총판코드' in target_df.columns else None
             if code_col and dist_code is not None:
-                tmp = target_df.copy()
-                try:
-                    tmp['__code_norm'] = tmp[code_col].apply(lambda x: str(int(x)) if isinstance(x, (int,float)) and not pd.isna(x) and float(x).is_integer() else str(x).strip() if pd.notna(x) else '')
-                except Exception:
-                    tmp['__code_norm'] = tmp[code_col].astype(str).str.strip()
+                tmp = copy_frame(target_df)
+                tmp['__code_norm'] = normalize_codes(tmp[code_col])
                 target_info = tmp[tmp['__code_norm'] == dist_code]
             else:
                 target_info = pd.DataFrame()
@@ -353,7 +341,7 @@ with tab1:
     with col1:
         # Radar chart
         metrics = ['주문부수', '거래학교수', '취급과목수', '학교당평균']
-        normalized_data = comparison_df[metrics].copy()
+        normalized_data = copy_frame(comparison_df[metrics])
         for col in metrics:
             max_val = normalized_data[col].max()
             normalized_data[col] = (normalized_data[col] / max_val) * 100 if max_val > 0 else 0
@@ -379,7 +367,7 @@ with tab1:
     with col2:
         # Summary table
         st.markdown("#### 📋 비교 요약")
-        display_df = comparison_df[['총판', '등급', '주문부수', '거래학교수', '학교당평균']].copy()
+        display_df = copy_frame(comparison_df[['총판', '등급', '주문부수', '거래학교수', '학교당평균']])
         st.dataframe(
             display_df.style.format({
                 '주문부수': '{:,.0f}',
@@ -395,7 +383,7 @@ with tab2:
     
     if not target_df.empty:
         # Goal achievement comparison
-        goal_data = comparison_df[comparison_df['목표부수'] > 0].copy()
+        goal_data = copy_frame(comparison_df[comparison_df['목표부수'] > 0])
         
         if not goal_data.empty:
             st.info("💡 선택한 총판들의 목표 대비 달성률을 비교합니다. (목표과목1 + 목표과목2 = 전체 목표)")
@@ -521,7 +509,7 @@ with tab2:
             }
             
             # Format using compatible method
-            formatted_df = goal_data[detail_cols].copy()
+            formatted_df = copy_frame(goal_data[detail_cols])
             st.dataframe(
                 formatted_df.style.format(cast(Mapping[str, Any], format_dict), na_rep='-')  # type: ignore[arg-type]
                 .background_gradient(
@@ -696,6 +684,7 @@ with tab5:
     
     # Get all distributor stats with market share
     distributor_market = st.session_state.get('distributor_market', pd.DataFrame())
+    dist_market_sizes = distributor_market_sizes(distributor_market)
     
     if not distributor_market.empty and '점유율(%)' in distributor_market.columns:
         # Select a reference distributor from selected ones
@@ -713,21 +702,14 @@ with tab5:
                 school_code_col = '정보공시학교코드' if '정보공시학교코드' in dist_data.columns else '학교코드'
                 
                 # Get market size from distributor_market
-                # 코드 기반으로 distributor_market 매칭 (세션의 code_to_official 사용)
+                # 코드 → 공식 총판명(세션의 code_to_official) → distributor_market의 총판명으로 매칭
                 dist_rows2 = order_df[order_df['총판'] == dist]
                 dist_code2 = None
                 if '총판코드_정규화' in dist_rows2.columns and not dist_rows2.empty:
                     codes2 = dist_rows2['총판코드_정규화'].dropna().astype(str)
                     dist_code2 = codes2.mode().iloc[0] if not codes2.empty else None
                 official = st.session_state.get('code_to_official', {}).get(dist_code2)
-                if official:
-                    dist_market_row = distributor_market[distributor_market['총판명(공식)'] == official]
-                else:
-                    dist_market_row = pd.DataFrame()
-                if not dist_market_row.empty:
-                    market_size = dist_market_row.iloc[0]['시장규모']
-                else:
-                    market_size = 0
+                market_size = dist_market_sizes.get(official, 0) if official else 0
                 
                 orders = dist_data['부수'].sum()
                 share = (orders / market_size * 100) if market_size > 0 else 0
@@ -821,8 +803,9 @@ with tab6:
     st.subheader("👥 학생수(시장규모)가 유사한 총판 분석")
     
     distributor_market = st.session_state.get('distributor_market', pd.DataFrame())
+    dist_market_sizes = distributor_market_sizes(distributor_market)
     
-    if not distributor_market.empty and '시장규모' in distributor_market.columns:
+    if dist_market_sizes:
         # Select a reference distributor
         ref_dist2 = st.selectbox("기준 총판 선택", selected_distributors, key="ref_market")
         
@@ -844,14 +827,7 @@ with tab6:
                     codes3 = dist_rows3['총판코드_정규화'].dropna().astype(str)
                     dist_code3 = codes3.mode().iloc[0] if not codes3.empty else None
                 official = st.session_state.get('code_to_official', {}).get(dist_code3)
-                if official:
-                    dist_market_row = distributor_market[distributor_market['총판명(공식)'] == official]
-                else:
-                    dist_market_row = pd.DataFrame()
-                if not dist_market_row.empty:
-                    market_size = dist_market_row.iloc[0]['시장규모']
-                else:
-                    market_size = 0
+                market_size = dist_market_sizes.get(official, 0) if official else 0
                 
                 orders = dist_data['부수'].sum()
                 share = (orders / market_size * 100) if market_size > 0 else 0
@@ -957,3 +933,5 @@ with tab6:
 
 st.markdown("---")
 st.caption("🔄 총판 비교 분석 페이지")
+
+profiler.finish()
@@ -1,5 +1,10 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.market_size_group import market_size_by_group
+from utils.order_cube import count_schools
+from utils.order_index import select_rows
+from utils.shared_data import copy_frame, session_view, view
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -7,6 +12,7 @@ from plotly.subplots import make_subplots
 
 st.set_page_config(page_title="등급별 분석", page_icon="🏅", layout="wide")
 apply_custom_style()
+profiler = page_profiler('7_🏅_등급별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # Get data
 if 'order_df' not in st.session_state:
@@ -14,7 +20,7 @@ if 'order_df' not in st.session_state:
     st.stop()
 
 # 🚨 등급별 분석은 목표과목 필터된 데이터 사용
-order_df = st.session_state.get('order_df_target_filtered', st.session_state['order_df']).copy()
+order_df = session_view('order_df_target_filtered', view(st.session_state['order_df']))
 distributor_df = st.session_state.get('distributor_df', pd.DataFrame())
 target_df = st.session_state.get('target_df', pd.DataFrame())
 sort_by_grade = st.session_state.get('sort_by_grade', None)
@@ -30,9 +36,9 @@ def show_grade_detail(grade):
     """등급별 상세 정보 모달"""
     st.subheader(f"🏅 등급: {grade}")
     
-    order_df = st.session_state.get('order_df_target_filtered', st.session_state['order_df'])
+    order_df = session_view('order_df_target_filtered', st.session_state['order_df'])
     grade_col = '총판등급' if '총판등급' in order_df.columns else '등급'
-    grade_orders = order_df[order_df[grade_col] == grade].copy()
+    grade_orders = select_rows(order_df, {grade_col: grade})
     
     # 기본 통계
     col1, col2, col3, col4 = st.columns(4)
@@ -42,7 +48,7 @@ def show_grade_detail(grade):
         st.metric("총판 수", f"{grade_orders['총판'].nunique():,}개")
     with col3:
         school_col = '정보공시학교코드' if '정보공시학교코드' in grade_orders.columns else '학교코드'
-        st.metric("학교 수", f"{grade_orders[school_col].nunique():,}개")
+        st.metric("학교 수", f"{count_schools(grade_orders, column=school_col):,}개")
     with col4:
         st.metric("과목 수", f"{grade_orders['과목명'].nunique():,}개" if '과목명' in grade_orders.columns else "N/A")
     
@@ -191,7 +197,7 @@ with col3:
     st.metric("총판당 평균", f"{avg_per_dist:,.0f}부")
 
 with col4:
-    total_schools = filtered_order['정보공시학교코드'].nunique() if '정보공시학교코드' in filtered_order.columns else filtered_order['학교코드'].nunique()
+    total_schools = count_schools(filtered_order)
     st.metric("거래 학교", f"{total_schools:,}개교")
 
 st.markdown("---")
@@ -207,31 +213,16 @@ with tab1:
     
     # Calculate statistics by grade with market share
     grade_stats = []
+    # 선택된 등급별 시장 규모를 한 번에 계산 (거래 학교들의 중등/고등 1,2학년 학생수 합계)
+    market_sizes = market_size_by_group(filtered_order, '등급', total_df)
     for grade in selected_grades:
         grade_data = filtered_order[filtered_order['등급'] == grade]
         
         # Calculate school code column
         school_code_col = '정보공시학교코드' if '정보공시학교코드' in grade_data.columns else '학교코드'
         
-        # Calculate market size for this grade's schools (담당 학교의 중등/고등 1,2학년 학생수)
-        school_codes = grade_data[school_code_col].unique() if school_code_col in grade_data.columns else []
-        
-        if not total_df.empty and len(school_codes) > 0:
-            grade_schools = total_df[total_df['정보공시 학교코드'].isin(pd.Series(school_codes).astype(str))]
-            if not grade_schools.empty:
-                # Calculate market size based on school level (중등=3, 고등=4)
-                # 중등 1,2학년 + 고등 1,2학년 학생수 합계
-                market_size = 0
-                for _, school in grade_schools.iterrows():
-                    grade_code = school.get('학교급코드', 0)
-                    if grade_code == 3:  # 중학교
-                        market_size += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-                    elif grade_code == 4:  # 고등학교
-                        market_size += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
-            else:
-                market_size = 0
-        else:
-            market_size = 0
+        # Market size for this grade's schools (담당 학교의 중등/고등 1,2학년 학생수)
+        market_size = int(market_sizes.get(grade, 0))
         
         stats = {
             '등급': grade,
@@ -370,7 +361,7 @@ with tab2:
             
             # 2026년도 실적 집계
             dist_2026_actual = grade_data_2026.groupby('총판')['부수'].sum().to_dict()
-            dist_in_grade['실적2026'] = dist_in_grade['총판'].map(dist_2026_actual).fillna(0)
+            dist_in_grade['실적2026'] = dist_in_grade['총판'].astype(object).map(dist_2026_actual).fillna(0)
             
             # 등급 내 점유율 계산
             total_in_grade = dist_in_grade['주문부수'].sum()
@@ -380,7 +371,7 @@ with tab2:
             target_df = st.session_state.get('target_df', pd.DataFrame())
             if not target_df.empty and '총판명(공식)' in target_df.columns:
                 # 목표 계산
-                target_summary = target_df.copy()
+                target_summary = copy_frame(target_df)
                 for col in ['목표과목1 부수', '목표과목2 부수', '전체목표 부수']:
                     if col in target_summary.columns:
                         target_summary[col] = target_summary[col].astype(str).str.replace(',', '').str.replace(' ', '')
@@ -392,7 +383,7 @@ with tab2:
                     target_summary['전체목표'] = target_summary.get('전체목표 부수', 0)
                 
                 target_map = target_summary.groupby('총판명(공식)')['전체목표'].sum().to_dict()
-                dist_in_grade['목표부수'] = dist_in_grade['총판'].map(target_map).fillna(0)
+                dist_in_grade['목표부수'] = dist_in_grade['총판'].astype(object).map(target_map).fillna(0)
                 dist_in_grade['달성률(%)'] = (dist_in_grade['주문부수'] / dist_in_grade['목표부수'] * 100).replace([float('inf'), -float('inf')], 0).fillna(0)
                 
                 # 순위 계산 (달성률 기준)
@@ -610,3 +601,5 @@ with tab4:
 
 st.markdown("---")
 st.caption("🏅 등급별 총판 분석 페이지")
+
+profiler.finish()
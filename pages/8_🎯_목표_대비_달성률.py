@@ -1,5 +1,10 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, session_view, view
+from utils.distributor_code import normalize_codes
+from utils.distributor_directory import directory_from_session
+from utils.achievement import achievement_table, actuals_by_official, target_totals, targets_by_official
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -7,41 +12,16 @@ from plotly.subplots import make_subplots
 
 st.set_page_config(page_title="목표 대비 달성률", page_icon="🎯", layout="wide")
 apply_custom_style()
+profiler = page_profiler('8_🎯_목표_대비_달성률')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 
-def _normalize_code(code_val) -> str:
-    """총판코드 값을 안전하게 정규화하여 문자열로 반환합니다.
-    - NaN 처리: 빈 문자열 반환
-    - 숫자/문자 혼용 처리: 문자열로 변환 후 쉼표/공백 제거
-    - 소수점 '.0' 제거: '123.0' -> '123'
-    - 숫자 형태인 경우 정수로 변환하여 소수점 제거
-    """
-    if pd.isna(code_val):
-        return ''
-    # 문자열 형태로 일단 변환
-    s = str(code_val).strip()
-    # 제거: 쉼표, 공백
-    s = s.replace(',', '').strip()
-    # 보통 Excel에서 불러오면 '123.0' 같은 케이스가 있음 -> 소수점 .0 제거
-    if s.endswith('.0'):
-        s = s[:-2]
-    # 시도: 숫자 변환 가능하면 정수 형태로 반환(소수점 없는 경우)
-    try:
-        f = float(s)
-        if f.is_integer():
-            return str(int(f))
-        # 소수인 경우는 소수 문자열 그대로 사용하되 불필요 공백 제거
-        return s
-    except Exception:
-        return s
-
 # Get data
 if 'order_df' not in st.session_state:
     st.error("데이터를 불러올 수 없습니다. 메인 페이지로 돌아가주세요.")
     st.stop()
 
 # 🚨 목표 대비 달성률은 목표과목 필터된 데이터 사용
-order_df = st.session_state.get('order_df_target_filtered', st.session_state['order_df']).copy()
+order_df = session_view('order_df_target_filtered', view(st.session_state['order_df']))
 target_df = st.session_state.get('target_df', pd.DataFrame())
 distributor_df = st.session_state.get('distributor_df', pd.DataFrame())
 
@@ -53,30 +33,15 @@ if target_df.empty or '총판명(공식)' not in target_df.columns:
     st.warning("⚠️ 목표 데이터가 없습니다. 메인 페이지에서 데이터를 확인해주세요.")
     st.stop()
 
-# 목표 데이터 전처리
-target_summary = target_df.copy()
-
-# 쉼표 제거 및 숫자 변환
-for col in ['목표과목1 부수', '목표과목2 부수', '전체목표 부수']:
-    if col in target_summary.columns:
-        target_summary[col] = target_summary[col].astype(str).str.replace(',', '').str.replace(' ', '')
-        target_summary[col] = pd.to_numeric(target_summary[col], errors='coerce').fillna(0)
-
-# 전체 목표 = 목표1 + 목표2
-if '목표과목1 부수' in target_summary.columns and '목표과목2 부수' in target_summary.columns:
-    target_summary['목표1'] = target_summary['목표과목1 부수']
-    target_summary['목표2'] = target_summary['목표과목2 부수']
-    target_summary['전체목표'] = target_summary['목표1'] + target_summary['목표2']
-else:
-    target_summary['전체목표'] = target_summary.get('전체목표 부수', 0)
-    target_summary['목표1'] = target_summary['전체목표'] * 0.5
-    target_summary['목표2'] = target_summary['전체목표'] * 0.5
+# 목표 데이터 전처리 (쉼표 제거 및 숫자 변환, 전체 목표 = 목표1 + 목표2)
+target_summary = target_totals(target_df)
 
+profiler.step('실적 집계')
 # 총판별 실적 집계 - 2026년도 목표과목1, 목표과목2만
 st.info("💡 목표는 2026년도 기준이므로, 2026년도 목표과목1·목표과목2 주문만 집계하여 달성률을 계산합니다.")
 
 # order_df는 이미 목표과목 필터된 데이터이므로 바로 사용
-order_2026 = order_df.copy()
+order_2026 = view(order_df)
 
 school_code_col = '정보공시학교코드' if '정보공시학교코드' in order_2026.columns else '학교코드'
 
@@ -105,41 +70,14 @@ actual_stats = order_2026.groupby('총판').agg({
 }).reset_index()
 actual_stats.columns = ['총판', '실적부수', '거래학교수', '주문금액']
 
+profiler.step('총판코드 매핑')
 # 🎯 총판코드 매핑 테이블 먼저 생성
-dist_code_map = {}  # {총판코드: 총판명(공식)}
+# 공유 총판 조회 테이블: app.py가 만든 code_to_official(정규화 완료)을 우선, 없으면 distributor_df의 숫자코드/총판코드
+directory = directory_from_session(st.session_state)
+dist_code_map = dict(directory.code_to_official)  # {총판코드: 총판명(공식)}
 mapping_source = None
-
-if not distributor_df.empty and '총판명(공식)' in distributor_df.columns:
-    # Prefer 숫자코드 (총판정보.csv의 정식 코드), fallback to 총판코드
-    preferred_code_col = '숫자코드' if '숫자코드' in distributor_df.columns else ('총판코드' if '총판코드' in distributor_df.columns else None)
-    if preferred_code_col:
-        for _, r in distributor_df.iterrows():
-            official = r.get('총판명(공식)')
-            code_val = r.get(preferred_code_col)
-
-            if pd.isna(official) or pd.isna(code_val):
-                continue
-
-            official_str = str(official).strip()
-            code_str = _normalize_code(code_val)
-            if code_str == '':
-                continue
-            dist_code_map[code_str] = official_str
-        if dist_code_map:
-            mapping_source = f"distributor_df:{preferred_code_col}"
-
-# Prefer mapping loaded in session (app.py generated or precomputed mapping)
-if 'code_to_official' in st.session_state and st.session_state.get('code_to_official'):
-    try:
-        # session mapping keys are already normalized by app.py
-        dist_code_map = {
-            _normalize_code(k): str(v).strip()
-            for k, v in st.session_state['code_to_official'].items()
-            if _normalize_code(k) and str(v).strip() != ''
-        }
-        mapping_source = 'session_state:code_to_official'
-    except Exception:
-        pass
+if dist_code_map:
+    mapping_source = 'session_state:code_to_official' if st.session_state.get('code_to_official') else 'distributor_df'
 
 # If still empty, try reading precomputed mapping CSV from outputs/
 if not dist_code_map:
@@ -150,11 +88,11 @@ if not dist_code_map:
         if os.path.exists(out_path):
             dfm = pd.read_csv(out_path, dtype=str)
             if 'order_code' in dfm.columns and 'official_name' in dfm.columns:
-                for _, r in dfm[dfm['matched'].astype(str).str.lower()=='true'].iterrows():
-                    k = _normalize_code(r.get('order_code'))
-                    v = str(r.get('official_name','')).strip()
-                    if k and v:
-                        dist_code_map[k] = v
+                matched = dfm[dfm['matched'].astype(str).str.lower()=='true']
+                codes = normalize_codes(matched['order_code'])
+                names = matched['official_name'].fillna('').astype(str).str.strip()
+                valid = (codes != '') & (names != '')
+                dist_code_map.update(zip(codes[valid], names[valid]))
                 if dist_code_map:
                     mapping_source = 'outputs:distributor_code_mapping.csv'
     except Exception:
@@ -184,8 +122,8 @@ if bool(st.session_state.get('auth_ok', False)):
             st.markdown(f"**distributor_df 컬럼:** {', '.join(list(distributor_df.columns)) if not distributor_df.empty else '(empty)'}")
 
             if '총판코드' in order_2026.columns:
-                tmp = order_2026.copy()
-                tmp['총판코드_정규화_dbg'] = tmp['총판코드'].apply(lambda x: _normalize_code(x))
+                tmp = view(order_2026)
+                tmp['총판코드_정규화_dbg'] = normalize_codes(tmp['총판코드'])
                 mapped_codes = set(dist_code_map.keys())
                 unique_codes = sorted([c for c in tmp['총판코드_정규화_dbg'].unique() if c != ''])
                 empty_code_rows = int((tmp['총판코드_정규화_dbg'] == '').sum())
@@ -212,36 +150,15 @@ if bool(st.session_state.get('auth_ok', False)):
         # 디버그 패널은 본 로직에 영향을 주지 않도록 조용히 실패
         pass
 
-# 목표 데이터를 총판코드로 그룹화
-if '총판코드' in target_summary.columns:
-    # 총판코드 정규화
-    target_summary['총판코드_정규화'] = target_summary['총판코드'].apply(lambda x: _normalize_code(x))
-    
-    # 총판코드별 목표 집계 후 공식명 매핑
-    target_by_code = target_summary.groupby('총판코드_정규화').agg({
-        '전체목표': 'sum',
-        '목표1': 'sum',
-        '목표2': 'sum'
-    }).reset_index()
-    
-    # 총판명(공식) 매핑
-    target_by_code['총판명(공식)'] = target_by_code['총판코드_정규화'].map(dist_code_map)
-    target_map = target_by_code[target_by_code['총판명(공식)'].notna()][[
-        '총판명(공식)', '전체목표', '목표1', '목표2'
-    ]].copy()
-else:
-    # Fallback: 총판명(공식)으로 그룹화
-    target_map = target_summary.groupby('총판명(공식)').agg({
-        '전체목표': 'sum',
-        '목표1': 'sum',
-        '목표2': 'sum'
-    }).reset_index()
+# 목표 데이터를 총판코드로 그룹화 후 공식명 매핑 (총판코드가 없으면 총판명(공식)으로 그룹화)
+target_map = targets_by_official(target_summary, dist_code_map)
+if '총판코드' not in target_summary.columns:
     st.sidebar.warning("⚠️ 목표 데이터에 총판코드가 없습니다!")
 
 # --- 미매핑 총판 보고 (총판코드 기준)
 if '총판코드' in order_2026.columns:
     # 총판코드 정규화
-    order_2026['총판코드_정규화'] = order_2026['총판코드'].apply(lambda x: _normalize_code(x))
+    order_2026['총판코드_정규화'] = normalize_codes(order_2026['총판코드'])
     
     mapped_codes = set(dist_code_map.keys())
     order_totals = order_2026.groupby(['총판', '총판코드_정규화'])['부수'].sum().reset_index()
@@ -265,62 +182,13 @@ else:
 
 # 🎯 총판코드 기반 매핑 완료
 
-# --- 실적 집계: 총판코드로 매핑
-order_actual_df = order_2026.copy()
-
-def _map_row_to_official(row):
-    """총판코드로만 매핑 (이름 기반 매핑 제거)"""
-    if '총판코드' in row.index and pd.notna(row.get('총판코드')):
-        code_val = row.get('총판코드')
-        code_str = _normalize_code(code_val)
-        if code_str in dist_code_map:
-            return dist_code_map[code_str]
-        else:
-            return f"[미매핑:{code_str}]"
-    
-    # 총판코드가 없으면 코드 없음 표시 (원본 주문의 `총판` 명칭은 사용하지 않음)
-    return "[코드없음]"
-
-# Aggregate by original identifiers then map to official names
-if '총판코드' in order_actual_df.columns:
-    agg_cols = ['총판', '총판코드']
-else:
-    agg_cols = ['총판']
-
-order_actual = order_actual_df.groupby(agg_cols)['부수'].sum().reset_index()
-order_actual['총판_key'] = order_actual.apply(_map_row_to_official, axis=1)
-actual_by_official = order_actual.groupby('총판_key')['부수'].sum().to_dict()
-
-# 추가 지표(거래학교수, 주문금액)도 동일한 방식으로 공식명 기준 집계
-metric_agg = {'부수': 'sum'}
-if school_code_col in order_actual_df.columns:
-    metric_agg[school_code_col] = 'nunique'
-if '금액' in order_actual_df.columns:
-    metric_agg['금액'] = 'sum'
-else:
-    # 금액 컬럼이 없으면 0으로 채울 수 있도록 더미 집계(부수 합계 사용)
-    metric_agg['금액'] = 'sum'
-
-order_metrics = order_actual_df.groupby(agg_cols).agg(metric_agg).reset_index()
-order_metrics['총판_key'] = order_metrics.apply(_map_row_to_official, axis=1)
-
-# 그룹핑하여 공식명 기준으로 합산
-metrics_by_official = order_metrics.groupby('총판_key').agg({
-    '부수': 'sum',
-    school_code_col: 'sum' if school_code_col in order_metrics.columns else 'sum',
-    '금액': 'sum'
-}).reset_index()
-metrics_by_official.columns = ['총판명(공식)', '실적부수_tmp', '거래학교수', '주문금액']
-
-# 실적부수는 기존 actual_by_official과 합치거나 대체
-metrics_by_official_map = metrics_by_official.set_index('총판명(공식)')['실적부수_tmp'].to_dict()
-trade_school_map = metrics_by_official.set_index('총판명(공식)')['거래학교수'].to_dict()
-order_amount_map = metrics_by_official.set_index('총판명(공식)')['주문금액'].to_dict()
+# --- 실적 집계: (총판, 총판코드)별 합산 후 총판코드로 공식명 매핑
+actuals = actuals_by_official(order_2026, dist_code_map, school_code_col)
+actual_by_official = actuals['실적부수'].to_dict()
 
 # 디버그: 이문당 매핑 전/후 체크
-raw_imd_sum = order_actual[order_actual['총판'].astype(str).str.contains('이문당', na=False, regex=False)]['부수'].sum()
-if raw_imd_sum > 0:
-    st.sidebar.info(f"🔍 '이문당' 원본 실적: {int(raw_imd_sum):,}부")
+if imd_sum_filtered > 0:
+    st.sidebar.info(f"🔍 '이문당' 원본 실적: {imd_sum_filtered:,}부")
 
 if '통영)이문당' in actual_by_official:
     st.sidebar.success(f"✅ '통영)이문당' 최종 실적: {int(actual_by_official['통영)이문당']):,}부")
@@ -339,8 +207,8 @@ if st.sidebar.button('🔁 세션 초기화 및 재실행'):
 actual_official_df = pd.DataFrame([{'총판명(공식)': k, '실적부수': v} for k, v in actual_by_official.items()])
 
 # 등급 정보 추가
-if not distributor_df.empty and '등급' in distributor_df.columns and '총판명(공식)' in distributor_df.columns:
-    grade_map = distributor_df.set_index('총판명(공식)')['등급'].to_dict()
+if '등급' in directory.fields:
+    grade_map = directory.field_map('등급', keep='last')  # 같은 공식명이 여러 행이면 마지막 행 (기존 set_index 규칙)
     target_map['등급'] = target_map['총판명(공식)'].map(grade_map)
     actual_official_df['등급'] = actual_official_df['총판명(공식)'].map(grade_map)
 
@@ -363,7 +231,7 @@ if not actual_official_df.empty and '총판코드' in order_2026.columns:
         sel_code = reverse_code_map.get(str(sel))
         
         if sel_code and '총판코드_정규화' in order_2026.columns:
-            contrib_rows = order_2026[order_2026['총판코드_정규화'] == sel_code].copy()
+            contrib_rows = copy_frame(order_2026[order_2026['총판코드_정규화'] == sel_code])
             contrib_sum = int(contrib_rows['부수'].sum()) if not contrib_rows.empty else 0
 
             st.sidebar.markdown(f"**선택 공식명:** {sel}")
@@ -386,20 +254,9 @@ if not actual_official_df.empty:
     display_df = actual_official_df[~actual_official_df['총판명(공식)'].astype(str).str.contains(r'\[미매핑:', na=False, regex=True)]
     st.sidebar.dataframe(display_df.head(10).reset_index(drop=True), use_container_width=True)
 
-# Build achievement_df from target_map and map 실적부수 from actual_by_official
-achievement_df = target_map.copy()
-achievement_df['실적부수'] = achievement_df['총판명(공식)'].map(lambda x: int(actual_by_official.get(str(x).strip(), 0)))
-# 거래학교수 및 주문금액 채우기 (매핑된 값이 있으면 사용, 없으면 0)
-achievement_df['거래학교수'] = achievement_df['총판명(공식)'].map(lambda x: int(trade_school_map.get(str(x).strip(), 0)))
-achievement_df['주문금액'] = achievement_df['총판명(공식)'].map(lambda x: float(order_amount_map.get(str(x).strip(), 0)))
-
-# Fill numeric NaNs for 목표 컬럼
-for col in ['전체목표', '목표1', '목표2', '실적부수']:
-    if col in achievement_df.columns:
-        achievement_df[col] = achievement_df[col].fillna(0)
-
-# 총판 통일
-achievement_df['총판'] = achievement_df['총판명(공식)']
+profiler.step('달성률 계산')
+# 목표(target_map)에 공식명별 실적부수/거래학교수/주문금액을 붙이고 달성률 계산
+achievement_df = achievement_table(target_map, actuals)
 
 # --- 디버그: 통영)이문당 관련 매핑/실적 출처 확인
 debug_official = '통영)이문당'
@@ -428,23 +285,9 @@ if debug_official in achievement_df['총판'].values and '총판코드_정규화
     except Exception:
         pass
 
-# 달성률 계산
-achievement_df['전체달성률(%)'] = (achievement_df['실적부수'] / achievement_df['전체목표'] * 100).replace([float('inf'), -float('inf')], 0).fillna(0)
-achievement_df['목표1달성률(%)'] = (achievement_df['실적부수'] / achievement_df['목표1'] * 100).replace([float('inf'), -float('inf')], 0).fillna(0)
-achievement_df['목표2달성률(%)'] = (achievement_df['실적부수'] / achievement_df['목표2'] * 100).replace([float('inf'), -float('inf')], 0).fillna(0)
-achievement_df['차이'] = achievement_df['실적부수'] - achievement_df['전체목표']
-
-# 데이터 정제: 숫자형 NaN 제거 및 총판명 결측치 처리
-num_cols = ['전체목표', '목표1', '목표2', '실적부수', '전체달성률(%)', '차이']
-for c in num_cols:
-    if c in achievement_df.columns:
-        achievement_df[c] = pd.to_numeric(achievement_df[c], errors='coerce').fillna(0)
-achievement_df['총판'] = achievement_df['총판'].fillna('')
-
 # 등급 정보 추가
-if not distributor_df.empty and '총판명(공식)' in distributor_df.columns and '등급' in distributor_df.columns:
-    # 중복 제거하여 매핑
-    grade_map = distributor_df.drop_duplicates(subset='총판명(공식)').set_index('총판명(공식)')['등급'].to_dict()
+if '등급' in directory.fields:
+    grade_map = directory.field_map('등급', keep='first')  # 중복 공식명은 첫 행 (기존 drop_duplicates 규칙)
     achievement_df['등급'] = achievement_df['총판'].map(grade_map).fillna('미분류')
 else:
     achievement_df['등급'] = '미분류'
@@ -469,6 +312,7 @@ else:
 # 목표가 있는 총판만 필터링
 achievement_df = achievement_df[achievement_df['전체목표'] > 0]
 
+profiler.step('필터/지표')
 # Sidebar Filters
 st.sidebar.header("🔍 필터 옵션")
 
@@ -532,10 +376,11 @@ with col5:
 
 st.markdown("---")
 
+profiler.step('탭')
 # Tab Layout
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 전체 현황", "🏆 TOP/BOTTOM", "📈 등급별 분석", "📋 상세 테이블", "📉 갭 분석"])
 
-with tab1:
+with tab1, profiler.section('📊 전체 현황'):
     st.subheader("📊 목표 대비 달성률 전체 현황")
     
     col1, col2 = st.columns(2)
@@ -544,7 +389,7 @@ with tab1:
         # 목표 vs 실적 비교 차트
         fig1 = go.Figure()
         
-        top_20 = achievement_df.head(20).copy()
+        top_20 = copy_frame(achievement_df.head(20))
         # 안전성: 결측치 채우기
         for col in ['총판', '전체목표', '실적부수']:
             if col in top_20.columns:
@@ -583,7 +428,7 @@ with tab1:
     
     with col2:
         # 달성률 차트
-        df_top_rate = achievement_df.head(20).copy()
+        df_top_rate = copy_frame(achievement_df.head(20))
         if df_top_rate.empty:
             st.info('달성률 데이터가 없습니다.')
         else:
@@ -640,7 +485,7 @@ with tab1:
         )
         st.plotly_chart(fig_pie, use_container_width=True)
 
-with tab2:
+with tab2, profiler.section('🏆 TOP/BOTTOM'):
     st.subheader("🏆 TOP/BOTTOM 달성 총판")
     
     col1, col2 = st.columns(2)
@@ -678,7 +523,7 @@ with tab2:
             </div>
             """, unsafe_allow_html=True)
 
-with tab3:
+with tab3, profiler.section('📈 등급별 분석'):
     st.subheader("📈 등급별 달성률 분석")
     # grade_achievement 변수를 항상 정의하여 이후 코드에서 NameError 발생을 방지
     grade_columns = ['등급', '목표합계', '실적합계', '시장규모', '거래학교수', '총판수', '평균달성률(%)', '점유율(%)', '총판당평균실적']
@@ -815,10 +660,10 @@ with tab3:
         st.markdown("---")
         st.markdown("#### 📋 등급별 상세 데이터")
         
-        display_df = grade_achievement[[
+        display_df = copy_frame(grade_achievement[[
             '등급', '총판수', '목표합계', '실적합계', '평균달성률(%)', 
             '시장규모', '점유율(%)', '거래학교수', '총판당평균실적'
-        ]].copy()
+        ]])
         
         st.dataframe(
             display_df.style.format({
@@ -846,7 +691,7 @@ with tab3:
         )
         
         if selected_grade:
-            grade_data = achievement_df[achievement_df['등급'] == selected_grade].copy()
+            grade_data = copy_frame(achievement_df[achievement_df['등급'] == selected_grade])
             grade_data = grade_data.sort_values('전체달성률(%)', ascending=False)
             
             col1, col2, col3 = st.columns(3)
@@ -929,16 +774,16 @@ with tab3:
         use_container_width=True
     )
 
-with tab4:
+with tab4, profiler.section('📋 상세 테이블'):
     st.subheader("📋 총판별 상세 달성률 데이터")
     
     # 순위 추가 (이미 정렬되어 있음)
     achievement_df['순위'] = range(1, len(achievement_df) + 1)
     
-    display_df = achievement_df[[
+    display_df = copy_frame(achievement_df[[
         '순위', '총판', '등급', '전체목표', '실적부수', '전체달성률(%)', 
         '차이', '시장규모', '점유율(%)', '거래학교수', '주문금액'
-    ]].copy()
+    ]])
     
     st.dataframe(
         display_df,
@@ -974,11 +819,11 @@ with tab4:
         mime="text/csv"
     )
 
-with tab5:
+with tab5, profiler.section('📉 갭 분석'):
     st.subheader("📉 목표 갭 분석")
     
     # 갭이 큰 순서대로 정렬
-    gap_df = achievement_df.copy()
+    gap_df = copy_frame(achievement_df)
     gap_df['절대갭'] = abs(gap_df['차이'])
     
     col1, col2 = st.columns(2)
@@ -989,7 +834,7 @@ with tab5:
         
         if len(over_achievement) > 0:
             # 안전한 텍스트 포맷: 값에 따라 + 기호를 붙인 문자열을 만들어 사용
-            over_achievement = over_achievement.copy()
+            over_achievement = copy_frame(over_achievement)
             over_achievement['text_label'] = over_achievement['차이'].apply(lambda v: f"+{int(v):,}" if v > 0 else f"{int(v):,}")
             fig = px.bar(
                 over_achievement,
@@ -1011,7 +856,7 @@ with tab5:
         under_achievement = gap_df[gap_df['차이'] < 0].sort_values('차이').head(10)
         
         if len(under_achievement) > 0:
-            under_achievement = under_achievement.copy()
+            under_achievement = copy_frame(under_achievement)
             under_achievement['text_label'] = under_achievement['차이'].apply(lambda v: f"{int(v):,}")
             fig = px.bar(
                 under_achievement,
@@ -1055,3 +900,5 @@ with tab5:
     ))
     
     st.plotly_chart(fig_scatter, use_container_width=True)
+
+profiler.finish()
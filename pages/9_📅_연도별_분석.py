@@ -1,11 +1,15 @@
 import streamlit as st
 from utils.style import apply_custom_style
+from utils.page_profiler import page_profiler
+from utils.shared_data import copy_frame, view
+from utils.distributor_directory import directory_from_session
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
 st.set_page_config(page_title="연도별 분석", page_icon="📅", layout="wide")
 apply_custom_style()
+profiler = page_profiler('9_📅_연도별_분석')  # RENDER_PROFILE=1 또는 관리자 도구에서 켬
 
 # 페이지 가이드
 st.markdown("""
@@ -32,10 +36,10 @@ st.title("📅 연도별 분석 (2025 vs 2026)")
 # 데이터 로드
 order_df = st.session_state.get('order_df')
 if 'order_df_original' in st.session_state:
-    order_df_full = st.session_state['order_df_original'].copy()
+    order_df_full = view(st.session_state['order_df_original'])
     st.sidebar.success("✅ 원본 데이터 사용")
 else:
-    order_df_full = order_df.copy() if order_df is not None else None
+    order_df_full = view(order_df)
     st.sidebar.info("ℹ️ 필터된 데이터 사용")
 
 distributor_df = st.session_state.get('distributor_df')
@@ -58,8 +62,8 @@ if subject_col is None:
     st.warning("과목 정보 컬럼이 없습니다.")
 
 # 학년도 필터링
-df_2025 = order_df_full[order_df_full['학년도'] == 2025].copy()
-df_2026 = order_df_full[order_df_full['학년도'] == 2026].copy()
+df_2025 = copy_frame(order_df_full[order_df_full['학년도'] == 2025])
+df_2026 = copy_frame(order_df_full[order_df_full['학년도'] == 2026])
 
 if df_2025.empty and df_2026.empty:
     st.warning("2025년 또는 2026년 데이터가 없습니다.")
@@ -127,7 +131,7 @@ with tab1:
         st.markdown("#### 📚 과목별 이탈/신규 학교 수")
         
         # 이탈 학교 과목별 집계
-        churned_df = df_2025[df_2025['학교코드'].isin(churned_schools)].copy()
+        churned_df = copy_frame(df_2025[df_2025['학교코드'].isin(churned_schools)])
         churned_by_subject = churned_df.groupby('과목').agg({
             '학교코드': 'nunique',
             '부수': 'sum'
@@ -136,7 +140,7 @@ with tab1:
         churned_by_subject = churned_by_subject.sort_values('이탈부수', ascending=False)
         
         # 신규 학교 과목별 집계
-        new_df = df_2026[df_2026['학교코드'].isin(new_schools)].copy()
+        new_df = copy_frame(df_2026[df_2026['학교코드'].isin(new_schools)])
         new_by_subject = new_df.groupby('과목').agg({
             '학교코드': 'nunique',
             '부수': 'sum'
@@ -221,7 +225,7 @@ with tab2:
         subj_comp['증감률_fmt'] = subj_comp['증감률(%)'].apply(lambda x: f"{x:+.1f}%")
         
         # 표시용 데이터프레임
-        display_df = subj_comp[['과목', '2025년_fmt', '2026년_fmt', '증감_fmt', '증감률_fmt']].copy()
+        display_df = copy_frame(subj_comp[['과목', '2025년_fmt', '2026년_fmt', '증감_fmt', '증감률_fmt']])
         display_df.columns = ['과목', '2025년', '2026년', '증감', '증감률(%)']
         
         st.dataframe(display_df, use_container_width=True, height=400)
@@ -286,7 +290,7 @@ with tab3:
         reg_comp['증감_fmt'] = reg_comp['증감'].apply(lambda x: f"{int(x):+,}")
         reg_comp['증감률_fmt'] = reg_comp['증감률(%)'].apply(lambda x: f"{x:+.1f}%")
         
-        display_df = reg_comp[['지역', '2025년_fmt', '2026년_fmt', '증감_fmt', '증감률_fmt']].copy()
+        display_df = copy_frame(reg_comp[['지역', '2025년_fmt', '2026년_fmt', '증감_fmt', '증감률_fmt']])
         display_df.columns = ['지역', '2025년', '2026년', '증감', '증감률(%)']
         
         st.dataframe(display_df, use_container_width=True, height=400)
@@ -321,26 +325,18 @@ with tab4:
     if '총판' not in df_2025.columns and '총판' not in df_2026.columns:
         st.warning("총판 정보가 없습니다.")
     else:
-        # 총판 매핑 (distributor_df 활용)
-        dist_map = {}
-        if distributor_df is not None and not distributor_df.empty and '총판명(공식)' in distributor_df.columns:
-            for _, r in distributor_df.iterrows():
-                official = r.get('총판명(공식)')
-                if pd.isna(official):
-                    continue
-                for col in ['총판명', '총판명1', '총판']:
-                    if col in distributor_df.columns and pd.notna(r.get(col)):
-                        dist_map[str(r.get(col)).strip()] = str(official).strip()
+        # 총판 매핑 (공유 총판 조회 테이블의 총판명/총판명1 → 공식명)
+        directory = directory_from_session(st.session_state)
         
         # 2025 총판별 합계
-        df_2025_mapped = df_2025.copy()
-        df_2025_mapped['총판_공식'] = df_2025_mapped['총판'].astype(str).str.strip().map(lambda x: dist_map.get(x, x))
+        df_2025_mapped = copy_frame(df_2025)
+        df_2025_mapped['총판_공식'] = directory.resolve_aliases(df_2025_mapped['총판'])
         dist_2025 = df_2025_mapped.groupby('총판_공식')['부수'].sum().reset_index()
         dist_2025.columns = ['총판', '2025년']
         
         # 2026 총판별 합계
-        df_2026_mapped = df_2026.copy()
-        df_2026_mapped['총판_공식'] = df_2026_mapped['총판'].astype(str).str.strip().map(lambda x: dist_map.get(x, x))
+        df_2026_mapped = copy_frame(df_2026)
+        df_2026_mapped['총판_공식'] = directory.resolve_aliases(df_2026_mapped['총판'])
         dist_2026 = df_2026_mapped.groupby('총판_공식')['부수'].sum().reset_index()
         dist_2026.columns = ['총판', '2026년']
         
@@ -358,7 +354,7 @@ with tab4:
         dist_comp['증감_fmt'] = dist_comp['증감'].apply(lambda x: f"{int(x):+,}")
         dist_comp['증감률_fmt'] = dist_comp['증감률(%)'].apply(lambda x: f"{x:+.1f}%")
         
-        display_df = dist_comp[['총판', '2025년_fmt', '2026년_fmt', '증감_fmt', '증감률_fmt']].copy()
+        display_df = copy_frame(dist_comp[['총판', '2025년_fmt', '2026년_fmt', '증감_fmt', '증감률_fmt']])
         display_df.columns = ['총판', '2025년', '2026년', '증감', '증감률(%)']
         
         st.dataframe(display_df, use_container_width=True, height=400)
@@ -473,3 +469,5 @@ with tab5:
 
 st.markdown("---")
 st.caption("📅 연도별 분석 페이지 | 2025 vs 2026 비교 분석")
+
+profiler.finish()
@@ -0,0 +1,82 @@
+"""
+총판별 시장 규모(calculate_distributor_market_size) 정합성 검사 + 벤치마크
+
+utils/synthetic_data.py 합성 원본을 data_pipeline으로 가공한 학생수/주문 데이터로
+기존 총판별 스캔(distributor_market_size_scan)과 groupby + 조인 방식의 결과가 같은지 확인한 뒤
+대용량(기본 1,000,000행) 주문에서 처리 시간을 측정합니다.
+
+합성 주문에는 학생수 데이터에 없는 총판('[미매핑:코드]', '[코드없음]')이 섞여 있고,
+정합성 검사에서는 총판 결측과 주문이 없는 총판(일부 총판의 주문 제거)도 함께 확인합니다.
+
+사용 예:
+    python scripts/bench_distributor_market.py
+    python scripts/bench_distributor_market.py --rows 1000000 --parity-rows 20000 --legacy
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.market_size_distributor import calculate_distributor_market_size, distributor_market_size_scan  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+from utils.schema import drop_schema  # noqa: E402
+from utils.synthetic_data import synthetic_base_datasets  # noqa: E402
+
+
+def with_gaps(order_df, seed=0):
+    """총판 10곳 중 1곳의 주문을 빼고 총판 결측(0.5%)을 섞은 주문 (원본 타입)"""
+    rng = np.random.default_rng(seed)
+    orders = drop_schema(order_df)
+    dists = np.sort(orders['총판'].dropna().unique())
+    orders = orders[~orders['총판'].isin(dists[:: 10])].copy()
+    orders.loc[rng.random(len(orders)) < 0.005, '총판'] = np.nan
+    return orders
+
+
+def report(label, func, *args, **kwargs):
+    result, seconds = timed(func, *args, **kwargs)
+    print(f'{label:<52} {seconds:8.3f}s')
+    return result
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--rows', type=int, default=1_000_000, help='벤치마크용 합성 주문 행 수')
+    p.add_argument('--parity-rows', type=int, default=20_000, help='정합성 검사용 합성 주문 행 수')
+    p.add_argument('--legacy', action='store_true', help='대용량에서도 기존 방식 시간 측정 (느림)')
+    args = p.parse_args()
+
+    # 1) 정합성 검사: 원본 타입 / schema(category, int32) 적용 / 금액 없음 / 주문 없음
+    print(f'[parity] {args.parity_rows:,} rows')
+    datasets = synthetic_base_datasets(orders=args.parity_rows, seed=1)
+    total_df, orders = datasets['total_df'], datasets['order_df']
+    plain_total, plain_orders = drop_schema(total_df), with_gaps(orders, seed=1)
+    cases = {
+        'plain': (plain_total, plain_orders),
+        'schema': (total_df, orders),
+        'no 금액': (plain_total, plain_orders.drop(columns=['금액'])),
+        'no orders': (plain_total, plain_orders.iloc[:0]),
+        'no 총판 column': (plain_total, plain_orders.drop(columns=['총판'])),
+    }
+    for label, (total, order) in cases.items():
+        expected = distributor_market_size_scan(total, order, None)
+        result = calculate_distributor_market_size(total, order, None)
+        pd.testing.assert_frame_equal(result, expected, obj=label)
+        print(f'{label:<52} OK ({len(result)} 총판)')
+    print('parity OK')
+
+    # 2) 벤치마크
+    print(f'\n[benchmark] {args.rows:,} rows')
+    datasets = synthetic_base_datasets(orders=args.rows, seed=2)
+    total_df, orders = datasets['total_df'], datasets['order_df']
+    report('groupby + join calculate_distributor_market_size', calculate_distributor_market_size, total_df, orders, None)
+    if args.legacy:
+        report('legacy distributor_market_size_scan', distributor_market_size_scan, total_df, orders, None)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+지연 로드(load_or_build_datasets(lazy=True) + lazy_loaders) 벤치마크 + 회귀 검사
+
+app.py의 load_data()와 같은 순서(데이터셋 준비 → SharedDataset → order_df 역인덱스/큐브)로
+첫 화면에 필요한 데이터가 준비될 때까지의 시간을 지연/즉시 모드로 비교합니다.
+- cold: 아티팩트 없이 원본 CSV에서 빌드 (임시 디렉터리)
+- warm: 이전 실행이 저장한 아티팩트에서 읽기
+그 다음 지연 데이터셋을 모두 꺼내 즉시 모드 결과와 같은지 확인합니다.
+
+임시 디렉터리에서만 작업하므로 outputs/artifacts는 바뀌지 않습니다.
+
+사용 예:
+    python scripts/bench_lazy_load.py
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import ARTIFACT_FRAMES, DERIVED_DATASETS, lazy_loaders, load_or_build_datasets  # noqa: E402
+from utils.order_cube import register_cube  # noqa: E402
+from utils.order_index import register_index  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+from utils.shared_data import SharedDataset, view  # noqa: E402
+
+
+def first_paint(artifact_dir, lazy, force=False):
+    """load_data()와 같은 준비 과정 → (SharedDataset, info, 초)"""
+    start = time.perf_counter()
+    datasets, info = load_or_build_datasets(artifact_dir=artifact_dir, force=force, lazy=lazy)
+    loaders = lazy_loaders(datasets, info, artifact_dir=artifact_dir) if lazy else None
+    shared = SharedDataset(datasets, version=info['key'], loaders=loaders)
+    schools = datasets['total_df']['정보공시 학교코드']
+
+    def register_order_frame(name, df):
+        if name in ('order_df', 'order_df_target_filtered'):
+            shared.indexes[name] = register_index(view(df))
+            shared.cubes[name] = register_cube(view(df), schools=schools)
+
+    shared.on_load(register_order_frame)
+    return shared, info, time.perf_counter() - start
+
+
+def check_same(lazy, eager):
+    for name in DERIVED_DATASETS:
+        loaded = lazy.loaded(name)
+        value, seconds = timed(lambda: lazy.view(name) if name in ARTIFACT_FRAMES else dict(lazy.mapping(name)))
+        if name in ARTIFACT_FRAMES:
+            pd.testing.assert_frame_equal(value, eager.view(name), obj=name)
+        else:
+            assert value == dict(eager.mapping(name)), name
+        state = 'loaded' if loaded else f'first access {seconds:.3f}s'
+        print(f'  {name:<28}OK ({state})')
+    assert set(lazy.indexes) == set(eager.indexes), (set(lazy.indexes), set(eager.indexes))
+
+
+def main():
+    work = tempfile.mkdtemp(prefix='lazy_load_')
+    try:
+        print(f"{'mode':<16}{'source':>10}{'seconds':>10}{'pending':>9}")
+        timings = {}
+        for phase, force in [('cold', True), ('warm', False)]:
+            for lazy in [False, True]:
+                artifact_dir = os.path.join(work, 'lazy' if lazy else 'eager')
+                shared, info, seconds = first_paint(artifact_dir, lazy, force=force)
+                mode = f"{phase}/{'lazy' if lazy else 'eager'}"
+                timings[mode] = (shared, seconds)
+                print(f"{mode:<16}{info['source']:>10}{seconds:>10.3f}{len(info['pending']):>9}")
+        for phase in ['cold', 'warm']:
+            eager_sec, lazy_sec = timings[f'{phase}/eager'][1], timings[f'{phase}/lazy'][1]
+            print(f'{phase}: {eager_sec / max(lazy_sec, 1e-9):.1f}x faster first paint')
+
+        for phase in ['cold', 'warm']:
+            print(f'[{phase}] lazy vs eager')
+            check_same(timings[f'{phase}/lazy'][0], timings[f'{phase}/eager'][0])
+
+        # 지연 모드가 채운 아티팩트는 다음 시작 때 파일에서 읽음
+        _, info, _ = first_paint(os.path.join(work, 'lazy'), True)
+        shared, _, _ = first_paint(os.path.join(work, 'lazy'), True)
+        print('pending after lazy run:', info['pending'])
+        check_same(shared, timings['warm/eager'][0])
+        print('parity OK')
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+V2 시장 규모 엔진 정합성 검사 + 벤치마크
+
+utils/synthetic_data.py 합성 원본을 data_pipeline으로 가공한 주문/학생수/제품 데이터로
+기존 그룹별 스캔(match_orders_with_student_data)과 조인 기반 엔진
+(match_orders_with_student_data_vectorized)의 결과가 같은지 확인한 뒤
+대용량(기본 500,000행) 주문에서 처리 시간을 측정합니다.
+
+정합성 검사는 schema 적용 전 원본 타입의 주문에 도서코드/교과서명_구분 결측을 일부 섞어 비교합니다
+(합성 주문에는 학생수 데이터에 없는 학교코드, 2025/2026 학년도가 이미 섞여 있음).
+
+사용 예:
+    python scripts/bench_market_v2.py
+    python scripts/bench_market_v2.py --rows 500000 --parity-rows 5000 --legacy
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.market_size_v2 import (  # noqa: E402
+    calculate_market_size_by_subject_v2,
+    match_orders_with_student_data,
+    match_orders_with_student_data_vectorized,
+)
+from utils.profiling import timed  # noqa: E402
+from utils.schema import drop_schema  # noqa: E402
+from utils.synthetic_data import synthetic_base_datasets  # noqa: E402
+
+
+def with_missing(order_df, seed=0):
+    """원본 타입(schema 적용 전)으로 되돌리고 도서코드(0.1%)/교과서명_구분(1%) 결측을 섞은 주문"""
+    rng = np.random.default_rng(seed)
+    orders = drop_schema(order_df)
+    n = len(orders)
+    for col, rate in [('도서코드(교지명구분)', 0.001), ('교과서명_구분', 0.01)]:
+        orders[col] = orders[col].astype(object)
+        orders.loc[rng.random(n) < rate, col] = np.nan
+    return orders
+
+
+def report(label, func, *args, **kwargs):
+    result, seconds = timed(func, *args, **kwargs)
+    print(f'{label:<48} {seconds:8.3f}s')
+    return result
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--rows', type=int, default=500_000, help='벤치마크용 합성 주문 행 수')
+    p.add_argument('--parity-rows', type=int, default=5_000, help='정합성 검사용 합성 주문 행 수')
+    p.add_argument('--legacy', action='store_true', help='대용량에서도 기존 엔진 시간 측정 (느림)')
+    args = p.parse_args()
+
+    # 1) 정합성 검사: 학교별 결과와 과목별 요약이 모두 같아야 함
+    print(f'[parity] {args.parity_rows:,} rows')
+    datasets = synthetic_base_datasets(orders=args.parity_rows, seed=1)
+    total_df, product_df = datasets['total_df'], datasets['product_df']
+    orders = with_missing(datasets['order_df'], seed=1)
+    legacy = report('legacy match_orders_with_student_data', match_orders_with_student_data, orders, total_df, year_offset=0)
+    fast = report('vectorized match_orders', match_orders_with_student_data_vectorized, orders, total_df)
+    pd.testing.assert_frame_equal(fast, legacy)
+
+    summary_legacy = calculate_market_size_by_subject_v2(orders, total_df, product_df, vectorized=False)
+    summary_fast = calculate_market_size_by_subject_v2(orders, total_df, product_df)
+    pd.testing.assert_frame_equal(summary_fast, summary_legacy)
+    print('parity OK')
+
+    # 2) 벤치마크
+    print(f'\n[benchmark] {args.rows:,} rows')
+    datasets = synthetic_base_datasets(orders=args.rows, seed=2)
+    orders, total_df, product_df = datasets['order_df'], datasets['total_df'], datasets['product_df']
+    report('vectorized calculate_market_size_by_subject_v2', calculate_market_size_by_subject_v2, orders, total_df, product_df)
+    if args.legacy:
+        report('legacy calculate_market_size_by_subject_v2', calculate_market_size_by_subject_v2, orders, total_df, product_df, vectorized=False)
+
+
+if __name__ == '__main__':
+    main()
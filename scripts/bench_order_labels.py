@@ -0,0 +1,134 @@
+"""
+주문 행 라벨(총판 표시명, 교과서명_구분) 정합성 검사 + 마이크로 벤치마크
+
+load_data()에서 행마다 파이썬 함수를 호출하던 기존 방식(order_df.apply(..., axis=1))과
+utils/data_pipeline.py의 벡터화 함수(label_distributors, label_subjects)의 결과가 같은지
+확인하고, 100k / 1M / 5M 행에서 처리 시간을 비교합니다.
+
+입력은 utils/synthetic_data.py 합성 원본을 data_pipeline으로 가공한 주문의 라벨 전 컬럼입니다
+(매핑 안 되는 총판코드, 빈 총판코드 포함). 정합성 검사에서는 학교급('3', ' 고등 ', '초등학교' 등)/
+제품_학교급/교과서명에 예외 값과 결측을 더 섞습니다.
+
+기존 방식은 행 수에 비례하므로 --legacy-rows(기본 100,000)행까지만 직접 측정하고
+그보다 큰 크기는 측정한 행당 시간으로 추정합니다 (표에 '~' 표시).
+
+사용 예:
+    python scripts/bench_order_labels.py
+    python scripts/bench_order_labels.py --sizes 100000 1000000 --legacy-rows 1000000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import label_distributors, label_subjects  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+from utils.synthetic_data import synthetic_base_datasets  # noqa: E402
+
+EDGE_LEVELS = np.array(['중학교', '고등학교', '3', '4', ' 고등 ', '초등학교', None], dtype=object)
+EDGE_SUBJECTS = np.array(['정보', ' 과학 ', '음악', None], dtype=object)
+
+
+def legacy_label_distributors(order_df):
+    return order_df.apply(
+        lambda r: (f"[미매핑:{r['총판코드_정규화']}]") if (pd.isna(r['총판']) or r['총판'] == '') and r['총판코드_정규화'] != '' else ("[코드없음]" if r['총판코드_정규화'] == '' else r['총판']),
+        axis=1
+    )
+
+
+def legacy_label_subjects(order_df):
+    def add_school_level_to_subject(row):
+        prod_level = row.get('제품_학교급') if '제품_학교급' in row.index else None
+        order_level = row.get('학교급') if '학교급' in row.index else None
+        school_level_val = prod_level if pd.notna(prod_level) else order_level
+        if pd.notna(school_level_val) and pd.notna(row.get('교과서명')):
+            school_level = str(school_level_val).strip()
+            subject = str(row['교과서명']).strip()
+            try:
+                lvl_num = int(school_level)
+            except Exception:
+                lvl_num = None
+            if lvl_num == 3:
+                return f'[중등] {subject}'
+            if lvl_num == 4:
+                return f'[고등] {subject}'
+            low = school_level.lower()
+            if '중' in low and '고' not in low:
+                return f'[중등] {subject}'
+            if '고' in low:
+                return f'[고등] {subject}'
+        return row.get('교과서명', '')
+
+    return order_df.apply(add_school_level_to_subject, axis=1)
+
+
+def label_inputs(rows, seed=0):
+    """합성 주문 rows 행의 라벨 전 컬럼 (load_data()가 라벨 함수에 넘기는 값)"""
+    datasets = synthetic_base_datasets(orders=rows, seed=seed)
+    order_df = datasets['order_df']
+    codes = order_df['총판코드_정규화'].astype(object)
+    return pd.DataFrame({
+        # 라벨 전 총판 = 총판코드로 매핑한 공식명 (매핑 안 되면 결측)
+        '총판': codes.map(datasets['code_to_official']),
+        '총판코드_정규화': codes,
+        '학교급': order_df['학교급'].astype(object),
+        '제품_학교급': order_df['제품_학교급'].astype(object),
+        '교과서명': order_df['교과서명'].astype(object),
+    })
+
+
+def with_edge_values(frame, seed=0):
+    """학교급/제품_학교급/교과서명에 예외 값과 결측을 섞음"""
+    rng = np.random.default_rng(seed)
+    frame = frame.copy()
+    n = len(frame)
+    picked = rng.random(n) < 0.3
+    frame.loc[picked, '학교급'] = EDGE_LEVELS[rng.integers(0, len(EDGE_LEVELS), picked.sum())]
+    frame.loc[rng.random(n) < 0.3, '제품_학교급'] = None
+    picked = rng.random(n) < 0.2
+    frame.loc[picked, '교과서명'] = EDGE_SUBJECTS[rng.integers(0, len(EDGE_SUBJECTS), picked.sum())]
+    return frame
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 5_000_000], help='측정할 행 수')
+    p.add_argument('--legacy-rows', type=int, default=100_000, help='기존 방식을 직접 측정할 최대 행 수')
+    p.add_argument('--parity-rows', type=int, default=20_000, help='정합성 검사용 행 수')
+    args = p.parse_args()
+
+    orders = with_edge_values(label_inputs(args.parity_rows, seed=1), seed=1)
+    pd.testing.assert_series_equal(label_distributors(orders['총판'], orders['총판코드_정규화']), legacy_label_distributors(orders))
+    pd.testing.assert_series_equal(label_subjects(orders), legacy_label_subjects(orders))
+    print(f'parity OK ({args.parity_rows:,} rows)\n')
+
+    print(f"{'rows':>10} {'label':<10} {'legacy(s)':>12} {'vectorized(s)':>14} {'speedup':>9}")
+    legacy_rate = {}
+    for rows in args.sizes:
+        orders = label_inputs(rows, seed=2)
+        for label, fast, slow in [
+            ('총판', lambda df: label_distributors(df['총판'], df['총판코드_정규화']), legacy_label_distributors),
+            ('교과서명', label_subjects, legacy_label_subjects),
+        ]:
+            _, fast_sec = timed(fast, orders)
+            if rows <= args.legacy_rows:
+                _, slow_sec = timed(slow, orders)
+                legacy_rate[label] = slow_sec / rows
+                slow_txt = f'{slow_sec:12.3f}'
+            else:
+                if label not in legacy_rate:
+                    sample = orders.iloc[:args.legacy_rows]
+                    _, sample_sec = timed(slow, sample)
+                    legacy_rate[label] = sample_sec / len(sample)
+                slow_sec = legacy_rate[label] * rows
+                slow_txt = f'{"~" + format(slow_sec, ".3f"):>12}'
+            print(f'{rows:>10,} {label:<10} {slow_txt} {fast_sec:14.3f} {slow_sec / fast_sec:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+합성 데이터 벤치마크 + 성능 회귀 검사 (배포 전 실행)
+
+utils/synthetic_data.py로 원본과 같은 형식의 CSV를 지정한 주문 행 수만큼 만들고
+1) load_data()의 원본 읽기/가공 단계 (build_base_datasets의 StageTimer 단계별)
+2) 시장 규모 계산 4종 (calculate_market_size_by_subject, _v2,
+   calculate_distributor_market_size, calculate_subject_market_by_distributor)
+의 시간을 --repeat 번 재서 최소값을 JSON 기록(outputs/bench_history.json)에 추가합니다.
+
+같은 머신·행 수·seed의 직전 기록보다 --threshold 배 이상 (그리고 --min-delta 초 이상)
+느려진 항목이 있으면 회귀로 표시하고 종료 코드 1을 돌려줍니다.
+직전 기록 시간은 저장소 코드와 무관한 기준 작업(calibrate) 시간 비율로 보정해
+머신 전체가 느려진 경우를 회귀로 잡지 않습니다.
+
+사용 예:
+    python scripts/bench_suite.py
+    python scripts/bench_suite.py --rows 10000 1000000 --repeat 3
+    python scripts/bench_suite.py --rows 10000000 --repeat 1 --skip market_v1
+    python scripts/bench_suite.py --no-record --threshold 1.2
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import StageTimer, build_base_datasets  # noqa: E402
+from utils.market_size import calculate_market_size_by_subject  # noqa: E402
+from utils.market_size_distributor import (  # noqa: E402
+    calculate_distributor_market_size,
+    calculate_subject_market_by_distributor,
+)
+from utils.market_size_v2 import calculate_market_size_by_subject_v2  # noqa: E402
+from utils.profiling import json_default, timed  # noqa: E402
+from utils.synthetic_data import make_sources, write_sources  # noqa: E402
+
+HISTORY_FILE = os.path.join(BASE_DIR, 'outputs', 'bench_history.json')
+
+# 이름: (함수, 기본 데이터셋에서 인자를 꺼내는 함수) - data_pipeline의 파생 표 계산과 같은 인자
+BENCHMARKS = {
+    'market_v1': (calculate_market_size_by_subject, lambda d: (d['order_df'], d['total_df'], d['product_df'])),
+    'market_v2': (calculate_market_size_by_subject_v2, lambda d: (d['order_df'], d['total_df'], d['product_df'])),
+    'distributor_market': (
+        calculate_distributor_market_size, lambda d: (d['total_df'], d['order_df'], d['distributor_df'])
+    ),
+    'subject_market_by_dist': (
+        calculate_subject_market_by_distributor, lambda d: (d['total_df'], d['order_df'], d['product_df'])
+    ),
+}
+
+
+def git_revision():
+    """(짧은 커밋 해시, 커밋 안 된 변경 여부) - git이 없으면 (None, None)"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BASE_DIR, capture_output=True, text=True,
+        ).stdout.strip() != ''
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def calibrate(repeat=5):
+    """
+    저장소 코드와 무관한 고정 작업(정렬 + groupby)의 최소 시간 - 머신 속도 기준값
+
+    같은 머신이라도 CPU 클럭/다른 작업 때문에 모든 항목이 함께 느려지는 경우가 있어
+    비교할 때 직전 기록을 이 값의 비율만큼 보정함
+    """
+    rng = np.random.default_rng(0)
+    values = rng.random(1_000_000)
+    frame = pd.DataFrame({'key': rng.integers(0, 1000, 1_000_000), 'value': values})
+
+    def work():
+        np.sort(values)
+        return frame.groupby('key')['value'].sum()
+
+    _, best = timed(work, repeat=repeat)
+    return best
+
+
+def bench_load(paths, repeat):
+    """build_base_datasets를 repeat 번 → (단계별 최소 시간, 마지막 결과)"""
+    best = {}
+    datasets = None
+    for _ in range(repeat):
+        timer = StageTimer()
+        datasets = build_base_datasets(paths, timer=timer)
+        seconds = {'load/total': timer.total()}
+        for stage in timer.ordered():
+            seconds[f"load/{stage['name']}"] = stage['seconds']
+        for name, value in seconds.items():
+            best[name] = min(best.get(name, value), value)
+    return best, datasets
+
+
+def bench_function(func, args, repeat):
+    """func(*args)를 repeat 번 → (최소 시간, 결과 행 수)"""
+    result, best = timed(func, *args, repeat=repeat)
+    return best, len(result)
+
+
+def run_scale(rows, seed, repeat, skip):
+    """주문 rows 행 규모 한 번 실행 → history 항목의 results/output_rows"""
+    start = time.perf_counter()
+    sources = make_sources(orders=rows, seed=seed)
+    work = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        paths = write_sources(work, sources)
+        del sources
+        print(f'[{rows:,} rows] synthetic data {time.perf_counter() - start:.1f}s')
+
+        results, datasets = bench_load(paths, repeat)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    output_rows = {}
+    for name, (func, get_args) in BENCHMARKS.items():
+        if name in skip:
+            continue
+        results[name], output_rows[name] = bench_function(func, get_args(datasets), repeat)
+    return results, output_rows
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return {'runs': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(history, f, ensure_ascii=False, indent=2, default=json_default)
+    os.replace(tmp, path)
+
+
+def previous_run(history, entry):
+    """같은 머신·행 수·seed의 가장 최근 기록 (없으면 None)"""
+    for run in reversed(history['runs']):
+        if all(run.get(k) == entry[k] for k in ('host', 'rows', 'seed')):
+            return run
+    return None
+
+
+def compare(entry, baseline, threshold, min_delta):
+    """
+    직전 기록과 비교 표 출력
+
+    Returns:
+        회귀 항목 이름 목록
+    """
+    regressions = []
+    # 머신 속도 보정: 직전 기록 시간 × (이번 기준값 / 직전 기준값)
+    speed = 1.0
+    if baseline is not None and baseline.get('calibration') and entry.get('calibration'):
+        speed = entry['calibration'] / baseline['calibration']
+    print(f"{'benchmark':<34}{'seconds':>10}{'previous':>10}{'ratio':>8}")
+    for name, seconds in entry['results'].items():
+        before = (baseline or {}).get('results', {}).get(name)
+        if before is None:
+            print(f'{name:<34}{seconds:>10.3f}{"-":>10}{"-":>8}')
+            continue
+        expected = before * speed
+        ratio = seconds / expected if expected > 0 else float('inf')
+        regressed = ratio >= threshold and seconds - expected >= min_delta
+        if regressed:
+            regressions.append(name)
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<34}{seconds:>10.3f}{before:>10.3f}{ratio:>7.2f}x{flag}')
+    if baseline is not None:
+        print(f"(previous: {baseline['at']} {baseline.get('commit') or ''}, machine speed x{speed:.2f} 보정)")
+    return regressions
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000], help='합성 주문 행 수 (여러 개 가능)')
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--repeat', type=int, default=3, help='항목별 반복 횟수 (최소값 기록)')
+    p.add_argument('--skip', nargs='*', default=[], choices=list(BENCHMARKS), help='건너뛸 계산')
+    p.add_argument('--history', default=HISTORY_FILE, help='JSON 기록 파일')
+    p.add_argument('--threshold', type=float, default=1.25, help='회귀로 볼 직전 대비 배수')
+    p.add_argument('--min-delta', type=float, default=0.05, help='회귀로 볼 최소 증가 시간(초) - 짧은 항목의 잡음 제외')
+    p.add_argument('--no-record', action='store_true', help='비교만 하고 기록하지 않음')
+    args = p.parse_args()
+
+    history = load_history(args.history)
+    commit, dirty = git_revision()
+    regressions = []
+    for rows in args.rows:
+        results, output_rows = run_scale(rows, args.seed, max(args.repeat, 1), set(args.skip))
+        calibration = calibrate()
+        entry = {
+            'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'commit': commit,
+            'dirty': dirty,
+            'host': platform.node(),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'rows': rows,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'calibration': calibration,
+            'results': results,
+            'output_rows': output_rows,
+        }
+        regressions += [f'{rows:,} rows {name}' for name in compare(
+            entry, previous_run(history, entry), args.threshold, args.min_delta
+        )]
+        history['runs'].append(entry)
+        print()
+
+    if not args.no_record:
+        save_history(args.history, history)
+        print(f'기록: {args.history} ({len(history["runs"])}건)')
+    if regressions:
+        print('성능 회귀:', ', '.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+대시보드 데이터 오프라인 빌드
+
+app.py의 load_data()와 같은 파이프라인(utils/data_pipeline.py)을 Streamlit 없이 실행하여
+총판 코드 매핑, 교과서명_구분, 총판등급, 시장 규모 테이블 3종, 목표과목 필터 데이터를
+outputs/artifacts/<키>/ 에 저장합니다. 앱은 시작 시 같은 키의 결과를 그대로 읽어옵니다.
+
+사용 예:
+    python scripts/build_artifacts.py
+    python scripts/build_artifacts.py --force --timings outputs/build_timings.json
+    python scripts/build_artifacts.py --orders path/to/orders.csv --out outputs/artifacts
+    python scripts/build_artifacts.py --append-orders path/to/daily_orders.csv
+
+주문현황 CSV에 행만 덧붙여진 경우(또는 --append-orders로 일별 추가분을 덧붙인 경우)
+이전 아티팩트에 추가 행만 반영합니다.
+"""
+import argparse
+import json
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.csv_ingest import append_csv_rows  # noqa: E402
+from utils.data_pipeline import ARTIFACT_DIR, DEFAULT_PATHS, StageTimer, load_or_build_datasets  # noqa: E402
+from utils.schema import format_memory_report  # noqa: E402
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--total', default=DEFAULT_PATHS['total'], help='학년별 학생수 CSV')
+    p.add_argument('--orders', default=DEFAULT_PATHS['order'], help='주문현황 CSV')
+    p.add_argument('--target', default=DEFAULT_PATHS['target'], help='총판별 목표 CSV')
+    p.add_argument('--product', default=DEFAULT_PATHS['product'], help='제품정보 CSV')
+    p.add_argument('--distributor', default=DEFAULT_PATHS['distributor'], help='총판정보 CSV')
+    p.add_argument('--mapping', default=DEFAULT_PATHS['distributor_map'], help='총판 코드 매핑 CSV')
+    p.add_argument('--out', default=ARTIFACT_DIR, help='아티팩트 저장 디렉터리')
+    p.add_argument('--force', action='store_true', help='같은 키의 아티팩트가 있어도 다시 계산')
+    p.add_argument('--timings', default=None, help='단계별 소요 시간을 JSON으로 저장할 경로')
+    p.add_argument('--append-orders', default=None, help='주문현황 CSV 끝에 덧붙일 일별 추가분 CSV (같은 헤더)')
+    args = p.parse_args()
+
+    if not os.path.exists(args.orders):
+        print(f'주문 파일을 찾을 수 없습니다: {args.orders}')
+        sys.exit(1)
+
+    if args.append_orders:
+        try:
+            added = append_csv_rows(args.orders, args.append_orders)
+        except (OSError, ValueError) as e:
+            print(f'추가분을 덧붙이지 못했습니다: {e}')
+            sys.exit(1)
+        print(f'주문 추가분 {added:,}행을 덧붙였습니다: {args.orders}')
+
+    paths = {
+        'total': args.total,
+        'order': args.orders,
+        'target': args.target,
+        'product': args.product,
+        'distributor': args.distributor,
+        'distributor_map': args.mapping,
+    }
+    timer = StageTimer()
+    datasets, info = load_or_build_datasets(paths, artifact_dir=args.out, force=args.force, timer=timer)
+
+    print(timer.report())
+    print()
+    if info['source'] == 'artifact':
+        print(f"변경 없음: 기존 아티팩트 사용 ({info['path']})")
+    elif info['path']:
+        if info['source'] == 'delta':
+            print('주문 추가분만 반영했습니다.')
+        print(f"아티팩트 저장: {info['path']}")
+    else:
+        print('아티팩트를 저장하지 못했습니다.')
+        sys.exit(1)
+
+    for name in ['order_df', 'market_analysis', 'distributor_market', 'subject_market_by_dist', 'order_df_target_filtered']:
+        print(f'{name:<28}{len(datasets[name]):>12,} rows')
+
+    if datasets.get('memory'):
+        print()
+        print(format_memory_report(datasets['memory']))
+
+    if args.timings:
+        os.makedirs(os.path.dirname(os.path.abspath(args.timings)), exist_ok=True)
+        with open(args.timings, 'w', encoding='utf-8') as f:
+            json.dump({'key': info['key'], 'source': info['source'], 'stages': timer.ordered()}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+주문 추가분(delta) 증분 반영 회귀 검사
+
+주문현황 CSV를 앞부분(기존 주문)과 나머지(추가분 여러 개)로 나눈 뒤
+1) 앞부분으로 전체 빌드해 아티팩트를 만들고
+2) 추가분을 append_csv_rows로 하나씩 덧붙이며 load_or_build_datasets(증분 반영)를 실행해
+3) 마지막 결과가 전체 주문으로 다시 빌드한 결과와 같은지 확인하고 소요 시간을 비교합니다.
+--lazy면 기본 데이터프레임만 든 아티팩트(지연 모드)에 추가분을 반영한 뒤 파생 표를 채워 비교합니다.
+
+임시 디렉터리에서만 작업하므로 원본 CSV와 outputs/artifacts는 바뀌지 않습니다.
+
+사용 예:
+    python scripts/check_delta_ingest.py
+    python scripts/check_delta_ingest.py --orders path/to/orders.csv --base-fraction 0.9 --deltas 3
+    python scripts/check_delta_ingest.py --lazy
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.artifact_store import load_artifacts  # noqa: E402
+from utils.csv_ingest import append_csv_rows  # noqa: E402
+from utils.data_pipeline import ARTIFACT_FRAMES, ARTIFACT_META, DEFAULT_PATHS, StageTimer, load_or_build_datasets  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+
+
+def split_lines(path):
+    """CSV를 (헤더 줄, 데이터 줄 목록) bytes로 (마지막 줄에 줄바꿈이 없으면 붙임)"""
+    with open(path, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    if lines and not lines[-1].endswith(b'\n'):
+        lines[-1] += b'\n'
+    return lines[0], lines[1:]
+
+
+def load_saved(artifact_dir, key):
+    frames, meta = load_artifacts(artifact_dir, key)
+    return frames, {name: meta.get(name, {}) for name in ARTIFACT_META}
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--orders', default=DEFAULT_PATHS['order'], help='주문현황 CSV')
+    p.add_argument('--base-fraction', type=float, default=0.9, help='기존 주문으로 쓸 앞부분 비율')
+    p.add_argument('--deltas', type=int, default=3, help='나머지를 몇 번에 나눠 덧붙일지')
+    p.add_argument('--lazy', action='store_true', help='지연 모드(파생 표 없이)로 빌드/증분 반영')
+    args = p.parse_args()
+
+    header, rows = split_lines(args.orders)
+    cut = int(len(rows) * args.base_fraction)
+    step = max(1, -(-(len(rows) - cut) // args.deltas))
+    chunks = [rows[i:i + step] for i in range(cut, len(rows), step)]
+
+    work = tempfile.mkdtemp(prefix='delta_ingest_')
+    try:
+        orders = os.path.join(work, 'orders.csv')
+        with open(orders, 'wb') as f:
+            f.write(header + b''.join(rows[:cut]))
+        paths = {**DEFAULT_PATHS, 'order': orders}
+        delta_dir = os.path.join(work, 'artifacts_delta')
+
+        _, seconds = timed(load_or_build_datasets, paths, artifact_dir=delta_dir, force=True, lazy=args.lazy)
+        print(f'base build: {cut:,} rows, {seconds:.2f}s')
+
+        for i, chunk in enumerate(chunks, 1):
+            delta_path = os.path.join(work, f'delta_{i}.csv')
+            with open(delta_path, 'wb') as f:
+                f.write(header + b''.join(chunk))
+            added = append_csv_rows(orders, delta_path)
+            timer = StageTimer()
+            (_, info), elapsed = timed(load_or_build_datasets, paths, artifact_dir=delta_dir, timer=timer, lazy=args.lazy)
+            assert info['source'] == 'delta', f"증분 반영되지 않음: {info['source']}"
+            print(f'delta {i}: +{added:,} rows, {elapsed:.2f}s')
+        print(timer.report())
+        if args.lazy:
+            # 지연 모드 아티팩트의 빠진 파생 표를 채움 (앱이 처음 접근할 때와 같은 계산)
+            _, info = load_or_build_datasets(paths, artifact_dir=delta_dir)
+
+        full_dir = os.path.join(work, 'artifacts_full')
+        (_, full_info), seconds = timed(load_or_build_datasets, paths, artifact_dir=full_dir, force=True)
+        print(f'full rebuild: {len(rows):,} rows, {seconds:.2f}s')
+
+        # 앱이 읽는 형태(아티팩트)끼리 비교
+        delta_frames, delta_meta = load_saved(delta_dir, info['key'])
+        full_frames, full_meta = load_saved(full_dir, full_info['key'])
+        for name in ARTIFACT_FRAMES:
+            pd.testing.assert_frame_equal(delta_frames[name], full_frames[name], obj=name)
+            print(f'{name:<28}{len(full_frames[name]):>10,} rows OK')
+        for name in ['market_size_by_level', 'code_to_official']:
+            assert delta_meta[name] == full_meta[name], name
+        print('parity OK')
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
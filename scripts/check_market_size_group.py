@@ -0,0 +1,80 @@
+"""
+그룹별 시장 규모 회귀 검사
+
+비교 분석(5) / 총판 비교분석(6) / 등급별 분석(7) 페이지가 쓰던 iterrows 방식과
+utils/market_size_group.py의 결과가 같은지 확인하고 소요 시간을 비교합니다.
+
+그룹: 시도교육청(페이지 5 지역 비교), 총판(페이지 5·6), 총판등급(페이지 7),
+무작위 학교 묶음(중복/결측/없는 학교코드 포함)
+
+사용 예:
+    python scripts/check_market_size_group.py
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import load_or_build_datasets  # noqa: E402
+from utils.market_size_group import market_size_by_group, market_size_for_schools, school_market_sizes  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+
+
+def legacy_market_size(total_df, school_codes):
+    """페이지에 있던 기존 계산 (학교별 iterrows)"""
+    schools = total_df[total_df['정보공시 학교코드'].isin(pd.Series(school_codes).astype(str))]
+    market = 0
+    for _, school in schools.iterrows():
+        grade_code = school.get('학교급코드', 0)
+        if grade_code == 3:  # 중학교
+            market += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
+        elif grade_code == 4:  # 고등학교
+            market += school.get('1학년 학생수', 0) + school.get('2학년 학생수', 0)
+    return market
+
+
+def check_grouping(order_df, total_df, by):
+    school_col = '정보공시학교코드' if '정보공시학교코드' in order_df.columns else '학교코드'
+    groups = order_df[by].dropna().unique()
+
+    expected, legacy_sec = timed(
+        lambda: {g: legacy_market_size(total_df, order_df.loc[order_df[by] == g, school_col].unique()) for g in groups}
+    )
+    result, fast_sec = timed(market_size_by_group, order_df, by, total_df)
+
+    mismatched = [g for g in groups if int(result.get(g, 0)) != int(expected[g])]
+    assert not mismatched, f'{by}: {len(mismatched)}개 그룹 불일치 (예: {mismatched[:5]})'
+    print(f'{by:<10}{len(groups):>8}{legacy_sec:>12.3f}{fast_sec:>12.4f}{legacy_sec / max(fast_sec, 1e-9):>9.1f}x')
+
+
+def check_random_sets(order_df, total_df, count=200, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = total_df['정보공시 학교코드'].astype(str).to_numpy()
+    extra = np.array(['없는학교', 'nan', None], dtype=object)
+    school_sizes = school_market_sizes(total_df)
+    for _ in range(count):
+        picked = np.concatenate([rng.choice(codes, rng.integers(0, 50)), extra[: rng.integers(0, 4)]])
+        picked = np.concatenate([picked, picked[: rng.integers(0, len(picked) + 1)]])  # 중복 포함
+        assert market_size_for_schools(picked, school_sizes=school_sizes) == legacy_market_size(total_df, picked)
+    print(f'random school sets: {count} OK')
+
+
+def main():
+    datasets, _ = load_or_build_datasets()
+    order_df = datasets['order_df']
+    total_df = datasets['total_df']
+
+    print(f"{'group':<10}{'groups':>8}{'legacy(s)':>12}{'new(s)':>12}{'speedup':>9}")
+    for by in ['시도교육청', '총판', '총판등급']:
+        if by in order_df.columns:
+            check_grouping(order_df, total_df, by)
+    check_random_sets(order_df, total_df)
+    print('parity OK')
+
+
+if __name__ == '__main__':
+    main()
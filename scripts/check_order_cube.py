@@ -0,0 +1,178 @@
+"""
+주문 집계 큐브(utils/order_cube.py) 회귀 검사 + 벤치마크
+
+rollup_orders()/count_schools()의 결과가 주문 행을 직접 groupby/nunique한 결과와 같은지 확인합니다.
+- 차원 하나/여러 개, 합계(부수, 금액)/행 수/차원 nunique·first/학교 수(셀별 학교 집합)
+- where 조건(값 하나, 값 목록), select_rows로 거른 프레임(조건 기록), 거른 뒤 다시 거른 프레임(큐브 미사용)
+- 뷰/거른 프레임에서 값을 바꾼 컬럼(바꾼 컬럼을 쓰는 집계는 큐브 미사용), 정렬한 프레임
+그 다음 주문 데이터를 --scale 배로 늘린 프레임에서 groupby와 큐브 rollup 시간을 비교합니다.
+
+사용 예:
+    python scripts/check_order_cube.py
+    python scripts/check_order_cube.py --scale 20
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import load_or_build_datasets  # noqa: E402
+from utils.order_cube import ROW_COUNT, count_schools, cube_for, register_cube, rollup_orders  # noqa: E402
+from utils.order_index import register_index, select_rows  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+from utils.shared_data import SharedDataset  # noqa: E402
+
+
+def expected(df, by, agg, where=None):
+    for col, value in (where or {}).items():
+        df = df[df[col].isin(value) if isinstance(value, list) else df[col] == value]
+    grouped = df.groupby(by)
+    if isinstance(agg, dict):
+        return grouped.agg(agg)
+    if agg == ROW_COUNT:
+        return grouped.size()
+    return grouped[agg].sum()
+
+
+def assert_same(result, expect, label):
+    if isinstance(expect, pd.Series):
+        pd.testing.assert_series_equal(result, expect, obj=label)
+    else:
+        pd.testing.assert_frame_equal(result, expect, obj=label)
+
+
+def random_case(rng, df, dims):
+    by = list(rng.choice(dims, size=rng.integers(1, 4), replace=False))
+    by = by[0] if len(by) == 1 else by
+    kind = rng.integers(0, 4)
+    if kind == 0:
+        agg = '부수'
+    elif kind == 1:
+        agg = ['부수', '금액']
+    elif kind == 2:
+        agg = ROW_COUNT
+    elif rng.random() < 0.5:
+        agg = {'부수': 'sum', '과목명': 'nunique', '정보공시학교코드': 'nunique', '교과서명_구분': 'first'}
+    else:
+        agg = {'정보공시학교코드': 'nunique'}
+    where = {}
+    if rng.random() < 0.5:
+        col = rng.choice(dims)
+        values = df[col].dropna().unique().tolist()
+        if values:
+            where[col] = values[int(rng.integers(0, len(values)))] if rng.random() < 0.5 else values[: max(1, len(values) // 2)]
+    return by, agg, where
+
+
+def expected_schools(df, where=None):
+    for col, value in (where or {}).items():
+        df = df[df[col].isin(value) if isinstance(value, list) else df[col] == value]
+    return int(df['정보공시학교코드'].nunique())
+
+
+def check_frame(name, df, cube, cases=300, seed=0):
+    rng = np.random.default_rng(seed)
+    dims = cube.dimensions
+    checked = 0
+    for col in dims:
+        assert_same(rollup_orders(df, col), expected(df, col, '부수'), f'{name}[{col}]')
+        checked += 1
+    for _ in range(cases):
+        by, agg, where = random_case(rng, df, dims)
+        assert_same(rollup_orders(df, by, agg, where), expected(df, by, agg, where), f'{name}{by} {agg} {where}')
+        assert count_schools(df, where) == expected_schools(df, where), (name, where)
+        checked += 2
+    assert count_schools(df, {dims[0]: '없는값'}) == 0
+    assert_same(rollup_orders(df, dims[0], {'정보공시학교코드': 'nunique'}, {dims[0]: '없는값'}),
+                expected(df, dims[0], {'정보공시학교코드': 'nunique'}, {dims[0]: '없는값'}), f'{name} empty')
+
+    # select_rows로 거른 프레임 (조건이 기록되어 큐브 사용), 그 결과에서 다시 거른 프레임
+    for _ in range(50):
+        row = df.iloc[int(rng.integers(0, len(df)))]
+        conditions = {col: row[col] for col in rng.choice(dims, size=2, replace=False) if pd.notna(row[col])}
+        subset = select_rows(df, conditions)
+        assert cube_for(subset)[0] is cube, conditions
+        by, agg, where = random_case(rng, subset, dims)
+        assert_same(rollup_orders(subset, by, agg, where), expected(subset, by, agg, where), f'{name}{conditions}')
+        assert count_schools(subset, where) == expected_schools(subset, where), (name, conditions, where)
+        masked = subset[subset['부수'] > 1]
+        if len(masked) < len(subset):
+            assert cube_for(masked)[0] is None
+        assert_same(rollup_orders(masked, by, agg, where), expected(masked, by, agg, where), f'{name}{conditions} masked')
+        checked += 2
+
+    # 뷰/거른 프레임에서 값을 바꾼 컬럼 (큐브 대신 직접 집계), 정렬 후 번호를 새로 매긴 프레임
+    for frame, label in [(df.copy(deep=False), 'view'), (select_rows(df, {dims[0]: df[dims[0]].iloc[0]}), 'subset')]:
+        values = frame['총판'].dropna().unique().tolist()
+        frame['총판'] = frame['총판'].map({value: f'그룹{i % 2}' for i, value in enumerate(values)})
+        frame['부수'] = frame['부수'] * 2
+        for by, agg, where in [('총판', '부수', None), ('학교급명', '부수', None),
+                               ('학교급명', ROW_COUNT, {'총판': '그룹0'}), ('시도교육청', '금액', None)]:
+            assert_same(rollup_orders(frame, by, agg, where), expected(frame, by, agg, where), f'{name} {label} {by} {where}')
+        assert count_schools(frame, {'총판': '그룹1'}) == expected_schools(frame, {'총판': '그룹1'}), (name, label)
+        assert cube_for(frame, ['시도교육청'])[0] is cube, (name, label)
+        checked += 5
+    reordered = df.sort_values('부수', kind='stable').reset_index(drop=True)
+    assert_same(rollup_orders(reordered, '시도교육청', {'교과서명_구분': 'first'}),
+                expected(reordered, '시도교육청', {'교과서명_구분': 'first'}), f'{name} reordered')
+    checked += 1
+    print(f'{name:<28}{len(df):>10,}{len(cube.cells):>10,}{checked:>8} OK ({cube.nbytes() / 1e6:.1f}MB)')
+
+
+def benchmark(order_df, total_df, scale):
+    big = pd.concat([order_df] * scale, ignore_index=True)
+    shared = SharedDataset({'order_df': big})
+    df = shared.view('order_df')
+    shared.cubes['order_df'], build_sec = timed(register_cube, df, schools=total_df['정보공시 학교코드'])
+    shared.indexes['order_df'] = register_index(df)
+    print(f'\n[benchmark] {len(big):,} rows -> {len(shared.cubes["order_df"].cells):,} cells (build {build_sec:.3f}s)')
+
+    year = df['학년도'].iloc[0]
+    subset = select_rows(df, 학년도=year)
+    cases = [
+        ('시도교육청', '부수', df),
+        (['총판', '과목명'], '부수', df),
+        (['학교급명', '교과군'], ['부수', '금액'], df),
+        ('시도교육청', '부수', subset),
+    ]
+    print(f"{'by':<32}{'rows':>10}{'groupby(s)':>12}{'cube(s)':>10}{'speedup':>9}")
+    for by, agg, frame in cases:
+        _, scan_sec = timed(expected, frame, by, agg, repeat=5)
+        _, cube_sec = timed(rollup_orders, frame, by, agg, repeat=5)
+        print(f'{str(by):<32}{len(frame):>10,}{scan_sec:>12.4f}{cube_sec:>10.4f}{scan_sec / max(cube_sec, 1e-9):>8.1f}x')
+
+    # 사이드바 선택 조합의 주문 학교 수 (nunique 대 셀별 학교 집합 합집합)
+    region = df['시도교육청'].iloc[0]
+    selections = [{}, {'학년도': year}, {'학년도': year, '시도교육청': region}, {'학년도': year, '교과군': df['교과군'].iloc[0]}]
+    print(f"{'학교 수 조건':<40}{'nunique(s)':>12}{'cube(s)':>10}{'speedup':>9}")
+    for where in selections:
+        _, scan_sec = timed(expected_schools, df, where, repeat=5)
+        _, cube_sec = timed(count_schools, df, where, repeat=5)
+        print(f'{str(where):<40}{scan_sec:>12.4f}{cube_sec:>10.5f}{scan_sec / max(cube_sec, 1e-9):>8.1f}x')
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--scale', type=int, default=20, help='벤치마크용으로 주문 데이터를 몇 배로 늘릴지')
+    args = p.parse_args()
+
+    datasets, info = load_or_build_datasets()
+    shared = SharedDataset(datasets, version=info['key'])
+
+    print(f"{'frame':<28}{'rows':>10}{'cells':>10}{'cases':>8}")
+    for name in ['order_df', 'order_df_target_filtered']:
+        shared.cubes[name] = register_cube(shared.view(name), schools=datasets['total_df']['정보공시 학교코드'])
+        shared.indexes[name] = register_index(shared.view(name))
+        check_frame(name, shared.view(name), shared.cubes[name])
+    print('parity OK')
+
+    benchmark(datasets['order_df'], datasets['total_df'], args.scale)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+주문 역인덱스(utils/order_index.py) 회귀 검사 + 벤치마크
+
+차원별 모든 값(+ 없는 값, 결측)과 무작위 조건 조합에 대해
+select_rows() 결과가 boolean mask(df[df[c] == v])와 같은지 확인하고
+(먼저 거르거나 정렬한 프레임, 조건 컬럼 값을 바꾼 뷰 포함),
+상세 모달처럼 값 하나로 자를 때의 행 위치 계산 시간을 비교합니다.
+
+사용 예:
+    python scripts/check_order_index.py
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import load_or_build_datasets  # noqa: E402
+from utils.order_index import index_for, register_index, select_positions, select_rows  # noqa: E402
+from utils.profiling import timed  # noqa: E402
+from utils.shared_data import SharedDataset  # noqa: E402
+
+
+def masked(df, conditions):
+    mask = pd.Series(True, index=df.index)
+    for col, value in conditions.items():
+        mask &= df[col] == value
+    return df[mask]
+
+
+def check_frame(name, df, index, combos=300, seed=0):
+    rng = np.random.default_rng(seed)
+    mask_sec = index_sec = 0.0
+    lookups = 0
+    for col in index.dimensions:
+        for value in index.values(col) + ['없는값', np.nan]:
+            # 행 위치 계산 시간만 비교 (행을 꺼내는 iloc 비용은 두 방식이 같음)
+            mask_sec += timed(lambda: np.flatnonzero((df[col] == value).to_numpy(dtype=bool, na_value=False)))[1]
+            index_sec += timed(select_positions, df, {col: value})[1]
+            lookups += 1
+            pd.testing.assert_frame_equal(select_rows(df, {col: value}), masked(df, {col: value}), obj=f'{name}[{col}={value!r}]')
+
+    # 조건 조합 (공통 필터처럼 2~4개 차원의 교집합)
+    dims = index.dimensions
+    for _ in range(combos):
+        cols = rng.choice(dims, size=rng.integers(2, min(4, len(dims)) + 1), replace=False)
+        row = df.iloc[int(rng.integers(0, len(df)))]
+        conditions = {col: row[col] for col in cols if pd.notna(row[col])}
+        pd.testing.assert_frame_equal(select_rows(df, conditions), masked(df, conditions), obj=f'{name}{conditions}')
+
+    # 인덱스가 없는 프레임(먼저 거른 프레임)은 mask로 계산
+    subset = df.iloc[::3]
+    col = dims[0]
+    value = index.values(col)[0]
+    pd.testing.assert_frame_equal(select_rows(subset, {col: value}), masked(subset, {col: value}))
+
+    # 행 수는 같지만 순서가 다른 프레임(정렬한 뷰)도 mask로 계산
+    reordered = df.sort_values('부수', kind='stable')
+    for col in dims:
+        value = index.values(col)[-1]
+        pd.testing.assert_frame_equal(select_rows(reordered, {col: value}), masked(reordered, {col: value}),
+                                      obj=f'{name}(sorted)[{col}={value!r}]')
+
+    # 조건 컬럼 값을 바꾼 뷰도 mask로 계산 (바꾸지 않은 컬럼은 그대로 인덱스)
+    rewritten = df.copy(deep=False)
+    values = index.values('총판')
+    rewritten['총판'] = rewritten['총판'].map({value: f'그룹{i % 2}' for i, value in enumerate(values)})
+    for conditions in [{'총판': '그룹0'}, {'총판': '그룹1', dims[0]: index.values(dims[0])[0]}]:
+        pd.testing.assert_frame_equal(select_rows(rewritten, conditions), masked(rewritten, conditions),
+                                      obj=f'{name}(rewritten){conditions}')
+    assert index_for(rewritten, [dims[0]]) is index and index_for(rewritten, ['총판']) is None
+
+    print(f'{name:<28}{len(dims):>6}{lookups:>9}{mask_sec:>11.3f}{index_sec:>11.3f}{mask_sec / max(index_sec, 1e-9):>9.1f}x')
+
+
+def main():
+    datasets, info = load_or_build_datasets()
+    shared = SharedDataset(datasets, version=info['key'])
+
+    print(f"{'frame':<28}{'dims':>6}{'lookups':>9}{'mask(s)':>11}{'index(s)':>11}{'speedup':>9}")
+    for name in ['order_df', 'order_df_target_filtered']:
+        shared.indexes[name], build_sec = timed(register_index, shared.view(name))
+        check_frame(name, shared.view(name), shared.indexes[name])
+        print(f'  build {build_sec:.3f}s, {shared.indexes[name].nbytes() / 1e6:.1f}MB')
+    print('parity OK')
+
+
+if __name__ == '__main__':
+    main()
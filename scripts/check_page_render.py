@@ -0,0 +1,79 @@
+"""
+페이지 렌더링 회귀 검사 (streamlit.testing AppTest)
+
+app.py를 PIN 인증된 세션으로 한 번 실행해 공유 데이터셋을 세션에 올린 뒤
+pages/의 각 페이지로 전환해 기본 위젯 값으로 끝까지 렌더링합니다.
+탭 안의 내용도 모두 실행되므로, 예외(st.exception)가 난 페이지를 스택과 함께 출력하고
+하나라도 있으면 종료 코드 1을 돌려줍니다.
+
+사용 예:
+    python scripts/check_page_render.py
+    python scripts/check_page_render.py --pages 6 8
+"""
+import argparse
+import glob
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from utils.profiling import timed  # noqa: E402
+
+APP_FILE = os.path.join(BASE_DIR, 'app.py')
+
+
+def page_files(numbers=None):
+    """pages/의 페이지 파일 (번호순, numbers가 있으면 그 번호만)"""
+    files = glob.glob(os.path.join(BASE_DIR, 'pages', '*.py'))
+    files.sort(key=lambda path: int(os.path.basename(path).split('_', 1)[0]))
+    if numbers:
+        files = [path for path in files if os.path.basename(path).split('_', 1)[0] in numbers]
+    return files
+
+
+def render(page, timeout):
+    """
+    app.py 실행 후 page로 전환해 렌더링
+
+    Returns:
+        (소요 시간, 예외 목록 [(메시지, 스택 마지막 줄들)])
+    """
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    at.session_state['auth_ok'] = True
+    at.run()
+    failures = [(e.message, e.stack_trace[-4:]) for e in at.exception]
+    if failures:
+        return 0.0, [(f'app.py: {message}', stack) for message, stack in failures]
+    at.switch_page(os.path.relpath(page, BASE_DIR))
+    _, seconds = timed(at.run)
+    return seconds, [(e.message, e.stack_trace[-4:]) for e in at.exception]
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--pages', nargs='*', help='검사할 페이지 번호 (기본: 전체)')
+    p.add_argument('--timeout', type=float, default=900, help='실행당 제한 시간(초) - 첫 실행은 데이터 로드 포함')
+    args = p.parse_args()
+
+    failed = []
+    for page in page_files(set(args.pages or [])):
+        name = os.path.splitext(os.path.basename(page))[0]
+        seconds, failures = render(page, args.timeout)
+        print(f"{'FAIL' if failures else 'OK':<5}{name:<28}{seconds:>7.1f}s")
+        for message, stack in failures:
+            print(f'      {message}')
+            for line in stack:
+                print(f'        {line}')
+        if failures:
+            failed.append(name)
+    if failed:
+        print('렌더링 실패:', ', '.join(failed))
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
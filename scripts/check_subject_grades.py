@@ -0,0 +1,133 @@
+"""
+대상 학년 규칙표 / 학년별 시장 규모 조회표 회귀 검사
+
+utils/market_size.py의
+1) subject_grade_table (고유 (과목명, 학교급코드) 조합에 규칙을 한 번에 적용)이
+   extract_grade_from_subject를 조합마다 호출한 결과와 같은지
+2) calculate_accurate_market_share (조회표 + groupby)가 기존 방식
+   (주문 행마다 apply로 대상 학년 → 그룹마다 iterrows로 total_df를 거르며 합산)과 같은지
+확인하고 소요 시간을 비교합니다.
+
+과목명: 주문/제품정보의 실제 과목명 + 매핑 키에 학기 표시/공백을 붙인 이름 + 결측
+학교급코드: 2, 3, 4, 25, 결측
+
+사용 예:
+    python scripts/check_subject_grades.py
+    python scripts/check_subject_grades.py --rows 5000
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import load_or_build_datasets  # noqa: E402
+from utils.market_size import (  # noqa: E402
+    SUBJECT_GRADE_MAPPING,
+    calculate_accurate_market_share,
+    extract_grade_from_subject,
+    get_all_grades_for_school_level,
+    get_next_year_grade_column,
+    subject_grade_table,
+)
+from utils.profiling import timed  # noqa: E402
+
+GROUPINGS = [['총판'], ['시도교육청', '학교급명'], ['교과서명_구분']]
+
+
+def legacy_group_market_share(group_df, total_df):
+    """기존 calculate_group_market_share (주문 행마다 total_df를 거름)"""
+    total_orders = group_df['부수'].sum()
+    market_size = 0
+    for _, row in group_df.iterrows():
+        school_code = row.get('학교급코드')
+        target_grade = row.get('대상학년')
+        if target_grade and school_code:
+            grade_column = get_next_year_grade_column(target_grade, is_2026=True)
+            if grade_column and grade_column in total_df.columns:
+                market_size += total_df[total_df['학교급코드'] == school_code][grade_column].sum()
+            else:
+                market_size += get_all_grades_for_school_level(school_code, total_df)
+        elif school_code:
+            market_size += get_all_grades_for_school_level(school_code, total_df)
+    share = (total_orders / market_size * 100) if market_size > 0 else 0
+    return pd.Series({'주문부수': total_orders, '시장규모': market_size, '점유율(%)': share})
+
+
+def legacy_accurate_market_share(order_df, total_df, group_by_columns):
+    """기존 calculate_accurate_market_share (행별 apply + 그룹별 iterrows)"""
+    def get_school_code(school_level):
+        if pd.isna(school_level):
+            return None
+        if '중학교' in str(school_level):
+            return 3
+        elif '고등' in str(school_level):
+            return 4
+        elif '초등' in str(school_level):
+            return 2
+        return None
+
+    order_with_grade = order_df.copy()
+    order_with_grade['학교급코드'] = order_with_grade['학교급명'].apply(get_school_code)
+    order_with_grade['대상학년'] = order_with_grade.apply(
+        lambda row: extract_grade_from_subject(row['과목명'], row['학교급코드']), axis=1
+    )
+    return order_with_grade.groupby(group_by_columns).apply(
+        lambda group: legacy_group_market_share(group, total_df)
+    ).reset_index()
+
+
+def check_rule_table(order_df, product_df):
+    subjects = set(order_df['과목명'].dropna().astype(str))
+    if '교과서명' in product_df.columns:
+        subjects |= set(product_df['교과서명'].dropna().astype(str))
+    for name in SUBJECT_GRADE_MAPPING:
+        subjects |= {name, f'{name} 1', f'{name}2', f' {name} ① ', f'{name} 심화', f'[중등] {name}'}
+    subjects = sorted(subjects) + [None]
+    levels = [2, 3, 4, 25, np.nan]
+    pairs = pd.DataFrame(
+        [(s, level) for s in subjects for level in levels], columns=['과목명', '학교급코드']
+    )
+
+    expected, scalar_sec = timed(
+        lambda: [extract_grade_from_subject(s, level) for s, level in zip(pairs['과목명'], pairs['학교급코드'])]
+    )
+    table, table_sec = timed(subject_grade_table, pairs)
+    result = table['대상학년']
+
+    expected = pd.Series(expected, dtype='float64')
+    mismatched = pairs[~((expected == result) | (expected.isna() & result.isna()))]
+    assert mismatched.empty, f'대상 학년 불일치 {len(mismatched)}건:\n{mismatched.head(10)}'
+    print(f'rule table: {len(pairs):,} pairs OK (scalar {scalar_sec:.3f}s, table {table_sec:.3f}s)')
+
+
+def check_market_share(order_df, total_df):
+    print(f"{'group':<24}{'groups':>8}{'legacy(s)':>12}{'table(s)':>12}{'speedup':>9}")
+    for keys in GROUPINGS:
+        expected, legacy_sec = timed(legacy_accurate_market_share, order_df, total_df, keys)
+        result, fast_sec = timed(calculate_accurate_market_share, order_df, total_df, keys)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, obj=str(keys))
+        label = '×'.join(keys)
+        print(f'{label:<24}{len(result):>8}{legacy_sec:>12.3f}{fast_sec:>12.4f}{legacy_sec / max(fast_sec, 1e-9):>9.1f}x')
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--rows', type=int, default=20_000, help='기존 방식과 비교할 주문 행 수 (기존 방식이 느려서 일부만)')
+    args = p.parse_args()
+
+    datasets, _ = load_or_build_datasets()
+    order_df, total_df = datasets['order_df'], datasets['total_df']
+    check_rule_table(order_df, datasets['product_df'])
+
+    sample = order_df.sample(n=min(args.rows, len(order_df)), random_state=0) if len(order_df) > args.rows else order_df
+    check_market_share(sample, total_df)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+총판별 도서코드별 시장 규모 회귀 검사
+
+utils/market_size_distributor.py의 큐브 조회 방식(calculate_subject_market_by_distributor)과
+기존 그룹별 스캔(subject_market_by_distributor_scan)의 결과가 같은지 확인하고 소요 시간을 비교합니다.
+
+실제 주문 외에 결측/예외를 섞은 변형도 검사합니다:
+과목명·학교급 결측(그룹 첫 행만 결측 포함), 학생수 데이터에 없는 총판, 학년도 정보 없음,
+금액 컬럼 없음, category가 아닌 컬럼, 학생수 결측(float)
+
+사용 예:
+    python scripts/check_subject_market_by_dist.py
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_pipeline import load_or_build_datasets  # noqa: E402
+from utils.market_size_distributor import (  # noqa: E402
+    calculate_subject_market_by_distributor,
+    subject_market_by_distributor_scan,
+)
+from utils.profiling import timed  # noqa: E402
+
+
+def compare(label, total_df, order_df, product_df):
+    expected, scan_sec = timed(subject_market_by_distributor_scan, total_df, order_df, product_df)
+    result, cube_sec = timed(calculate_subject_market_by_distributor, total_df, order_df, product_df)
+
+    pd.testing.assert_frame_equal(result, expected, obj=label)
+    print(f'{label:<24}{len(result):>8,}{scan_sec:>12.3f}{cube_sec:>12.4f}{scan_sec / max(cube_sec, 1e-9):>9.1f}x')
+
+
+def perturb(order_df, total_df, seed=0):
+    """결측/예외 값을 섞은 주문·학생수 데이터"""
+    rng = np.random.default_rng(seed)
+    orders = order_df.copy()
+    for col in ['총판', '교과서명_구분', '학교급']:
+        if col in orders.columns:
+            orders[col] = orders[col].astype(object)
+    n = len(orders)
+    orders.loc[rng.random(n) < 0.05, '교과서명_구분'] = np.nan
+    orders.loc[rng.random(n) < 0.05, '학교급'] = np.nan
+    orders.loc[rng.random(n) < 0.02, '총판'] = '학생수에없는총판'
+    orders.loc[rng.random(n) < 0.01, '총판'] = np.nan
+    if '학년도' in orders.columns:
+        orders['학년도'] = orders['학년도'].where(rng.random(n) > 0.05, 2024)
+
+    total = total_df.copy()
+    for col in ['1학년 학생수', '2학년 학생수']:
+        total[col] = total[col].astype(float).where(rng.random(len(total)) > 0.02)
+    return orders, total
+
+
+def main():
+    datasets, _ = load_or_build_datasets()
+    order_df = datasets['order_df']
+    total_df = datasets['total_df']
+    product_df = datasets['product_df']
+
+    print(f"{'case':<24}{'rows':>8}{'scan(s)':>12}{'cube(s)':>12}{'speedup':>9}")
+    compare('orders', total_df, order_df, product_df)
+    orders, total = perturb(order_df, total_df)
+    compare('missing values', total, orders, product_df)
+    compare('no 금액/학년도', total_df, order_df.drop(columns=['금액', '학년도'], errors='ignore'), product_df)
+    compare('subset (1 book)', total_df, order_df[order_df['도서코드(교지명구분)'] == order_df['도서코드(교지명구분)'].iloc[0]], product_df)
+    compare('empty', total_df, order_df.iloc[:0], product_df)
+    print('parity OK')
+
+
+if __name__ == '__main__':
+    main()
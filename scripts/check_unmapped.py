@@ -1,34 +1,24 @@
+import os
+import sys
+
 import pandas as pd
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-def normalize(code_val):
-    import pandas as pd
-    if pd.isna(code_val):
-        return ''
-    s = str(code_val).strip()
-    s = s.replace(',', '').strip()
-    if s.endswith('.0'):
-        s = s[:-2]
-    try:
-        f = float(s)
-        if f.is_integer():
-            return str(int(f))
-        return s
-    except Exception:
-        return s
+from utils.distributor_code import normalize_codes  # noqa: E402
 
 
 def main():
     orders = pd.read_csv('씨마스_22개정 주문현황_학교코드총판코드.csv', dtype=str, low_memory=False)
     mapdf = pd.read_csv('outputs/distributor_code_mapping.csv', dtype=str)
 
-    mapped_codes = set(mapdf[mapdf['matched'].astype(str).str.lower()=='true']['order_code'].apply(normalize))
+    mapped_codes = set(normalize_codes(mapdf[mapdf['matched'].astype(str).str.lower()=='true']['order_code']))
 
     if '총판코드' not in orders.columns:
         print('NO 총판코드 column')
         return
 
-    orders['총판코드_norm'] = orders['총판코드'].apply(normalize)
+    orders['총판코드_norm'] = normalize_codes(orders['총판코드'])
     unique_codes = sorted([c for c in orders['총판코드_norm'].unique() if c!=''])
 
     unmapped = [c for c in unique_codes if c not in mapped_codes]
@@ -1,31 +1,18 @@
 import os
+import sys
+
 import pandas as pd
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.distributor_code import normalize_codes  # noqa: E402
+
 ORDER_FILE = os.path.join(BASE_DIR, '씨마스_22개정 주문현황_학교코드총판코드.csv')
 DISTRIBUTOR_FILE = os.path.join(BASE_DIR, '총판정보.csv')
 TARGET_FILE = os.path.join(BASE_DIR, '22개정 총판별 목표.csv')
 
 
-def _normalize_code(code_val) -> str:
-    if pd.isna(code_val):
-        return ''
-    s = str(code_val).strip().replace(',', '').strip()
-    if s.endswith('.0'):
-        s = s[:-2]
-    try:
-        f = float(s)
-        if f.is_integer():
-            s = str(int(f))
-    except Exception:
-        pass
-
-    # 핵심: 4자리 코드 유지 (선행 0 보호)
-    if s.isdigit() and 0 < len(s) < 4:
-        s = s.zfill(4)
-    return s
-
-
 def _read_csv_auto(path: str, *, dtype=None):
     try:
         return pd.read_csv(path, encoding='cp949', low_memory=False, dtype=dtype)
@@ -40,14 +27,9 @@ def build_map(dist: pd.DataFrame):
     if not code_col or '총판명(공식)' not in dist.columns:
         return {}
 
-    m = {}
-    for _, r in dist.iterrows():
-        code = _normalize_code(r.get(code_col))
-        name = r.get('총판명(공식)')
-        if pd.isna(name) or code == '':
-            continue
-        m[code] = str(name).strip()
-    return m
+    codes = normalize_codes(dist[code_col])
+    valid = dist['총판명(공식)'].notna() & (codes != '')
+    return dict(zip(codes[valid], dist.loc[valid, '총판명(공식)'].astype(str).str.strip()))
 
 
 def check(label: str, orders: pd.DataFrame, dist: pd.DataFrame):
@@ -56,7 +38,7 @@ def check(label: str, orders: pd.DataFrame, dist: pd.DataFrame):
         return
 
     m = build_map(dist)
-    orders_norm = orders['총판코드'].apply(_normalize_code)
+    orders_norm = normalize_codes(orders['총판코드'])
     unique_codes = sorted([c for c in orders_norm.unique() if c != ''])
     mapped = set(m.keys())
     unmapped = [c for c in unique_codes if c not in mapped]
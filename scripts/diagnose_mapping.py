@@ -1,36 +1,23 @@
 import pandas as pd
 import os
+import sys
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE)
+
+from utils.distributor_code import normalize_codes  # noqa: E402
 
-BASE = os.path.dirname(os.path.dirname(__file__))
 ORDERS_CSV = os.path.join(BASE, '씨마스_22개정 주문현황_학교코드총판코드.csv')
 DIST_CSV = os.path.join(BASE, '총판정보.csv')
 OUT_MAP = os.path.join(BASE, 'outputs', 'distributor_code_mapping.csv')
 
 
-def normalize(code_val):
-    if pd.isna(code_val):
-        return ''
-    s = str(code_val).strip()
-    s = s.replace(',', '').strip()
-    # remove common invisible characters
-    s = s.replace('\u200b', '')
-    if s.endswith('.0'):
-        s = s[:-2]
-    try:
-        f = float(s)
-        if f.is_integer():
-            return str(int(f))
-        return s
-    except Exception:
-        return s
-
-
 def load_orders():
     orders = pd.read_csv(ORDERS_CSV, dtype=str, low_memory=False)
     if '총판코드' not in orders.columns:
         print('ERROR: orders has no 총판코드 column')
         return None
-    orders['총판코드_norm'] = orders['총판코드'].apply(normalize)
+    orders['총판코드_norm'] = normalize_codes(orders['총판코드'])
     if '부수' in orders.columns:
         orders['부수_num'] = pd.to_numeric(orders['부수'], errors='coerce').fillna(0)
     else:
@@ -55,7 +42,7 @@ def build_dist_map_from_dist():
         print('No official name column in distributor file')
         return {}
 
-    df['code_norm'] = df[code_col].apply(normalize)
+    df['code_norm'] = normalize_codes(df[code_col])
     dmap = df.dropna(subset=['code_norm']).set_index('code_norm')['총판명(공식)'].to_dict()
     return dmap
 
@@ -66,7 +53,7 @@ def load_out_map():
     df = pd.read_csv(OUT_MAP, dtype=str)
     if 'order_code' not in df.columns or 'official_name' not in df.columns:
         return None
-    df['order_code_norm'] = df['order_code'].apply(normalize)
+    df['order_code_norm'] = normalize_codes(df['order_code'])
     df_true = df[df['matched'].astype(str).str.lower()=='true']
     return df_true.set_index('order_code_norm')['official_name'].to_dict()
 
@@ -1,22 +1,11 @@
 import argparse
 import pandas as pd
 import os
+import sys
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-def _normalize_code(code_val) -> str:
-    if pd.isna(code_val):
-        return ''
-    s = str(code_val).strip()
-    s = s.replace(',', '').strip()
-    if s.endswith('.0'):
-        s = s[:-2]
-    try:
-        f = float(s)
-        if f.is_integer():
-            return str(int(f))
-        return s
-    except Exception:
-        return s
+from utils.distributor_code import normalize_codes  # noqa: E402
 
 
 def build_mapping(order_csv, distributor_csv, out_dir):
@@ -35,13 +24,13 @@ def build_mapping(order_csv, distributor_csv, out_dir):
         else:
             raise RuntimeError('총판정보.csv에 `총판명(공식)` 또는 `총판명` 컬럼이 필요합니다.')
 
-    dist['숫자코드_norm'] = dist['숫자코드'].apply(_normalize_code)
+    dist['숫자코드_norm'] = normalize_codes(dist['숫자코드'])
     dist_map = dist.dropna(subset=['숫자코드_norm']).set_index('숫자코드_norm')['총판명(공식)'].to_dict()
 
     # Orders normalization
     if '총판코드' not in orders.columns:
         raise RuntimeError('주문현황 CSV에 `총판코드` 컬럼이 필요합니다.')
-    orders['총판코드_norm'] = orders['총판코드'].apply(_normalize_code)
+    orders['총판코드_norm'] = normalize_codes(orders['총판코드'])
 
     # Prepare results
     # NOTE: 정책상 "주문현황의 총판(명칭)" 컬럼은 매핑 로직에 사용하지 않습니다.
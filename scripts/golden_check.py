@@ -0,0 +1,253 @@
+"""
+골든 출력 회귀 검사 - 시장 규모/점유율 계산을 바꾸기 전후의 수치 비교
+
+고정 입력으로 현재 구현의 파생 표를 모두 계산해 스냅샷(outputs/golden/<입력>/)으로 저장하고(record),
+코드를 고친 뒤 같은 입력으로 다시 계산해 허용 오차 안에서 같은지 컬럼별로 비교합니다(check).
+- synthetic: utils/synthetic_data.py 합성 원본 (행 수/seed는 스냅샷에 기록, check 때 같은 입력 재생성)
+- anonymized: 실제 원본 CSV의 개인정보 컬럼만 가명 처리 (주문현황 CSV가 없으면 건너뜀,
+  원본이 스냅샷 이후 바뀌었으면 경고 - 그 경우 차이는 입력 변화일 수 있음)
+비교 대상: data_pipeline 파생 표 전체 + utils/market_size*.py 계산 결과 + 총판별 달성률 (GOLDEN_CASES)
+
+합성 입력 스냅샷(outputs/golden/synthetic/)은 저장소에 커밋되어 있어 누구나 같은 기준과 비교합니다.
+계산 결과가 의도적으로 바뀌는 변경이면 record --inputs synthetic으로 다시 저장해 함께 커밋하세요.
+익명화 입력 스냅샷(outputs/golden/anonymized/)은 실제 원본에서 만들어지므로 커밋하지 않습니다.
+
+최적화 작업 순서:
+    코드 수정 후               python scripts/golden_check.py check
+    (익명화 입력은 git stash / 이전 커밋에서 먼저 python scripts/golden_check.py record --inputs anonymized)
+
+사용 예:
+    python scripts/golden_check.py record
+    python scripts/golden_check.py record --inputs synthetic --rows 20000
+    python scripts/golden_check.py check
+    python scripts/golden_check.py check --only market_analysis accurate_share/총판 --rtol 1e-6
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.achievement import achievement_table, actuals_by_official, target_totals, targets_by_official  # noqa: E402
+from utils.data_pipeline import DEFAULT_PATHS, DERIVED_DATASETS, build_datasets  # noqa: E402
+from utils.distributor_directory import DistributorDirectory  # noqa: E402
+from utils.golden import (  # noqa: E402
+    DEFAULT_ATOL,
+    DEFAULT_RTOL,
+    anonymize_sources,
+    diff_frame,
+    format_report,
+    read_manifest,
+    read_table,
+    write_snapshot,
+)
+from utils.market_size import (  # noqa: E402
+    calculate_accurate_market_share,
+    calculate_market_size_by_region_subject,
+    calculate_market_size_by_subject,
+)
+from utils.market_size_group import market_size_by_group, school_market_sizes  # noqa: E402
+from utils.synthetic_data import write_sources  # noqa: E402
+
+GOLDEN_DIR = os.path.join(BASE_DIR, 'outputs', 'golden')
+INPUTS = ['synthetic', 'anonymized']
+DEFAULT_ROWS = 5_000
+
+# 파생 표의 행 키 (없는 표는 숫자가 아닌 컬럼으로 정렬해 비교)
+DERIVED_KEYS = {
+    'market_analysis': ['도서코드'],
+    'market_size_by_level': ['key'],
+    'distributor_market': ['총판명'],
+    'subject_market_by_dist': ['총판명', '도서코드', '학교급'],
+}
+
+
+def achievement(datasets):
+    """목표 대비 달성률(8) 페이지의 총판별 달성률 표"""
+    directory = DistributorDirectory(datasets['distributor_df'], datasets.get('code_to_official'))
+    code_map = dict(directory.code_to_official)
+    target_map = targets_by_official(target_totals(datasets['target_df']), code_map)
+    return achievement_table(target_map, actuals_by_official(datasets['order_df_target_filtered'], code_map))
+
+
+# 이름: (datasets → 결과, 키 컬럼) - 페이지가 쓰는 utils/market_size*.py, utils/achievement.py 계산
+GOLDEN_CASES = {
+    'market_size_by_subject': (
+        lambda d: calculate_market_size_by_subject(d['order_df'], d['total_df'], d['product_df']),
+        ['과목명', '학교급'],
+    ),
+    'market_size_by_region_subject': (
+        lambda d: calculate_market_size_by_region_subject(d['order_df'], d['total_df']),
+        ['시도교육청', '과목명', '학교급'],
+    ),
+    'accurate_share/총판': (
+        lambda d: calculate_accurate_market_share(d['order_df'], d['total_df'], ['총판']),
+        ['총판'],
+    ),
+    'accurate_share/시도교육청×학교급명': (
+        lambda d: calculate_accurate_market_share(d['order_df'], d['total_df'], ['시도교육청', '학교급명']),
+        ['시도교육청', '학교급명'],
+    ),
+    'market_size_by_group/총판': (
+        lambda d: market_size_by_group(d['order_df'], '총판', d['total_df']).rename_axis('총판'),
+        ['총판'],
+    ),
+    'market_size_by_group/총판등급': (
+        lambda d: market_size_by_group(d['order_df'], '총판등급', d['total_df']).rename_axis('총판등급'),
+        ['총판등급'],
+    ),
+    'school_market_sizes': (
+        lambda d: school_market_sizes(d['total_df']).rename_axis('정보공시 학교코드'),
+        ['정보공시 학교코드'],
+    ),
+    'achievement': (achievement, ['총판명(공식)']),
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def source_hashes(paths):
+    hashes = {}
+    for name, path in paths.items():
+        if os.path.exists(path):
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            hashes[name] = digest.hexdigest()
+    return hashes
+
+
+def prepare_input(kind, work, rows, seed):
+    """
+    입력 CSV 준비
+
+    Returns:
+        (paths, 입력 설명 dict) - 준비할 수 없으면 (None, 사유 문자열)
+    """
+    if kind == 'synthetic':
+        paths = write_sources(os.path.join(work, kind), orders=rows, seed=seed)
+        return paths, {'kind': kind, 'rows': rows, 'seed': seed}
+    if not os.path.exists(DEFAULT_PATHS['order']):
+        return None, f"주문현황 CSV가 없습니다: {DEFAULT_PATHS['order']}"
+    paths = anonymize_sources(DEFAULT_PATHS, os.path.join(work, kind))
+    return paths, {'kind': kind, 'sources': source_hashes(DEFAULT_PATHS)}
+
+
+def golden_tables(paths, only=None):
+    """입력으로 모든 비교 대상 계산 → {이름: (결과, 키)}"""
+    start = time.perf_counter()
+    datasets = build_datasets(paths)
+    print(f'  build_datasets {time.perf_counter() - start:.1f}s')
+    tables = {name: (datasets[name], DERIVED_KEYS.get(name)) for name in DERIVED_DATASETS}
+    for name, (func, keys) in GOLDEN_CASES.items():
+        if only and name not in only:
+            continue
+        start = time.perf_counter()
+        tables[name] = (func(datasets), keys)
+        print(f'  {name} {time.perf_counter() - start:.1f}s')
+    if only:
+        tables = {name: value for name, value in tables.items() if name in only}
+    return tables
+
+
+def record(kind, args, work):
+    paths, spec = prepare_input(kind, work, args.rows, args.seed)
+    if paths is None:
+        print(f'[{kind}] 건너뜀: {spec}')
+        return True
+    print(f'[{kind}] record')
+    tables = golden_tables(paths)
+    directory = os.path.join(args.golden, kind)
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    write_snapshot(directory, tables, meta={
+        'input': spec,
+        'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': git_commit(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    })
+    print(f'  {len(tables)}개 표 저장: {directory}')
+    return True
+
+
+def check(kind, args, work):
+    directory = os.path.join(args.golden, kind)
+    manifest = read_manifest(directory)
+    if manifest is None:
+        print(f'[{kind}] 스냅샷이 없습니다 - 먼저 record를 실행하세요: {directory}')
+        return kind != 'synthetic'
+    spec = manifest['input']
+    paths, current = prepare_input(kind, work, spec.get('rows', args.rows), spec.get('seed', args.seed))
+    if paths is None:
+        print(f'[{kind}] 건너뜀: {current}')
+        return True
+    print(f"[{kind}] check (스냅샷: {manifest['recorded_at']} {manifest.get('commit') or ''})")
+    if kind == 'anonymized' and current['sources'] != spec['sources']:
+        changed = sorted(k for k in current['sources'] if current['sources'][k] != spec['sources'].get(k))
+        print(f'  경고: 스냅샷 이후 원본이 바뀜 {changed} - 차이는 입력 변화일 수 있음')
+
+    only = set(args.only or [])
+    tables = golden_tables(paths, only=only)
+    ok = True
+    for name, entry in manifest['tables'].items():
+        if only and name not in only:
+            continue
+        if name not in tables:
+            print(f'{name}: 현재 결과에 없음')
+            ok = False
+            continue
+        value, _ = tables[name]
+        report = diff_frame(read_table(directory, entry), value, keys=entry['keys'], rtol=args.rtol, atol=args.atol)
+        ok &= report['ok']
+        print('\n'.join(format_report(name, report)))
+    for name in sorted(set(tables) - set(manifest['tables'])):
+        print(f'{name}: 스냅샷에 없음 (record로 다시 저장하면 포함)')
+    return ok
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('mode', choices=['record', 'check'])
+    p.add_argument('--inputs', nargs='+', default=INPUTS, choices=INPUTS)
+    p.add_argument('--golden', default=GOLDEN_DIR, help='스냅샷 디렉터리')
+    p.add_argument('--rows', type=int, default=DEFAULT_ROWS, help='합성 주문 행 수 (record)')
+    p.add_argument('--seed', type=int, default=0, help='합성 데이터 seed (record)')
+    p.add_argument('--only', nargs='*', help='이 표만 비교 (check)')
+    p.add_argument('--rtol', type=float, default=DEFAULT_RTOL, help='숫자 컬럼 상대 허용 오차')
+    p.add_argument('--atol', type=float, default=DEFAULT_ATOL, help='숫자 컬럼 절대 허용 오차')
+    args = p.parse_args()
+
+    work = tempfile.mkdtemp(prefix='golden_')
+    try:
+        ok = True
+        for kind in args.inputs:
+            ok &= (record if args.mode == 'record' else check)(kind, args, work)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    if not ok:
+        print('골든 출력과 다릅니다')
+        sys.exit(1)
+    if args.mode == 'check':
+        print('골든 출력과 같습니다')
+
+
+if __name__ == '__main__':
+    main()
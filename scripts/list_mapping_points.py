@@ -1,29 +1,19 @@
 import os
+import sys
+
 import pandas as pd
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.distributor_code import normalize_codes  # noqa: E402
+
 ORDER_FILE = os.path.join(BASE_DIR, '씨마스_22개정 주문현황_학교코드총판코드.csv')
 DISTRIBUTOR_FILE = os.path.join(BASE_DIR, '총판정보.csv')
 OUT_DIR = os.path.join(BASE_DIR, 'outputs')
 os.makedirs(OUT_DIR, exist_ok=True)
 
 
-def _normalize_code(code_val) -> str:
-    if pd.isna(code_val):
-        return ''
-    s = str(code_val).strip()
-    s = s.replace(',', '').strip()
-    if s.endswith('.0'):
-        s = s[:-2]
-    try:
-        f = float(s)
-        if f.is_integer():
-            return str(int(f))
-        return s
-    except Exception:
-        return s
-
-
 def main():
     print('Loading files:')
     print('-', ORDER_FILE)
@@ -40,9 +30,9 @@ def main():
         return
 
     # Normalize
-    orders['총판코드_norm'] = orders['총판코드'].apply(_normalize_code)
+    orders['총판코드_norm'] = normalize_codes(orders['총판코드'])
     dist_code_col = '숫자코드' if '숫자코드' in dist.columns else '총판코드'
-    dist['숫자코드_norm'] = dist[dist_code_col].apply(_normalize_code)
+    dist['숫자코드_norm'] = normalize_codes(dist[dist_code_col])
 
     # Build sets
     order_codes = set([c for c in orders['총판코드_norm'].unique() if c and str(c).strip() != ''])
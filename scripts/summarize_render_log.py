@@ -0,0 +1,89 @@
+"""
+느린 rerun 로그(outputs/render_profile.jsonl) 집계 → 최적화 대상 목록
+
+utils/page_profiler.py가 남긴 로그(순환된 .1 ~ .N 포함)를 읽어
+1) 페이지별 rerun 수와 시간 분포(p50/p95/최대), 평균 DataFrame 복사 횟수
+2) (페이지, 구간)별 누적 시간 순위 - 누적 시간이 큰 구간부터 손보면 됨
+을 출력합니다.
+
+사용 예:
+    python scripts/summarize_render_log.py
+    python scripts/summarize_render_log.py --log outputs/render_profile.jsonl --top 30
+    python scripts/summarize_render_log.py --page 3_🏢_총판별_분석
+"""
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from utils.page_profiler import RENDER_LOG_FILE, render_log_files  # noqa: E402
+
+
+def read_records(path):
+    records = []
+    for file in render_log_files(path):
+        with open(file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 쓰다 끊긴 마지막 줄 등은 건너뜀
+                    continue
+    return records
+
+
+def distribution(grouped):
+    return grouped.agg(
+        reruns=('seconds', 'size'),
+        total=('seconds', 'sum'),
+        p50=('seconds', 'median'),
+        p95=('seconds', lambda s: s.quantile(0.95)),
+        max=('seconds', 'max'),
+        deep_copies=('copies_deep', 'mean'),
+    ).sort_values('total', ascending=False)
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--log', default=RENDER_LOG_FILE, help='렌더 로그 JSONL 경로 (순환 파일도 함께 읽음)')
+    p.add_argument('--top', type=int, default=20, help='구간 순위 출력 개수')
+    p.add_argument('--page', default=None, help='이 페이지만 집계')
+    args = p.parse_args()
+
+    records = read_records(args.log)
+    if args.page:
+        records = [r for r in records if r.get('page') == args.page]
+    if not records:
+        print(f'기록이 없습니다: {args.log}')
+        return
+
+    pages = pd.DataFrame([{
+        'page': r['page'], 'seconds': r['seconds'], 'copies_deep': r.get('copies_deep', 0),
+    } for r in records])
+    sections = pd.DataFrame([{
+        'page': r['page'],
+        'section': '  ' * s.get('depth', 0) + s['name'],
+        'seconds': s['seconds'],
+        'copies_deep': s.get('copies_deep', 0),
+    } for r in records for s in r.get('sections', [])])
+
+    pd.set_option('display.width', 200)
+    pd.set_option('display.unicode.east_asian_width', True)
+    print(f'느린 rerun {len(records):,}건 ({records[0]["at"]} ~ {records[-1]["at"]})\n')
+    print('[페이지별]')
+    print(distribution(pages.groupby('page')).round(3).to_string())
+    if not sections.empty:
+        print(f'\n[구간별 누적 시간 상위 {args.top}]')
+        print(distribution(sections.groupby(['page', 'section'])).head(args.top).round(3).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+총판별 목표 대비 달성률 계산
+
+목표 대비 달성률(8) 페이지가 본문에서 직접 하던 목표 합산, 총판코드 → 공식명 실적 집계,
+달성률 계산을 모았습니다. scripts/golden_check.py가 같은 함수로 스냅샷을 비교합니다.
+
+- 목표: '목표과목1 부수' + '목표과목2 부수' (없으면 '전체목표 부수'를 반씩), 쉼표 숫자 문자열 허용
+- 실적: 목표과목 필터된 주문을 (총판, 총판코드)로 합산한 뒤 총판코드로 공식명 매핑
+  (매핑 안 되는 코드는 '[미매핑:코드]', 총판코드 컬럼이 없으면 '[코드없음]')
+- 달성률(%) = 실적부수 / 목표 × 100 (목표가 0이면 0)
+"""
+import numpy as np
+import pandas as pd
+
+from utils.distributor_code import normalize_codes
+from utils.shared_data import copy_frame
+
+TARGET_QUANTITY_COLUMNS = ['목표과목1 부수', '목표과목2 부수', '전체목표 부수']
+TARGET_COLUMNS = ['전체목표', '목표1', '목표2']
+NO_CODE = '[코드없음]'
+
+
+def target_totals(target_df):
+    """
+    목표 표에 숫자 목표 컬럼(목표1, 목표2, 전체목표)을 더한 복사본
+
+    Args:
+        target_df: 총판별 목표 데이터 (목표 부수는 '1,200' 같은 문자열 가능)
+
+    Returns:
+        DataFrame (원본 컬럼 + 목표1, 목표2, 전체목표)
+    """
+    summary = copy_frame(target_df)
+    # 쉼표/공백 제거 후 숫자 변환 (숫자가 아니면 0)
+    for col in TARGET_QUANTITY_COLUMNS:
+        if col in summary.columns:
+            text = summary[col].astype(str).str.replace(',', '').str.replace(' ', '')
+            summary[col] = pd.to_numeric(text, errors='coerce').fillna(0)
+
+    # 전체 목표 = 목표1 + 목표2
+    if '목표과목1 부수' in summary.columns and '목표과목2 부수' in summary.columns:
+        summary['목표1'] = summary['목표과목1 부수']
+        summary['목표2'] = summary['목표과목2 부수']
+        summary['전체목표'] = summary['목표1'] + summary['목표2']
+    else:
+        summary['전체목표'] = summary.get('전체목표 부수', 0)
+        summary['목표1'] = summary['전체목표'] * 0.5
+        summary['목표2'] = summary['전체목표'] * 0.5
+    return summary
+
+
+def targets_by_official(target_summary, code_map):
+    """
+    총판 공식명별 목표 합계
+
+    총판코드가 있으면 정규화한 코드로 합산한 뒤 공식명으로 매핑(매핑 안 되는 코드는 제외),
+    없으면 목표 표의 총판명(공식)으로 합산합니다.
+
+    Args:
+        target_summary: target_totals() 결과
+        code_map: {정규화 총판코드: 총판명(공식)}
+
+    Returns:
+        DataFrame: 총판명(공식), 전체목표, 목표1, 목표2
+    """
+    agg = {col: 'sum' for col in TARGET_COLUMNS}
+    if '총판코드' not in target_summary.columns:
+        return target_summary.groupby('총판명(공식)').agg(agg).reset_index()
+
+    codes = normalize_codes(target_summary['총판코드']).rename('총판코드_정규화')
+    by_code = target_summary[TARGET_COLUMNS].groupby(codes).agg(agg).reset_index()
+    by_code['총판명(공식)'] = by_code['총판코드_정규화'].map(code_map)
+    return by_code.loc[by_code['총판명(공식)'].notna(), ['총판명(공식)', *TARGET_COLUMNS]]
+
+
+def official_keys(frame, code_map):
+    """
+    행별 총판 공식명 (총판코드로만 매핑 - 주문의 총판 이름은 쓰지 않음)
+
+    Args:
+        frame: 총판코드 컬럼이 있는 표
+        code_map: {정규화 총판코드: 총판명(공식)}
+
+    Returns:
+        Series (frame과 같은 index): 공식명, '[미매핑:코드]', 코드가 없으면 '[코드없음]'
+    """
+    if '총판코드' not in frame.columns:
+        return pd.Series(NO_CODE, index=frame.index, dtype=object)
+    codes = normalize_codes(frame['총판코드'])
+    keys = codes.map(code_map).astype(object)
+    unmapped = keys.isna()
+    keys[unmapped] = '[미매핑:' + codes[unmapped] + ']'
+    keys[frame['총판코드'].isna().to_numpy()] = NO_CODE
+    return keys
+
+
+def actuals_by_official(order_df, code_map, school_code_col=None):
+    """
+    총판 공식명별 실적 (부수, 거래학교수, 주문금액)
+
+    (총판, 총판코드)별로 먼저 합산한 뒤 공식명으로 다시 합산합니다. 거래학교수는
+    (총판, 총판코드)별 고유 학교 수의 합계입니다 (기존 페이지 계산과 같음).
+
+    Args:
+        order_df: 목표과목 필터된 주문 데이터
+        code_map: {정규화 총판코드: 총판명(공식)}
+        school_code_col: 학교코드 컬럼 (None이면 정보공시학교코드, 없으면 학교코드)
+
+    Returns:
+        DataFrame (index = 총판명(공식)): 실적부수, 거래학교수, 주문금액
+    """
+    if school_code_col is None:
+        school_code_col = '정보공시학교코드' if '정보공시학교코드' in order_df.columns else '학교코드'
+    agg_cols = ['총판', '총판코드'] if '총판코드' in order_df.columns else ['총판']
+    metric_agg = {'부수': 'sum'}
+    if school_code_col in order_df.columns:
+        metric_agg[school_code_col] = 'nunique'
+    if '금액' in order_df.columns:
+        metric_agg['금액'] = 'sum'
+
+    grouped = order_df.groupby(agg_cols).agg(metric_agg).reset_index()
+    keys = official_keys(grouped, code_map)
+    actuals = grouped[list(metric_agg)].groupby(keys.rename('총판명(공식)')).sum()
+    actuals = actuals.rename(columns={'부수': '실적부수', school_code_col: '거래학교수', '금액': '주문금액'})
+    for col in ['거래학교수', '주문금액']:
+        if col not in actuals.columns:
+            actuals[col] = 0
+    return actuals[['실적부수', '거래학교수', '주문금액']]
+
+
+def _rate(actual, target):
+    """실적 / 목표 × 100 (목표 0 → 0)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rate = actual / target * 100
+    return rate.replace([np.inf, -np.inf], 0).fillna(0)
+
+
+def achievement_table(target_map, actuals):
+    """
+    총판별 목표 대비 달성률 표
+
+    Args:
+        target_map: targets_by_official() 결과 (등급 등 추가 컬럼은 그대로 유지)
+        actuals: actuals_by_official() 결과
+
+    Returns:
+        DataFrame: target_map 컬럼 + 실적부수, 거래학교수, 주문금액, 총판,
+        전체달성률(%), 목표1달성률(%), 목표2달성률(%), 차이
+    """
+    table = target_map.copy()
+    names = table['총판명(공식)'].astype(str).str.strip()
+    table['실적부수'] = names.map(actuals['실적부수']).fillna(0).astype(np.int64)
+    table['거래학교수'] = names.map(actuals['거래학교수']).fillna(0).astype(np.int64)
+    table['주문금액'] = names.map(actuals['주문금액']).fillna(0).astype(float)
+    for col in [*TARGET_COLUMNS, '실적부수']:
+        table[col] = table[col].fillna(0)
+    table['총판'] = table['총판명(공식)']
+
+    table['전체달성률(%)'] = _rate(table['실적부수'], table['전체목표'])
+    table['목표1달성률(%)'] = _rate(table['실적부수'], table['목표1'])
+    table['목표2달성률(%)'] = _rate(table['실적부수'], table['목표2'])
+    table['차이'] = table['실적부수'] - table['전체목표']
+
+    # 숫자형 NaN 제거 및 총판명 결측치 처리
+    for col in [*TARGET_COLUMNS, '실적부수', '전체달성률(%)', '차이']:
+        table[col] = pd.to_numeric(table[col], errors='coerce').fillna(0)
+    table['총판'] = table['총판'].fillna('')
+    return table
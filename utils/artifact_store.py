@@ -0,0 +1,343 @@
+"""
+사전 계산 데이터 아티팩트 저장소
+
+load_data()가 만든 데이터프레임을 outputs/artifacts/<키>/ 아래에
+Feather(Arrow IPC, 비압축) 형식으로 저장하고, 원본 CSV가 바뀌지 않았으면
+다음 시작 시 CSV 파싱과 계산 없이 메모리 매핑으로 바로 읽어옵니다.
+
+- 키: 원본 CSV들의 크기 + 내용 해시(sha256) + 파이프라인 모듈 소스 해시(code_fingerprint) + ARTIFACT_VERSION
+  (계산 코드가 바뀌면 버전을 손으로 올리지 않아도 새 키로 다시 계산)
+- 수정시각(mtime)은 내용 해시 재계산을 건너뛰는 용도로만 사용
+  (배포 환경에서 새로 체크아웃하면 mtime이 바뀌어도 같은 키를 유지)
+- pyarrow가 없거나 Feather로 저장할 수 없는 표는 pickle로 저장
+- find_append_base(): 주문현황에 행만 덧붙여졌으면 이전 아티팩트를 찾아 증분 반영에 사용
+- load_artifacts(names=...)로 일부 표만 읽고, 나중에 계산한 표는 add_artifact_frames()로 추가
+  (지연 계산하는 파생 표용)
+"""
+import glob
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow는 streamlit 의존성으로 함께 설치됨
+    feather = None
+
+# 저장 형식(manifest/프레임 파일)이 바뀌면 올려서 기존 아티팩트를 무효화
+# (계산 로직 변경은 PIPELINE_MODULES 소스 해시가 키에 들어가므로 자동 반영)
+ARTIFACT_VERSION = 5
+
+# 저장되는 표의 내용을 결정하는 utils/ 모듈 (glob 패턴)
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+PIPELINE_MODULES = ['data_pipeline.py', 'schema.py', 'csv_ingest.py', 'market_size*.py', 'distributor_*.py']
+
+MANIFEST_NAME = 'manifest.json'
+HASH_CACHE_NAME = 'source_hashes.json'
+KEEP_ARTIFACTS = 2
+
+# add_artifact_frames의 manifest 읽기-수정-쓰기를 세션 스레드 간 직렬화
+_manifest_lock = threading.Lock()
+
+
+def _file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json(path, data):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=_json_default)
+    os.replace(tmp_path, path)
+
+
+def _json_default(value):
+    # numpy 스칼라(np.int64 등)를 JSON으로 저장
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f'JSON으로 변환할 수 없는 값: {type(value)!r}')
+
+
+def code_fingerprint(directory=UTILS_DIR, patterns=PIPELINE_MODULES):
+    """
+    파이프라인 모듈 소스의 sha256 (파일 이름 + 내용, 줄바꿈은 LF로 맞춤)
+
+    Returns:
+        16자리 해시 문자열
+    """
+    files = sorted({path for pattern in patterns for path in glob.glob(os.path.join(directory, pattern))})
+    digest = hashlib.sha256()
+    for path in files:
+        with open(path, 'rb') as f:
+            source = f.read().replace(b'\r\n', b'\n')
+        digest.update(os.path.basename(path).encode('utf-8') + b'\0')
+        digest.update(hashlib.sha256(source).digest())
+    return digest.hexdigest()[:16]
+
+
+def fingerprint_sources(paths, root):
+    """
+    원본 파일들의 지문(크기, 수정시각, 내용 해시) 계산
+
+    Args:
+        paths: {이름: 파일 경로}
+        root: 아티팩트 루트 디렉터리 (해시 캐시 저장 위치)
+
+    Returns:
+        (키 문자열, {이름: 지문 dict})
+    """
+    hash_cache_path = os.path.join(root, HASH_CACHE_NAME)
+    hash_cache = _load_json(hash_cache_path)
+    cache_changed = False
+
+    sources = {}
+    for name, path in sorted(paths.items()):
+        if not path or not os.path.exists(path):
+            sources[name] = {'exists': False}
+            continue
+        stat = os.stat(path)
+        cached = hash_cache.get(os.path.abspath(path), {})
+        if cached.get('size') == stat.st_size and cached.get('mtime_ns') == stat.st_mtime_ns:
+            sha = cached['sha256']
+        else:
+            sha = _file_sha256(path)
+            hash_cache[os.path.abspath(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+            cache_changed = True
+        sources[name] = {'exists': True, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha}
+
+    if cache_changed:
+        try:
+            os.makedirs(root, exist_ok=True)
+            _write_json(hash_cache_path, hash_cache)
+        except OSError:
+            pass
+
+    key_material = {
+        'version': ARTIFACT_VERSION,
+        'code': code_fingerprint(),
+        'sources': {name: {k: v for k, v in info.items() if k != 'mtime_ns'} for name, info in sources.items()},
+    }
+    key = hashlib.sha256(json.dumps(key_material, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return key, sources
+
+
+def load_artifacts(root, key, names=None):
+    """
+    저장된 아티팩트 읽기
+
+    Args:
+        names: 읽을 표 이름 목록 (None이면 전체, 아티팩트에 없는 이름은 건너뜀)
+
+    Returns:
+        ({이름: DataFrame}, meta dict) 또는 아티팩트가 없으면 None
+    """
+    artifact_dir = os.path.join(root, key)
+    manifest = _load_json(os.path.join(artifact_dir, MANIFEST_NAME))
+    if manifest.get('version') != ARTIFACT_VERSION or 'frames' not in manifest:
+        return None
+
+    frames = {}
+    try:
+        for name, info in manifest['frames'].items():
+            if names is not None and name not in names:
+                continue
+            path = os.path.join(artifact_dir, info['file'])
+            if info['format'] == 'feather':
+                if feather is None:
+                    return None
+                table = feather.read_table(path, memory_map=True)
+                frames[name] = table.to_pandas()
+            else:
+                frames[name] = pd.read_pickle(path)
+    except Exception:
+        return None
+    return frames, manifest.get('meta', {})
+
+
+def _write_frame(directory, name, df):
+    """표 하나를 Feather(불가하면 pickle)로 저장하고 manifest 항목 반환"""
+    info = None
+    if feather is not None:
+        path = os.path.join(directory, f'{name}.feather')
+        try:
+            feather.write_feather(df, path, compression='uncompressed')
+            info = {'file': f'{name}.feather', 'format': 'feather'}
+        except Exception:
+            # 혼합 타입 object 컬럼 등은 Arrow로 변환 불가 → pickle
+            if os.path.exists(path):
+                os.remove(path)
+    if info is None:
+        df.to_pickle(os.path.join(directory, f'{name}.pkl'))
+        info = {'file': f'{name}.pkl', 'format': 'pickle'}
+    info['rows'] = int(len(df))
+    return info
+
+
+def save_artifacts(root, key, frames, meta=None, sources=None):
+    """
+    데이터프레임 묶음을 아티팩트로 저장 (오래된 아티팩트는 KEEP_ARTIFACTS개만 유지)
+
+    Args:
+        root: 아티팩트 루트 디렉터리
+        key: fingerprint_sources가 만든 키
+        frames: {이름: DataFrame}
+        meta: JSON으로 저장할 부가 정보 (dict)
+        sources: fingerprint_sources가 만든 원본 지문
+
+    Returns:
+        저장된 디렉터리 경로 (실패 시 None)
+    """
+    artifact_dir = os.path.join(root, key)
+    tmp_dir = f'{artifact_dir}.tmp'
+    try:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        frame_info = {name: _write_frame(tmp_dir, name, df) for name, df in frames.items()}
+
+        _write_json(os.path.join(tmp_dir, MANIFEST_NAME), {
+            'version': ARTIFACT_VERSION,
+            'key': key,
+            'code': code_fingerprint(),
+            'sources': sources or {},
+            'frames': frame_info,
+            'meta': meta or {},
+        })
+
+        shutil.rmtree(artifact_dir, ignore_errors=True)
+        os.replace(tmp_dir, artifact_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+
+    _prune_artifacts(root, keep_key=key)
+    return artifact_dir
+
+
+def add_artifact_frames(root, key, frames=None, meta=None):
+    """
+    이미 저장된 아티팩트에 표/meta 항목 추가 (지연 계산한 파생 표를 다음 시작 때 재사용)
+
+    Args:
+        frames: {이름: DataFrame} (같은 이름이 있으면 덮어씀)
+        meta: manifest meta에 합칠 dict
+
+    Returns:
+        성공 여부 (아티팩트가 없거나 버전이 다르면 False)
+    """
+    artifact_dir = os.path.join(root, key)
+    manifest_path = os.path.join(artifact_dir, MANIFEST_NAME)
+    with _manifest_lock:
+        manifest = _load_json(manifest_path)
+        if manifest.get('version') != ARTIFACT_VERSION or 'frames' not in manifest:
+            return False
+        try:
+            for name, df in (frames or {}).items():
+                manifest['frames'][name] = _write_frame(artifact_dir, name, df)
+            manifest['meta'] = {**manifest.get('meta', {}), **(meta or {})}
+            _write_json(manifest_path, manifest)
+        except OSError:
+            return False
+    return True
+
+
+def file_prefix_sha256(path, size, chunk_size=1 << 20):
+    """파일 앞 size 바이트의 sha256 (파일이 더 짧으면 None)"""
+    digest = hashlib.sha256()
+    remaining = size
+    with open(path, 'rb') as f:
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return None
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def find_append_base(root, sources, paths, name='order'):
+    """
+    name 원본에 행만 덧붙여진 경우, 이전 내용으로 만든 아티팩트 찾기 (증분 반영용)
+
+    조건:
+    - 같은 파이프라인 코드(code_fingerprint)로 만든 아티팩트
+    - 다른 원본은 모두 같은 내용(크기 + sha256)
+    - 이전 파일 크기만큼의 앞부분 해시가 이전 sha256과 같고, 그 끝이 줄바꿈
+
+    Args:
+        root: 아티팩트 루트 디렉터리
+        sources: fingerprint_sources가 만든 현재 원본 지문
+        paths: {이름: 파일 경로}
+        name: 행이 덧붙여졌는지 확인할 원본 이름
+
+    Returns:
+        (이전 키, 이전 name 원본 크기) 또는 없으면 None
+    """
+    current = sources.get(name, {})
+    if not current.get('exists') or not os.path.isdir(root):
+        return None
+    others = {k: _content_id(v) for k, v in sources.items() if k != name}
+    code = code_fingerprint()
+
+    candidates = []
+    for key in os.listdir(root):
+        manifest_path = os.path.join(root, key, MANIFEST_NAME)
+        if key.endswith('.tmp') or not os.path.exists(manifest_path):
+            continue
+        candidates.append((os.path.getmtime(manifest_path), key, manifest_path))
+
+    for _, key, manifest_path in sorted(candidates, reverse=True):
+        manifest = _load_json(manifest_path)
+        old_sources = manifest.get('sources', {})
+        previous = old_sources.get(name, {})
+        if manifest.get('version') != ARTIFACT_VERSION or manifest.get('code') != code or not previous.get('exists'):
+            continue
+        if {k: _content_id(v) for k, v in old_sources.items() if k != name} != others:
+            continue
+        old_size = previous.get('size', 0)
+        if not 0 < old_size < current['size']:
+            continue
+        path = paths[name]
+        with open(path, 'rb') as f:
+            f.seek(old_size - 1)
+            ends_with_newline = f.read(1) == b'\n'
+        if ends_with_newline and file_prefix_sha256(path, old_size) == previous.get('sha256'):
+            return key, old_size
+    return None
+
+
+def _content_id(info):
+    return (info.get('exists'), info.get('size'), info.get('sha256'))
+
+
+def clear_artifacts(root):
+    """저장된 아티팩트 전체 삭제 (관리자 캐시 초기화용)"""
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def _prune_artifacts(root, keep_key):
+    entries = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name == keep_key or not os.path.isdir(path) or name.endswith('.tmp'):
+            continue
+        if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+            entries.append((os.path.getmtime(path), path))
+    for _, path in sorted(entries, reverse=True)[KEEP_ARTIFACTS - 1:]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -1,50 +1,227 @@
 """
 Common filter components for all analysis pages
+
+사이드바 공통 필터(학년도/교과군/과목/지역/총판)의 결과 행 위치와 선택지 목록을
+(데이터셋 버전, 행 구성, 선택값) 키로 프로세스 전체에서 메모해 둡니다.
+같은 조합을 다시 고르면 마스크 계산과 unique()/정렬 없이 캐시에서 바로 가져옵니다.
+
+- 데이터셋 버전: SharedDataset이 프레임 attrs['dataset_version']에 기록 (뷰/행 필터 결과에도 전달됨)
+- 행 구성: 전체 행이면 'all', 페이지에서 먼저 거른 프레임이면 index 해시
+  (reset_index로 번호를 새로 매긴 부분 집합은 캐시하지 않음)
+- 캐시는 LRU, 항목 수(FILTER_CACHE_ENTRIES)와 메모리(FILTER_CACHE_BYTES) 상한
+- 버전이 없는 프레임(직접 만든 DataFrame 등)은 캐시 없이 바로 계산
+- 전체 프레임은 역인덱스(utils/order_index.py)의 행 위치 교집합으로, 거른 프레임은 mask로 계산
+- 필터 컬럼(학년도, 총판 등) 값을 바꾼 프레임을 넘길 때는 attrs의 버전을 지울 것
+- 결과 프레임 attrs에 거른 조건을 기록 (utils/order_cube.py의 rollup_orders가 큐브로 집계)
 """
-import streamlit as st
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
 import pandas as pd
+import streamlit as st
+
+from utils.order_index import index_for
+from utils.shared_data import DATASET_ROWS_ATTR, DATASET_VERSION_ATTR, filter_conditions, tag_filter, view
+
+FILTER_CACHE_ENTRIES = 512
+FILTER_CACHE_BYTES = 64 << 20
+
+YEAR_ALL = '전체(2025+2026)'
+
+
+class FilterCache:
+    """키 → 값 LRU 캐시 (항목 수와 대략적인 메모리 상한, 세션 스레드 간 공유)"""
+
+    def __init__(self, max_entries=FILTER_CACHE_ENTRIES, max_bytes=FILTER_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        key가 있으면 캐시 값, 없으면 compute() 결과를 저장 후 반환 (key가 None이면 저장 안 함)
+        """
+        if key is None:
+            return compute()
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+        value = compute()
+        size = _nbytes(value)
+        with self._lock:
+            if key not in self._items and size <= self.max_bytes:
+                self._items[key] = (value, size)
+                self._bytes += size
+                while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                    _, (_, evicted) = self._items.popitem(last=False)
+                    self._bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """{'entries', 'bytes', 'hits', 'misses'}"""
+        with self._lock:
+            return {'entries': len(self._items), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+_cache = FilterCache()
+
+
+def filter_cache():
+    """프로세스 공유 필터 캐시 (관리자 도구/진단용)"""
+    return _cache
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, list):
+        return 64 * (len(value) + 1)
+    return 64
+
+
+def dataset_token(df):
+    """
+    필터 캐시 키의 앞부분 (데이터셋 버전, 행 구성)
+
+    Returns:
+        튜플 또는 버전이 없으면 None (캐시 사용 안 함)
+    """
+    version = df.attrs.get(DATASET_VERSION_ATTR)
+    if version is None:
+        return None
+    index = df.index
+    if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+        # reset_index로 번호를 새로 매긴 부분 집합은 행 구성을 알 수 없으므로 캐시하지 않음
+        if len(index) != df.attrs.get(DATASET_ROWS_ATTR):
+            return None
+        rows = 'all'
+    else:
+        hashed = pd.util.hash_pandas_object(index, index=False).to_numpy()
+        rows = hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest()
+    return (version, rows)
+
+
+def _key(token, *parts):
+    return None if token is None else (token, *parts)
+
+
+def _column_values(df, col, positions):
+    values = df[col]
+    return values if positions is None else values.iloc[positions]
+
+
+def _sorted_options(df, col, positions, reverse=False):
+    index = index_for(df, [col])
+    if positions is None and index is not None and index.has(col):
+        return sorted(index.values(col), reverse=reverse)
+    return sorted(_column_values(df, col, positions).dropna().unique().tolist(), reverse=reverse)
+
+
+def _narrow(df, col, value, positions):
+    """positions(None = 전체 행) 중 col == value 인 행 위치"""
+    index = index_for(df, [col])
+    if index is not None and index.has(col):
+        # 역인덱스: 값의 행 위치와 앞 단계 위치의 교집합 (둘 다 오름차순)
+        matched = index.positions(col, value)
+        narrowed = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+    else:
+        mask = (df[col] == value).to_numpy(dtype=bool, na_value=False)
+        narrowed = np.flatnonzero(mask) if positions is None else positions[mask[positions]]
+    narrowed.flags.writeable = False  # 세션 간 공유되는 캐시 값
+    return narrowed
+
+
+class _FilterState:
+    """apply_common_filters 한 번의 단계별 선택 (선택이 쌓일수록 키가 길어짐)"""
+
+    def __init__(self, df):
+        self.df = df
+        self.token = dataset_token(df)
+        self.positions = None
+        self.steps = ()
+
+    def options(self, col, full=False, reverse=False):
+        """선택지 목록 (full=True면 앞 단계 필터와 무관하게 전체 행 기준)"""
+        steps = () if full else self.steps
+        positions = None if full else self.positions
+        return _cache.get_or_compute(
+            _key(self.token, 'options', col, reverse, steps),
+            lambda: _sorted_options(self.df, col, positions, reverse=reverse),
+        )
+
+    def narrow(self, col, value):
+        positions = self.positions
+        self.steps = self.steps + ((col, value),)
+        self.positions = _cache.get_or_compute(
+            _key(self.token, 'rows', self.steps),
+            lambda: _narrow(self.df, col, value, positions),
+        )
+
+    def result(self):
+        if self.positions is None:
+            return view(self.df)
+        result = self.df.iloc[self.positions]
+        base = filter_conditions(self.df, [col for col, _ in self.steps])
+        if base is not None:
+            # 공유 프레임을 등호 조건으로만 거른 결과 - 차트가 집계 큐브(order_cube)를 쓸 수 있도록 기록
+            tag_filter(result, base + self.steps)
+        return result
 
 
 def apply_common_filters(order_df, show_filters=None):
     """
     Apply common filters to order data
-    
+
     Args:
         order_df: Order dataframe
         show_filters: List of filters to show. Options: ['학년도', '교과군', '과목', '지역', '총판']
                      If None, shows all filters
-    
+
     Returns:
         Filtered dataframe
     """
     if show_filters is None:
         show_filters = ['학년도', '교과군', '과목', '지역', '총판']
-    
+
     st.sidebar.markdown("---")
     st.sidebar.header("🔍 공통 필터")
-    
-    filtered_df = order_df.copy()
-    
+
+    state = _FilterState(order_df)
+
     # 0. 학년도 필터 (2026년도 기본값, 전체 옵션 추가)
     if '학년도' in show_filters and '학년도' in order_df.columns:
-        years = sorted(order_df['학년도'].dropna().unique().tolist(), reverse=True)
+        years = state.options('학년도', full=True, reverse=True)
         # "전체" 옵션 추가 (2025+2026 합쳐서 보기)
-        year_options = ['전체(2025+2026)'] + years
+        year_options = [YEAR_ALL] + years
         # 2026년도가 있으면 기본값으로, 없으면 최신 학년도
         default_year = 2026 if 2026 in years else (years[0] if years else None)
         default_index = year_options.index(default_year) if default_year in year_options else 0
-        
+
         selected_year = st.sidebar.selectbox(
-            "📅 학년도 선택", 
-            year_options, 
+            "📅 학년도 선택",
+            year_options,
             index=default_index,
             key='common_filter_year'
         )
-        
+
         # 전체 선택 시 필터링 안함
-        if selected_year != '전체(2025+2026)':
-            filtered_df = filtered_df[filtered_df['학년도'] == selected_year]
-        
+        if selected_year != YEAR_ALL:
+            state.narrow('학년도', selected_year)
+
         # 학년도별 비교 옵션
         if len(years) > 1:
             show_comparison = st.sidebar.checkbox("📊 학년도별 비교 보기", key='common_filter_year_comparison')
@@ -53,46 +230,46 @@ def apply_common_filters(order_df, show_filters=None):
                 st.session_state['selected_year'] = selected_year
             elif not show_comparison and 'year_comparison_enabled' in st.session_state:
                 del st.session_state['year_comparison_enabled']
-    
+
     # 1. 교과군 필터
     if '교과군' in show_filters:
         subject_col = '교과군_제품' if '교과군_제품' in order_df.columns else '교과군'
         if subject_col in order_df.columns:
-            subject_groups = ['전체'] + sorted(order_df[subject_col].dropna().unique().tolist())
+            subject_groups = ['전체'] + state.options(subject_col, full=True)
             selected_group = st.sidebar.selectbox("📚 교과군 선택", subject_groups, key='common_filter_subject_group')
-            
+
             if selected_group != '전체':
-                filtered_df = filtered_df[filtered_df[subject_col] == selected_group]
-    
+                state.narrow(subject_col, selected_group)
+
     # 2. 과목 필터
     if '과목' in show_filters:
-        subject_col = '교과서명_구분' if '교과서명_구분' in filtered_df.columns else '교과서명'
-        if subject_col in filtered_df.columns:
-            subjects = ['전체'] + sorted(filtered_df[subject_col].dropna().unique().tolist())
+        subject_col = '교과서명_구분' if '교과서명_구분' in order_df.columns else '교과서명'
+        if subject_col in order_df.columns:
+            subjects = ['전체'] + state.options(subject_col)
             selected_subject = st.sidebar.selectbox("📖 과목 선택", subjects, key='common_filter_subject')
-            
+
             if selected_subject != '전체':
-                filtered_df = filtered_df[filtered_df[subject_col] == selected_subject]
-    
+                state.narrow(subject_col, selected_subject)
+
     # 3. 지역 필터
     if '지역' in show_filters:
-        if '시도교육청' in filtered_df.columns:
-            regions = ['전체'] + sorted(filtered_df['시도교육청'].dropna().unique().tolist())
+        if '시도교육청' in order_df.columns:
+            regions = ['전체'] + state.options('시도교육청')
             selected_region = st.sidebar.selectbox("🗺️ 지역 선택", regions, key='common_filter_region')
-            
+
             if selected_region != '전체':
-                filtered_df = filtered_df[filtered_df['시도교육청'] == selected_region]
-    
+                state.narrow('시도교육청', selected_region)
+
     # 4. 총판 필터
     if '총판' in show_filters:
-        if '총판' in filtered_df.columns:
-            distributors = ['전체'] + sorted(filtered_df['총판'].dropna().unique().tolist())
+        if '총판' in order_df.columns:
+            distributors = ['전체'] + state.options('총판')
             selected_dist = st.sidebar.selectbox("🏢 총판 선택", distributors, key='common_filter_distributor')
-            
+
             if selected_dist != '전체':
-                filtered_df = filtered_df[filtered_df['총판'] == selected_dist]
-    
-    return filtered_df
+                state.narrow('총판', selected_dist)
+
+    return state.result()
 
 
 def show_filter_summary(filtered_df, original_df):
@@ -0,0 +1,127 @@
+"""
+과목 간 동시 구매(연계 판매) 분석
+
+학교가 한 번이라도 주문한 (학교, 과목) 고유 쌍을 학교순으로 정렬한 희소 구매 표(CSR 형태의
+numpy 배열)로 만들고, 과목마다 그 과목을 산 학교들의 과목을 bincount 해
+과목×과목 동시 구매 학교 수(대각선 = 과목별 구매 학교 수)를 구합니다.
+(기존 페이지는 학교마다 과목 쌍을 돌며 DataFrame.loc[s1, s2] += 1 로 채웠음)
+
+- 학교×과목 행렬을 만들지 않으므로 메모리는 고유 (학교, 과목) 쌍 수에 비례 (scipy 불필요)
+- co_occurrence()로 한 번 계산한 결과에서 히트맵 표(co_occurrence_matrix)와
+  상위 쌍(top_pairs: 지지도 support, 신뢰도 confidence, 향상도 lift)을 함께 만듦
+- 개수는 모두 int64
+"""
+import numpy as np
+import pandas as pd
+
+
+class CoOccurrence:
+    """과목 쌍별 동시 구매 학교 수 (co_occurrence() 결과)"""
+
+    def __init__(self, items, counts, n_baskets):
+        """
+        Args:
+            items: 정렬된 항목 이름 배열
+            counts: (항목 수 × 항목 수) int64 대칭 행렬 - 동시 구매 바구니 수, 대각선은 항목별 구매 바구니 수
+            n_baskets: 바구니(학교) 수
+        """
+        self.items = items
+        self.counts = counts
+        self.n_baskets = n_baskets
+
+    @property
+    def item_counts(self):
+        """항목별 구매 바구니 수 (items 순서)"""
+        return np.diag(self.counts)
+
+
+def co_occurrence(df, basket_col, item_col):
+    """
+    바구니(학교)별 항목(과목) 동시 구매 수 계산
+
+    Args:
+        df: 주문 데이터
+        basket_col: 바구니 컬럼 (예: 정보공시학교코드)
+        item_col: 항목 컬럼 (예: 과목명)
+
+    Returns:
+        CoOccurrence
+    """
+    rows = df[[basket_col, item_col]].dropna()
+    basket_ids, baskets = pd.factorize(rows[basket_col])
+    item_ids, items = pd.factorize(rows[item_col], sort=True)
+    n_items = len(items)
+
+    # 같은 학교의 같은 과목 주문이 여러 행이어도 한 번 (바구니 → 항목 순으로 정렬된 고유 쌍)
+    bought = np.unique(basket_ids.astype(np.int64) * n_items + item_ids)
+    basket = bought // n_items
+    item = bought % n_items
+    basket_ptr = np.concatenate([[0], np.cumsum(np.bincount(basket, minlength=len(baskets)))])
+    by_item = np.argsort(item, kind='stable')
+    item_ptr = np.concatenate([[0], np.cumsum(np.bincount(item, minlength=n_items))])
+
+    counts = np.zeros((n_items, n_items), dtype=np.int64)
+    for a in range(n_items):
+        # 항목 a를 산 바구니들의 구매 항목을 모아 항목별로 셈
+        holders = basket[by_item[item_ptr[a]:item_ptr[a + 1]]]
+        starts = basket_ptr[holders]
+        lengths = basket_ptr[holders + 1] - starts
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        counts[a] = np.bincount(item[positions], minlength=n_items)
+    return CoOccurrence(np.asarray(items, dtype=object), counts, len(baskets))
+
+
+def co_occurrence_matrix(result, zero_diagonal=True):
+    """
+    히트맵용 과목×과목 동시 구매 표
+
+    Args:
+        result: co_occurrence() 결과
+        zero_diagonal: 자기 자신과의 값(대각선)을 0으로 (아니면 과목별 구매 학교 수)
+
+    Returns:
+        DataFrame (index/columns = 정렬된 과목명, int64)
+    """
+    dense = result.counts.copy()
+    if zero_diagonal:
+        np.fill_diagonal(dense, 0)
+    return pd.DataFrame(dense, index=result.items, columns=result.items)
+
+
+def top_pairs(result, n=5, sort_by='동시구매수'):
+    """
+    동시 구매가 많은 과목 쌍 상위 n개와 연관 규칙 지표
+
+    Args:
+        result: co_occurrence() 결과
+        n: 반환할 쌍 수 (None이면 전체)
+        sort_by: 정렬 기준 ('동시구매수', 'lift', 'support' 등 반환 컬럼)
+
+    Returns:
+        DataFrame: 과목A, 과목B(A < B), 동시구매수, support, confidence(A→B),
+        confidence(B→A), lift
+    """
+    columns = ['과목A', '과목B', '동시구매수', 'support', 'confidence(A→B)', 'confidence(B→A)', 'lift']
+    n_baskets = result.n_baskets
+    if n_baskets == 0 or len(result.items) < 2:
+        return pd.DataFrame(columns=columns)
+
+    # 상삼각에서 0이 아닌 쌍만 (과목A, 과목B 순이라 동률일 때 순서가 항상 같음)
+    a, b = np.triu_indices(len(result.items), k=1)
+    together = result.counts[a, b]
+    keep = together > 0
+    a, b, together = a[keep], b[keep], together[keep]
+    item_counts = result.item_counts
+    count_a = item_counts[a].astype(float)
+    count_b = item_counts[b].astype(float)
+    pairs = pd.DataFrame({
+        '과목A': result.items[a],
+        '과목B': result.items[b],
+        '동시구매수': together,
+        'support': together / n_baskets,
+        'confidence(A→B)': together / count_a,
+        'confidence(B→A)': together / count_b,
+        'lift': together * n_baskets / (count_a * count_b),
+    }, columns=columns)
+    pairs = pairs.sort_values(sort_by, ascending=False, kind='stable')
+    return pairs.head(n).reset_index(drop=True) if n is not None else pairs.reset_index(drop=True)
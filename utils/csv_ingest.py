@@ -0,0 +1,223 @@
+"""
+원본 CSV 읽기 (인코딩 판별 + 필요한 컬럼만 + 멀티스레드 파서)
+
+기존에는 cp949로 읽다가 UnicodeDecodeError가 나면 utf-8로 파일 전체를 다시 읽었습니다.
+여기서는 파일 앞부분 바이트로 인코딩을 먼저 정한 뒤 한 번만 읽습니다.
+
+- BOM(UTF-8/UTF-16)이 있으면 그 인코딩, 없으면 앞부분이 UTF-8로 풀리는지 확인 후 cp949
+- pyarrow가 설치되어 있으면 멀티스레드 파서(engine='pyarrow'), 없으면 C 파서
+- usecols로 필요한 컬럼만 읽음 (공백이 붙은 헤더도 strip 후 비교, 없는 컬럼은 무시)
+- 헤더에 같은 이름이 중복된 파일(총판정보.csv 등)은 'A.1'처럼 이름을 구분해 주는 C 파서로 읽음
+- read_csv_tail(): 파일 끝에 덧붙여진 행만 읽기 (주문현황 증분 반영)
+- append_csv_rows(): 일별 추가분 CSV의 행을 누적 CSV 끝에 덧붙이기
+"""
+import codecs
+import csv
+import io
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 인코딩 판별에 사용할 앞부분 크기 (바이트)
+SNIFF_BYTES = 1 << 16
+
+# UTF-8이 아니면 사용할 기본 인코딩 (엑셀 한글 CSV)
+FALLBACK_ENCODING = 'cp949'
+
+_BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+def sniff_encoding(path, sample_size=SNIFF_BYTES):
+    """
+    파일 앞부분 바이트로 인코딩 판별
+
+    Args:
+        path: CSV 파일 경로
+        sample_size: 읽어볼 바이트 수
+
+    Returns:
+        'utf-8-sig' / 'utf-16' / 'utf-8' / 'cp949' 중 하나
+    """
+    with open(path, 'rb') as f:
+        head = f.read(sample_size)
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    try:
+        # final=False: 샘플 끝에서 잘린 multibyte 문자는 오류로 보지 않음
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+
+def read_header(path, encoding=None):
+    """
+    헤더 행의 컬럼 이름 (파일에 적힌 그대로, 중복 포함)
+
+    Returns:
+        컬럼 이름 리스트 (빈 파일이면 [])
+    """
+    encoding = encoding or sniff_encoding(path)
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def _resolve_usecols(header, usecols):
+    """strip 기준으로 usecols를 실제 헤더 이름에 맞춤 (없는 컬럼은 제외)"""
+    wanted = {str(c).strip() for c in usecols}
+    return [name for name in header if name.strip() in wanted]
+
+
+def _resolve_dtype(header, dtype):
+    """dtype 키를 실제 헤더 이름에 맞춤 (없는 컬럼은 제외)"""
+    by_stripped = {name.strip(): name for name in header}
+    return {by_stripped[key.strip()]: value for key, value in dtype.items() if key.strip() in by_stripped}
+
+
+def read_csv_fast(path, usecols=None, dtype=None, encoding=None):
+    """
+    CSV를 인코딩 판별 후 한 번에 읽기
+
+    Args:
+        path: CSV 파일 경로
+        usecols: 읽을 컬럼 목록 (None이면 전체, 없는 컬럼은 무시)
+        dtype: {컬럼: 타입} (없는 컬럼은 무시)
+        encoding: 지정하면 판별을 건너뜀
+
+    Returns:
+        DataFrame (컬럼 이름은 strip 하지 않은 원래 이름)
+    """
+    encoding = encoding or sniff_encoding(path)
+    header = read_header(path, encoding)
+    return _read(path, header, encoding, usecols, dtype)
+
+
+def read_csv_tail(path, offset, usecols=None, dtype=None, encoding=None):
+    """
+    CSV의 offset 바이트 이후에 추가된 행만 읽기 (헤더는 파일 첫 행을 사용)
+
+    주문현황 CSV에 행이 덧붙여진 경우 이전 크기(offset)부터만 파싱하는 증분 반영용입니다.
+    offset은 이전 파일의 끝(줄바꿈 직후)이어야 합니다.
+
+    Args:
+        path: CSV 파일 경로
+        offset: 읽기 시작할 바이트 위치
+        usecols / dtype / encoding: read_csv_fast와 동일
+
+    Returns:
+        DataFrame (추가된 행이 없으면 컬럼만 있는 빈 표)
+    """
+    encoding = encoding or sniff_encoding(path)
+    header = read_header(path, encoding)
+    with open(path, 'rb') as f:
+        header_line = f.readline()
+        f.seek(offset)
+        tail = f.read()
+    return _read(header_line + tail, header, encoding, usecols, dtype)
+
+
+def _read(source, header, encoding, usecols, dtype):
+    """파일 경로 또는 bytes(헤더 + 행)를 pyarrow → C 파서 순으로 읽기"""
+    columns = _resolve_usecols(header, usecols) if usecols is not None else None
+    kwargs = {'encoding': encoding, 'usecols': columns, 'dtype': _resolve_dtype(header, dtype or {})}
+
+    duplicated = len(set(header)) != len(header)
+    if HAS_PYARROW and not duplicated:
+        try:
+            df = pd.read_csv(_open(source), engine='pyarrow', **kwargs)
+            return _restore_text_columns(df, source, kwargs)
+        except (ValueError, UnicodeDecodeError, ImportError):
+            pass
+    try:
+        return pd.read_csv(_open(source), low_memory=False, **kwargs)
+    except UnicodeDecodeError:
+        if encoding == FALLBACK_ENCODING:
+            raise
+        # 샘플 뒤쪽에 UTF-8이 아닌 바이트가 있던 경우
+        kwargs['encoding'] = FALLBACK_ENCODING
+        return pd.read_csv(_open(source), low_memory=False, **kwargs)
+
+
+def _open(source):
+    """bytes는 읽을 때마다 새 버퍼로 (재시도/텍스트 복원 시 처음부터 다시 읽음)"""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _is_temporal(values):
+    """datetime64 컬럼 또는 datetime.date/time 객체 컬럼(pyarrow date32/time 변환 결과)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return True
+    if values.dtype != object:
+        return False
+    return pd.api.types.infer_dtype(values, skipna=True) in ('date', 'datetime', 'time')
+
+
+def _restore_text_columns(df, source, kwargs):
+    """
+    pyarrow가 날짜/시간으로 해석한 컬럼을 C 파서와 같은 문자열로 되돌림
+
+    C 파서는 parse_dates 없이 날짜를 문자열로 두므로 페이지 코드가 기대하는 타입을 맞춥니다.
+    """
+    parsed = [c for c in df.columns if c not in kwargs['dtype'] and _is_temporal(df[c])]
+    if not parsed:
+        return df
+    text = pd.read_csv(_open(source), low_memory=False, encoding=kwargs['encoding'], usecols=parsed)
+    for col in parsed:
+        df[col] = text[col]
+    return df
+
+
+def append_csv_rows(path, delta_path):
+    """
+    다른 CSV(일별 추가분 등)의 데이터 행을 path 끝에 덧붙이기
+
+    헤더가 같아야 하며(strip 기준), 추가 행은 path의 인코딩으로 다시 저장합니다.
+    덧붙인 뒤에는 load_or_build_datasets가 추가된 바이트만 읽어 증분 반영합니다.
+
+    Args:
+        path: 누적 CSV 경로 (예: 주문현황)
+        delta_path: 추가할 행이 있는 CSV 경로
+
+    Returns:
+        추가한 행 수
+
+    Raises:
+        ValueError: 헤더가 다르거나 UTF-16 파일인 경우
+    """
+    encoding = sniff_encoding(path)
+    delta_encoding = sniff_encoding(delta_path)
+    if 'utf-16' in (encoding, delta_encoding):
+        raise ValueError('UTF-16 CSV에는 행을 덧붙일 수 없습니다.')
+    header = [name.strip() for name in read_header(path, encoding)]
+    delta_header = [name.strip() for name in read_header(delta_path, delta_encoding)]
+    if header != delta_header:
+        raise ValueError(f'헤더가 다릅니다: {delta_path}')
+
+    with open(delta_path, 'r', encoding=delta_encoding, newline='') as f:
+        f.readline()  # 헤더
+        body = f.read()
+    rows = sum(1 for row in csv.reader(io.StringIO(body)) if row)
+    if not rows:
+        return 0
+    if not body.endswith('\n'):
+        body += '\n'
+
+    with open(path, 'rb+') as f:
+        f.seek(0, io.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, io.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+        # utf-8-sig의 BOM은 파일 맨 앞에만 있으므로 추가 행은 BOM 없이 저장
+        f.write(body.encode('utf-8' if encoding == 'utf-8-sig' else encoding))
+    return rows
@@ -0,0 +1,830 @@
+"""
+데이터 로드 및 파생 테이블 계산 파이프라인
+
+app.py의 load_data()와 오프라인 빌드 스크립트(scripts/build_artifacts.py)가
+같은 로직을 사용하도록 Streamlit에 의존하지 않는 형태로 분리했습니다.
+
+- build_datasets(): 원본 CSV를 읽고 총판 매핑, 제품 병합, 시장 규모 계산까지 수행
+- load_or_build_datasets(): outputs/artifacts에 같은 원본으로 만든 결과가 있으면 읽고,
+  주문현황에 행만 덧붙여졌으면 update_datasets()로 추가분만 반영,
+  둘 다 아니면 build_datasets() 실행 후 저장
+- 파생 표(시장 규모, 목표과목 주문 등)는 DERIVED_DATASETS에 의존 데이터셋과 함께 선언,
+  load_or_build_datasets(lazy=True)는 기본 데이터프레임만 준비하고 파생 표는
+  lazy_loaders()로 처음 접근할 때 아티팩트에서 읽거나 계산 (첫 화면을 빨리 그리기 위해)
+- 각 단계의 소요 시간/CPU/행 수/메모리는 StageTimer(utils/profiling.py)로 기록
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from utils.artifact_store import (
+    add_artifact_frames, find_append_base, fingerprint_sources, load_artifacts, save_artifacts,
+)
+from utils.csv_ingest import read_csv_fast, read_csv_tail, sniff_encoding
+from utils.distributor_code import normalize_codes
+from utils.distributor_directory import DistributorDirectory
+from utils.market_size import calculate_market_size_by_subject
+from utils.market_size_v2 import calculate_market_size_by_subject_v2
+from utils.market_size_group import MARKET_COLUMN, mid_high_12_students
+from utils.market_size_distributor import calculate_distributor_market_size, calculate_subject_market_by_distributor
+from utils.profiling import StageTimer
+from utils.schema import ORDER_CATEGORY_COLUMNS, TOTAL_CATEGORY_COLUMNS, apply_schema, concat_with_schema, memory_report
+
+# ---------------------------------------------------------
+# File Paths
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOTAL_FILE = os.path.join(BASE_DIR, "2025년도_학년별·학급별 학생수(초중고)_전체.csv")
+ORDER_FILE = os.path.join(BASE_DIR, "씨마스_22개정 주문현황_학교코드총판코드.csv")
+TARGET_FILE = os.path.join(BASE_DIR, "22개정 총판별 목표.csv")
+PRODUCT_FILE = os.path.join(BASE_DIR, "제품정보.csv")
+DISTRIBUTOR_FILE = os.path.join(BASE_DIR, "총판정보.csv")
+OUTPUTS_MAP_FILE = os.path.join(BASE_DIR, 'outputs', 'distributor_code_mapping.csv')
+ARTIFACT_DIR = os.path.join(BASE_DIR, 'outputs', 'artifacts')
+MAPPING_SCRIPT = os.path.join(BASE_DIR, 'scripts', 'generate_distributor_mapping.py')
+
+DEFAULT_PATHS = {
+    'total': TOTAL_FILE,
+    'order': ORDER_FILE,
+    'target': TARGET_FILE,
+    'product': PRODUCT_FILE,
+    'distributor': DISTRIBUTOR_FILE,
+    'distributor_map': OUTPUTS_MAP_FILE,
+}
+
+# 학년별 학생수 CSV에서 읽는 컬럼 (학년별 학급수, 학급당 학생수, 교사수 등은 사용하지 않음)
+TOTAL_USECOLS = [
+    '시도교육청', '교육지원청', '지역', '정보공시 학교코드', '학교명', '학교급코드',
+    '설립구분', '제외여부', '제외사유',
+    '1학년 학생수', '2학년 학생수', '3학년 학생수', '4학년 학생수', '5학년 학생수', '6학년 학생수',
+    '학생수(계)', '담당총판코드', '담당총판', '본사담당자(2025.09)',
+]
+
+# 주문현황 코드 컬럼은 str로 고정
+ORDER_DTYPE: dict[str, Any] = {
+    '총판코드': str,
+    '정보공시학교코드': str,
+    '정보공시 학교코드': str,
+    '학교코드': str,
+}
+
+# 원본을 읽어 가공한 기본 데이터프레임 (파생 표는 DERIVED_DATASETS)
+BASE_FRAMES = ['total_df', 'order_df', 'target_df', 'product_df', 'distributor_df']
+# 아티팩트로 저장하는 데이터프레임
+ARTIFACT_FRAMES = BASE_FRAMES + [
+    'market_analysis', 'distributor_market', 'subject_market_by_dist',
+    'order_df_target_filtered',
+]
+# 아티팩트 manifest의 meta로 저장하는 dict 값
+ARTIFACT_META = ['market_size_by_level', 'code_to_official', 'memory']
+
+
+def label_distributors(official, codes):
+    """
+    주문 행별 총판 표시명 (공식명, 없으면 [미매핑:코드] / [코드없음])
+
+    (공식명, 코드) 조합마다 한 번만 판정하고 행에는 조합 번호로 펼칩니다.
+
+    Args:
+        official: 정규화 코드로 매핑한 공식 총판명 Series (미매핑은 NaN)
+        codes: 정규화된 총판코드 Series ('' = 코드 없음)
+
+    Returns:
+        총판 표시명 Series
+    """
+    name_codes, names = pd.factorize(official)
+    code_codes, code_uniques = pd.factorize(codes)
+    width = len(code_uniques) + 1
+    pair_codes, pairs = pd.factorize((name_codes.astype(np.int64) + 1) * width + (code_codes + 1))
+
+    # 조합 번호 → (공식명, 코드); -1(결측)은 마지막에 붙인 NaN
+    pair_name = pd.Series(np.append(np.asarray(names, dtype=object), np.nan)[pairs // width - 1])
+    pair_code = pd.Series(np.append(np.asarray(code_uniques, dtype=object), np.nan)[pairs % width - 1])
+    no_code = (pair_code == '').to_numpy()
+    unmapped = (pair_name.isna() | (pair_name == '')).to_numpy()
+    labels = np.select(
+        [no_code, unmapped],
+        ['[코드없음]', ('[미매핑:' + pair_code.map(str) + ']').to_numpy(dtype=object)],
+        default=pair_name.to_numpy(dtype=object),
+    )
+    return pd.Series(labels[pair_codes], index=official.index)
+
+
+def _level_prefix(level_val):
+    """학교급 값 하나를 '[중등] ' / '[고등] ' / '' 로 분류"""
+    school_level = str(level_val).strip()
+
+    # 숫자 코드로 표기된 경우 처리 (예: 3=중학교, 4=고등학교)
+    try:
+        lvl_num = int(school_level)
+    except Exception:
+        lvl_num = None
+
+    if lvl_num == 3:
+        return '[중등] '
+    if lvl_num == 4:
+        return '[고등] '
+
+    # 문자열 표기인 경우 더 넓게 탐지
+    low = school_level.lower()
+    if '중' in low and '고' not in low:
+        return '[중등] '
+    if '고' in low:
+        return '[고등] '
+    return ''
+
+
+def label_subjects(order_df):
+    """
+    교과서명 앞에 학교급 구분 붙이기 (중등 정보 vs 고등 정보)
+
+    제품의 학교급(제품_학교급)을 우선하고 없으면 주문의 학교급을 사용합니다.
+    학교급 판별과 라벨 문자열 생성은 고유값마다 한 번만 하고 행에는 코드로 펼칩니다.
+
+    Returns:
+        교과서명_구분 Series (학교급을 알 수 없으면 원래 교과서명)
+    """
+    if '교과서명' not in order_df.columns:
+        return pd.Series('', index=order_df.index)
+
+    # 행별 학교급 구분: 0=판별 불가, 1=중등, 2=고등
+    prefixes = ['', '[중등] ', '[고등] ']
+    level_id = np.zeros(len(order_df), dtype=np.int64)
+    assigned = np.zeros(len(order_df), dtype=bool)
+    for col in ['제품_학교급', '학교급']:
+        if col not in order_df.columns:
+            continue
+        codes, uniques = pd.factorize(order_df[col])
+        ids = np.array([prefixes.index(_level_prefix(v)) for v in uniques] + [0], dtype=np.int64)
+        take = ~assigned & (codes >= 0)
+        level_id[take] = ids[codes[take]]
+        assigned |= take
+
+    # 라벨 표: [원래 교과서명..., 중등 라벨..., 고등 라벨..., 결측]
+    subject_codes, subject_uniques = pd.factorize(order_df['교과서명'])
+    n = len(subject_uniques)
+    raw = pd.Series(subject_uniques, dtype=object)
+    stripped = raw.astype(str).str.strip()
+    table = np.concatenate([
+        raw.to_numpy(dtype=object),
+        ('[중등] ' + stripped).to_numpy(dtype=object),
+        ('[고등] ' + stripped).to_numpy(dtype=object),
+        np.array([np.nan], dtype=object),
+    ])
+    idx = np.where(subject_codes >= 0, level_id * n + subject_codes, 3 * n)
+    return pd.Series(table[idx], index=order_df.index)
+
+
+def _read_reference(path, dtype=None):
+    """목표/제품/총판정보 CSV 읽기 (파일이 없거나 읽지 못하면 빈 DataFrame)"""
+    try:
+        return read_csv_fast(path, dtype=dtype)
+    except Exception:
+        return pd.DataFrame()
+
+
+def _ensure_outputs_map(paths):
+    """총판 코드 매핑 파일이 없으면 매핑 스크립트로 생성 시도"""
+    outputs_map_path = paths['distributor_map']
+    if os.path.exists(outputs_map_path):
+        return outputs_map_path
+    # try to run the mapping script to generate outputs
+    if os.path.exists(MAPPING_SCRIPT):
+        try:
+            subprocess.run([sys.executable, MAPPING_SCRIPT, '--orders', paths['order'], '--distributor', paths['distributor'], '--out', os.path.dirname(outputs_map_path)], check=True, cwd=BASE_DIR)
+        except Exception:
+            # ignore errors; fallback to building from distributor_df
+            pass
+    return outputs_map_path
+
+
+def _load_code_map(paths, timer=None):
+    """총판 코드 매핑 CSV(scripts/generate_distributor_mapping.py 결과) → {정규화 코드: 공식명}"""
+    dist_code_map = {}
+    # If a precomputed mapping exists (script output), prefer it. If missing, attempt to auto-generate it.
+    # (매핑 파일이 없으면 하위 프로세스로 스크립트를 실행하므로 따로 계측)
+    with (timer or StageTimer()).stage('ensure_outputs_map'):
+        outputs_map_path = _ensure_outputs_map(paths)
+    if os.path.exists(outputs_map_path):
+        try:
+            map_df = pd.read_csv(outputs_map_path, dtype=str)
+            # Expect columns: order_code, matched, official_code, official_name
+            if 'order_code' in map_df.columns and 'official_name' in map_df.columns:
+                matched = map_df[map_df['matched'].astype(str).str.lower() == 'true']
+                codes = normalize_codes(matched['order_code'])
+                names = matched['official_name'].fillna('').astype(str).str.strip()
+                valid = (codes != '') & (names != '')
+                dist_code_map = dict(zip(codes[valid], names[valid]))
+        except Exception:
+            dist_code_map = {}
+    return dist_code_map
+
+
+def _clean_orders(order_df):
+    """주문 컬럼명 strip, 정보공시학교코드는 문자열로"""
+    order_df.columns = order_df.columns.str.strip()
+    if '정보공시학교코드' in order_df.columns:
+        order_df['정보공시학교코드'] = order_df['정보공시학교코드'].astype(str)
+    return order_df
+
+
+def enrich_orders(order_df, product_df, directory, timer=None):
+    """
+    주문 행별 파생 컬럼 추가 (총판 공식명, 제품 정보, 교과서명_구분, 학교급명, 총판등급)
+
+    행마다 독립적인 계산이라 전체 빌드와 증분 반영(update_datasets)이 같은 함수를 사용합니다.
+
+    Args:
+        order_df: 주문 데이터 (컬럼명 strip 된 상태)
+        product_df: 제품정보 (원본 또는 이미 코드가 6자리로 정리된 표)
+        directory: DistributorDirectory
+        timer: StageTimer (옵션)
+
+    Returns:
+        (order_df, 코드 정리된 product_df)
+    """
+    timer = timer or StageTimer()
+    dist_code_map = dict(directory.code_to_official)
+
+    with timer.stage('distributor_mapping') as stage:
+        # 주문 데이터 총판은 '총판코드' 컬럼을 정규화하여 매핑 (이름 기반 매핑 제거)
+        if '총판' in order_df.columns and '총판코드' in order_df.columns and dist_code_map:
+            order_df['총판코드_정규화'] = normalize_codes(order_df['총판코드'])
+            # Map strictly by numeric code -> official name. Do NOT fallback to 주문의 `총판` 명칭.
+            order_df['총판'] = order_df['총판코드_정규화'].map(dist_code_map)
+            # For unmapped codes, show a clear marker using the code (do not use original name)
+            order_df['총판'] = label_distributors(order_df['총판'], order_df['총판코드_정규화'])
+        stage.rows = len(order_df)
+
+    # Merge product info to add school level to subject names
+    with timer.stage('product_merge') as stage:
+        if (not product_df.empty and '코드' in product_df.columns and '학교급' in product_df.columns
+                and '도서코드(교지명구분)' in order_df.columns):
+            # Create mapping from product code to school level
+            # 제품 코드를 6자리로 표준화 (제품정보.csv는 5자리 또는 6자리 숫자)
+            # 주문 데이터의 도서코드(교지명구분)는 이미 6자리이므로 문자열로만 변환
+            product_df = product_df.dropna(subset=['코드'])
+            product_df['코드'] = product_df['코드'].astype(int).astype(str).str.zfill(6)
+            order_df['도서코드(교지명구분)'] = order_df['도서코드(교지명구분)'].astype(str)
+
+            # Merge to get school level, subject name and target subject info (목표과목)
+            # Include '교과서명' so we can build 교과서명_구분 = [중등]/[고등] + 교과서명
+            merge_cols = ['코드', '학교급', '교과군', '교과서명']
+            if '2026 목표과목' in product_df.columns:
+                merge_cols.append('2026 목표과목')
+
+            product_merge = product_df[merge_cols].rename(columns={'교과군': '교과군_제품', '학교급': '제품_학교급'})
+
+            order_df = pd.merge(
+                order_df,
+                product_merge,
+                left_on='도서코드(교지명구분)',
+                right_on='코드',
+                how='left'
+            )
+            merged_products = True
+        else:
+            merged_products = False
+        stage.rows = len(order_df)
+
+    with timer.stage('subject_labels') as stage:
+        if merged_products:
+            # Add school level to subject name for clarity (중등 정보 vs 고등 정보)
+            order_df['교과서명_구분'] = label_subjects(order_df)
+
+            # Add 학교급명 column (copy from 학교급) for consistency
+            if '학교급' in order_df.columns:
+                order_df['학교급명'] = order_df['학교급']
+        else:
+            # If product code missing in order data, fall back to original subject name
+            order_df['교과서명_구분'] = order_df.get('교과서명', '')
+        stage.rows = len(order_df)
+
+    # Add distributor grade for sorting (using already mapped official names)
+    with timer.stage('distributor_grade') as stage:
+        if '등급' in directory.fields and '총판' in order_df.columns:
+            order_df['총판등급'] = directory.map_field(order_df['총판'], '등급')
+        stage.rows = len(order_df)
+
+    return order_df, product_df
+
+
+def build_datasets(paths=None, timer=None):
+    """
+    원본 CSV를 읽어 대시보드에서 쓰는 모든 데이터프레임과 파생 테이블 계산
+
+    Args:
+        paths: 원본 파일 경로 dict (기본값 DEFAULT_PATHS)
+        timer: 단계별 시간을 기록할 StageTimer (옵션)
+
+    Returns:
+        dict: total_df, order_df, target_df, product_df, distributor_df,
+              market_analysis, market_size_by_level, distributor_market,
+              subject_market_by_dist, order_df_target_filtered, code_to_official,
+              memory (schema 적용 전후 메모리)
+    """
+    timer = timer or StageTimer()
+    datasets, _ = complete_datasets(build_base_datasets(paths, timer=timer), timer=timer)
+    return datasets
+
+
+def build_base_datasets(paths=None, timer=None):
+    """
+    원본 CSV를 읽어 기본 데이터프레임만 가공 (파생 표는 compute_derived로 따로 계산)
+
+    Returns:
+        dict: BASE_FRAMES + code_to_official, memory
+    """
+    paths = {**DEFAULT_PATHS, **(paths or {})}
+    timer = timer or StageTimer()
+
+    # Load student data (학급수/교사수 등 사용하지 않는 컬럼은 읽지 않음)
+    with timer.stage('read_total') as stage:
+        total_df = read_csv_fast(paths['total'], usecols=TOTAL_USECOLS)
+        stage.rows = len(total_df)
+
+    # Load order data
+    # NOTE: 코드 컬럼은 str로 고정(배포 환경에서 dtype 추론으로 코드 포맷이 깨져 미매핑이 발생할 수 있음)
+    with timer.stage('read_orders') as stage:
+        order_df = read_csv_fast(paths['order'], dtype=ORDER_DTYPE)
+        stage.rows = len(order_df)
+
+    # Load target / product / distributor data (작은 참조 파일은 전체 컬럼을 읽고, 실패하면 빈 표)
+    with timer.stage('read_reference') as stage:
+        target_dtype: dict[str, Any] = {
+            '총판코드': str,
+        }
+        target_df = _read_reference(paths['target'], dtype=target_dtype)
+        product_df = _read_reference(paths['product'])
+
+        dist_dtype: dict[str, Any] = {
+            '숫자코드': str,
+            '총판코드': str,
+        }
+        distributor_df = _read_reference(paths['distributor'], dtype=dist_dtype)
+        stage.rows = len(target_df) + len(product_df) + len(distributor_df)
+
+    # Clean column names
+    total_df.columns = total_df.columns.str.strip()
+    order_df = _clean_orders(order_df)
+    if not target_df.empty:
+        target_df.columns = target_df.columns.str.strip()
+    if not product_df.empty:
+        product_df.columns = product_df.columns.str.strip()
+    if not distributor_df.empty:
+        distributor_df.columns = distributor_df.columns.str.strip()
+
+    # Ensure School Codes are strings
+    if '정보공시 학교코드' in total_df.columns:
+        total_df['정보공시 학교코드'] = total_df['정보공시 학교코드'].astype(str)
+    # 학교별 중등/고등 1·2학년 학생수 (비교/총판/등급 페이지의 그룹별 시장 규모용)
+    total_df[MARKET_COLUMN] = mid_high_12_students(total_df)
+
+    # Map distributor official names using distributor info (prefer outputs mapping if exists)
+    with timer.stage('distributor_directory') as stage:
+        # 총판 조회 테이블 (outputs 매핑이 없으면 distributor_df의 '숫자코드' 우선으로 코드 매핑 생성)
+        directory = DistributorDirectory(distributor_df, _load_code_map(paths, timer=timer))
+        dist_code_map = dict(directory.code_to_official)
+        stage.rows = len(dist_code_map)
+
+    order_df, product_df = enrich_orders(order_df, product_df, directory, timer=timer)
+
+    # 반복 문자열 컬럼은 category, 정수는 int32로 (메모리 전후 비교는 meta에 기록)
+    with timer.stage('schema') as stage:
+        before = {'order_df': order_df, 'total_df': total_df}
+        order_df = apply_schema(order_df, ORDER_CATEGORY_COLUMNS)
+        total_df = apply_schema(total_df, TOTAL_CATEGORY_COLUMNS)
+        memory = memory_report(before, {'order_df': order_df, 'total_df': total_df})
+        stage.rows = len(order_df)
+
+    # 매핑 딕셔너리 (코드 -> 공식명): 주문 총판코드 매핑에 사용된 경우만 세션에 저장
+    code_to_official = dist_code_map if '총판코드_정규화' in order_df.columns else {}
+
+    return {
+        'total_df': total_df,
+        'order_df': order_df,
+        'target_df': target_df,
+        'product_df': product_df,
+        'distributor_df': distributor_df,
+        'code_to_official': code_to_official,
+        'memory': memory,
+    }
+
+
+def _market_analysis(order_df, total_df, product_df, timer):
+    # Calculate accurate market size by subject (V2: 학교별 학년 추정)
+    with timer.stage('market_v2') as stage:
+        market_analysis = calculate_market_size_by_subject_v2(order_df, total_df, product_df)
+        stage.rows = len(market_analysis)
+
+    # Fallback to V1 if V2 fails
+    if market_analysis.empty:
+        with timer.stage('market_v1_fallback') as stage:
+            market_analysis = calculate_market_size_by_subject(order_df, total_df, product_df)
+            stage.rows = len(market_analysis)
+    # schema 적용 후 부수가 int32라 합계도 int32 - schema 전 주문으로 계산하던 결과(int64)와 맞춤
+    if '주문부수' in market_analysis.columns and market_analysis['주문부수'].dtype == np.int32:
+        market_analysis['주문부수'] = market_analysis['주문부수'].astype(np.int64)
+    return market_analysis
+
+
+def _distributor_market(total_df, order_df, distributor_df, timer):
+    # Calculate distributor market size (총판별 담당 학교 기준)
+    with timer.stage('distributor_market') as stage:
+        distributor_market = calculate_distributor_market_size(total_df, order_df, distributor_df)
+        stage.rows = len(distributor_market)
+    return distributor_market
+
+
+def _subject_market_by_dist(total_df, order_df, product_df, timer):
+    # Calculate subject market by distributor (총판별 과목별 시장 규모)
+    with timer.stage('subject_market_by_dist') as stage:
+        subject_market_by_dist = calculate_subject_market_by_distributor(total_df, order_df, product_df)
+        stage.rows = len(subject_market_by_dist)
+    return subject_market_by_dist
+
+
+def _market_size_by_level(total_df, timer):
+    # Calculate total market size by school level for comparison analysis
+    # 중등 = 중학교 1,2학년 / 고등 = 고등학교 1,2학년
+    market_size_by_level = {}
+    if not total_df.empty:
+        # 중학교 (학교급코드 = 3)
+        middle_schools = total_df[total_df['학교급코드'] == 3]
+        market_size_by_level['중등'] = middle_schools['1학년 학생수'].sum() + middle_schools['2학년 학생수'].sum()
+
+        # 고등학교 (학교급코드 = 4)
+        high_schools = total_df[total_df['학교급코드'] == 4]
+        market_size_by_level['고등'] = high_schools['1학년 학생수'].sum() + high_schools['2학년 학생수'].sum()
+
+        # 전체
+        market_size_by_level['전체'] = market_size_by_level['중등'] + market_size_by_level['고등']
+    return market_size_by_level
+
+
+def _target_filtered_orders(order_df, timer):
+    # 🚨 중요: 목표 관련 페이지(목표 대비 달성률, 등급별 분석)에서만 목표과목 필터 사용
+    with timer.stage('target_filter') as stage:
+        filtered = filter_target_orders(order_df)
+        # 거른 행에 남은 값만 범주로 (원본을 거른 뒤 schema를 적용한 것과 같은 결과)
+        for col in filtered.columns:
+            if isinstance(filtered[col].dtype, pd.CategoricalDtype):
+                filtered[col] = filtered[col].cat.remove_unused_categories()
+        order_df_target_filtered = apply_schema(filtered, ORDER_CATEGORY_COLUMNS)
+        stage.rows = len(order_df_target_filtered)
+    return order_df_target_filtered
+
+
+# 파생 데이터셋 선언: 이름 → (의존하는 데이터셋, 계산 함수(*의존 값, timer))
+# build_datasets()는 모두 계산하고, 앱은 처음 접근할 때 계산 (lazy_loaders)
+DERIVED_DATASETS = {
+    'market_analysis': (('order_df', 'total_df', 'product_df'), _market_analysis),
+    'distributor_market': (('total_df', 'order_df', 'distributor_df'), _distributor_market),
+    'subject_market_by_dist': (('total_df', 'order_df', 'product_df'), _subject_market_by_dist),
+    'market_size_by_level': (('total_df',), _market_size_by_level),
+    'order_df_target_filtered': (('order_df',), _target_filtered_orders),
+}
+
+
+def compute_derived(name, get, timer=None):
+    """
+    DERIVED_DATASETS에 선언된 파생 데이터셋 하나 계산
+
+    Args:
+        name: 파생 데이터셋 이름
+        get: 이름 → 데이터셋 값 (의존 데이터셋 조회, dict.__getitem__ 등)
+        timer: StageTimer (옵션)
+    """
+    deps, compute = DERIVED_DATASETS[name]
+    return compute(*(get(dep) for dep in deps), timer=timer or StageTimer())
+
+
+def complete_datasets(datasets, timer=None):
+    """
+    datasets에 없는 파생 데이터셋을 모두 계산해 채운 새 dict
+
+    Returns:
+        (datasets dict, 새로 계산한 이름 목록)
+    """
+    datasets = dict(datasets)
+    computed = []
+    for name in DERIVED_DATASETS:
+        if name not in datasets:
+            datasets[name] = compute_derived(name, datasets.__getitem__, timer)
+            computed.append(name)
+    return datasets, computed
+
+
+def update_datasets(datasets, delta_orders, timer=None):
+    """
+    주문 추가분(delta)만 반영해 build_datasets 결과를 갱신
+
+    추가된 주문 행만 enrich_orders로 가공하고, 시장 규모 표는 추가분이 건드린
+    키(도서코드 / 총판 / (총판, 도서코드))의 행만 다시 계산해 바꿔 끼웁니다.
+    학생수·제품·총판 정보는 그대로라고 가정합니다 (바뀌면 전체 빌드).
+    결과는 같은 주문 전체로 build_datasets를 실행한 것과 같습니다.
+
+    Args:
+        datasets: build_datasets / 아티팩트에서 읽은 결과 dict
+        delta_orders: 추가된 주문 행 (read_csv_tail 결과 등, 가공 전)
+        timer: StageTimer (옵션)
+
+    Returns:
+        갱신된 datasets dict (입력 dict는 수정하지 않음)
+    """
+    timer = timer or StageTimer()
+    base_orders = datasets['order_df']
+    total_df = datasets['total_df']
+    directory = DistributorDirectory(datasets['distributor_df'], datasets.get('code_to_official'))
+
+    delta = _clean_orders(delta_orders)
+    delta, product_df = enrich_orders(delta, datasets['product_df'], directory, timer=timer)
+    # 전체 빌드와 같은 행 번호 (목표과목 필터 결과가 원래 index를 유지하므로)
+    delta.index = pd.RangeIndex(len(base_orders), len(base_orders) + len(delta))
+
+    with timer.stage('append_orders') as stage:
+        order_df = concat_with_schema([base_orders, delta], ORDER_CATEGORY_COLUMNS)
+        stage.rows = len(delta)
+
+    book_col = '도서코드(교지명구분)'
+    updated = {}
+    # 지연 모드 아티팩트에 아직 없는 파생 표는 건너뜀 (처음 접근할 때 갱신된 주문으로 계산)
+    if 'market_analysis' in datasets:
+        market_analysis = datasets['market_analysis']
+        with timer.stage('market_v2') as stage:
+            if book_col in delta.columns and '도서코드' in market_analysis.columns:
+                books = pd.unique(delta[book_col].dropna())
+                part = calculate_market_size_by_subject_v2(order_df[order_df[book_col].isin(books)], total_df, product_df)
+                market_analysis = _replace_rows(market_analysis, part, ['도서코드'], books)
+                # 전체 계산과 같은 순서: 도서코드 groupby 순서 → 주문부수 내림차순(quicksort)
+                market_analysis = market_analysis.sort_values('주문부수', ascending=False)
+            else:
+                market_analysis = calculate_market_size_by_subject_v2(order_df, total_df, product_df)
+            if market_analysis.empty:
+                market_analysis = calculate_market_size_by_subject(order_df, total_df, product_df)
+            stage.rows = len(market_analysis)
+        updated['market_analysis'] = market_analysis
+
+    if '총판' in delta.columns and 'distributor_market' in datasets:
+        distributor_market = datasets['distributor_market']
+        dists = pd.unique(delta['총판'].dropna())
+        with timer.stage('distributor_market') as stage:
+            dist_col = '담당총판_공식' if '담당총판_공식' in total_df.columns else '담당총판'
+            if dist_col in total_df.columns and '총판명' in distributor_market.columns:
+                part = calculate_distributor_market_size(
+                    total_df[total_df[dist_col].isin(dists)], order_df[order_df['총판'].isin(dists)],
+                    datasets['distributor_df'],
+                )
+                distributor_market = _replace_rows(distributor_market, part, ['총판명'], dists)
+            stage.rows = len(distributor_market)
+        updated['distributor_market'] = distributor_market
+
+    if '총판' in delta.columns and 'subject_market_by_dist' in datasets:
+        subject_market_by_dist = datasets['subject_market_by_dist']
+        with timer.stage('subject_market_by_dist') as stage:
+            if book_col in delta.columns and {'총판명', '도서코드'} <= set(subject_market_by_dist.columns):
+                pairs = delta[['총판', book_col]].dropna().drop_duplicates()
+                keys = pd.MultiIndex.from_frame(pairs)
+                in_pairs = pd.MultiIndex.from_arrays([order_df['총판'], order_df[book_col]]).isin(keys)
+                part = calculate_subject_market_by_distributor(total_df, order_df[in_pairs], product_df)
+                subject_market_by_dist = _replace_rows(subject_market_by_dist, part, ['총판명', '도서코드'], keys)
+            else:
+                subject_market_by_dist = calculate_subject_market_by_distributor(total_df, order_df, product_df)
+            stage.rows = len(subject_market_by_dist)
+        updated['subject_market_by_dist'] = subject_market_by_dist
+
+    if 'order_df_target_filtered' in datasets:
+        with timer.stage('target_filter') as stage:
+            updated['order_df_target_filtered'] = concat_with_schema(
+                [datasets['order_df_target_filtered'], filter_target_orders(delta)], ORDER_CATEGORY_COLUMNS,
+            )
+            stage.rows = len(updated['order_df_target_filtered'])
+
+    memory = dict(datasets.get('memory') or {})
+    if 'order_df' in memory:
+        memory['order_df'] = {**memory['order_df'], 'after': int(order_df.memory_usage(deep=True).sum())}
+
+    return {
+        **datasets,
+        'order_df': order_df,
+        'product_df': product_df,
+        **updated,
+        'memory': memory,
+    }
+
+
+def _replace_rows(table, part, key_cols, keys):
+    """
+    table에서 keys에 해당하는 행을 part로 바꾸고 키 순서(groupby 순서)로 정렬
+
+    Args:
+        table: 기존 집계 표 (키 컬럼 기준 정렬된 groupby 결과)
+        part: 영향받은 키만 다시 계산한 표
+        key_cols: 키 컬럼 목록
+        keys: 영향받은 키 (컬럼 하나면 배열, 여러 개면 MultiIndex)
+    """
+    if len(key_cols) == 1:
+        stale = table[key_cols[0]].isin(keys)
+    else:
+        stale = pd.MultiIndex.from_frame(table[key_cols]).isin(keys)
+    merged = pd.concat([table[~stale], part], ignore_index=True) if len(part) else table[~stale]
+    return merged.sort_values(key_cols, kind='stable').reset_index(drop=True)
+
+
+def filter_target_orders(order_df):
+    """목표과목 필터링된 데이터 생성 (2026학년도 + 목표과목1/2, 목표 관련 페이지용)"""
+    # 목표과목 컬럼 확인 (목표과목 또는 2026 목표과목)
+    target_col = None
+    if '목표과목' in order_df.columns:
+        target_col = '목표과목'
+    elif '2026 목표과목' in order_df.columns:
+        target_col = '2026 목표과목'
+
+    if '학년도' in order_df.columns and target_col is not None:
+        return order_df[
+            (order_df['학년도'] == 2026) &
+            (order_df[target_col].isin(['목표과목1', '목표과목2']))
+        ].copy()
+    return order_df[order_df['학년도'] == 2026].copy() if '학년도' in order_df.columns else order_df.copy()
+
+
+def source_stamp(paths=None):
+    """
+    원본 파일들의 (크기, 수정시각) 묶음 - 내용 해시 없이 파일 변경 여부만 빠르게 확인
+
+    앱의 공유 데이터 캐시 키로 사용해, 주문현황에 행이 추가되면 다음 rerun에서 다시 로드합니다.
+    """
+    paths = {**DEFAULT_PATHS, **(paths or {})}
+    stamp = []
+    for name, path in sorted(paths.items()):
+        try:
+            stat = os.stat(path)
+            stamp.append((name, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            stamp.append((name, None, None))
+    return tuple(stamp)
+
+
+def load_or_build_datasets(paths=None, artifact_dir=ARTIFACT_DIR, force=False, timer=None, lazy=False):
+    """
+    사전 계산 아티팩트가 있으면 읽고, 없으면 계산 후 저장
+
+    Args:
+        paths: 원본 파일 경로 dict (기본값 DEFAULT_PATHS)
+        artifact_dir: 아티팩트 루트 디렉터리
+        force: True면 기존 아티팩트를 무시하고 다시 계산
+        timer: 단계별 시간을 기록할 StageTimer (옵션)
+        lazy: True면 기본 데이터프레임만 읽고/계산하고 파생 표(DERIVED_DATASETS)는 미룸
+              (info['pending'] 이름은 lazy_loaders()로 처음 접근할 때 읽거나 계산)
+
+    Returns:
+        (datasets dict, info dict) - info: {'source': 'artifact'|'delta'|'built', 'key', 'path', 'pending'}
+        ('delta': 이전 아티팩트에 주문현황 추가 행만 반영)
+    """
+    paths = {**DEFAULT_PATHS, **(paths or {})}
+    timer = timer or StageTimer()
+
+    with timer.stage('fingerprint'):
+        try:
+            artifact_key, sources = fingerprint_sources(paths, artifact_dir)
+        except OSError:
+            artifact_key, sources = None, {}
+
+    if artifact_key and not force:
+        with timer.stage('load_artifacts') as stage:
+            cached = load_artifacts(artifact_dir, artifact_key, names=BASE_FRAMES if lazy else None)
+            if cached is not None:
+                frames, meta = cached
+                stage.rows = len(frames.get('order_df', ()))
+        if cached is not None and all(name in frames for name in BASE_FRAMES):
+            datasets = _with_meta(frames, meta)
+            artifact_path = os.path.join(artifact_dir, artifact_key)
+            if not lazy:
+                # 지연 모드로 저장된 아티팩트는 빠진 파생 표를 계산해 채움
+                datasets, computed = complete_datasets(datasets, timer=timer)
+                if computed:
+                    with timer.stage('save_artifacts'):
+                        _persist_derived(artifact_dir, artifact_key, datasets, computed)
+            return datasets, _load_info('artifact', artifact_key, artifact_path, datasets)
+
+    datasets, source = None, 'built'
+    if artifact_key and not force:
+        datasets = _apply_appended_orders(paths, sources, artifact_dir, timer)
+        source = 'delta' if datasets is not None else source
+    if datasets is None:
+        datasets = build_base_datasets(paths, timer=timer)
+    if not lazy:
+        datasets, _ = complete_datasets(datasets, timer=timer)
+
+    saved_path = None
+    try:
+        # build_datasets가 총판 코드 매핑 파일을 새로 만들었을 수 있으므로 지문 재계산
+        artifact_key, sources = fingerprint_sources(paths, artifact_dir)
+    except OSError:
+        artifact_key = None
+    if artifact_key and os.path.exists(paths['order']):
+        with timer.stage('save_artifacts'):
+            saved_path = save_artifacts(
+                artifact_dir, artifact_key,
+                {name: datasets[name] for name in ARTIFACT_FRAMES if name in datasets},
+                meta={
+                    **{name: datasets[name] for name in ARTIFACT_META if name in datasets},
+                    'timings': list(timer.stages),
+                    'built_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                },
+                sources=sources,
+            )
+    return datasets, _load_info(source, artifact_key, saved_path, datasets)
+
+
+def _with_meta(frames, meta):
+    """아티팩트 표 + manifest meta 값 (저장되지 않은 파생 meta는 빼고)"""
+    datasets = dict(frames)
+    for name in ARTIFACT_META:
+        if name in meta or name not in DERIVED_DATASETS:
+            datasets[name] = meta.get(name, {})
+    return datasets
+
+
+def _load_info(source, key, path, datasets):
+    pending = [name for name in DERIVED_DATASETS if name not in datasets]
+    return {'source': source, 'key': key, 'path': path, 'pending': pending}
+
+
+def _persist_derived(artifact_dir, key, datasets, names):
+    """계산한 파생 데이터셋을 아티팩트에 추가 (표는 파일, dict 값은 meta)"""
+    frames = {name: datasets[name] for name in names if name in ARTIFACT_FRAMES}
+    meta = {name: datasets[name] for name in names if name in ARTIFACT_META}
+    return add_artifact_frames(artifact_dir, key, frames, meta)
+
+
+def lazy_loaders(datasets, info, artifact_dir=ARTIFACT_DIR, history=None):
+    """
+    load_or_build_datasets(lazy=True)가 미룬 파생 데이터셋의 로더
+
+    로더는 아티팩트에 저장된 표가 있으면 그 파일만 읽고, 없으면 기본 데이터프레임으로
+    계산한 뒤 아티팩트에 추가합니다 (다음 시작부터는 파일에서 읽음).
+
+    Args:
+        datasets: load_or_build_datasets가 반환한 dict (기본 데이터프레임)
+        info: load_or_build_datasets가 반환한 info
+        artifact_dir: 아티팩트 루트 디렉터리
+        history: 로드마다 단계 기록을 남길 LoadHistory (옵션, utils/profiling.py)
+
+    Returns:
+        {이름: 인자 없는 함수} (SharedDataset(loaders=...)에 전달)
+    """
+    key = info.get('key')
+    persist = key is not None and info.get('path') is not None
+
+    def loader(name):
+        def load():
+            timer = StageTimer()
+            value = None
+            if persist and name in ARTIFACT_FRAMES:
+                with timer.stage('load_artifacts') as stage:
+                    cached = load_artifacts(artifact_dir, key, names=[name])
+                    if cached is not None and name in cached[0]:
+                        value = cached[0][name]
+                        stage.rows = len(value)
+            source = 'artifact' if value is not None else 'built'
+            if value is None:
+                value = compute_derived(name, datasets.__getitem__, timer)
+                if persist:
+                    with timer.stage('save_artifacts'):
+                        _persist_derived(artifact_dir, key, {name: value}, [name])
+            if history is not None:
+                history.record(f'지연 로드: {name}', timer, source=source, key=key)
+            return value
+        return load
+
+    return {name: loader(name) for name in info.get('pending', ())}
+
+
+def _apply_appended_orders(paths, sources, artifact_dir, timer):
+    """
+    주문현황 CSV에 행만 덧붙여졌으면 이전 아티팩트 + 추가 행으로 갱신 (아니면 None)
+
+    추가된 바이트만 파싱하므로 CSV 읽기와 행 가공은 추가 행 수에 비례합니다.
+    """
+    found = find_append_base(artifact_dir, sources, paths, name='order')
+    if found is None:
+        return None
+    base_key, old_size = found
+    if sniff_encoding(paths['order']).startswith('utf-16'):
+        return None
+    with timer.stage('load_artifacts') as stage:
+        cached = load_artifacts(artifact_dir, base_key)
+        stage.rows = len(cached[0].get('order_df', ())) if cached is not None else None
+    if cached is None or not all(name in cached[0] for name in BASE_FRAMES):
+        return None
+    base = _with_meta(*cached)
+
+    with timer.stage('read_order_delta') as stage:
+        delta = read_csv_tail(paths['order'], old_size, dtype=ORDER_DTYPE)
+        stage.rows = len(delta)
+    return update_datasets(base, delta, timer=timer)
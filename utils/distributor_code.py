@@ -0,0 +1,117 @@
+"""
+총판코드 정규화
+
+주문현황(총판코드), 총판정보(숫자코드/총판코드), 목표(총판코드), 매핑 CSV(order_code)의
+코드 값을 서로 비교할 수 있는 하나의 문자열 형태로 맞춥니다.
+
+규칙 (앱/페이지/스크립트 공통):
+- 결측값 → ''
+- 앞뒤 공백, 쉼표(','), 폭 없는 공백('\u200b') 제거
+- Excel식 '123.0' → '123', 정수로 읽히는 값은 정수 문자열로 ('0101' → '101')
+- 1~3자리 숫자는 4자리로 0 채움 ('101' → '0101')
+
+컬럼 단위 정규화(normalize_codes)는 고유값만 한 번 변환한 뒤 코드 배열로 펼치며,
+한 번 변환한 값은 모듈 수준 메모 테이블에 보관해 다음 호출에서 다시 계산하지 않습니다.
+"""
+import numpy as np
+import pandas as pd
+
+# 메모 테이블 최대 크기 (넘으면 비우고 다시 채움)
+MEMO_LIMIT = 200_000
+
+# str(원본 값) → 정규화된 코드
+_CODE_MEMO = {}
+
+
+def _normalize_strings(raw):
+    """
+    문자열 Series를 규칙에 따라 정규화 (pandas 문자열 메서드로 한 번에 처리)
+
+    Args:
+        raw: str(원본 값)으로 이루어진 Series
+
+    Returns:
+        정규화된 코드 Series (같은 index)
+    """
+    s = (
+        raw.str.strip()
+        .str.replace(',', '', regex=False)
+        .str.replace('\u200b', '', regex=False)
+        .str.strip()
+    )
+    s = s.str.replace(r'\.0$', '', regex=True)
+
+    # 정수로 읽히는 값은 정수 문자열로 ('0101', '1e3', '101.00' 등)
+    num = pd.to_numeric(s, errors='coerce').astype('float64')
+    is_int = num.notna() & np.isfinite(num) & (num == np.trunc(num))
+    if is_int.any():
+        ints = num[is_int]
+        small = ints.abs() < 2 ** 53
+        converted = pd.Series(index=ints.index, dtype=object)
+        converted[small] = ints[small].astype('int64').astype(str)
+        converted[~small] = ints[~small].map(lambda v: str(int(v)))
+        s = s.astype(object)
+        s[is_int] = converted
+
+    # 4자리 숫자 코드 유지(선행 0 보호). 예: '101' -> '0101'
+    short = s.str.isdigit() & s.str.len().between(1, 3)
+    if short.any():
+        s[short] = s[short].str.zfill(4)
+    return s
+
+
+def _lookup(keys):
+    """str 값 배열을 메모 테이블로 정규화 (처음 보는 값만 계산)"""
+    keys = pd.Series(keys, dtype=object)
+    result = keys.map(_CODE_MEMO)
+    missing = result.isna()
+    if missing.any():
+        new_keys = keys[missing]
+        computed = _normalize_strings(new_keys.astype(str))
+        if len(_CODE_MEMO) + len(new_keys) > MEMO_LIMIT:
+            _CODE_MEMO.clear()
+        _CODE_MEMO.update(zip(new_keys.tolist(), computed.tolist()))
+        result = result.astype(object)
+        result[missing] = computed.to_numpy()
+    return result.to_numpy(dtype=object)
+
+
+def normalize_codes(values):
+    """
+    코드 컬럼 전체를 정규화
+
+    Args:
+        values: Series 또는 배열 (숫자/문자 혼용, 결측 포함 가능)
+
+    Returns:
+        정규화된 코드 Series (원본과 같은 index, 결측은 '')
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(values)
+    codes, uniques = pd.factorize(s)
+    if len(uniques) == 0:
+        return pd.Series([''] * len(s), index=s.index, name=s.name)
+    table = _lookup(pd.Series(uniques).astype(str).to_numpy(dtype=object))
+    # codes == -1(결측)은 마지막에 붙인 ''를 가리킴
+    table = np.append(table, '')
+    return pd.Series(table[codes], index=s.index, name=s.name)
+
+
+def normalize_code(code_val) -> str:
+    """
+    코드 값 하나를 정규화 (dict 키 등 스칼라용)
+
+    Returns:
+        정규화된 코드 문자열 (결측은 '')
+    """
+    if pd.isna(code_val):
+        return ''
+    key = str(code_val)
+    cached = _CODE_MEMO.get(key)
+    if cached is not None:
+        return cached
+    return _lookup([key])[0]
+
+
+def clear_code_memo():
+    """메모 테이블 비우기"""
+    _CODE_MEMO.clear()
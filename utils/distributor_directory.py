@@ -0,0 +1,265 @@
+"""
+총판 조회 테이블 (총판정보.csv 기반)
+
+load_data()와 여러 페이지가 distributor_df를 iterrows로 돌며 각자 만들던
+코드→공식명, 공식명→등급/지역 dict를 하나의 DistributorDirectory로 모았습니다.
+
+- 정규화된 총판코드, 총판명(공식), 별칭(총판명/총판명1)으로 조회 (dict 기반 O(1))
+- 조회 항목: 등급, 지역, 시도, 시군구, 시군구2, 교육청
+- 같은 공식명이 여러 행에 있으면 항목별로 마지막 값(결측 제외)을 사용 (기존 load_data 규칙),
+  field_map(keep='first'|'last')는 drop_duplicates처럼 첫/마지막 행의 값을 그대로 사용 (페이지별 기존 규칙)
+- 프로세스당 한 번 만들어 st.session_state['distributor_directory']로 공유
+"""
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from utils.distributor_code import normalize_code, normalize_codes
+
+OFFICIAL_COLUMN = '총판명(공식)'
+
+# 조회 항목 이름 → 총판정보.csv 컬럼
+FIELD_COLUMNS = {
+    '등급': '등급',
+    '지역': '지 역',
+    '시도': '시도',
+    '시군구': '시군구',
+    '시군구2': '시군구2',
+    '교육청': '교육지원청',
+}
+
+# 공식명 대신 쓰이는 이름 컬럼 (연도별 분석 등에서 원본 총판명을 공식명으로 맞출 때 사용)
+ALIAS_COLUMNS = ['총판명', '총판명1', '총판']
+
+# 코드 컬럼 우선순위 (숫자코드가 총판정보.csv의 정식 코드)
+CODE_COLUMNS = ['숫자코드', '총판코드']
+
+
+def _field_rows(df, key):
+    """key 컬럼이 있는 행의 조회 항목 (index는 strip 한 key, 중복 key 그대로)"""
+    columns = {field: col for field, col in FIELD_COLUMNS.items() if col in df.columns}
+    if df.empty or key not in df.columns:
+        return pd.DataFrame(columns=list(columns))
+    keys = df[key]
+    valid = keys.notna()
+    rows = df.loc[valid, list(columns.values())].copy()
+    rows.columns = list(columns)
+    rows.index = keys[valid].astype(str).str.strip()
+    return rows
+
+
+def _field_table(rows):
+    """key별 조회 항목 표 (key는 처음 나온 순서, 값은 마지막 비결측 값)"""
+    return rows.groupby(level=0, sort=False).last()
+
+
+def _code_map_from_frame(df):
+    """총판정보의 숫자코드(없으면 총판코드) → 공식명"""
+    code_col = next((c for c in CODE_COLUMNS if c in df.columns), None)
+    if code_col is None or OFFICIAL_COLUMN not in df.columns:
+        return {}
+    valid = df[OFFICIAL_COLUMN].notna() & df[code_col].notna()
+    codes = normalize_codes(df.loc[valid, code_col])
+    names = df.loc[valid, OFFICIAL_COLUMN].astype(str).str.strip()
+    keep = codes != ''
+    return dict(zip(codes[keep], names[keep]))
+
+
+class DistributorDirectory:
+    """총판코드/공식명/별칭으로 등급·지역 정보를 조회하는 읽기 전용 테이블"""
+
+    def __init__(self, distributor_df=None, code_to_official=None):
+        """
+        Args:
+            distributor_df: 총판정보 데이터프레임 (컬럼명 strip 된 상태)
+            code_to_official: {정규화 코드: 공식명} (매핑 CSV 등). 비어 있으면 distributor_df의 코드로 생성
+        """
+        df = distributor_df if distributor_df is not None else pd.DataFrame()
+        code_map = dict(code_to_official) if code_to_official else _code_map_from_frame(df)
+
+        self._rows_by_official = _field_rows(df, OFFICIAL_COLUMN)
+        self._rows_by_name = _field_rows(df, '총판명')
+        self.by_official = _field_table(self._rows_by_official)
+        self.by_name = _field_table(self._rows_by_name)
+        self.fields = list(self.by_official.columns)
+
+        self._code_to_official = code_map
+        self._official_to_code = {name: code for code, name in code_map.items()}
+        self._info_by_official = self.by_official.to_dict('index')
+        self._info_by_code = {
+            code: self._info_by_official[name]
+            for code, name in code_map.items()
+            if name in self._info_by_official
+        }
+        self._info_by_name = self.by_name.to_dict('index')
+        self._aliases = self._build_aliases(df)
+        # 총판 표시명 → 지역 정보 (resolve_region 결과 메모, 프로세스 공유 객체라 rerun 사이에도 유지)
+        self._region_memo = {}
+
+    @staticmethod
+    def _build_aliases(df):
+        cols = [c for c in ALIAS_COLUMNS if c in df.columns]
+        if OFFICIAL_COLUMN not in df.columns or not cols:
+            return {}
+        rows = df[df[OFFICIAL_COLUMN].notna()]
+        # 행 순서대로 펼쳐 dict로 만들면 같은 별칭은 마지막 행이 우선 (기존 페이지 규칙)
+        names = pd.Series(rows[cols].to_numpy(dtype=object).ravel())
+        officials = pd.Series(np.repeat(rows[OFFICIAL_COLUMN].astype(str).str.strip().to_numpy(dtype=object), len(cols)))
+        valid = names.notna()
+        return dict(zip(names[valid].astype(str).str.strip(), officials[valid]))
+
+    def __len__(self):
+        return len(self._info_by_official)
+
+    @property
+    def code_to_official(self):
+        """{정규화 코드: 공식명} (읽기 전용)"""
+        return MappingProxyType(self._code_to_official)
+
+    @property
+    def official_to_code(self):
+        """{공식명: 정규화 코드} (같은 공식명이면 마지막 코드)"""
+        return MappingProxyType(self._official_to_code)
+
+    def official_name(self, code, default=None):
+        """총판코드(정규화 전 값도 가능) → 공식명"""
+        return self._code_to_official.get(normalize_code(code), default)
+
+    def code_of(self, official, default=None):
+        """공식명 → 정규화 코드"""
+        return self._official_to_code.get(str(official).strip(), default)
+
+    def resolve_alias(self, name, default=None):
+        """총판명/총판명1/공식명 → 공식명 (없으면 default)"""
+        if pd.isna(name):
+            return default
+        key = str(name).strip()
+        if key in self._aliases:
+            return self._aliases[key]
+        return key if key in self._info_by_official else default
+
+    def resolve_aliases(self, values):
+        """
+        Series 전체를 공식명으로 (별칭 dict 매핑, 찾지 못한 값은 strip 한 원래 값 유지)
+
+        Returns:
+            공식명 Series (같은 index)
+        """
+        names = values.astype(str).str.strip()
+        return names.map(self._aliases).fillna(names)
+
+    def info(self, key):
+        """
+        코드 또는 공식명으로 조회
+
+        Returns:
+            {'등급': ..., '시도': ..., ...} 또는 None
+        """
+        if pd.isna(key):
+            return None
+        found = self._info_by_code.get(normalize_code(key))
+        if found is None:
+            found = self._info_by_official.get(str(key).strip())
+        return dict(found) if found is not None else None
+
+    def get(self, key, field, default=None):
+        """코드/공식명의 항목 하나 (예: get('4001', '등급'))"""
+        found = self.info(key)
+        if found is None:
+            return default
+        value = found.get(field)
+        return default if pd.isna(value) else value
+
+    def field_map(self, field, by='official', keep=None):
+        """
+        {키: 항목 값} dict (Series.map용)
+
+        Args:
+            field: '등급', '시군구' 등
+            by: 'official'(공식명) / 'code'(정규화 코드) / 'name'(총판명)
+            keep: 같은 키가 여러 행일 때 규칙
+                None - 항목별 마지막 비결측 값 (기본)
+                'first' / 'last' - 첫/마지막 행의 값 (그 값이 결측이면 키 없음, drop_duplicates와 같음)
+        """
+        if by == 'code':
+            values = self.field_map(field, keep=keep)
+            return {code: values[name] for code, name in self._code_to_official.items() if name in values}
+        if keep is None:
+            table = self.by_name if by == 'name' else self.by_official
+        else:
+            table = self._rows_by_name if by == 'name' else self._rows_by_official
+            table = table[~table.index.duplicated(keep=keep)]
+        if field not in table.columns:
+            return {}
+        return table[field].dropna().to_dict()
+
+    def map_field(self, values, field, by='official', keep=None):
+        """Series 전체를 항목 값으로 변환 (고유값 기준 dict 매핑, 없으면 NaN, keep은 field_map과 같음)"""
+        if by == 'code':
+            values = normalize_codes(values)
+        return values.map(self.field_map(field, by=by, keep=keep))
+
+    def resolve_region(self, name):
+        """
+        주문의 총판 표시명 하나 → 조회 항목 dict
+
+        공식명 → 총판명 순으로 정확히 일치하는 행을 찾고, 없으면 총판명과의 부분 일치
+        (한쪽이 다른 쪽에 포함, 총판정보 행 순서상 첫 번째)로 찾습니다.
+        결과는 표시명별로 메모해 두므로 같은 값은 한 번만 탐색합니다.
+
+        Returns:
+            {'등급': ..., '시군구': ..., ...} 또는 None
+        """
+        if pd.isna(name):
+            return None
+        key = str(name)
+        if key in self._region_memo:
+            return self._region_memo[key]
+        found = self._info_by_official.get(key) or self._info_by_name.get(key)
+        if found is None:
+            found = next((info for n, info in self._info_by_name.items() if n in key or key in n), None)
+        self._region_memo[key] = found
+        return found
+
+    def map_region(self, values, fields):
+        """
+        Series의 고유값마다 resolve_region을 한 번씩 호출해 행 전체에 펼침
+
+        Args:
+            values: 총판 표시명 Series (category 가능)
+            fields: 항목 이름 목록 (예: ['시군구', '시군구2', '지역'])
+
+        Returns:
+            항목별 컬럼을 가진 DataFrame (같은 index, 찾지 못하면 None)
+        """
+        codes, uniques = pd.factorize(values)
+        resolved = [self.resolve_region(v) for v in uniques]
+        result = {}
+        for field in fields:
+            table = np.array([info.get(field) if info else None for info in resolved] + [None], dtype=object)
+            result[field] = table[codes]
+        return pd.DataFrame(result, index=values.index)
+
+    def region_table(self, by='name'):
+        """
+        키별 조회 항목 전체 {키: {항목: 값}} (키는 총판정보에 처음 나온 순서)
+
+        Args:
+            by: 'name'(총판명) / 'official'(공식명)
+        """
+        table = self.by_name if by == 'name' else self.by_official
+        return table.to_dict('index')
+
+
+def directory_from_session(state):
+    """
+    세션에 공유된 DistributorDirectory (없으면 distributor_df / code_to_official로 생성)
+
+    Args:
+        state: st.session_state
+    """
+    directory = state.get('distributor_directory')
+    if directory is None:
+        directory = DistributorDirectory(state.get('distributor_df'), state.get('code_to_official'))
+    return directory
@@ -0,0 +1,323 @@
+"""
+골든 출력 회귀 검사 (성능 개선 전후 수치 동일성)
+
+시장 규모/점유율 계산을 빠르게 고칠 때 점유율(%), 시장규모 같은 보고 수치가
+조용히 바뀌지 않았는지 확인하는 도구입니다. scripts/golden_check.py가 사용합니다.
+
+- 스냅샷: 표마다 Feather(zstd 압축) 한 파일 + manifest.json (입력 정보, 표별 키/행 수)
+  Feather로 저장할 수 없는 표(섞인 object 컬럼 등)는 pickle
+- 비교: 키 컬럼으로 행을 맞춘 뒤(키가 없으면 숫자가 아닌 컬럼으로 정렬) 컬럼별로
+  숫자는 허용 오차(rtol/atol) 안이면 같음, 나머지는 값이 같아야 함 (NaN끼리는 같음)
+  → 컬럼별 불일치 수, 최대 절대/상대 오차, 예시 행을 보고
+- dtype 변경(int64 → int32, category → str 등)은 값이 같으면 경고로만 보고
+- 익명화 입력: 실제 원본 CSV의 개인정보 컬럼(대표자, 연락처, 담당자 이름 등)만
+  고정된 가명으로 바꿔 저장 (나머지 셀은 그대로라 계산 결과에 영향 없음)
+"""
+import csv
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.csv_ingest import sniff_encoding
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow는 streamlit 의존성으로 함께 설치됨
+    feather = None
+
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_RTOL = 1e-9
+DEFAULT_ATOL = 1e-9
+
+# 원본 CSV별 익명화 컬럼: 헤더 이름(strip 기준) → 가명 접두어 (None이면 고정 문자열로 가림)
+ANONYMIZE_COLUMNS = {
+    'total': {'본사담당자(2025.09)': '담당자'},
+    'order': {'본사담당자(2025.09)': '담당자'},
+    'product': {'대표저자': '저자', '담당': '담당자'},
+    'distributor': {'대 표': '대표', '핸 드 폰': None, '연 락 처': None, 'FAX': None, '주 소': None},
+}
+MASK = '***'
+
+
+def as_frame(value):
+    """
+    스냅샷으로 저장할 수 있는 DataFrame으로 변환
+
+    - DataFrame: 이름 있는 인덱스는 컬럼으로, 이름 없는 인덱스(필터 후 남은 행 번호 등)는 버림
+    - Series: 인덱스 + 값 컬럼 (이름 없으면 'value')
+    - dict: key / value 두 컬럼
+    """
+    if isinstance(value, dict):
+        return pd.DataFrame({'key': [str(k) for k in value], 'value': list(value.values())})
+    if isinstance(value, pd.Series):
+        value = value.to_frame(value.name if value.name is not None else 'value')
+    frame = value.reset_index(drop=all(name is None for name in value.index.names))
+    frame.columns = [str(c) for c in frame.columns]
+    return frame
+
+
+def write_snapshot(directory, tables, meta=None):
+    """
+    표 묶음을 스냅샷 디렉터리에 저장 (기존 스냅샷은 덮어씀)
+
+    Args:
+        directory: 저장할 디렉터리
+        tables: {이름: (DataFrame/Series/dict, 키 컬럼 목록 또는 None)}
+        meta: manifest에 함께 남길 정보 (입력 설명, 커밋 등)
+
+    Returns:
+        manifest dict
+    """
+    os.makedirs(directory, exist_ok=True)
+    entries = {}
+    for name, (value, keys) in tables.items():
+        frame = as_frame(value)
+        entries[name] = {
+            'file': _write_table(directory, name, frame),
+            'keys': keys,
+            'rows': len(frame),
+            'columns': list(frame.columns),
+        }
+    manifest = {**(meta or {}), 'tables': entries}
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, default=_json_default)
+    return manifest
+
+
+def read_manifest(directory):
+    """스냅샷 manifest (없으면 None)"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_table(directory, entry):
+    """manifest 항목의 표 읽기"""
+    path = os.path.join(directory, entry['file'])
+    if path.endswith('.feather'):
+        return feather.read_feather(path)
+    return pd.read_pickle(path)
+
+
+def _write_table(directory, name, frame):
+    stem = hashlib.sha1(name.encode('utf-8')).hexdigest()[:12]
+    if feather is not None:
+        filename = f'{stem}.feather'
+        try:
+            feather.write_feather(frame, os.path.join(directory, filename), compression='zstd')
+            return filename
+        except (TypeError, ValueError):
+            # pyarrow 변환 실패(섞인 object 컬럼 등) → pickle
+            pass
+    filename = f'{stem}.pkl'
+    frame.to_pickle(os.path.join(directory, filename))
+    return filename
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f'JSON으로 변환할 수 없는 값: {type(value)!r}')
+
+
+def _plain(series):
+    """category → 실제 값 dtype (정렬/비교를 카테고리 순서와 무관하게)"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(series.cat.categories.dtype)
+    return series
+
+
+def _is_number(series):
+    return pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype)
+
+
+def _align(expected, actual, keys):
+    """
+    두 표의 행을 맞춤
+
+    Returns:
+        (expected, actual, 행 라벨 목록, 기대에만 있는 행 수, 결과에만 있는 행 수)
+    """
+    if keys and all(k in expected.columns and k in actual.columns for k in keys):
+        exp = expected.set_index(keys)
+        act = actual.set_index(keys)
+        if exp.index.is_unique and act.index.is_unique:
+            common = exp.index.intersection(act.index, sort=False)
+            missing = len(exp.index.difference(act.index))
+            extra = len(act.index.difference(exp.index))
+            exp, act = exp.loc[common], act.loc[common]
+            return exp.reset_index(drop=True), act.reset_index(drop=True), list(common), missing, extra
+
+    # 키가 없거나 중복 → 숫자가 아닌 컬럼(없으면 전체)으로 정렬한 뒤 위치로 비교
+    order_by = [c for c in expected.columns if c in actual.columns and not _is_number(expected[c])]
+    order_by = order_by or [c for c in expected.columns if c in actual.columns]
+    if order_by:
+        # object 컬럼에 섞인 타입(None, int, str)도 정렬되도록 숫자가 아닌 컬럼은 문자열로 비교
+        def sort_key(s):
+            return s if _is_number(s) else s.astype(str)
+
+        expected = expected.sort_values(order_by, kind='stable', na_position='last', key=sort_key)
+        actual = actual.sort_values(order_by, kind='stable', na_position='last', key=sort_key)
+    n = min(len(expected), len(actual))
+    labels = list(range(n))
+    return (
+        expected.iloc[:n].reset_index(drop=True), actual.iloc[:n].reset_index(drop=True), labels,
+        max(len(expected) - n, 0), max(len(actual) - n, 0),
+    )
+
+
+def _scalar(value):
+    # np.float64(1.0) → 1.0 (보고서 표시용)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _column_diff(exp, act, labels, rtol, atol, examples):
+    """컬럼 하나 비교 → 불일치가 없으면 None"""
+    if _is_number(exp) and _is_number(act):
+        a = exp.to_numpy(dtype='float64', na_value=np.nan)
+        b = act.to_numpy(dtype='float64', na_value=np.nan)
+        both_nan = np.isnan(a) & np.isnan(b)
+        with np.errstate(invalid='ignore'):
+            same = both_nan | np.isclose(a, b, rtol=rtol, atol=atol)
+        bad = np.flatnonzero(~same)
+        if not len(bad):
+            return None
+        delta = np.abs(a[bad] - b[bad])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel = delta / np.abs(a[bad])
+        result = {
+            'mismatches': len(bad),
+            'max_abs': float(np.nanmax(delta)) if not np.isnan(delta).all() else None,
+            'max_rel': float(np.nanmax(rel)) if not np.isnan(rel).all() else None,
+        }
+    else:
+        a = exp.astype(object).to_numpy()
+        b = act.astype(object).to_numpy()
+        same = (pd.isna(a) & pd.isna(b)) | (a == b)
+        bad = np.flatnonzero(~same)
+        if not len(bad):
+            return None
+        result = {'mismatches': len(bad), 'max_abs': None, 'max_rel': None}
+    result['examples'] = [
+        {'row': labels[i], 'expected': _scalar(a[i]), 'actual': _scalar(b[i])} for i in bad[:examples]
+    ]
+    return result
+
+
+def diff_frame(expected, actual, keys=None, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL, examples=3):
+    """
+    기대 표와 현재 표의 허용 오차 비교
+
+    Args:
+        expected: 스냅샷 표
+        actual: 현재 구현 결과 (as_frame 적용 전 값도 가능)
+        keys: 행을 맞출 키 컬럼 (None이면 숫자가 아닌 컬럼으로 정렬 후 위치 비교)
+        rtol / atol: 숫자 컬럼 허용 오차 (np.isclose 기준)
+        examples: 컬럼별로 보여줄 불일치 예시 수
+
+    Returns:
+        dict: ok, rows(기대, 현재), missing_columns, extra_columns, missing_rows, extra_rows,
+              dtype_changes({컬럼: (기대, 현재)}), columns({컬럼: 불일치 정보})
+    """
+    actual = as_frame(actual)
+    common = [c for c in expected.columns if c in actual.columns]
+    report = {
+        'rows': (len(expected), len(actual)),
+        'missing_columns': [c for c in expected.columns if c not in actual.columns],
+        'extra_columns': [c for c in actual.columns if c not in expected.columns],
+        'dtype_changes': {
+            c: (str(expected[c].dtype), str(actual[c].dtype))
+            for c in common if str(expected[c].dtype) != str(actual[c].dtype)
+        },
+        'columns': {},
+    }
+    exp = pd.DataFrame({c: _plain(expected[c]) for c in common})
+    act = pd.DataFrame({c: _plain(actual[c]) for c in common})
+    exp, act, labels, report['missing_rows'], report['extra_rows'] = _align(exp, act, keys)
+    for column in exp.columns:
+        diff = _column_diff(exp[column], act[column], labels, rtol, atol, examples)
+        if diff is not None:
+            report['columns'][column] = diff
+    report['ok'] = not (
+        report['missing_columns'] or report['extra_columns'] or report['missing_rows']
+        or report['extra_rows'] or report['columns']
+    )
+    return report
+
+
+def format_report(name, report):
+    """diff_frame 결과를 사람이 읽는 줄 목록으로"""
+    expected_rows, actual_rows = report['rows']
+    status = 'OK' if report['ok'] else 'MISMATCH'
+    lines = [f'{name}: {status} ({expected_rows:,} → {actual_rows:,} rows)']
+    if report['missing_columns']:
+        lines.append(f"  없어진 컬럼: {report['missing_columns']}")
+    if report['extra_columns']:
+        lines.append(f"  새 컬럼: {report['extra_columns']}")
+    if report['missing_rows'] or report['extra_rows']:
+        lines.append(f"  행: 기대에만 {report['missing_rows']:,}, 현재에만 {report['extra_rows']:,}")
+    for column, (before, after) in report['dtype_changes'].items():
+        lines.append(f'  dtype {column}: {before} → {after}')
+    for column, diff in report['columns'].items():
+        error = ''
+        if diff['max_abs'] is not None:
+            error = f", 최대 절대오차 {diff['max_abs']:.6g}"
+            if diff['max_rel'] is not None:
+                error += f", 최대 상대오차 {diff['max_rel']:.3g}"
+        lines.append(f"  {column}: {diff['mismatches']:,}행 불일치{error}")
+        for example in diff['examples']:
+            lines.append(f"    {example['row']}: {example['expected']!r} → {example['actual']!r}")
+    return lines
+
+
+def _pseudonym(prefix, value):
+    return f'{prefix}{hashlib.sha1(value.encode("utf-8")).hexdigest()[:6]}'
+
+
+def anonymize_csv(source, target, columns):
+    """
+    CSV의 지정 컬럼만 가명/가림 처리해 utf-8-sig로 저장 (헤더와 나머지 셀은 그대로)
+
+    Args:
+        source / target: 원본 / 저장 경로
+        columns: {헤더 이름: 가명 접두어 또는 None(가림)}
+    """
+    with open(source, 'r', encoding=sniff_encoding(source), newline='') as src, \
+            open(target, 'w', encoding='utf-8-sig', newline='') as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        header = next(reader, [])
+        writer.writerow(header)
+        positions = [(i, columns[name.strip()]) for i, name in enumerate(header) if name.strip() in columns]
+        for row in reader:
+            for i, prefix in positions:
+                if i < len(row) and row[i].strip():
+                    row[i] = MASK if prefix is None else _pseudonym(prefix, row[i].strip())
+            writer.writerow(row)
+
+
+def anonymize_sources(paths, directory):
+    """
+    원본 CSV들을 익명화해 directory에 저장
+
+    Args:
+        paths: {이름: 원본 경로} (data_pipeline.DEFAULT_PATHS와 같은 키)
+        directory: 저장할 디렉터리
+
+    Returns:
+        dict: 익명화한 파일 경로 (없는 원본은 그대로 원본 경로)
+    """
+    os.makedirs(directory, exist_ok=True)
+    result = {}
+    for name, path in paths.items():
+        if not os.path.exists(path):
+            result[name] = path
+            continue
+        result[name] = os.path.join(directory, os.path.basename(path))
+        anonymize_csv(path, result[name], ANONYMIZE_COLUMNS.get(name, {}))
+    return result
@@ -11,6 +11,7 @@
 - 미술 ①, 미술 ② → 1학기, 2학기
 """
 
+import numpy as np
 import pandas as pd
 import re
 
@@ -30,6 +31,17 @@ SUBJECT_GRADE_MAPPING = {
     # 기타 선택과목은 2-3학년
 }
 
+# 과목명 끝의 학기 표시 ("한국사 1" → "한국사", "미술 ①" → "미술")
+SEMESTER_SUFFIX = r'\s*[①②③④⑤⑥\d]+\s*$'
+
+# SUBJECT_GRADE_MAPPING에 없는 과목의 키워드 규칙 (학교급코드, 키워드, 학년) - 위에서부터 먼저 맞는 규칙
+# 중학교 미술/체육/음악 등 어느 규칙에도 안 맞으면 전 학년(None)
+GRADE_KEYWORD_RULES = [
+    (3, ('정보', '진로'), 1),  # 중1 과목들
+    (3, ('보건',), 2),  # 중2 과목들
+    (4, ('한국사', '인공지능'), 1),  # 고1 필수과목 (선택과목은 대부분 2-3학년이지만 특정 어려움)
+]
+
 def extract_grade_from_subject(subject_name, school_level_code=None):
     """
     과목명에서 학년 정보 추출
@@ -50,7 +62,7 @@ def extract_grade_from_subject(subject_name, school_level_code=None):
     
     # 기본 과목명에서 숫자/기호 제거 (학기 표시 제거)
     # "한국사 1" → "한국사", "미술 ①" → "미술"
-    base_subject = re.sub(r'\s*[①②③④⑤⑥\d]+\s*$', '', subject_str).strip()
+    base_subject = re.sub(SEMESTER_SUFFIX, '', subject_str).strip()
     
     # 직접 매핑 확인 (기본 과목명으로)
     if base_subject in SUBJECT_GRADE_MAPPING:
@@ -65,27 +77,61 @@ def extract_grade_from_subject(subject_name, school_level_code=None):
             return mapping['학년']
     
     # 과목 키워드로 추정
-    if school_level_code == 3:  # 중학교
-        # 중1 과목들
-        if any(keyword in base_subject for keyword in ['정보', '진로']):
-            return 1
-        # 중2 과목들
-        elif any(keyword in base_subject for keyword in ['보건']):
-            return 2
-        # 미술, 체육 등은 전 학년 대상
-        elif any(keyword in base_subject for keyword in ['미술', '체육', '음악']):
-            return None  # 전 학년
-        return None  # 기본: 전 학년
-        
-    elif school_level_code == 4:  # 고등학교
-        # 고1 필수과목
-        if any(keyword in base_subject for keyword in ['한국사', '인공지능']):
-            return 1
-        # 선택과목은 대부분 2-3학년이지만 특정 어려움
-        return None  # 전 학년 또는 선택 과목
+    for level, keywords, grade in GRADE_KEYWORD_RULES:
+        if school_level_code == level and any(keyword in base_subject for keyword in keywords):
+            return grade
     
     return None
 
+def subject_grade_table(pairs):
+    """
+    (과목명, 학교급코드) 고유 조합별 대상 학년 (extract_grade_from_subject 규칙을 한 번에 적용)
+    
+    주문 행마다 정규식/키워드 검사를 하지 않고 고유 조합에만 적용한 뒤 merge로 붙이는 용도
+    
+    Args:
+        pairs: 과목명, 학교급코드(숫자, 알 수 없으면 NaN) 컬럼의 DataFrame
+    
+    Returns:
+        pairs + 대상학년 컬럼 (float, 전 학년 대상이면 NaN)
+        학교급코드가 NaN이면 extract_grade_from_subject(과목명, NaN)과 같음 (매핑/키워드 미적용)
+    """
+    subjects = pairs['과목명'].astype(object)
+    codes = pd.to_numeric(pairs['학교급코드'], errors='coerce').astype('float64')
+    text = subjects.astype(str).str.strip()
+    base = text.str.replace(SEMESTER_SUFFIX, '', regex=True).str.strip()
+    
+    grade = pd.Series(np.nan, index=pairs.index)
+    pending = subjects.notna()
+    # 기본 과목명 → 원래 과목명 순으로 직접 매핑 (학교급이 맞을 때만, 매핑 학년이 None이면 전 학년으로 확정)
+    mapped_level = {name: rule['학교급코드'] for name, rule in SUBJECT_GRADE_MAPPING.items()}
+    mapped_grade = {name: rule['학년'] for name, rule in SUBJECT_GRADE_MAPPING.items()}
+    for key in (base, text):
+        hit = pending & (key.map(mapped_level) == codes)
+        grade[hit] = key[hit].map(mapped_grade).astype('float64')
+        pending &= ~hit
+    # 키워드 규칙
+    for level, keywords, value in GRADE_KEYWORD_RULES:
+        pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+        hit = pending & (codes == level) & base.str.contains(pattern, regex=True)
+        grade[hit] = value
+        pending &= ~hit
+    return pairs.assign(대상학년=grade)
+
+def subject_grades(subjects, school_level_codes):
+    """
+    행별 대상 학년 (고유 (과목명, 학교급코드) 조합에만 규칙 적용 후 merge)
+    
+    Returns:
+        float ndarray (행 순서 그대로, 전 학년 대상이면 NaN)
+    """
+    keys = pd.DataFrame({
+        '과목명': pd.Series(subjects).reset_index(drop=True),
+        '학교급코드': pd.Series(school_level_codes).reset_index(drop=True).astype('float64'),
+    })
+    table = subject_grade_table(keys.drop_duplicates().reset_index(drop=True))
+    return keys.merge(table, on=['과목명', '학교급코드'], how='left')['대상학년'].to_numpy(dtype='float64')
+
 def get_next_year_grade_column(current_grade, is_2026=True):
     """
     2025년 학년별 학생수 데이터에서 2026년도에 해당하는 컬럼명 반환
@@ -271,10 +317,78 @@ def calculate_market_size_by_region_subject(order_df, total_df):
     
     return pd.DataFrame(results)
 
+def _school_level_code(school_level):
+    """학교급명 → 학교급 코드 (중학교 3, 고등 4, 초등 2, 그 외 None)"""
+    if pd.isna(school_level):
+        return None
+    if '중학교' in str(school_level):
+        return 3
+    elif '고등' in str(school_level):
+        return 4
+    elif '초등' in str(school_level):
+        return 2
+    return None
+
+def school_level_codes(school_levels):
+    """
+    행별 학교급 코드 (고유 학교급명마다 한 번 판별)
+    
+    Returns:
+        float Series (알 수 없으면 NaN)
+    """
+    values = pd.Series(school_levels).astype(object)
+    codes = {name: _school_level_code(name) for name in pd.unique(values.dropna())}
+    return values.map(codes).astype('float64')
+
+def grade_market_lookup(total_df):
+    """
+    (학교급코드, 대상학년) → 2026년 시장 규모(학생수) 조회표
+    
+    학교급별 학년 컬럼 합계를 한 번만 구해 calculate_group_market_share의 행별 규칙을 표로 옮김
+    - 대상학년이 있으면 다음 학년 컬럼 합계 (컬럼이 없으면 학교급 전체)
+    - 대상학년 NaN(전 학년)이면 get_all_grades_for_school_level 값
+    - 표에 없는 조합(학교급코드 없음/학생수 데이터에 없는 학교급)은 0
+    
+    Returns:
+        DataFrame [학교급코드, 대상학년, 시장규모]
+    """
+    grade_columns = [f'{i}학년 학생수' for i in range(1, 7) if f'{i}학년 학생수' in total_df.columns]
+    level_sums = total_df.groupby('학교급코드')[grade_columns].sum()
+    rows = []
+    for level, sums in level_sums.iterrows():
+        # get_all_grades_for_school_level과 같은 컬럼 (2026년 기준 +1학년)
+        all_columns = [f'{i+1}학년 학생수' for i in range(1, 3 if level != 2 else 6)]
+        all_grades = sum(sums[col] for col in all_columns if col in sums.index)
+        rows.append((level, np.nan, all_grades))
+        for grade in range(1, 7):
+            grade_column = get_next_year_grade_column(grade, is_2026=True)
+            rows.append((level, grade, sums[grade_column] if grade_column in sums.index else all_grades))
+    lookup = pd.DataFrame(rows, columns=['학교급코드', '대상학년', '시장규모'])
+    lookup[['학교급코드', '대상학년']] = lookup[['학교급코드', '대상학년']].astype('float64')
+    return lookup
+
+def grade_market_sizes(school_level_codes, target_grades, total_df, lookup=None):
+    """
+    행별 시장 규모 (grade_market_lookup을 merge로 붙임)
+    
+    Returns:
+        ndarray (행 순서 그대로)
+    """
+    lookup = grade_market_lookup(total_df) if lookup is None else lookup
+    keys = pd.DataFrame({
+        '학교급코드': np.asarray(school_level_codes, dtype='float64'),
+        '대상학년': np.asarray(target_grades, dtype='float64'),
+    })
+    merged = keys.merge(lookup, on=['학교급코드', '대상학년'], how='left')
+    return merged['시장규모'].fillna(0).to_numpy()
+
 def calculate_accurate_market_share(order_df, total_df, group_by_columns):
     """
     일반적인 그룹별 정확한 점유율 계산
     
+    주문 행의 대상 학년은 고유 (과목명, 학교급코드) 조합마다 한 번 판별하고(subject_grades),
+    행별 시장 규모는 (학교급코드, 대상학년) 조회표로 붙인 뒤 그룹 합계 한 번으로 계산
+    
     Args:
         order_df: 주문 데이터
         total_df: 학생수 데이터
@@ -283,56 +397,37 @@ def calculate_accurate_market_share(order_df, total_df, group_by_columns):
     Returns:
         DataFrame with accurate market share
     """
-    # 각 주문 건에 대상 학년 정보 추가
-    order_with_grade = order_df.copy()
+    keys = [group_by_columns] if isinstance(group_by_columns, str) else list(group_by_columns)
+    codes = school_level_codes(order_df['학교급명'])
+    grades = subject_grades(order_df['과목명'], codes)
     
-    # 학교급 코드 추가
-    def get_school_code(school_level):
-        if pd.isna(school_level):
-            return None
-        if '중학교' in str(school_level):
-            return 3
-        elif '고등' in str(school_level):
-            return 4
-        elif '초등' in str(school_level):
-            return 2
-        return None
-    
-    order_with_grade['학교급코드'] = order_with_grade['학교급명'].apply(get_school_code)
-    order_with_grade['대상학년'] = order_with_grade.apply(
-        lambda row: extract_grade_from_subject(row['과목명'], row['학교급코드']),
-        axis=1
-    )
+    rows = pd.DataFrame({col: order_df[col] for col in keys})
+    # 결측/소수 부수도 기존 합계처럼 그대로 더함 (숫자가 아닌 값은 결측)
+    rows['주문부수'] = pd.to_numeric(order_df['부수'], errors='coerce')
+    rows['시장규모'] = grade_market_sizes(codes, grades, total_df)
     
     # 그룹별 집계
-    result = order_with_grade.groupby(group_by_columns).apply(
-        lambda group: calculate_group_market_share(group, total_df)
-    ).reset_index()
+    result = rows.groupby(keys)[['주문부수', '시장규모']].sum().astype('float64')
+    market_size = result['시장규모'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share = np.where(market_size > 0, result['주문부수'].to_numpy() / market_size * 100, 0)
+    result['점유율(%)'] = share
     
-    return result
+    return result.reset_index()
 
-def calculate_group_market_share(group_df, total_df):
+def calculate_group_market_share(group_df, total_df, lookup=None):
     """
     그룹에 대한 시장 규모 및 점유율 계산
+    
+    Args:
+        group_df: 학교급코드, 대상학년, 부수 컬럼이 있는 주문 행
+        total_df: 학생수 데이터
+        lookup: grade_market_lookup(total_df) 결과 (여러 그룹에 재사용할 때)
     """
     total_orders = group_df['부수'].sum()
     
     # 시장 규모 계산 (학년 고려)
-    market_size = 0
-    
-    for _, row in group_df.iterrows():
-        school_code = row.get('학교급코드')
-        target_grade = row.get('대상학년')
-        
-        if target_grade and school_code:
-            grade_column = get_next_year_grade_column(target_grade, is_2026=True)
-            if grade_column and grade_column in total_df.columns:
-                grade_market = total_df[total_df['학교급코드'] == school_code][grade_column].sum()
-                market_size += grade_market
-            else:
-                market_size += get_all_grades_for_school_level(school_code, total_df)
-        elif school_code:
-            market_size += get_all_grades_for_school_level(school_code, total_df)
+    market_size = grade_market_sizes(group_df['학교급코드'], group_df['대상학년'], total_df, lookup).sum()
     
     share = (total_orders / market_size * 100) if market_size > 0 else 0
     
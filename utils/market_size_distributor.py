@@ -2,15 +2,289 @@
 총판별 시장 규모 계산 모듈
 
 학생수 CSV의 담당총판 정보를 활용하여 총판별 정확한 시장 규모를 계산합니다.
+
+- 총판 × 학교급(중/고) × 학년(1/2) 학생수는 distributor_grade_cube로 한 번만 집계
+- 총판별 / (총판, 도서코드)별 표는 주문 groupby 집계 + 큐브 조회로 계산
+- 기존 총판·그룹별 스캔 함수(*_scan)는 정합성 검사용으로 유지
 """
 
 import pandas as pd
 import numpy as np
 
 
-def calculate_distributor_market_size(total_df, order_df, distributor_df):
+# 총판 큐브의 학교급코드(3=중학교, 4=고등학교)와 학년 컬럼
+CUBE_LEVELS = (3, 4)
+CUBE_GRADES = ('1학년 학생수', '2학년 학생수')
+
+# 배정 학년 번호(0=학년도 정보 없음) → (대상학년, 배정로직)
+_GRADE_TEXT = {
+    1: '1학년',
+    2: '2학년',
+    0: '1,2학년',
+}
+
+
+def _distributor_column(total_df):
+    return '담당총판_공식' if '담당총판_공식' in total_df.columns else '담당총판'
+
+
+def distributor_grade_cube(total_df, dist_col=None):
+    """
+    총판 × 학교급(중/고) × 학년(1/2) 학생수 합계 큐브
+
+    총판·도서코드 그룹마다 total_df를 총판으로 다시 거르던 계산을 한 번의 groupby로 바꿉니다.
+
+    Args:
+        total_df: 학생수 데이터 (담당총판 정보 포함)
+        dist_col: 총판 컬럼 (기본: 담당총판_공식, 없으면 담당총판)
+
+    Returns:
+        index=총판명, columns=(학교급코드, 학년 컬럼) MultiIndex 인 DataFrame
+        (담당 학교가 있는 총판만, 중·고등학교가 없으면 0)
+    """
+    dist_col = dist_col or _distributor_column(total_df)
+    columns = pd.MultiIndex.from_product([CUBE_LEVELS, CUBE_GRADES])
+    if dist_col not in total_df.columns or total_df.empty:
+        return pd.DataFrame(columns=columns)
+
+    levels = total_df['학교급코드']
+    parts = {}
+    for level in CUBE_LEVELS:
+        for grade in CUBE_GRADES:
+            parts[(level, grade)] = total_df[grade].where(levels == level, 0)
+    values = pd.DataFrame(parts, index=total_df.index)
+    cube = values.groupby(total_df[dist_col].to_numpy(dtype=object), sort=False).sum()
+    cube.columns = columns
+    return cube
+
+
+def _as_sum_dtype(values):
+    """정수 합계는 int64로 (Series.sum()이 int32 컬럼도 int64 스칼라를 돌려주는 것과 맞춤)"""
+    values = np.asarray(values)
+    return values.astype(np.int64) if values.dtype.kind in 'iub' else values
+
+
+def _first_positions(group_ids, n_groups):
+    """그룹 번호별 첫 행 위치 (group_ids는 0..n_groups-1)"""
+    first = np.full(n_groups, len(group_ids), dtype=np.int64)
+    np.minimum.at(first, group_ids, np.arange(len(group_ids)))
+    return first
+
+
+def calculate_distributor_market_size(total_df, order_df, distributor_df, vectorized=True, cube=None):
     """
     총판별 시장 규모 계산
+
+    학생수는 총판별 groupby 한 번(distributor_grade_cube + 학교급별 학교 수),
+    주문은 총판별 groupby 한 번으로 집계한 뒤 총판명으로 조인합니다.
+    결과(행 순서, 값, 컬럼)는 기존 총판별 스캔(distributor_market_size_scan)과 같습니다.
+
+    Args:
+        total_df: 학생수 데이터 (담당총판 정보 포함)
+        order_df: 주문 데이터
+        distributor_df: 총판 정보 (총판명(공식) 포함)
+        vectorized: False면 기존 총판별 스캔 사용
+        cube: distributor_grade_cube 결과 (여러 번 호출할 때 재사용)
+
+    Returns:
+        총판별 시장 규모 DataFrame
+    """
+    if not vectorized:
+        return distributor_market_size_scan(total_df, order_df, distributor_df)
+
+    dist_col = _distributor_column(total_df)
+    if dist_col not in total_df.columns:
+        return pd.DataFrame()
+    if cube is None:
+        cube = distributor_grade_cube(total_df, dist_col)
+    if cube.empty:
+        return pd.DataFrame()
+
+    # 1. 학생수 집계: 총판별 중/고 1·2학년 학생수(큐브) + 학교급별 학교 수
+    dist_names = cube.index.dropna().sort_values()
+    students = cube.reindex(dist_names)
+    middle_market = _as_sum_dtype(students[(3, CUBE_GRADES[0])].to_numpy() + students[(3, CUBE_GRADES[1])].to_numpy())
+    high_market = _as_sum_dtype(students[(4, CUBE_GRADES[0])].to_numpy() + students[(4, CUBE_GRADES[1])].to_numpy())
+    total_market = middle_market + high_market
+
+    levels = total_df['학교급코드']
+    school_counts = pd.DataFrame({
+        'middle': (levels == 3).to_numpy(dtype=np.int64),
+        'high': (levels == 4).to_numpy(dtype=np.int64),
+        'all': np.ones(len(total_df), dtype=np.int64),
+    }).groupby(total_df[dist_col].to_numpy(dtype=object), sort=False).sum().reindex(dist_names)
+
+    # 2. 주문 집계: 총판별 부수/금액 합계, 주문 학교 수 (주문이 없는 총판은 0)
+    zeros = np.zeros(len(dist_names), dtype=np.int64)
+    total_orders, total_amount, num_schools = zeros, zeros, zeros
+    if '총판' in order_df.columns:
+        grouped = order_df.groupby('총판', sort=False, observed=True)
+        total_orders = _reindex_filled(_as_sum_series(grouped['부수'].sum()), dist_names)
+        if '금액' in order_df.columns:
+            total_amount = _reindex_filled(_as_sum_series(grouped['금액'].sum()), dist_names)
+        school_code_col = next((c for c in ['정보공시학교코드', '정보공시 학교코드', '학교코드'] if c in order_df.columns), None)
+        if school_code_col:
+            num_schools = _reindex_filled(grouped[school_code_col].nunique(), dist_names)
+
+    # 3. 점유율 (시장 규모가 0이면 0)
+    has_market = total_market > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share_pct = np.where(has_market, total_orders / total_market * 100, 0)
+    if not has_market.any():
+        share_pct = np.zeros(len(dist_names), dtype=np.int64)  # 기존 결과와 같은 정수 0
+
+    return pd.DataFrame({
+        '총판명': np.asarray(dist_names, dtype=object),
+        '중학교_시장규모': middle_market,
+        '고등학교_시장규모': high_market,
+        '전체_시장규모': total_market,
+        '주문부수': total_orders,
+        '주문금액': total_amount,
+        '주문학교수': num_schools,
+        '점유율(%)': share_pct,
+        '담당_중학교수': school_counts['middle'].to_numpy(),
+        '담당_고등학교수': school_counts['high'].to_numpy(),
+        '담당_전체학교수': school_counts['all'].to_numpy(),
+    })
+
+
+def _as_sum_series(values):
+    return pd.Series(_as_sum_dtype(values), index=values.index)
+
+
+def _reindex_filled(values, index):
+    """총판별 집계를 index 순서로 (없는 총판은 0)"""
+    return values.reindex(index, fill_value=0).to_numpy()
+
+
+def calculate_subject_market_by_distributor(total_df, order_df, product_df, vectorized=True, cube=None):
+    """
+    총판별 + 도서코드별 시장 규모 계산
+
+    (총판, 도서코드) 그룹 집계를 한 번 하고, 배정 학년에 맞는 학생수는
+    distributor_grade_cube 조회로 가져옵니다. 결과(행 순서, 값, 컬럼)는
+    기존 그룹별 스캔(subject_market_by_distributor_scan)과 같습니다.
+    행은 그룹별로 독립이라 주문 일부(추가분이 건드린 그룹)만 넣어 다시 계산할 수 있습니다.
+
+    Args:
+        total_df: 학생수 데이터 (담당총판 정보 포함)
+        order_df: 주문 데이터 (제품정보와 병합되어 학교급 정보 포함)
+        product_df: 제품 정보
+        vectorized: False면 기존 그룹별 스캔 사용
+        cube: distributor_grade_cube 결과 (여러 번 호출할 때 재사용)
+
+    Returns:
+        총판별 도서코드별 시장 규모 DataFrame
+    """
+    if not vectorized:
+        return subject_market_by_distributor_scan(total_df, order_df, product_df)
+
+    dist_col = _distributor_column(total_df)
+    if dist_col not in total_df.columns or '총판' not in order_df.columns:
+        return pd.DataFrame()
+
+    book_code_col = '도서코드(교지명구분)' if '도서코드(교지명구분)' in order_df.columns else '도서코드'
+    if book_code_col not in order_df.columns:
+        return pd.DataFrame()
+
+    if cube is None:
+        cube = distributor_grade_cube(total_df, dist_col)
+
+    # 총판/도서코드가 결측인 그룹은 제외 (기존: dropna=False로 묶은 뒤 건너뜀)
+    orders = order_df[order_df['총판'].notna() & order_df[book_code_col].notna()]
+    if orders.empty:
+        return pd.DataFrame()
+
+    # 1. (총판, 도서코드) 그룹 집계 - 그룹 번호는 groupby 순회 순서와 같음
+    grouped = orders.groupby(['총판', book_code_col], sort=True)
+    group_ids = grouped.ngroup().to_numpy()
+    n_groups = grouped.ngroups
+    first = _first_positions(group_ids, n_groups)
+    dist_names = orders['총판'].to_numpy(dtype=object)[first]
+    book_codes = orders[book_code_col].to_numpy(dtype=object)[first]
+
+    # 담당 학교가 없는 총판은 제외
+    dist_index = pd.Index(dist_names, dtype=object)
+    keep = dist_index.isin(cube.index)
+    students = cube.reindex(dist_index, fill_value=0)
+    if not keep.any():
+        return pd.DataFrame()
+
+    # 2. 과목명/학교급: 그룹 첫 행 값 (그룹 전체가 결측이면 도서코드 / None)
+    def first_or(col, fallback):
+        if col not in orders.columns:
+            return fallback
+        values = orders[col].to_numpy(dtype=object)[first]
+        has_value = grouped[col].count().to_numpy() > 0
+        return np.where(has_value, values, fallback)
+
+    subject_names = first_or('교과서명_구분', np.array([str(b) for b in book_codes], dtype=object))
+    school_levels = first_or('학교급', np.full(n_groups, None, dtype=object))
+
+    # 3. 학년도별 주문 여부 → 배정 학년 (1: 2025년 주문 있음, 2: 2026년만, 0: 정보 없음)
+    if '학년도' in orders.columns:
+        years = orders['학년도']
+        has_2025 = (years == 2025).groupby(group_ids).any().to_numpy()
+        has_2026 = (years == 2026).groupby(group_ids).any().to_numpy()
+    else:
+        has_2025 = has_2026 = np.zeros(n_groups, dtype=bool)
+    grade_num = np.select([has_2025, has_2026], [1, 2], default=0)
+    grade_logic = np.select(
+        [has_2025 & has_2026, has_2026, has_2025],
+        ['2025+2026년 주문', '2026년만 주문', '2025년만 주문'],
+        default='학년도 정보 없음',
+    )
+
+    # 4. 주문 정보
+    total_orders = _as_sum_dtype(grouped['부수'].sum())
+    total_amount = _as_sum_dtype(grouped['금액'].sum()) if '금액' in orders.columns else np.zeros(n_groups, dtype=np.int64)
+    school_code_col_name = next((c for c in ['정보공시학교코드', '정보공시 학교코드', '학교코드'] if c in orders.columns), None)
+    num_schools = grouped[school_code_col_name].nunique().to_numpy() if school_code_col_name else np.zeros(n_groups, dtype=np.int64)
+
+    # 5. 학교급 판정 후 큐브에서 배정 학년 학생수 조회
+    subject_text = pd.Series(subject_names, dtype=object).map(str)
+    is_middle = (school_levels == '중학교') | subject_text.str.contains('[중등]', regex=False).to_numpy()
+    is_high = ~is_middle & ((school_levels == '고등학교') | subject_text.str.contains('[고등]', regex=False).to_numpy())
+
+    def grade_sum(levels):
+        g1 = sum(students[(level, CUBE_GRADES[0])].to_numpy() for level in levels)
+        g2 = sum(students[(level, CUBE_GRADES[1])].to_numpy() for level in levels)
+        return np.select([grade_num == 1, grade_num == 2], [g1, g2], default=g1 + g2)
+
+    market_size = _as_sum_dtype(np.select(
+        [is_middle, is_high],
+        [grade_sum([3]), grade_sum([4])],
+        default=grade_sum([3, 4]),
+    ))
+    level_text = np.select([is_middle, is_high], ['중등', '고등'], default='전체')
+    target_grade = np.array([_GRADE_TEXT[g] for g in grade_num], dtype=object)
+
+    # 점유율 (시장 규모가 0이면 0)
+    has_market = market_size > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        share_pct = np.where(has_market, total_orders / market_size * 100, 0)
+    if not has_market[keep].any():
+        share_pct = np.zeros(n_groups, dtype=np.int64)  # 기존 결과와 같은 정수 0
+
+    result = pd.DataFrame({
+        '총판명': dist_names,
+        '도서코드': book_codes,
+        '과목명': subject_names,
+        '학교급': level_text,
+        '대상학년': target_grade,
+        '배정로직': grade_logic,
+        '시장규모': market_size,
+        '주문부수': total_orders,
+        '주문금액': total_amount,
+        '주문학교수': num_schools,
+        '점유율(%)': share_pct,
+    })
+    return result[keep].reset_index(drop=True)
+
+
+def distributor_market_size_scan(total_df, order_df, distributor_df):
+    """
+    총판별 시장 규모 계산 (기존 총판별 스캔 방식, 정합성 검사용)
     
     Args:
         total_df: 학생수 데이터 (담당총판 정보 포함)
@@ -83,9 +357,9 @@ def calculate_distributor_market_size(total_df, order_df, distributor_df):
     return pd.DataFrame(results)
 
 
-def calculate_subject_market_by_distributor(total_df, order_df, product_df):
+def subject_market_by_distributor_scan(total_df, order_df, product_df):
     """
-    총판별 + 도서코드별 시장 규모 계산
+    총판별 + 도서코드별 시장 규모 계산 (기존 그룹별 스캔 방식, 정합성 검사용)
     
     Args:
         total_df: 학생수 데이터 (담당총판 정보 포함)
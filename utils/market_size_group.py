@@ -0,0 +1,100 @@
+"""
+그룹별(지역/총판/등급 등) 시장 규모 계산
+
+비교 분석(5), 총판 비교분석(6), 등급별 분석(7) 페이지가 그룹마다
+total_df를 학교코드로 거른 뒤 iterrows로 학교를 하나씩 더하던 계산을 모았습니다.
+
+- 시장 규모 = 그룹이 거래한 학교들의 중등/고등(학교급코드 3/4) 1·2학년 학생수 합계
+- 학교별 값은 total_df의 mid_high_12_students 컬럼(파이프라인에서 미리 계산)을 사용
+- 주문의 (그룹, 학교) 고유 조합에 학교별 값을 붙여 groupby 합계 한 번으로 계산
+"""
+import numpy as np
+import pandas as pd
+
+MARKET_COLUMN = 'mid_high_12_students'
+SCHOOL_CODE_COLUMN = '정보공시 학교코드'
+
+# 시장 규모에 포함하는 학교급(3=중학교, 4=고등학교)과 학년 컬럼
+MARKET_SCHOOL_LEVELS = (3, 4)
+MARKET_GRADE_COLUMNS = ('1학년 학생수', '2학년 학생수')
+
+
+def mid_high_12_students(total_df):
+    """
+    학교 행별 중등/고등 1·2학년 학생수 (그 외 학교급은 0)
+
+    Returns:
+        int64 Series (total_df와 같은 index)
+    """
+    if total_df.empty or '학교급코드' not in total_df.columns:
+        return pd.Series(0, index=total_df.index, dtype=np.int64)
+    students = pd.Series(0, index=total_df.index, dtype=np.int64)
+    for col in MARKET_GRADE_COLUMNS:
+        if col in total_df.columns:
+            students += pd.to_numeric(total_df[col], errors='coerce').fillna(0).astype(np.int64)
+    return students.where(total_df['학교급코드'].isin(MARKET_SCHOOL_LEVELS), 0)
+
+
+def school_market_sizes(total_df):
+    """
+    학교코드(str) → 시장 규모 Series (같은 학교코드가 여러 행이면 합계)
+
+    mid_high_12_students 컬럼이 없으면 여기서 계산합니다.
+    """
+    if total_df is None or total_df.empty or SCHOOL_CODE_COLUMN not in total_df.columns:
+        return pd.Series(dtype=np.int64)
+    values = total_df[MARKET_COLUMN] if MARKET_COLUMN in total_df.columns else mid_high_12_students(total_df)
+    codes = total_df[SCHOOL_CODE_COLUMN].astype(str)
+    return values.astype(np.int64).groupby(codes.to_numpy(), sort=False).sum()
+
+
+def _school_code_column(order_df, school_code_col=None):
+    if school_code_col:
+        return school_code_col
+    return '정보공시학교코드' if '정보공시학교코드' in order_df.columns else '학교코드'
+
+
+def market_size_by_group(order_df, by, total_df=None, school_sizes=None, school_code_col=None):
+    """
+    그룹별 시장 규모 (그룹이 주문한 학교들의 중등/고등 1·2학년 학생수 합계)
+
+    Args:
+        order_df: 주문 데이터
+        by: 그룹 컬럼 이름 (예: '총판', '등급', '시도교육청')
+        total_df: 학생수 데이터 (school_sizes를 주면 생략 가능)
+        school_sizes: school_market_sizes() 결과 (여러 번 호출할 때 재사용)
+        school_code_col: 주문의 학교코드 컬럼 (기본: 정보공시학교코드, 없으면 학교코드)
+
+    Returns:
+        {그룹 값: 시장 규모} int64 Series (주문이 있는 그룹만, 학교가 없으면 0)
+    """
+    if school_sizes is None:
+        school_sizes = school_market_sizes(total_df if total_df is not None else pd.DataFrame())
+    code_col = _school_code_column(order_df, school_code_col)
+    if order_df.empty or by not in order_df.columns or code_col not in order_df.columns:
+        return pd.Series(dtype=np.int64)
+
+    pairs = pd.DataFrame({
+        'group': order_df[by].to_numpy(dtype=object),
+        'school': order_df[code_col].astype(str).to_numpy(dtype=object),
+    }).drop_duplicates()
+    pairs = pairs[pairs['group'].notna()]
+    sizes = pairs['school'].map(school_sizes).fillna(0).astype(np.int64)
+    return sizes.groupby(pairs['group'].to_numpy(), sort=False).sum()
+
+
+def market_size_for_schools(school_codes, total_df=None, school_sizes=None):
+    """
+    학교코드 목록 하나의 시장 규모
+
+    Args:
+        school_codes: 학교코드 배열/Series (중복 무시)
+        total_df / school_sizes: market_size_by_group과 동일
+
+    Returns:
+        int 시장 규모
+    """
+    if school_sizes is None:
+        school_sizes = school_market_sizes(total_df if total_df is not None else pd.DataFrame())
+    codes = pd.Series(pd.unique(pd.Series(school_codes, dtype=object).astype(str)))
+    return int(codes.map(school_sizes).fillna(0).sum())
@@ -180,7 +180,172 @@ def match_orders_with_student_data(order_df, total_df, year_offset=1):
     return pd.DataFrame(results)
 
 
-def calculate_market_size_by_subject_v2(order_df, total_df, product_df=None):
+# 학년별 학생수 컬럼 (2025년 기준)
+GRADE_STUDENT_COLUMNS = {1: '1학년 학생수', 2: '2학년 학생수', 3: '3학년 학생수'}
+
+
+def build_school_grade_index(total_df):
+    """
+    학교코드별 1~3학년 학생수 인덱스 생성 (한 번만 계산)
+
+    match_orders_with_student_data와 동일하게 학교코드가 중복되면 첫 행을 사용하고,
+    결측 학생수는 0, 소수는 정수로 절사합니다.
+
+    Args:
+        total_df: 학생수 데이터 (2025년 기준)
+
+    Returns:
+        '정보공시 학교코드'를 인덱스로 하는 학년별 학생수 데이터프레임
+    """
+    code_col = '정보공시 학교코드'
+    if code_col not in total_df.columns:
+        return pd.DataFrame()
+
+    grade_cols = [col for col in GRADE_STUDENT_COLUMNS.values() if col in total_df.columns]
+    index = total_df[[code_col] + grade_cols].drop_duplicates(subset=code_col, keep='first')
+    index = index.set_index(code_col)
+    for col in grade_cols:
+        students = pd.to_numeric(index[col], errors='coerce').fillna(0)
+        index[col] = np.trunc(students.to_numpy(dtype=float)).astype('int64')
+    return index
+
+
+def match_orders_with_student_data_vectorized(order_df, total_df, school_index=None):
+    """
+    match_orders_with_student_data의 조인 기반 버전
+
+    (학교, 도서코드, 학교급명) 그룹마다 total_df 전체를 다시 필터링하는 대신,
+    학교코드 인덱스를 한 번 만들고 그룹 집계 결과와 조인한 뒤
+    배정 학년과 시장 규모를 배열 연산으로 계산합니다. 결과(행 순서, 값)는
+    기존 함수와 동일합니다.
+
+    Args:
+        order_df: 주문 데이터
+        total_df: 학생수 데이터 (2025년 기준)
+        school_index: build_school_grade_index 결과 (없으면 새로 생성)
+
+    Returns:
+        학교별 + 도서코드별 시장 규모 데이터프레임
+    """
+    school_code_col = None
+    for col in ['정보공시학교코드', '정보공시 학교코드', '학교코드']:
+        if col in order_df.columns:
+            school_code_col = col
+            break
+
+    if not school_code_col:
+        return pd.DataFrame()
+
+    book_code_col = '도서코드(교지명구분)' if '도서코드(교지명구분)' in order_df.columns else '도서코드'
+    if book_code_col not in order_df.columns:
+        return pd.DataFrame()
+
+    if school_index is None:
+        if '정보공시 학교코드' not in total_df.columns:
+            return pd.DataFrame()
+        school_index = build_school_grade_index(total_df)
+
+    groupby_cols = [school_code_col, book_code_col]
+    has_level = '학교급명' in order_df.columns
+    if has_level:
+        groupby_cols.append('학교급명')
+
+    # 1. 그룹 집계: 그룹 번호는 groupby 순회 순서와 같음
+    grouped = order_df.groupby(groupby_cols, dropna=False, sort=True)
+    group_ids = grouped.ngroup().to_numpy()
+    _, first_pos = np.unique(group_ids, return_index=True)
+    total_orders = grouped['부수'].sum().to_numpy()
+
+    school_codes = order_df[school_code_col].take(first_pos).to_numpy(dtype=object)
+    book_codes = order_df[book_code_col].take(first_pos).to_numpy(dtype=object)
+    if has_level:
+        school_levels = order_df['학교급명'].take(first_pos).to_numpy(dtype=object)
+    else:
+        school_levels = np.full(len(first_pos), '미상', dtype=object)
+
+    # 과목명: 그룹 첫 행의 교과서명_구분 (전부 결측이면 도서코드 문자열)
+    book_code_str = np.array([str(code) for code in book_codes], dtype=object)
+    if '교과서명_구분' in order_df.columns:
+        first_subject = order_df['교과서명_구분'].take(first_pos).to_numpy(dtype=object)
+        has_subject = grouped['교과서명_구분'].count().to_numpy() > 0
+        subject_names = np.where(has_subject, first_subject, book_code_str)
+    else:
+        subject_names = book_code_str
+
+    # 2. 학교코드 인덱스와 조인 (매칭되지 않는 학교는 제외)
+    school_keys = pd.Index([str(code) for code in school_codes], dtype=object)
+    positions = school_index.index.get_indexer(school_keys)
+    matched = positions >= 0
+    positions = positions[matched]
+
+    grade_students = {}
+    for grade, col in GRADE_STUDENT_COLUMNS.items():
+        if col in school_index.columns:
+            grade_students[grade] = school_index[col].to_numpy()[positions]
+
+    # 3. 도서코드별 학년도 주문 패턴 → 배정 학년
+    book_codes = book_codes[matched]
+    n_rows = len(book_codes)
+    has_2025 = np.zeros(n_rows, dtype=bool)
+    has_2026 = np.zeros(n_rows, dtype=bool)
+    known_book = np.zeros(n_rows, dtype=bool)
+    if '학년도' in order_df.columns:
+        year_flags = pd.DataFrame({
+            'has_2025': order_df['학년도'].eq(2025),
+            'has_2026': order_df['학년도'].eq(2026),
+        }).groupby(order_df[book_code_col], dropna=True).any()
+        book_positions = year_flags.index.get_indexer(pd.Index(book_codes, dtype=object))
+        known_book = book_positions >= 0
+        has_2025[known_book] = year_flags['has_2025'].to_numpy()[book_positions[known_book]]
+        has_2026[known_book] = year_flags['has_2026'].to_numpy()[book_positions[known_book]]
+
+    both_years = known_book & has_2025 & has_2026
+    only_2026 = known_book & has_2026 & ~has_2025
+    only_2025 = known_book & has_2025 & ~has_2026
+    target_grade = np.select([both_years, only_2026, only_2025], [1.0, 2.0, 1.0], default=np.nan)
+    grade_logic = np.select(
+        [both_years, only_2026, only_2025],
+        ["2025+2026년 주문", "2026년만 주문", "2025년만 주문"],
+        default="학년도 정보 없음",
+    ).astype(object)
+
+    # 4. 시장 규모: 배정 학년 학생수 (학년 정보 없으면 전체 학년 합계)
+    market_size = np.zeros(n_rows, dtype='int64')
+    for students in grade_students.values():
+        market_size = market_size + students
+    for grade in (1, 2):
+        if grade in grade_students:
+            mask = target_grade == grade
+            market_size[mask] = grade_students[grade][mask]
+
+    if n_rows == 0:
+        return pd.DataFrame()
+
+    # 배정학년: 기존 결과와 같은 dtype (전부 결측이면 None, 일부 결측이면 float)
+    if np.isnan(target_grade).all():
+        target_grade_col = np.full(n_rows, None, dtype=object)
+    elif np.isnan(target_grade).any():
+        target_grade_col = target_grade
+    else:
+        target_grade_col = target_grade.astype('int64')
+
+    zeros = np.zeros(n_rows, dtype='int64')
+    return pd.DataFrame({
+        '학교코드': pd.Series(school_codes[matched]).tolist(),
+        '도서코드': pd.Series(book_codes).tolist(),
+        '과목명': pd.Series(subject_names[matched]).tolist(),
+        '학교급': pd.Series(school_levels[matched]).tolist(),
+        '주문부수': total_orders[matched],
+        '배정학년': target_grade_col,
+        '배정로직': grade_logic,
+        '시장규모': market_size,
+        '1학년학생수': grade_students.get(1, zeros),
+        '2학년학생수': grade_students.get(2, zeros),
+        '3학년학생수': grade_students.get(3, zeros),
+    })
+
+
+def calculate_market_size_by_subject_v2(order_df, total_df, product_df=None, vectorized=True):
     """
     과목별 시장 규모 및 점유율 계산 (개선 버전)
     
@@ -195,12 +360,16 @@ def calculate_market_size_by_subject_v2(order_df, total_df, product_df=None):
         order_df: 주문 데이터프레임
         total_df: 학생수 데이터프레임 (2025년 기준)
         product_df: 제품 정보 데이터프레임 (옵션)
+        vectorized: True면 조인 기반 엔진, False면 기존 그룹별 스캔 사용
     
     Returns:
         과목별 시장 규모 및 점유율 데이터프레임
     """
     # 학교별 데이터 매칭 (학년도 패턴으로 배정 학년 판단)
-    school_subject = match_orders_with_student_data(order_df, total_df, year_offset=0)
+    if vectorized:
+        school_subject = match_orders_with_student_data_vectorized(order_df, total_df)
+    else:
+        school_subject = match_orders_with_student_data(order_df, total_df, year_offset=0)
     
     if school_subject.empty:
         return pd.DataFrame()
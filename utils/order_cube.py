@@ -0,0 +1,375 @@
+"""
+주문 데이터 사전 집계 큐브 (차원 조합별 부수/금액/주문건수)
+
+대시보드 차트 대부분은 order_df를 학년도, 총판, 시도교육청, 교육지원청, 도서코드/과목명,
+학교급명, 등급, 목표과목 중 몇 개로 묶은 부수/금액 합계입니다.
+load_data()에서 이 차원 전체 조합(관측된 조합만)으로 한 번 집계해 두고,
+차트는 주문 행 대신 큐브 셀을 다시 묶어(rollup) 같은 결과를 얻습니다.
+
+- rollup_orders(df, by, agg, where): df.groupby(by)[agg].sum() 과 같은 결과
+  - df가 공유 프레임 전체이거나 등호 조건으로만 거른 행(shared_data.filter_conditions)이고
+    필요한 컬럼이 모두 큐브에 있으며 그 컬럼 값을 바꾸지 않았으면 큐브 셀에서 집계,
+    아니면 df를 직접 groupby
+- 합계(부수, 금액), 행 수(주문건수), 차원 컬럼의 nunique/first를 지원
+  (셀은 처음 나온 순서로 저장하므로 first도 행 단위 결과와 같음)
+- 학교 수(정보공시학교코드 nunique)는 셀끼리 더할 수 없으므로 셀마다 학교 ID 집합을 두고
+  고른 셀들의 합집합 크기로 계산 (SchoolSets, count_schools)
+  - 학교 ID: total_df의 정보공시 학교코드 순서대로 0..n-1, 학생수 데이터에 없는 코드는 그 뒤에 추가
+  - 셀별 집합은 roaring bitmap의 array container처럼 정렬된 ID 배열 (전체를 CSR로 보관)
+  - 합집합은 학교 수 크기의 bitmap에 표시 후 개수 (그룹이 많으면 정렬 후 중복 제거)
+"""
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_list_like
+
+from utils.order_index import OrderIndex
+from utils.shared_data import DATASET_ROWS_ATTR, DATASET_VERSION_ATTR, filter_conditions
+
+# 큐브 차원 (없는 컬럼은 건너뜀, 등급은 총판등급)
+# 도서코드에 딸린 과목명/교과서명_구분/교과군은 셀 수를 늘리지 않음
+CUBE_DIMENSIONS = [
+    '학년도', '총판', '총판등급', '시도교육청', '교육지원청', '학교급명',
+    '도서코드(교지명구분)', '과목명', '교과서명_구분', '교과군', '교과군_제품', '목표과목',
+]
+CUBE_MEASURES = ['부수', '금액']
+# 셀별 주문 행 수 (rollup_orders의 agg로 쓰면 groupby().size()와 같은 결과)
+ROW_COUNT = '주문건수'
+
+# 학교 수(nunique)를 셀별 집합으로 지원하는 학교 코드 컬럼 (앞의 것 우선)
+SCHOOL_COLUMNS = ['정보공시학교코드', '학교코드']
+
+_DIMENSION_AGGS = ('nunique', 'first')
+# 그룹별 합집합을 bitmap(그룹 수 x 학교 수)으로 셀 때의 최대 크기 (넘으면 정렬로 중복 제거)
+_BITMAP_BITS = 1 << 24
+
+_registry = weakref.WeakValueDictionary()
+_registry_lock = threading.Lock()
+
+
+class SchoolSets:
+    """셀별 학교 ID 집합 (셀마다 정렬된 ID 배열을 이어 붙인 CSR)"""
+
+    def __init__(self, cell_codes, school_ids, n_cells, n_ids):
+        """
+        Args:
+            cell_codes: 주문 행별 셀 번호
+            school_ids: 주문 행별 학교 ID (결측 -1)
+            n_cells: 셀 수
+            n_ids: 학교 ID 수
+        """
+        self.n_ids = max(int(n_ids), 1)
+        valid = school_ids >= 0
+        keys = cell_codes[valid].astype(np.int64) * self.n_ids + school_ids[valid]
+        keys.sort()
+        if len(keys):
+            keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+        id_dtype = np.int32 if self.n_ids < np.iinfo(np.int32).max else np.int64
+        self.ids = (keys % self.n_ids).astype(id_dtype)
+        counts = np.bincount(keys // self.n_ids, minlength=n_cells)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def nbytes(self):
+        return int(self.ids.nbytes + self.offsets.nbytes)
+
+    def _members(self, cells):
+        """고른 셀들의 (셀 순번, 학교 ID) - 셀 순번은 cells 안의 위치"""
+        starts = self.offsets[cells]
+        lengths = self.offsets[cells + 1] - starts
+        ends = np.cumsum(lengths)
+        positions = np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - (ends - lengths), lengths)
+        return np.repeat(np.arange(len(cells)), lengths), self.ids[positions]
+
+    def count(self, cells):
+        """고른 셀들의 학교 합집합 크기"""
+        _, ids = self._members(cells)
+        bitmap = np.zeros(self.n_ids, dtype=bool)
+        bitmap[ids] = True
+        return int(np.count_nonzero(bitmap))
+
+    def count_by(self, cells, groups, n_groups):
+        """
+        그룹별 학교 합집합 크기
+
+        Args:
+            cells: 고른 셀 번호 배열
+            groups: 셀별 그룹 번호 (-1이면 제외)
+            n_groups: 그룹 수
+
+        Returns:
+            그룹별 학교 수 (int64 배열)
+        """
+        members, ids = self._members(cells)
+        member_groups = groups[members]
+        keep = member_groups >= 0
+        keys = member_groups[keep].astype(np.int64) * self.n_ids + ids[keep]
+        if n_groups * self.n_ids <= _BITMAP_BITS:
+            bitmap = np.zeros(n_groups * self.n_ids, dtype=bool)
+            bitmap[keys] = True
+            return np.count_nonzero(bitmap.reshape(n_groups, self.n_ids), axis=1).astype(np.int64)
+        keys.sort()
+        if len(keys):
+            keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+        return np.bincount(keys // self.n_ids, minlength=n_groups).astype(np.int64)
+
+
+class OrderCube:
+    """주문 프레임 하나의 차원 조합별 집계 셀"""
+
+    def __init__(self, df, dimensions=None, measures=None, schools=None):
+        """
+        Args:
+            df: 주문 데이터 (SharedDataset 프레임, attrs에 데이터셋 버전)
+            dimensions: 큐브 차원 목록 (기본 CUBE_DIMENSIONS)
+            measures: 합계를 낼 컬럼 목록 (기본 CUBE_MEASURES)
+            schools: 학교 ID 순서를 정할 학교 코드 (total_df['정보공시 학교코드'], 없으면 주문에 나온 순서)
+        """
+        self.version = df.attrs.get(DATASET_VERSION_ATTR)
+        self.n_rows = len(df)
+        self.dimensions = [col for col in dimensions or CUBE_DIMENSIONS if col in df.columns]
+        self.measures = [col for col in measures or CUBE_MEASURES if col in df.columns]
+        self.measure_dtypes = {col: df[col].dtype for col in self.measures}
+
+        values = {col: df[col] for col in self.dimensions}
+        for col in self.measures:
+            # 셀 합계는 int64로 보관하고 rollup 결과에서 원래 dtype으로 되돌림
+            values[col] = df[col].astype('int64') if is_integer_dtype(df[col].dtype) else df[col]
+        frame = pd.DataFrame(values, index=df.index)
+        # sort=False: 셀을 처음 나온 순서로 두어 first 집계가 행 단위 결과와 같도록 함
+        grouped = frame.groupby(self.dimensions, sort=False, observed=True, dropna=False)
+        cells = grouped[self.measures].sum()
+        cells[ROW_COUNT] = grouped.size()
+        self.cells = cells.reset_index()
+        # 셀 선택용 역인덱스 (차원 값 → 셀 번호)
+        self._cell_index = OrderIndex(self.cells, self.dimensions)
+
+        self.school_column = next((col for col in SCHOOL_COLUMNS if col in df.columns), None)
+        self.school_sets = None
+        if self.school_column is not None:
+            known = pd.Index(schools if schools is not None else []).dropna().unique()
+            codes, uniques = pd.factorize(pd.concat([pd.Series(known), df[self.school_column].reset_index(drop=True)],
+                                                    ignore_index=True))
+            self.school_sets = SchoolSets(grouped.ngroup().to_numpy(), codes[len(known):], len(self.cells), len(uniques))
+
+    def nbytes(self):
+        school_bytes = self.school_sets.nbytes() if self.school_sets is not None else 0
+        return int(self.cells.memory_usage(deep=True).sum()) + school_bytes
+
+    def select_cells(self, conditions=()):
+        """
+        조건을 모두 만족하는 셀 번호 (오름차순)
+
+        값 하나인 조건은 셀 역인덱스의 교집합, 값 목록(isin) 조건은 그 결과에 mask로 적용
+        """
+        scalar = {}
+        listed = []
+        for col, value in conditions:
+            if is_list_like(value) or col in scalar:
+                listed.append((col, value))
+            else:
+                scalar[col] = value
+        positions = self._cell_index.select(scalar)
+        if positions is None:
+            positions = np.arange(len(self.cells))
+        if listed:
+            positions = positions[_match(self.cells.iloc[positions], listed)]
+        return positions
+
+    def _is_school_count(self, col, func):
+        return self.school_sets is not None and col == self.school_column and func == 'nunique'
+
+    def supports(self, by, agg, conditions=()):
+        """by/agg/조건 컬럼이 모두 큐브로 계산 가능한지"""
+        columns = set(_as_list(by)) | {col for col, _ in conditions}
+        if not columns or not columns <= set(self.dimensions):
+            return False
+        if agg == ROW_COUNT:
+            return True
+        for col, func in _agg_items(agg):
+            if col in self.measures and func == 'sum':
+                continue
+            if isinstance(agg, dict) and self._is_school_count(col, func):
+                continue
+            if col in self.dimensions and func in _DIMENSION_AGGS:
+                continue
+            return False
+        return True
+
+    def rollup(self, by, agg='부수', conditions=()):
+        """
+        조건에 맞는 셀을 by로 다시 묶은 집계 (supports()가 True인 경우만)
+
+        Args:
+            by: 묶을 차원 (컬럼 이름 또는 목록)
+            agg: 합계 컬럼 이름/목록, ROW_COUNT,
+                 또는 {컬럼: 'sum'|'nunique'|'first'} (ROW_COUNT 제외, 학교 코드 컬럼은 nunique)
+            conditions: ((컬럼, 값 또는 값 목록), ...)
+
+        Returns:
+            df.groupby(by)[agg].sum() / df.groupby(by).agg(agg) 와 같은 Series 또는 DataFrame
+        """
+        cells = self.cells.iloc[self.select_cells(conditions)] if conditions else self.cells
+        grouped = cells.groupby(by, observed=True)
+        if isinstance(agg, dict):
+            rest = {col: func for col, func in agg.items() if not self._is_school_count(col, func)}
+            result = grouped.agg(rest) if rest else grouped.size().to_frame().iloc[:, :0]
+            for col in result.columns:
+                if col in self.measure_dtypes and agg[col] == 'sum':
+                    result[col] = self._as_source_dtype(result[col], col)
+            if len(rest) < len(agg):
+                # 셀 순서의 그룹 번호 (result index 순서와 같음, 결측 키는 -1)
+                groups = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+                result[self.school_column] = self.school_sets.count_by(
+                    cells.index.to_numpy(), groups, len(result))
+                result = result[list(agg)]
+            return result
+        if agg == ROW_COUNT:
+            return grouped[ROW_COUNT].sum().rename(None)
+        if isinstance(agg, str):
+            return self._as_source_dtype(grouped[agg].sum(), agg)
+        result = grouped[list(agg)].sum()
+        # groupby(...)[목록].sum()은 같은 dtype 컬럼을 한 블록으로 계산하므로 하나라도 범위를 넘으면 모두 int64
+        for dtype in {self.measure_dtypes[col] for col in result.columns}:
+            cols = [col for col in result.columns if self.measure_dtypes[col] == dtype]
+            if all(self._fits(result[col], col) for col in cols):
+                result[cols] = result[cols].astype(dtype)
+        return result
+
+    def _fits(self, values, col):
+        dtype = self.measure_dtypes[col]
+        if not is_integer_dtype(dtype) or not len(values):
+            return is_integer_dtype(dtype)
+        info = np.iinfo(dtype)
+        return info.min <= values.min() and values.max() <= info.max
+
+    def _as_source_dtype(self, values, col):
+        """합계를 원래 컬럼 dtype으로 (범위를 넘으면 int64 유지 - groupby 합계와 같은 규칙)"""
+        if col in self.measure_dtypes and self._fits(values, col):
+            return values.astype(self.measure_dtypes[col])
+        return values
+
+
+def _as_list(by):
+    return [by] if isinstance(by, str) else list(by)
+
+
+def _agg_items(agg):
+    if isinstance(agg, dict):
+        return list(agg.items())
+    return [(col, 'sum') for col in _as_list(agg)]
+
+
+def _match(df, conditions):
+    """((컬럼, 값 또는 값 목록), ...)을 모두 만족하는 행의 boolean 배열"""
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in conditions:
+        if is_list_like(value):
+            matched = df[col].isin(list(value))
+        else:
+            matched = df[col] == value
+        mask &= matched.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _conditions(where):
+    if not where:
+        return ()
+    items = where.items() if isinstance(where, dict) else where
+    return tuple((col, tuple(value) if is_list_like(value) else value) for col, value in items)
+
+
+def register_cube(df, dimensions=None, measures=None, schools=None):
+    """
+    df의 집계 큐브를 만들어 데이터셋 버전으로 등록 (load_data에서 프레임마다 한 번)
+
+    Args:
+        schools: 학교 ID 순서를 정할 학교 코드 (total_df['정보공시 학교코드'])
+
+    Returns:
+        OrderCube (호출한 쪽이 참조를 유지하는 동안 등록 유지)
+    """
+    cube = OrderCube(df, dimensions, measures, schools)
+    if cube.version is not None:
+        with _registry_lock:
+            _registry[cube.version] = cube
+    return cube
+
+
+def cube_for(df, columns=()):
+    """
+    df를 큐브로 집계할 수 있으면 (OrderCube, df를 만든 조건), 아니면 (None, None)
+
+    Args:
+        df: 주문 데이터 (공유 프레임의 뷰 또는 거른 프레임)
+        columns: 집계에 쓸 컬럼 - 뷰/거른 프레임에서 값을 바꾼 컬럼이 있으면 큐브를 쓰지 않음
+    """
+    version = df.attrs.get(DATASET_VERSION_ATTR)
+    if version is None:
+        return None, None
+    with _registry_lock:
+        cube = _registry.get(version)
+    if cube is None or cube.n_rows != df.attrs.get(DATASET_ROWS_ATTR):
+        return None, None
+    conditions = filter_conditions(df, columns)
+    if conditions is None:
+        return None, None
+    return cube, conditions
+
+
+def rollup_orders(df, by, agg='부수', where=None):
+    """
+    주문 데이터를 by로 묶은 집계 (큐브가 있으면 큐브 셀에서, 없으면 df를 직접 groupby)
+
+    Args:
+        df: 주문 데이터 (공유 프레임의 뷰 또는 거른 프레임)
+        by: 묶을 컬럼 (이름 또는 목록)
+        agg: '부수' 같은 합계 컬럼 이름/목록, ROW_COUNT(행 수),
+             또는 {컬럼: 'sum'|'nunique'|'first'} (groupby().agg()와 같은 형식)
+        where: {컬럼: 값 또는 값 목록} - df에서 먼저 거를 조건 (목록이면 isin)
+
+    Returns:
+        df[조건].groupby(by)[agg].sum() (dict면 .agg(agg), ROW_COUNT면 .size())와 같은 결과
+    """
+    where = _conditions(where)
+    columns = _as_list(by) + [col for col, _ in where]
+    if agg != ROW_COUNT:
+        columns += [col for col, _ in _agg_items(agg)]
+    cube, conditions = cube_for(df, columns)
+    if cube is not None and cube.supports(by, agg, conditions + where):
+        return cube.rollup(by, agg, conditions + where)
+    if where:
+        df = df[_match(df, where)]
+    grouped = df.groupby(by)
+    if isinstance(agg, dict):
+        return grouped.agg(agg)
+    if agg == ROW_COUNT:
+        return grouped.size()
+    return grouped[agg].sum() if isinstance(agg, str) else grouped[list(agg)].sum()
+
+
+def count_schools(df, where=None, column=None):
+    """
+    주문 학교 수 (df[조건][column].nunique()와 같은 값, 큐브가 있으면 셀별 학교 집합의 합집합)
+
+    Args:
+        df: 주문 데이터 (공유 프레임의 뷰 또는 거른 프레임)
+        where: {컬럼: 값 또는 값 목록} - df에서 먼저 거를 조건
+        column: 학교 코드 컬럼 (기본: SCHOOL_COLUMNS 중 df에 있는 것)
+
+    Returns:
+        학교 수 (int)
+    """
+    column = column or next((col for col in SCHOOL_COLUMNS if col in df.columns), None)
+    if column is None:
+        return 0
+    where = _conditions(where)
+    cube, conditions = cube_for(df, [column] + [col for col, _ in where])
+    if cube is not None and cube.school_column == column and cube.school_sets is not None:
+        conditions = conditions + where
+        if all(col in cube.dimensions for col, _ in conditions):
+            return cube.school_sets.count(cube.select_cells(conditions))
+    if where:
+        df = df[_match(df, where)]
+    return int(df[column].nunique())
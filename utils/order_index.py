@@ -0,0 +1,195 @@
+"""
+주문 데이터 차원별 역인덱스 (값 → 행 위치)
+
+페이지와 상세 모달이 order_df를 같은 몇 개 컬럼(학년도, 총판, 시도교육청, 과목명 등)의
+등호 조건으로 자를 때마다 컬럼 전체를 훑던 것을, load_data()에서 한 번 만든
+값별 정렬된 행 위치 배열 조회로 바꿉니다. 여러 조건은 위치 배열의 교집합으로 계산합니다.
+
+- 인덱스는 SharedDataset의 프레임(전체 행)에 대해 만들고 데이터셋 버전으로 등록
+- select_rows(): 넘겨받은 프레임이 등록된 전체 프레임(같은 버전, 같은 행 index, 조건 컬럼 값 그대로)이면
+  인덱스, 아니면(페이지에서 먼저 거르거나 정렬한 프레임, 조건 컬럼을 바꾼 뷰 등) 기존처럼 boolean mask로
+  계산 - 결과는 같음
+- 위치 배열은 세션 간 공유되므로 읽기 전용
+- select_rows() 결과에는 거른 조건을 기록 (utils/order_cube.py가 같은 행을 큐브에서 재현)
+"""
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from utils.shared_data import DATASET_VERSION_ATTR, filter_conditions, tag_filter
+
+# 인덱스를 만드는 차원 (없는 컬럼은 건너뜀)
+INDEX_DIMENSIONS = [
+    '학년도', '총판', '시도교육청', '과목명', '교과서명_구분', '총판등급', '등급', '목표과목',
+    '도서코드(교지명구분)', '교과군_제품', '교과군', '학교급명',
+]
+
+_registry = weakref.WeakValueDictionary()
+_registry_lock = threading.Lock()
+
+
+class OrderIndex:
+    """프레임 하나의 차원별 역인덱스 (값 → 오름차순 행 위치 배열)"""
+
+    def __init__(self, df, dimensions=None):
+        """
+        Args:
+            df: 주문 데이터 (SharedDataset 프레임, attrs에 데이터셋 버전)
+            dimensions: 인덱스를 만들 컬럼 목록 (기본 INDEX_DIMENSIONS)
+        """
+        self.version = df.attrs.get(DATASET_VERSION_ATTR)
+        self.n_rows = len(df)
+        # 행 위치가 가리키는 행 (같은 길이라도 정렬한 프레임은 index가 달라 인덱스를 쓰지 않음)
+        self.row_index = df.index
+        self._dims = {}
+        position_dtype = np.int32 if len(df) < np.iinfo(np.int32).max else np.int64
+        for col in dimensions or INDEX_DIMENSIONS:
+            if col in df.columns:
+                self._dims[col] = _build_dimension(df[col], position_dtype)
+
+    @property
+    def dimensions(self):
+        return list(self._dims)
+
+    def has(self, col):
+        return col in self._dims
+
+    def values(self, col):
+        """차원의 값 목록 (결측 제외, 처음 나온 순서)"""
+        return list(self._dims[col][0])
+
+    def positions(self, col, value):
+        """
+        col == value 인 행 위치 (오름차순, 읽기 전용)
+
+        값이 없거나 결측이면 빈 배열 (df[col] == value 와 같은 결과)
+        """
+        lookup, order, offsets = self._dims[col]
+        code = lookup.get(value) if not _is_missing(value) else None
+        if code is None:
+            return order[:0]
+        return order[offsets[code]:offsets[code + 1]]
+
+    def select(self, conditions):
+        """
+        여러 등호 조건을 모두 만족하는 행 위치 (위치 배열 교집합, 작은 배열부터)
+
+        Args:
+            conditions: {컬럼: 값} (모든 컬럼이 인덱스에 있어야 함)
+
+        Returns:
+            오름차순 행 위치 배열 (조건이 없으면 None = 전체 행)
+        """
+        if not conditions:
+            return None
+        arrays = sorted((self.positions(col, value) for col, value in conditions.items()), key=len)
+        result = arrays[0]
+        for other in arrays[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def nbytes(self):
+        return sum(order.nbytes + offsets.nbytes for _, order, offsets in self._dims.values())
+
+
+def _is_missing(value):
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def _build_dimension(values, position_dtype):
+    """(값 → 코드 dict, 코드순으로 정렬한 행 위치, 코드별 시작 위치)"""
+    codes, uniques = pd.factorize(values)
+    keys = list(uniques.tolist()) if hasattr(uniques, 'tolist') else list(uniques)
+    lookup = {key: code for code, key in enumerate(keys)}
+    valid = codes >= 0
+    # 같은 코드 안에서는 행 순서가 유지되도록 stable 정렬
+    order = np.argsort(codes, kind='stable')[np.count_nonzero(~valid):].astype(position_dtype)
+    counts = np.bincount(codes[valid], minlength=len(keys))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    order.flags.writeable = False
+    return lookup, order, offsets
+
+
+def register_index(df, dimensions=None):
+    """
+    df의 역인덱스를 만들어 데이터셋 버전으로 등록 (load_data에서 프레임마다 한 번)
+
+    Returns:
+        OrderIndex (호출한 쪽이 참조를 유지하는 동안 등록 유지)
+    """
+    index = OrderIndex(df, dimensions)
+    if index.version is not None:
+        with _registry_lock:
+            _registry[index.version] = index
+    return index
+
+
+def index_for(df, columns=()):
+    """
+    df가 등록된 전체 프레임(같은 버전, 같은 행 index - 순서 포함)이면 그 OrderIndex, 아니면 None
+
+    Args:
+        df: 주문 데이터
+        columns: 조회할 차원 - 뷰에서 값을 바꾼 컬럼이 있으면 None
+    """
+    version = df.attrs.get(DATASET_VERSION_ATTR)
+    if version is None:
+        return None
+    with _registry_lock:
+        index = _registry.get(version)
+    if index is None or index.n_rows != len(df):
+        return None
+    if df.index is not index.row_index and not df.index.equals(index.row_index):
+        return None
+    if columns and filter_conditions(df, columns) != ():
+        return None
+    return index
+
+
+def select_positions(df, conditions):
+    """
+    등호 조건을 모두 만족하는 df의 행 위치 (인덱스가 있으면 교집합, 없으면 mask)
+
+    Returns:
+        오름차순 행 위치 배열 (조건이 없으면 None = 전체 행)
+    """
+    if not conditions:
+        return None
+    index = index_for(df, conditions)
+    if index is not None and all(index.has(col) for col in conditions):
+        return index.select(conditions)
+    mask = np.ones(len(df), dtype=bool)
+    for col, value in conditions.items():
+        mask &= (df[col] == value).to_numpy(dtype=bool, na_value=False)
+    return np.flatnonzero(mask)
+
+
+def select_rows(df, conditions=None, **kwargs):
+    """
+    df[(df[c1] == v1) & (df[c2] == v2) ...] 와 같은 결과 (행 순서, index 유지)
+
+    Args:
+        df: 주문 데이터 (공유 프레임의 뷰 또는 거른 프레임)
+        conditions: {컬럼: 값} (컬럼 이름이 식별자가 아니면 이쪽으로)
+        **kwargs: 컬럼=값 조건
+
+    Returns:
+        조건에 맞는 행 DataFrame (df가 공유 프레임이면 attrs에 조건 기록 - 큐브 집계용)
+    """
+    conditions = {**(conditions or {}), **kwargs}
+    positions = select_positions(df, conditions)
+    if positions is None:
+        return df.copy(deep=False)
+    result = df.iloc[positions]
+    # 조건 컬럼 값을 바꾼 프레임이면 큐브가 같은 행을 재현할 수 없으므로 기록하지 않음
+    base = filter_conditions(df, conditions)
+    if base is not None:
+        tag_filter(result, base + tuple(conditions.items()))
+    return result
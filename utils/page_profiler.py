@@ -0,0 +1,237 @@
+"""
+페이지 렌더 프로파일러 (opt-in)
+
+pages/의 각 파일은 위젯을 바꿀 때마다 처음부터 끝까지 다시 실행됩니다.
+프로파일링을 켜면 페이지의 이름 붙인 구간(탭, 데이터 준비 단계 등)별로
+시간/CPU/최대 메모리 할당/DataFrame 복사 횟수를 기록하고, 느린 rerun은 outputs/ 아래 JSONL로 남깁니다.
+
+    profiler = page_profiler('3_총판별_분석')
+    profiler.step('데이터 준비')             # 다음 step()/finish()까지 한 구간 (들여쓰기 없이)
+    with tab1, profiler.section('📊 총판별 현황'):
+        ...
+    profiler.finish()                      # 페이지 끝: 요약 표시 + 느린 rerun 기록
+
+- 켜는 방법: 환경변수 RENDER_PROFILE=1 또는 관리자 도구의 '페이지 렌더 프로파일링' 체크
+  (꺼져 있으면 section()/step()/finish()는 아무것도 하지 않음)
+- 느린 rerun 기준: RENDER_SLOW_SECONDS (기본 1.0초)
+- 로그: outputs/render_profile.jsonl, RENDER_LOG_BYTES를 넘으면 .1 ~ .RENDER_LOG_BACKUPS로 순환
+- DataFrame 복사: 켜져 있는 동안 스크립트 스레드의 shared_data.copy_frame()(깊은 복사)과
+  view()/session_view()(얕은 복사) 호출을 셈 (pandas를 감싸지 않으므로 꺼져 있으면 비용 없음)
+- 메모리 할당: 환경변수 PROFILE_MEMORY=1일 때만 (tracemalloc은 프로세스 전체를 느리게 하므로 기본은 끔)
+- st.stop()/st.rerun()/예외로 finish()에 닿지 못한 rerun의 step() 구간은 다음 PageProfiler를
+  만들 때(같은 스레드의 다음 rerun 또는 끝난 스레드의 것) 닫아 tracemalloc을 돌려놓음
+- 집계: scripts/summarize_render_log.py (구간별 p50/p95/최대 → 최적화 대상 목록)
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from utils.profiling import StageTimer, json_default, track_frame_copies
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RENDER_LOG_FILE = os.path.join(BASE_DIR, 'outputs', 'render_profile.jsonl')
+RENDER_LOG_BYTES = 5 << 20
+RENDER_LOG_BACKUPS = 3
+DEFAULT_SLOW_SECONDS = 1.0
+
+# 관리자 도구 체크박스가 켜는 세션 키 (위젯 키가 아니라 페이지를 옮겨도 유지)
+PROFILE_SESSION_KEY = 'render_profiling'
+
+_log_lock = threading.Lock()
+
+# step() 구간이 열려 있는 프로파일러 (finish() 전에 rerun이 끝나면 여기 남음)
+_open_profilers = set()
+_open_lock = threading.Lock()
+
+
+def profiling_enabled():
+    """환경변수 또는 세션 토글로 프로파일링이 켜져 있는지"""
+    if os.environ.get('RENDER_PROFILE', '0') == '1':
+        return True
+    return bool(st.session_state.get(PROFILE_SESSION_KEY, False))
+
+
+def slow_seconds():
+    try:
+        return float(os.environ.get('RENDER_SLOW_SECONDS', DEFAULT_SLOW_SECONDS))
+    except ValueError:
+        return DEFAULT_SLOW_SECONDS
+
+
+class PageProfiler:
+    """페이지 rerun 한 번의 구간 기록"""
+
+    def __init__(self, page, enabled):
+        release_abandoned()
+        self.page = page
+        self.enabled = enabled
+        self._step = None
+        self._finished = False
+        self._thread = threading.current_thread()
+        if enabled:
+            self.copies = {'deep': 0, 'shallow': 0}
+            track_frame_copies(self.copies)
+            # 메모리 할당은 PROFILE_MEMORY=1일 때만 잼 (StageTimer 기본값)
+            self.timer = StageTimer()
+            self.cpu = time.process_time()
+        else:
+            # st.stop() 등으로 finish()에 닿지 못한 이전 rerun의 카운터를 떼어냄
+            track_frame_copies(None)
+
+    def section(self, name):
+        """
+        이름 붙인 구간 (with 문, 탭과 함께: with tab1, profiler.section('이름'):)
+
+        꺼져 있으면 아무것도 하지 않는 컨텍스트
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._section(name)
+
+    @contextlib.contextmanager
+    def _section(self, name):
+        before = dict(self.copies)
+        with self.timer.stage(name) as stage:
+            try:
+                yield stage
+            finally:
+                stage.extra.update(self._copies_since(before))
+
+    def step(self, name):
+        """앞 step 구간을 닫고 새 구간 시작 (페이지 최상위 코드를 들여쓰기 없이 나눌 때)"""
+        if not self.enabled:
+            return
+        self._close_step()
+        stage = self.timer.stage(name)
+        stage.__enter__()
+        self._step = (stage, dict(self.copies))
+        with _open_lock:
+            _open_profilers.add(self)
+
+    def _close_step(self):
+        if self._step is not None:
+            stage, before = self._step
+            self._step = None
+            with _open_lock:
+                _open_profilers.discard(self)
+            stage.extra.update(self._copies_since(before))
+            stage.__exit__(None, None, None)
+
+    def _copies_since(self, before):
+        return {f'copies_{kind}': self.copies[kind] - before[kind] for kind in self.copies}
+
+    def finish(self):
+        """
+        페이지 끝에서 호출: 구간 요약을 사이드바에 표시하고 느린 rerun이면 로그에 추가
+
+        Returns:
+            rerun 기록 dict (꺼져 있으면 None)
+        """
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        self._close_step()
+        track_frame_copies(None)
+        record = {
+            'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'page': self.page,
+            'session': _session_id(),
+            'seconds': time.perf_counter() - self.timer.origin,
+            'cpu_seconds': time.process_time() - self.cpu,
+            'copies_deep': self.copies['deep'],
+            'copies_shallow': self.copies['shallow'],
+            'sections': self.timer.ordered(),
+        }
+        record['slow'] = record['seconds'] >= slow_seconds()
+        if record['slow']:
+            append_render_log(record)
+        _show_summary(record)
+        return record
+
+
+def release_abandoned():
+    """
+    끝난 rerun이 남긴 step() 구간을 닫음 (단계 기록과 tracemalloc 사용 수를 정리)
+
+    같은 스레드에서 새 프로파일러를 만들면 이전 rerun은 끝난 것이고,
+    스레드가 끝났으면 그 rerun의 finish()는 더 이상 호출되지 않습니다.
+
+    Returns:
+        닫은 프로파일러 수
+    """
+    current = threading.current_thread()
+    with _open_lock:
+        stale = [p for p in _open_profilers if p._thread is current or not p._thread.is_alive()]
+    for profiler in stale:
+        profiler._close_step()
+    return len(stale)
+
+
+def page_profiler(page):
+    """
+    페이지 상단에서 만들고 끝에서 finish() (꺼져 있으면 비용 없는 객체)
+
+    Args:
+        page: 로그에 남길 페이지 이름 (파일 이름 등)
+    """
+    return PageProfiler(page, profiling_enabled())
+
+
+def _session_id():
+    # 같은 세션의 rerun을 묶어 보기 위한 임의 ID (세션 상태에 보관)
+    if '_render_profile_session' not in st.session_state:
+        st.session_state['_render_profile_session'] = uuid.uuid4().hex[:8]
+    return st.session_state['_render_profile_session']
+
+
+def append_render_log(record, path=RENDER_LOG_FILE, max_bytes=RENDER_LOG_BYTES, backups=RENDER_LOG_BACKUPS):
+    """
+    JSONL 로그에 한 줄 추가 (max_bytes를 넘으면 path.1 ~ path.backups로 밀어냄)
+
+    Returns:
+        성공 여부 (쓰기 실패는 페이지 렌더를 막지 않음)
+    """
+    line = json.dumps(record, ensure_ascii=False, default=json_default) + '\n'
+    with _log_lock:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path) and os.path.getsize(path) + len(line) > max_bytes:
+                for i in range(backups - 1, 0, -1):
+                    if os.path.exists(f'{path}.{i}'):
+                        os.replace(f'{path}.{i}', f'{path}.{i + 1}')
+                os.replace(path, f'{path}.1')
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError:
+            return False
+    return True
+
+
+def render_log_files(path=RENDER_LOG_FILE, backups=RENDER_LOG_BACKUPS):
+    """존재하는 로그 파일 목록 (오래된 것부터)"""
+    files = [f'{path}.{i}' for i in range(backups, 0, -1)] + [path]
+    return [f for f in files if os.path.exists(f)]
+
+
+def _show_summary(record):
+    rows = [{
+        '구간': '  ' * s.get('depth', 0) + s['name'],
+        '시간(초)': round(s['seconds'], 3),
+        'CPU(초)': round(s['cpu_seconds'], 3),
+        '할당(MB)': round(s['peak_alloc_delta'] / 1e6, 1) if s.get('peak_alloc_delta') is not None else None,
+        '깊은 복사': s.get('copies_deep', 0),
+        '얕은 복사': s.get('copies_shallow', 0),
+    } for s in record['sections']]
+    title = f"⏱️ 렌더 프로파일 {record['seconds']:.2f}초" + (" (느림, 로그 기록)" if record['slow'] else "")
+    with st.sidebar.expander(title, expanded=False):
+        st.caption(
+            f"CPU {record['cpu_seconds']:.2f}초 · DataFrame 복사 깊은 {record['copies_deep']:,} / 얕은 {record['copies_shallow']:,}"
+        )
+        if rows:
+            st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
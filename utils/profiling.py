@@ -0,0 +1,255 @@
+"""
+데이터 로드 단계별 계측 (StageTimer) + 최근 로드 기록
+
+파이프라인 각 단계를 with timer.stage('이름') as stage: 로 감싸면
+벽시계 시간, CPU 시간, 처리 행 수(stage.rows), 단계 중 최대 메모리 할당 증가량을 기록합니다.
+단계 안에서 다시 stage()를 열면 하위 단계(depth + 1)로 기록되어 워터폴에서 겹쳐 보입니다.
+
+- CPU 시간은 프로세스 전체(time.process_time) 기준 - 다른 세션 스레드가 돌면 함께 잡힘
+- 메모리는 StageTimer(trace_memory=True) 또는 환경변수 PROFILE_MEMORY=1일 때만 tracemalloc으로 잼
+  (할당 추적 비용이 커서 프로파일링 중에만, 페이지 렌더 프로파일러도 PROFILE_MEMORY=1일 때만):
+  단계 시작 시점 대비 단계 안의 최대 할당량(peak_alloc_delta, 바이트, numpy 버퍼 포함, pyarrow 메모리 풀 제외).
+  하위 단계의 최대치는 상위 단계에도 반영, 다른 스레드의 할당도 함께 잡힘, 끄면 None
+- LoadHistory의 peak_rss는 프로세스 최대 RSS (getrusage, 로드 시점까지의 최고치)
+- LoadHistory: 앱의 load_data()/지연 로드 결과를 최근 LOAD_HISTORY_SIZE건까지 프로세스에 보관
+  (관리자 도구의 워터폴과 JSON 내보내기에 사용)
+- track_frame_copies()/count_frame_copy(): 페이지 프로파일러가 켠 스레드에서
+  shared_data.view()(얕은 복사)/copy_frame()(깊은 복사) 호출 횟수를 셈
+- timed(): 함수 한 번 호출의 최소 벽시계 시간 (scripts/의 벤치마크/정합성 검사 공용)
+"""
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+LOAD_HISTORY_SIZE = 20
+
+# tracemalloc을 켠 StageTimer 단계 수 (동시에 프로파일링하는 세션이 서로 끄지 않도록)
+_trace_lock = threading.Lock()
+_trace_users = 0
+
+
+def peak_rss():
+    """프로세스 최대 RSS (바이트, 알 수 없으면 None)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트
+    return int(peak) if sys.platform == 'darwin' else int(peak) * 1024
+
+
+def _start_tracing():
+    global _trace_users
+    with _trace_lock:
+        if _trace_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _trace_users += 1
+
+
+def _stop_tracing():
+    global _trace_users
+    with _trace_lock:
+        _trace_users -= 1
+        if _trace_users == 0:
+            tracemalloc.stop()
+
+
+class StageTimer:
+    """파이프라인 단계별 소요 시간 기록"""
+
+    def __init__(self, trace_memory=None):
+        """
+        Args:
+            trace_memory: 단계별 최대 할당 증가량을 tracemalloc으로 잴지
+                (None이면 환경변수 PROFILE_MEMORY=1일 때만, 느려지므로 프로파일링할 때만 켬)
+        """
+        if trace_memory is None:
+            trace_memory = os.environ.get('PROFILE_MEMORY', '0') == '1'
+        self.stages = []
+        self.origin = time.perf_counter()
+        self.trace_memory = trace_memory
+        self._depth = 0
+        self._open = []  # 메모리를 재는 중인 단계 (바깥 → 안쪽)
+
+    def stage(self, name):
+        return _Stage(self, name)
+
+    def total(self):
+        """최상위 단계 시간 합 (하위 단계는 상위 단계에 포함)"""
+        return sum(s['seconds'] for s in self.stages if not s.get('depth'))
+
+    def ordered(self):
+        """시작 순서로 정렬한 단계 목록 (하위 단계는 상위 단계 바로 뒤)"""
+        return sorted(self.stages, key=lambda s: (s.get('start', 0.0), s.get('depth', 0)))
+
+    def report(self):
+        """단계별 소요 시간 표 (문자열)"""
+        total = self.total()
+        lines = [f"{'stage':<28}{'seconds':>10}{'share':>9}{'rows':>12}{'cpu':>9}{'alloc+MB':>9}"]
+        for s in self.ordered():
+            share = s['seconds'] / total * 100 if total > 0 else 0
+            rows = f"{s['rows']:,}" if s['rows'] is not None else '-'
+            cpu = f"{s['cpu_seconds']:.3f}" if s.get('cpu_seconds') is not None else '-'
+            peak = f"{s['peak_alloc_delta'] / 1e6:.1f}" if s.get('peak_alloc_delta') is not None else '-'
+            name = '  ' * s.get('depth', 0) + s['name']
+            lines.append(f"{name:<28}{s['seconds']:>10.3f}{share:>8.1f}%{rows:>12}{cpu:>9}{peak:>9}")
+        lines.append(f"{'total':<28}{total:>10.3f}")
+        return '\n'.join(lines)
+
+
+class _Stage:
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.rows = None
+        # 단계 기록에 함께 남길 값 (페이지 프로파일러의 DataFrame 복사 횟수 등)
+        self.extra = {}
+
+    def __enter__(self):
+        self.depth = self.timer._depth
+        self.timer._depth += 1
+        if self.timer.trace_memory:
+            _start_tracing()
+            # reset_peak()은 프로세스 전체 값이라 지금까지의 최대치를 바깥 단계에 먼저 반영
+            self.base = self._fold_peak()
+            self.peak = self.base
+            self.timer._open.append(self)
+        self.cpu = time.process_time()
+        self.start = time.perf_counter()
+        return self
+
+    def _fold_peak(self):
+        """열린 단계들의 최대치에 지금까지의 peak를 반영하고 peak를 초기화 → 현재 할당량"""
+        current, peak = tracemalloc.get_traced_memory()
+        for stage in self.timer._open:
+            stage.peak = max(stage.peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        cpu = time.process_time() - self.cpu
+        alloc_delta = None
+        if self.timer.trace_memory:
+            self._fold_peak()
+            self.timer._open.remove(self)
+            alloc_delta = self.peak - self.base
+            _stop_tracing()
+        self.timer._depth -= 1
+        self.timer.stages.append({
+            'name': self.name,
+            'seconds': end - self.start,
+            'rows': self.rows,
+            'cpu_seconds': cpu,
+            'peak_alloc_delta': alloc_delta,
+            'start': self.start - self.timer.origin,
+            'depth': self.depth,
+            **self.extra,
+        })
+        return False
+
+
+class LoadHistory:
+    """최근 데이터 로드의 단계 기록 (프로세스 공유, 오래된 것부터 버림)"""
+
+    def __init__(self, size=LOAD_HISTORY_SIZE):
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, label, timer, **info):
+        """
+        로드 한 번의 단계 기록 추가
+
+        Args:
+            label: 로드 구분 ('load_data', '지연 로드: market_analysis' 등)
+            timer: 단계를 기록한 StageTimer
+            **info: 함께 남길 값 (source, key 등 JSON으로 저장 가능한 값)
+
+        Returns:
+            추가한 기록 dict
+        """
+        entry = {
+            'label': label,
+            'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_seconds': timer.total(),
+            'peak_rss': peak_rss(),
+            **info,
+            'stages': timer.ordered(),
+        }
+        with self._lock:
+            self._entries.append(entry)
+        return entry
+
+    def entries(self):
+        """기록 목록 (오래된 것부터)"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def to_json(self):
+        """회귀 추적용 JSON 문자열 ({'loads': [...]})"""
+        return json.dumps({'loads': self.entries()}, ensure_ascii=False, indent=2, default=json_default)
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """
+    func(*args, **kwargs)를 repeat 번 실행해 가장 짧은 시간을 잼
+
+    Returns:
+        (마지막 실행 결과, 최소 시간(초))
+    """
+    best = None
+    result = None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return result, best
+
+
+def json_default(value):
+    """json.dumps(default=...)용: numpy 스칼라를 파이썬 값으로"""
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f'JSON으로 저장할 수 없는 값: {type(value).__name__}')
+
+
+_history = LoadHistory()
+
+
+def load_history():
+    """프로세스 공유 로드 기록 (관리자 도구/진단용)"""
+    return _history
+
+
+# 페이지 프로파일러가 켠 스레드의 DataFrame 복사 횟수 {'deep': n, 'shallow': n} (없으면 세지 않음)
+_frame_copies = threading.local()
+
+
+def track_frame_copies(counts):
+    """
+    이 스레드의 shared_data.view()/copy_frame() 호출을 counts에 셈
+
+    Args:
+        counts: {'deep': 0, 'shallow': 0} (None이면 그만 셈)
+    """
+    _frame_copies.counts = counts
+
+
+def count_frame_copy(deep):
+    """복사 한 번 기록 (이 스레드에서 세는 중이 아니면 아무것도 하지 않음)"""
+    counts = getattr(_frame_copies, 'counts', None)
+    if counts is not None:
+        counts['deep' if deep else 'shallow'] += 1
@@ -0,0 +1,131 @@
+"""
+주문/학생수 데이터 컬럼 타입(schema) 선언
+
+반복되는 긴 한글 문자열 컬럼(총판, 시도교육청, 학교명 등)은 category로,
+정수 컬럼은 값 범위에 맞춰 int32 이하로 줄여 메모리를 아낍니다.
+category 컬럼의 groupby는 문자열 비교 대신 정수 코드로 묶으므로 더 빠릅니다.
+(pandas 3의 기본값 observed=True로 결과에는 관측된 범주만 나옴 - requirements.txt에서 pandas>=3)
+
+주의 (페이지 코드 작성 시):
+- category 컬럼에 없는 값을 넣는 fillna/loc 대입은 오류 → 먼저 .astype(str)
+- category Series의 .map()/.apply() 결과도 category일 수 있음 → 숫자 결과는 .astype(str) 후 map
+- value_counts()는 필터 후에도 모든 범주를 0건으로 포함 → 필요하면 [lambda s: s > 0]
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# 주문현황 (order_df, order_df_target_filtered)
+ORDER_CATEGORY_COLUMNS = [
+    '총판', '시도교육청', '교육지원청', '학교명', '과목명',
+    '교과서명_구분', '학교급명', '목표과목',
+]
+
+# 학년별 학생수 (total_df)
+TOTAL_CATEGORY_COLUMNS = [
+    '시도교육청', '교육지원청', '지역', '설립구분', '제외여부', '제외사유',
+    '담당총판', '본사담당자(2025.09)',
+]
+
+# 정수 컬럼은 이 타입보다 작게 줄이지 않음 (int16 등은 곱셈 시 넘침 위험)
+MIN_INT_DTYPE = np.int32
+
+
+def apply_schema(df, category_columns=(), downcast_ints=True):
+    """
+    선언된 컬럼을 category로, 정수 컬럼을 작은 정수 타입으로 변환
+
+    Args:
+        df: 변환할 데이터프레임
+        category_columns: category로 바꿀 컬럼 목록 (없는 컬럼은 무시)
+        downcast_ints: int64 컬럼을 값 범위가 맞으면 int32로 축소
+
+    Returns:
+        변환된 데이터프레임 (원본은 수정하지 않음)
+    """
+    df = df.copy(deep=False)
+    for col in category_columns:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+
+    if downcast_ints:
+        info = np.iinfo(MIN_INT_DTYPE)
+        for col in df.columns[df.dtypes == np.int64]:
+            values = df[col]
+            if values.empty or (values.min() >= info.min and values.max() <= info.max):
+                df[col] = values.astype(MIN_INT_DTYPE)
+    return df
+
+
+def drop_schema(df):
+    """
+    apply_schema 전 타입으로 되돌림 (category → 값 타입, int32 → int64)
+
+    schema 적용 전 원본 타입에서도 결과가 같은지 보는 정합성 검사용입니다.
+
+    Returns:
+        변환된 데이터프레임 (원본은 수정하지 않음)
+    """
+    df = df.copy(deep=False)
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(dtype.categories.dtype)
+        elif dtype == MIN_INT_DTYPE:
+            df[col] = df[col].astype(np.int64)
+    return df
+
+
+def concat_with_schema(frames, category_columns=(), downcast_ints=True):
+    """
+    schema가 적용된 표에 행을 이어 붙이기 (증분 반영용)
+
+    category 컬럼은 각 표의 범주를 합친 뒤 정렬한 범주로 맞춰
+    전체를 다시 category로 변환한 것과 같은 결과를 만듭니다.
+
+    Args:
+        frames: 이어 붙일 데이터프레임 목록 (index는 그대로 유지)
+        category_columns: category로 유지할 컬럼 목록
+        downcast_ints: apply_schema와 동일
+
+    Returns:
+        합쳐진 데이터프레임
+    """
+    frames = [df.copy(deep=False) for df in frames]
+    for col in category_columns:
+        if not all(col in df.columns for df in frames):
+            continue
+        parts = [df[col] if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].astype('category') for df in frames]
+        categories = union_categoricals(parts, sort_categories=True, ignore_order=True).categories
+        for df, part in zip(frames, parts):
+            df[col] = part.cat.set_categories(categories)
+    return apply_schema(pd.concat(frames), category_columns, downcast_ints=downcast_ints)
+
+
+def memory_report(before, after):
+    """
+    변환 전후 메모리 사용량 비교 (memory_usage(deep=True) 기준)
+
+    Args:
+        before: {이름: 변환 전 DataFrame}
+        after: {이름: 변환 후 DataFrame}
+
+    Returns:
+        {이름: {'before': 바이트, 'after': 바이트}}
+    """
+    return {
+        name: {
+            'before': int(before[name].memory_usage(deep=True).sum()),
+            'after': int(after[name].memory_usage(deep=True).sum()),
+        }
+        for name in before
+    }
+
+
+def format_memory_report(report):
+    """memory_report 결과를 표 형태 문자열로"""
+    lines = [f"{'frame':<28}{'before(MB)':>12}{'after(MB)':>12}{'saved':>8}"]
+    for name, row in report.items():
+        saved = 1 - row['after'] / row['before'] if row['before'] else 0
+        lines.append(f"{name:<28}{row['before'] / 1e6:>12.2f}{row['after'] / 1e6:>12.2f}{saved:>8.0%}")
+    return '\n'.join(lines)
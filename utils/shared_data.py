@@ -0,0 +1,275 @@
+"""
+프로세스 공유 데이터셋
+
+load_data()가 만든 데이터프레임을 st.cache_resource로 프로세스에 한 벌만 두고,
+세션/페이지에는 데이터를 복사하지 않은 읽기 전용 뷰를 나눠줍니다.
+
+- 뷰는 DataFrame.copy(deep=False)로 만들며 Copy-on-Write 덕분에
+  페이지가 컬럼을 추가하거나 값을 바꾸면 그 컬럼만 새로 할당되고 공유 원본은 그대로 유지
+- 따라서 페이지 상단에서 order_df 전체를 .copy() 할 필요가 없음 (view() 사용),
+  원본과 분리된 복사본이 꼭 필요하면 copy_frame() (페이지 렌더 프로파일러의 복사 횟수에 잡힘)
+- pandas 3의 기본 동작(Copy-on-Write, category groupby의 observed=True)에 의존 (requirements.txt)
+- 프레임 attrs에 데이터셋 버전을 기록해 두어 뷰/행 필터 결과를 캐시 키로 구분 (common_filters)
+- 등호 조건으로 거른 행 프레임(과 전체 프레임)에는 그 조건과 컬럼 메모리를 기록해 두어
+  집계 큐브(order_cube)가 같은 행을 재현 - 기록 뒤 값을 바꾼 컬럼은 큐브 대신 직접 집계
+- loaders로 넘긴 데이터셋(파생 표)은 처음 view()/mapping()할 때 한 번만 읽거나 계산
+  (페이지에서는 session_view()로 꺼냄)
+"""
+import threading
+import uuid
+import weakref
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+from utils.profiling import count_frame_copy
+
+# DataFrame.attrs에 데이터셋 버전/원본 행 수를 기록하는 키 (view()와 행 필터 결과에도 그대로 전달됨)
+DATASET_VERSION_ATTR = 'dataset_version'
+DATASET_ROWS_ATTR = 'dataset_rows'
+# 공유 프레임을 등호 조건으로만 거른 결과에 (조건, 행 수/첫/끝 index, 컬럼별 메모리)를 기록하는 키
+DATASET_FILTER_ATTR = 'dataset_filter'
+
+
+def view(df):
+    """
+    공유 데이터프레임의 읽기 전용 뷰 (데이터 복사 없음)
+
+    뷰에서 컬럼을 추가/수정하면 Copy-on-Write로 해당 컬럼만 복사되므로
+    페이지에서 자유롭게 가공해도 다른 세션의 데이터에는 영향이 없습니다.
+    """
+    if df is None:
+        return None
+    count_frame_copy(deep=False)
+    return df.copy(deep=False)
+
+
+def copy_frame(df):
+    """
+    공유 데이터프레임(또는 그 행 필터 결과)의 깊은 복사
+
+    페이지에서 .copy() 대신 사용하면 페이지 렌더 프로파일러의 깊은 복사 횟수에 잡힙니다.
+    """
+    if df is None:
+        return None
+    count_frame_copy(deep=True)
+    return df.copy()
+
+
+def _row_signature(df):
+    if not len(df):
+        return (0, None, None)
+    return (len(df), df.index[0], df.index[-1])
+
+
+def _array_source(array):
+    """
+    배열 값이 들어 있는 메모리 ((소유 객체 weakref, 위치), ...)
+
+    소유 객체가 살아 있는 동안은 그 메모리가 다른 배열에 다시 쓰이지 않으므로
+    위치가 같으면 같은 값입니다 (numpy는 최상위 base, arrow는 ChunkedArray가 소유 객체).
+    """
+    if isinstance(array, pd.Categorical):
+        return _array_source(array.codes) + _array_source(array.categories.array)
+    if hasattr(array, '__arrow_array__'):
+        chunked = array.__arrow_array__()
+        layout = tuple(
+            (chunk.offset, len(chunk), *(buf.address for buf in chunk.buffers() if buf is not None))
+            for chunk in chunked.chunks
+        )
+        return ((weakref.ref(chunked), layout),)
+    data = np.asarray(array)
+    owner = data
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    return ((weakref.ref(owner), (data.__array_interface__['data'][0], data.shape, data.strides)),)
+
+
+def column_source(values):
+    """
+    컬럼(Series) 값이 들어 있는 메모리 기록 - same_source()로 비교
+
+    view()로 나눠준 뷰의 컬럼은 원본과 같은 메모리를 가리키고,
+    컬럼을 다시 대입하거나 값을 바꾸거나(Copy-on-Write) 행을 거르거나 정렬하면 새 메모리가 됩니다.
+    """
+    return _array_source(values.array)
+
+
+def same_source(source, values):
+    """values(Series)가 column_source()로 기록한 메모리의 값 그대로인지"""
+    current = _array_source(values.array)
+    return len(current) == len(source) and all(
+        ref() is not None and layout == current_layout
+        for (ref, layout), (_, current_layout) in zip(source, current)
+    )
+
+
+class _FilterTag:
+    """
+    tag_filter()의 기록 (조건, 행 signature, 컬럼별 메모리)
+
+    attrs가 파생 프레임으로 전파될 때 깊은 복사하지 않고 그대로 공유합니다.
+    pickle하면 컬럼 기록(weakref)은 버리므로 복원한 프레임은 알 수 없음으로 처리됩니다.
+    """
+
+    __slots__ = ('conditions', 'rows', 'sources')
+
+    def __init__(self, conditions, rows, sources):
+        self.conditions = conditions
+        self.rows = rows
+        self.sources = sources
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (_FilterTag, (self.conditions, self.rows, None))
+
+
+def tag_filter(df, conditions):
+    """
+    df(공유 프레임을 거른 결과)에 거른 조건과 지금 컬럼들의 메모리를 기록
+
+    Args:
+        df: 거른 결과 프레임 (attrs만 바뀜)
+        conditions: ((컬럼, 값), ...) - 모두 만족하는 행만 남긴 등호 조건
+
+    Returns:
+        df
+    """
+    sources = {col: column_source(df[col]) for col in df.columns} if df.columns.is_unique else None
+    df.attrs[DATASET_FILTER_ATTR] = _FilterTag(tuple(conditions), _row_signature(df), sources)
+    return df
+
+
+def filter_conditions(df, columns=()):
+    """
+    df가 공유 프레임 전체 또는 등호 조건으로만 거른 행이면 그 조건
+
+    기록된 조건은 행 수와 첫/끝 index가 그대로이고 columns의 값이 기록할 때의
+    배열 그대로일 때만 인정합니다. (조건 기록 뒤 다시 거르거나 정렬한 프레임,
+    columns 중 값을 바꾼 컬럼이 있는 프레임은 알 수 없음으로 처리)
+
+    Args:
+        df: 공유 프레임의 뷰 또는 거른 프레임
+        columns: 값이 그대로여야 하는 컬럼 (조건을 이어서 거를 컬럼, 집계에 쓸 컬럼)
+
+    Returns:
+        ((컬럼, 값), ...) - 전체 행이면 빈 튜플, 알 수 없으면 None
+    """
+    if df.attrs.get(DATASET_VERSION_ATTR) is None:
+        return None
+    tag = df.attrs.get(DATASET_FILTER_ATTR)
+    if not isinstance(tag, _FilterTag) or tag.sources is None or tag.rows != _row_signature(df):
+        return None
+    for col in columns:
+        if col not in tag.sources or col not in df.columns or not same_source(tag.sources[col], df[col]):
+            return None
+    return tag.conditions
+
+
+class SharedDataset:
+    """st.cache_resource로 공유하는 데이터셋 묶음 (프레임은 view()로만 꺼냄)"""
+
+    def __init__(self, frames, meta=None, version=None, loaders=None):
+        """
+        Args:
+            frames: {이름: DataFrame 또는 dict}
+            meta: 부가 객체 (DistributorDirectory 등)
+            version: 데이터셋 버전 (아티팩트 키 등, 없으면 임의 값) - 필터 캐시 키에 사용
+            loaders: {이름: 인자 없는 함수} - 처음 접근할 때 호출해 값을 채우는 지연 데이터셋
+        """
+        self._frames = {}
+        self.meta = MappingProxyType(dict(meta or {}))
+        self.version = version or uuid.uuid4().hex
+        # 프레임별 역인덱스 (load_data에서 utils.order_index.register_index로 채움, 등록 유지용 참조)
+        self.indexes = {}
+        # 프레임별 집계 큐브 (load_data에서 utils.order_cube.register_cube로 채움)
+        self.cubes = {}
+        self._loaders = {name: fn for name, fn in (loaders or {}).items() if name not in frames}
+        # 지연 데이터셋을 읽은 뒤 호출할 함수 (name, value) - 인덱스/큐브 등록 등
+        self._on_load = []
+        self._lock = threading.RLock()
+        for name, value in frames.items():
+            self._store(name, value)
+
+    def _store(self, name, value):
+        if isinstance(value, pd.DataFrame):
+            value.attrs[DATASET_VERSION_ATTR] = f'{self.version}:{name}'
+            value.attrs[DATASET_ROWS_ATTR] = len(value)
+            # 전체 행 (빈 조건)과 원본 컬럼 메모리 - 뷰에서 바꾼 컬럼을 큐브 집계에 쓰지 않도록
+            tag_filter(value, ())
+        self._frames[name] = value
+
+    def _get(self, name):
+        if name in self._frames:
+            return self._frames[name]
+        with self._lock:
+            # 여러 세션이 동시에 처음 접근해도 한 번만 계산
+            if name not in self._frames:
+                if name not in self._loaders:
+                    raise KeyError(name)
+                self._store(name, self._loaders[name]())
+                del self._loaders[name]
+                for hook in self._on_load:
+                    hook(name, self._frames[name])
+        return self._frames[name]
+
+    def on_load(self, hook):
+        """
+        지연 데이터셋을 읽은 직후 hook(name, value) 호출 (이미 읽은 데이터셋은 바로 호출)
+        """
+        with self._lock:
+            self._on_load.append(hook)
+            for name, value in list(self._frames.items()):
+                hook(name, value)
+
+    def __contains__(self, name):
+        return name in self._frames or name in self._loaders
+
+    def names(self):
+        return list(self._frames) + [name for name in self._loaders if name not in self._frames]
+
+    def loaded(self, name):
+        """이미 읽었거나 계산한 데이터셋인지 (지연 데이터셋이 아니면 항상 True)"""
+        return name in self._frames
+
+    def view(self, name):
+        """이름에 해당하는 데이터프레임의 읽기 전용 뷰 (지연 데이터셋은 처음 한 번 읽거나 계산)"""
+        return view(self._get(name))
+
+    def mapping(self, name):
+        """dict 값(code_to_official 등)을 읽기 전용으로 반환"""
+        value = self._get(name) if name in self else None
+        return MappingProxyType(value or {})
+
+    def memory_usage(self):
+        """
+        프레임별 메모리 사용량 (바이트, deep=True, 아직 읽지 않은 지연 데이터셋은 제외)
+
+        Returns:
+            {이름: 바이트}
+        """
+        return {
+            name: int(df.memory_usage(deep=True).sum())
+            for name, df in list(self._frames.items())
+            if isinstance(df, pd.DataFrame)
+        }
+
+
+def session_view(name, default=None):
+    """
+    세션에 저장된 공유 데이터셋(app.py의 st.session_state['shared_dataset'])에서 name의 뷰
+
+    지연 데이터셋은 이 페이지에서 처음 접근할 때 읽거나 계산합니다.
+
+    Returns:
+        DataFrame 뷰 (데이터셋이 없으면 default)
+    """
+    import streamlit as st
+
+    shared = st.session_state.get('shared_dataset')
+    if shared is None or name not in shared:
+        return default
+    return shared.view(name)
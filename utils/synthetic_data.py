@@ -0,0 +1,473 @@
+"""
+합성 원본 데이터 생성 (벤치마크/회귀 검사용)
+
+실제 원본 CSV 5종(학생수, 주문, 제품정보, 총판정보, 총판별 목표)과 같은 헤더/값 형식의
+데이터를 원하는 규모(주문 1만 ~ 1,000만 행)로 만듭니다. 실제 파일 없이도
+data_pipeline.build_base_datasets()와 시장 규모 계산을 그대로 돌려볼 수 있습니다.
+
+- 헤더는 원본 그대로 (제품정보의 중복 '교과군', 총판정보의 중복 '순번/숫자코드/시군구2' 포함)
+- 값 형식도 원본과 같게: 학교코드 'S' + 9자리, 총판코드 4자리, 도서코드 6자리,
+  확정가/목표 부수는 천 단위 쉼표 문자열, 중·고등학교의 4~6학년 컬럼은 빈 값
+- 주문은 중·고등학교 × 같은 학교급 제품 조합이며, 담당 총판이 아닌 총판 주문,
+  매핑 안 되는 총판코드, 학생수 데이터에 없는 학교코드를 일부 섞음
+- 같은 seed면 같은 데이터 (주문 행 수만 바꾸면 학교/총판/제품 구성은 그대로)
+
+    sources = make_sources(orders=1_000_000, seed=0)
+    paths = write_sources('/tmp/synthetic', sources)
+    datasets = build_base_datasets(paths)
+
+    datasets = synthetic_base_datasets(orders=500_000, seed=1)   # 위 세 줄 + 임시 파일 정리
+"""
+import codecs
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.data_pipeline import build_base_datasets
+
+# (시도교육청, 지역 접두어, 약칭, 지역(시군구) 수, 총판 수) - 원본 분포를 줄여 옮김
+REGIONS = [
+    ('서울특별시교육청', '서울특별시', '서울', 25, 12),
+    ('부산광역시교육청', '부산광역시', '부산', 16, 5),
+    ('대구광역시교육청', '대구광역시', '대구', 9, 4),
+    ('인천광역시교육청', '인천광역시', '인천', 10, 4),
+    ('광주광역시교육청', '광주광역시', '광주', 5, 2),
+    ('대전광역시교육청', '대전광역시', '대전', 5, 2),
+    ('울산광역시교육청', '울산광역시', '울산', 5, 2),
+    ('세종특별자치시교육청', '세종특별자치시', '세종', 1, 1),
+    ('경기도교육청', '경기도', '경기', 44, 25),
+    ('강원특별자치도교육청', '강원특별자치도', '강원', 18, 5),
+    ('충청북도교육청', '충청북도', '충북', 14, 5),
+    ('충청남도교육청', '충청남도', '충남', 16, 6),
+    ('전북특별자치도교육청', '전북특별자치도', '전북', 16, 5),
+    ('전라남도교육청', '전라남도', '전남', 22, 6),
+    ('경상북도교육청', '경상북도', '경북', 24, 7),
+    ('경상남도교육청', '경상남도', '경남', 20, 7),
+    ('제주특별자치도교육청', '제주특별자치도', '제주', 2, 2),
+]
+
+# 학교급코드: (학교급, 학교명 접미어, 학년 수, 비율)
+SCHOOL_LEVELS = {
+    2: ('초등학교', '초등학교', 6, 0.52),
+    3: ('중학교', '중학교', 3, 0.27),
+    4: ('고등학교', '고등학교', 3, 0.20),
+    25: ('각종학교', '학교', 6, 0.01),
+}
+
+# 제품 (학교급, 교과군, 교과군(세부), 교과서명) - 시장 규모 계산의 과목명 규칙에 걸리는 이름 위주
+PRODUCT_TITLES = [
+    ('고등학교', '사회', '사회(역사/도덕)', '한국사 1'),
+    ('고등학교', '사회', '사회(역사/도덕)', '한국사 2'),
+    ('고등학교', '사회', '사회(역사/도덕)', '현대사회와 윤리'),
+    ('고등학교', '사회', '사회(역사/도덕)', '사회문제 탐구'),
+    ('고등학교', '사회', '사회(역사/도덕)', '여행지리'),
+    ('고등학교', '사회', '사회(역사/도덕)', '통합사회 1'),
+    ('고등학교', '사회', '사회(역사/도덕)', '통합사회 2'),
+    ('고등학교', '과학', '과학', '통합과학 1'),
+    ('고등학교', '과학', '과학', '통합과학 2'),
+    ('고등학교', '과학', '과학', '기후변화와 환경생태'),
+    ('고등학교', '수학', '수학', '경제 수학'),
+    ('고등학교', '수학', '수학', '인공지능 수학'),
+    ('고등학교', '정보', '정보', '정보'),
+    ('고등학교', '정보', '정보', '인공지능 기초'),
+    ('고등학교', '정보', '정보', '데이터 과학'),
+    ('고등학교', '체육', '체육', '체육 1'),
+    ('고등학교', '체육', '체육', '체육 2'),
+    ('고등학교', '미술', '미술', '미술'),
+    ('고등학교', '교양', '교양', '진로와 직업'),
+    ('고등학교', '교양', '교양', '논리와 사고'),
+    ('고등학교', '기술', '기술⋅가정', '기술·가정'),
+    ('고등학교', '한문', '한문', '한문'),
+    ('고등학교', '전문', '정보·통신', '프로그래밍'),
+    ('고등학교', '고시 외 과목', '정보/과학', '디지털 리터러시'),
+    ('중학교', '정보', '정보', '정보'),
+    ('중학교', '교양', '진로·보건', '보건'),
+    ('중학교', '교양', '진로·보건', '진로와 직업'),
+    ('중학교', '미술', '예술(미술)', '미술 ①'),
+    ('중학교', '미술', '예술(미술)', '미술 ②'),
+    ('중학교', '체육', '체육', '체육 ①'),
+    ('중학교', '체육', '체육', '체육 ②'),
+    ('중학교', '기술', '기술⋅가정', '기술·가정 ①'),
+    ('중학교', '한문', '한문', '한문'),
+    ('초등학교', '체육', '체육', '체육 3'),
+    ('초등학교', '체육', '체육', '체육 4'),
+]
+
+TOTAL_COLUMNS = [
+    '시도교육청', '교육지원청', '지역', '정보공시 학교코드', '학교명', '학교급코드', '설립구분', '제외여부', '제외사유',
+    *[f'{g}학년 {kind}' for g in range(1, 7) for kind in ('학급수', '학생수', '학급당 학생수')],
+    *[f'{group} {kind}' for group in ('특수학급', '순회학급') for kind in ('학급수', '학생수', '학급당 학생수')],
+    '학급수(계)', '학생수(계)', '학급당 학생수(계)', '교사수', '수업교원 1인당 학생수',
+    '담당총판코드', '담당총판', '본사담당자(2025.09)',
+]
+
+ORDER_COLUMNS = [
+    '학년도', '시도교육청', '교육지원청', '지역', '시도', '학교명', '정보공시학교코드', '학교급', '총판', '총판코드',
+    '도서코드(교지명구분)', '교지명', '과목명', '교과군', '부수', '금액', '학교코드', '시도명', '본사담당자(2025.09)', '목표과목',
+]
+
+PRODUCT_COLUMNS = [
+    '코드', '교과군', '연번', '학교급', '구분', '교과군', '교과서명', '대표저자', '심의기관', '판형', '확정가', '담당', '비고',
+    '2026 목표과목',
+]
+
+DISTRIBUTOR_COLUMNS = [
+    '순번', '숫자코드', '지 역', '총판명', '총판명1', '총판명(공식)', '대 표', '핸 드 폰', '연 락 처', 'FAX', '주 소',
+    'Unnamed: 8', 'Unnamed: 9', '등급', '교육청코드', '교육청명', '교육지원청', '시도', '시도구', '시군구', '시군구2',
+    '순번', '숫자코드', '시군구2',
+]
+
+TARGET_COLUMNS = [
+    '지역', '총판코드', '지역', '총판명', '총판명(공식)', '목표과목1 부수', '목표과목 1매출액', '목표과목2 부수', '목표과목2 매출액',
+]
+
+MAP_COLUMNS = ['order_code', 'matched', 'official_code', 'official_name', 'matched_by']
+
+# write_sources가 쓰는 파일 이름 (키는 data_pipeline.DEFAULT_PATHS와 같음)
+SOURCE_FILES = {
+    'total': 'total.csv',
+    'order': 'orders.csv',
+    'target': 'target.csv',
+    'product': 'product.csv',
+    'distributor': 'distributor.csv',
+    'distributor_map': 'distributor_code_mapping.csv',
+}
+
+MANAGERS = ['김민수', '이서연', '박지훈', '최수빈', '정하늘', '강도윤']
+GRADES = ['S', 'A', 'B', 'C', 'D', 'E', 'F', 'G']
+UNMAPPED_CODE = '9999'
+UNKNOWN_SCHOOL = 'X000000000'
+
+
+def _thousands(values):
+    """정수 배열 → '12,345' 형식 문자열 (원본의 쉼표 숫자 컬럼)"""
+    return [f'{int(v):,}' for v in values]
+
+
+def _make_regions():
+    """지역(시군구) 표: 시도 정보 + 교육지원청"""
+    rows = []
+    for sido_pos, (office, prefix, short, n_regions, _) in enumerate(REGIONS):
+        for k in range(1, n_regions + 1):
+            name = f'지역{k:02d}'
+            rows.append({
+                'sido_pos': sido_pos,
+                '시도교육청': office,
+                '교육지원청': office if n_regions == 1 else f'{prefix}{name}교육지원청',
+                '지역': f'{prefix} {name}',
+                '시도': prefix,
+                '약칭': short,
+            })
+    return pd.DataFrame(rows)
+
+
+def make_distributors(rng):
+    """총판정보.csv 형식의 총판 표 (시도별 REGIONS의 총판 수만큼)"""
+    rows = []
+    for sido_pos, (office, prefix, short, _, n_dist) in enumerate(REGIONS):
+        for k in range(1, n_dist + 1):
+            code = str(1000 + sido_pos * 100 + k)
+            name = f'{short}{k:02d}서적'
+            rows.append([
+                float(len(rows) + 1), code, short, name, name, f'{short}{k:02d}){name}', '대표자',
+                '010-0000-0000', '02)000-0000', '02)000-0001', f'{prefix} 중앙로 {k}',
+                '비고' if not rows else np.nan, np.nan if rows else '비고', rng.choice(GRADES),
+                float(100 + sido_pos), f'{short}{k:02d}',
+                office.replace('교육청', f'{short}{k:02d}교육지원청'), short, short, short, prefix,
+                sido_pos + 1, code, prefix,
+            ])
+    return pd.DataFrame(rows, columns=DISTRIBUTOR_COLUMNS)
+
+
+def make_products(rng):
+    """제품정보.csv 형식의 제품 표 (교과서명마다 교과서/지도서 두 행)"""
+    rows = []
+    for title_pos, (level, group, subgroup, title) in enumerate(PRODUCT_TITLES):
+        price = int(rng.integers(80, 200)) * 100
+        target = {0: '목표과목1', 1: '목표과목2'}.get(title_pos % 6, np.nan)
+        for kind, code_base in [('교과서', 460000), ('지도서', 560000)]:
+            rows.append([
+                code_base + title_pos * 100 + 81, group, len(rows) + 1, level, kind, subgroup, title,
+                f'저자{title_pos:02d}', '교육과정평가원', '215*280',
+                f'{price if kind == "교과서" else price * 3:,} ', MANAGERS[title_pos % len(MANAGERS)],
+                '개정 반영' if title_pos % 5 == 0 else np.nan,
+                target,
+            ])
+    return pd.DataFrame(rows, columns=PRODUCT_COLUMNS)
+
+
+def make_schools(rng, regions, distributors, schools):
+    """학년별 학생수 CSV 형식의 학교 표"""
+    level_codes = np.array(list(SCHOOL_LEVELS))
+    level_share = np.array([v[3] for v in SCHOOL_LEVELS.values()])
+    levels = rng.choice(level_codes, schools, p=level_share / level_share.sum())
+    region_pos = rng.integers(0, len(regions), schools)
+    region = regions.iloc[region_pos].reset_index(drop=True)
+
+    # 지역(시군구)별 담당 총판: 같은 시도의 총판을 돌아가며 배정
+    dist_codes = distributors.iloc[:, 1]
+    dist_sido = np.repeat(np.arange(len(REGIONS)), [r[4] for r in REGIONS])
+    first_dist = np.searchsorted(dist_sido, np.arange(len(REGIONS)))
+    region_dist = np.array([
+        first_dist[s] + k % REGIONS[s][4]
+        for k, s in enumerate(regions['sido_pos'].to_numpy())
+    ])
+    dist_pos = region_dist[region_pos]
+
+    df = pd.DataFrame({
+        '시도교육청': region['시도교육청'],
+        '교육지원청': region['교육지원청'],
+        '지역': region['지역'],
+        '정보공시 학교코드': [f'S{i:09d}' for i in rng.permutation(np.arange(1, schools * 20, 20))[:schools]],
+        '학교명': [
+            f"{r.split()[-1]}{i}{SCHOOL_LEVELS[lv][1]}"
+            for i, (r, lv) in enumerate(zip(region['지역'], levels), start=1)
+        ],
+        '학교급코드': levels,
+        '설립구분': rng.choice(['공립', '사립', '국립'], schools, p=[0.78, 0.21, 0.01]),
+        '제외여부': np.where(rng.random(schools) < 0.0005, 'Y', 'N'),
+    })
+    df['제외사유'] = np.where(df['제외여부'] == 'Y', '본교는 해당항목에 대해서 교육통계 입력자료가 없으므로 제외함.', None)
+
+    n_grades = np.array([SCHOOL_LEVELS[lv][2] for lv in levels])
+    big = levels >= 3
+    total_students = np.zeros(schools, dtype=np.int64)
+    total_classes = np.zeros(schools, dtype=np.int64)
+    for g in range(1, 7):
+        has = n_grades >= g
+        students = np.where(big, rng.integers(20, 400, schools), rng.integers(3, 160, schools))
+        students[rng.random(schools) < 0.01] = 0
+        classes = np.ceil(students / 25).astype(np.int64)
+        total_students += np.where(has, students, 0)
+        total_classes += np.where(has, classes, 0)
+        per_class = np.round(students / np.maximum(classes, 1), 1)
+        if g > 3:
+            # 중·고등학교는 4~6학년 빈 값 (원본도 1~3학년만 정수 컬럼)
+            classes, students, per_class = (np.where(has, v, np.nan) for v in (classes, students, per_class))
+        df[f'{g}학년 학급수'] = classes
+        df[f'{g}학년 학생수'] = students
+        df[f'{g}학년 학급당 학생수'] = per_class
+    for group in ('특수학급', '순회학급'):
+        students = np.where(rng.random(schools) < 0.3, rng.integers(1, 10, schools), 0)
+        classes = (students > 0).astype(np.int64)
+        df[f'{group} 학급수'] = classes
+        df[f'{group} 학생수'] = students
+        df[f'{group} 학급당 학생수'] = np.round(students / np.maximum(classes, 1), 1)
+    teachers = np.maximum(total_students // 12, 3)
+    df['학급수(계)'] = total_classes
+    df['학생수(계)'] = total_students
+    df['학급당 학생수(계)'] = np.round(total_students / np.maximum(total_classes, 1), 1)
+    df['교사수'] = teachers
+    df['수업교원 1인당 학생수'] = np.round(total_students / teachers, 1)
+    df['담당총판코드'] = dist_codes.to_numpy()[dist_pos].astype(int)
+    df['담당총판'] = distributors['총판명(공식)'].to_numpy()[dist_pos]
+    df['본사담당자(2025.09)'] = np.where(rng.random(schools) < 0.3, rng.choice(MANAGERS, schools), None)
+    return df[TOTAL_COLUMNS]
+
+
+def make_orders(rng, total_df, product_df, distributor_df, orders):
+    """
+    주문현황 CSV 형식의 주문 표 (중·고등학교 × 같은 학교급 제품)
+
+    반복 문자열 컬럼은 category로 만들어 1,000만 행에서도 메모리를 아낌 (CSV 값은 같음)
+    """
+    schools = total_df[total_df['학교급코드'].isin([3, 4])].reset_index(drop=True)
+    products = product_df.iloc[:, [0, 1, 3, 6, 13]].copy()
+    products.columns = ['코드', '교과군', '학교급', '교과서명', '목표과목']
+    products = products[products['학교급'].isin(['중학교', '고등학교'])].reset_index(drop=True)
+    dist_codes = distributor_df.iloc[:, 1].astype(str).to_numpy()
+    dist_names = distributor_df['총판명(공식)'].to_numpy()
+    prices = product_df.iloc[:, 10].str.replace(',', '').astype(int).to_numpy()
+    price_by_code = dict(zip(product_df.iloc[:, 0], prices))
+
+    # 학교마다 같은 학교급 제품 중에서 고름
+    school_pos = rng.integers(0, len(schools), orders, dtype=np.int32)
+    level_names = np.where(schools['학교급코드'].to_numpy() == 3, '중학교', '고등학교')
+    book_pos = np.empty(orders, dtype=np.int32)
+    for level in ('중학교', '고등학교'):
+        candidates = np.flatnonzero(products['학교급'].to_numpy() == level)
+        mask = (level_names == level)[school_pos]
+        book_pos[mask] = candidates[rng.integers(0, len(candidates), mask.sum())]
+
+    def pick(values, positions):
+        categories, codes = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+        return pd.Categorical.from_codes(codes.astype(np.int32)[positions], categories)
+
+    # 담당 총판 주문이 대부분, 일부는 다른 총판/매핑 안 되는 코드/빈 코드
+    school_dist = pd.Index(dist_codes).get_indexer(schools['담당총판코드'].astype(str))
+    dist_pos = school_dist[school_pos]
+    other = rng.random(orders) < 0.05
+    dist_pos[other] = rng.integers(0, len(dist_codes), other.sum())
+    code_values = np.append(dist_codes, [UNMAPPED_CODE, ''])
+    name_values = np.append(dist_names, ['미등록)총판', ''])
+    noise = rng.random(orders)
+    dist_pos[noise < 0.01] = len(dist_codes)
+    dist_pos[(noise >= 0.01) & (noise < 0.015)] = len(dist_codes) + 1
+
+    school_values = np.append(schools['정보공시 학교코드'].to_numpy(), UNKNOWN_SCHOOL)
+    school_code_pos = np.where(rng.random(orders) < 0.005, len(school_values) - 1, school_pos)
+
+    quantity = rng.integers(1, 300, orders)
+    book_codes = products['코드'].to_numpy()
+    amount = quantity * np.array([price_by_code[c] for c in book_codes])[book_pos]
+    sido = schools['지역'].str.split().str[0]
+    target = products['목표과목'].fillna('')
+
+    df = pd.DataFrame({
+        '학년도': rng.choice([2025, 2026], orders),
+        '시도교육청': pick(schools['시도교육청'], school_pos),
+        '교육지원청': pick(schools['교육지원청'], school_pos),
+        '지역': pick(schools['지역'], school_pos),
+        '시도': pick(sido, school_pos),
+        '학교명': pick(schools['학교명'], school_pos),
+        '정보공시학교코드': pick(school_values, school_code_pos),
+        '학교급': pick(level_names, school_pos),
+        '총판': pick(name_values, dist_pos),
+        '총판코드': pick(code_values, dist_pos),
+        '도서코드(교지명구분)': pick(book_codes, book_pos),
+        '교지명': pick(products['교과서명'], book_pos),
+        '과목명': pick(products['교과서명'], book_pos),
+        '교과군': pick(products['교과군'], book_pos),
+        '부수': quantity,
+        '금액': amount,
+        '학교코드': pick(school_values, school_code_pos),
+        '시도명': pick(sido, school_pos),
+        '본사담당자(2025.09)': pick(schools['본사담당자(2025.09)'].fillna(''), school_pos),
+        '목표과목': pick(target, book_pos),
+    })
+    return df[ORDER_COLUMNS]
+
+
+def make_targets(rng, distributor_df):
+    """총판별 목표 CSV 형식 (총판의 약 70%, 목표 없는 총판은 빈 값/0)"""
+    picked = distributor_df[rng.random(len(distributor_df)) < 0.7]
+    n = len(picked)
+    prefix = {short: prefix for _, prefix, short, _, _ in REGIONS}
+    qty1 = rng.integers(5, 130, n) * 100
+    qty2 = rng.integers(0, 130, n) * 100
+    no_target1 = rng.random(n) < 0.1
+    rows = pd.DataFrame({
+        0: picked['지 역'].map(prefix).to_numpy(),
+        1: picked.iloc[:, 1].to_numpy(),
+        2: picked['지 역'].to_numpy(),
+        3: picked['총판명'].to_numpy(),
+        4: picked['총판명(공식)'].to_numpy(),
+        5: np.where(no_target1, np.nan, np.array(_thousands(qty1), dtype=object)),
+        6: np.where(no_target1, np.nan, np.array(_thousands(qty1 * 15000), dtype=object)),
+        7: _thousands(qty2),
+        8: _thousands(qty2 * 15000),
+    })
+    rows.columns = TARGET_COLUMNS
+    return rows
+
+
+def make_code_map(distributor_df):
+    """outputs/distributor_code_mapping.csv 형식 (모든 총판코드가 코드로 매칭)"""
+    codes = distributor_df.iloc[:, 1].astype(str)
+    return pd.DataFrame({
+        'order_code': codes.to_numpy(),
+        'matched': True,
+        'official_code': codes.to_numpy(),
+        'official_name': distributor_df['총판명(공식)'].to_numpy(),
+        'matched_by': 'code',
+    }, columns=MAP_COLUMNS)
+
+
+def make_sources(orders=100_000, schools=12_000, seed=0):
+    """
+    원본 CSV 5종 + 총판코드 매핑 파일의 합성 데이터
+
+    Args:
+        orders: 주문 행 수 (1만 ~ 1,000만)
+        schools: 학교 수 (원본은 약 12,000)
+        seed: 난수 시드 (주문 수와 무관하게 학교/총판/제품 구성을 고정)
+
+    Returns:
+        dict: total, order, target, product, distributor, distributor_map (원본 헤더의 DataFrame)
+    """
+    rng = np.random.default_rng(seed)
+    regions = _make_regions()
+    distributor_df = make_distributors(rng)
+    product_df = make_products(rng)
+    total_df = make_schools(rng, regions, distributor_df, schools)
+    target_df = make_targets(rng, distributor_df)
+    # 주문만 별도 난수열 → 주문 수를 바꿔도 참조 데이터는 같음
+    order_df = make_orders(np.random.default_rng([seed, 1]), total_df, product_df, distributor_df, orders)
+    return {
+        'total': total_df,
+        'order': order_df,
+        'target': target_df,
+        'product': product_df,
+        'distributor': distributor_df,
+        'distributor_map': make_code_map(distributor_df),
+    }
+
+
+def _write_csv(df, path, chunk_rows=1_000_000):
+    """원본과 같은 utf-8-sig CSV (큰 표는 pyarrow로 나눠 쓰고, 중복 헤더 표는 pandas로)"""
+    if len(df) >= 100_000 and df.columns.is_unique:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pacsv
+        except ImportError:
+            pa = None
+        if pa is not None:
+            with open(path, 'wb') as f:
+                f.write(codecs.BOM_UTF8)
+                writer = None
+                for start in range(0, len(df), chunk_rows):
+                    table = pa.Table.from_pandas(df.iloc[start:start + chunk_rows], preserve_index=False)
+                    # category → 문자열 (조각마다 사전이 달라도 같은 스키마)
+                    table = table.cast(pa.schema([
+                        pa.field(f.name, pa.string()) if pa.types.is_dictionary(f.type) else f
+                        for f in table.schema
+                    ]))
+                    if writer is None:
+                        writer = pacsv.CSVWriter(f, table.schema)
+                    writer.write_table(table)
+                writer.close()
+            return
+    df.to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def write_sources(directory, sources=None, **kwargs):
+    """
+    합성 데이터를 CSV로 저장
+
+    Args:
+        directory: 저장할 디렉터리 (없으면 생성)
+        sources: make_sources() 결과 (없으면 kwargs로 생성)
+        **kwargs: make_sources() 인자 (orders, schools, seed)
+
+    Returns:
+        dict: build_base_datasets(paths=...)에 넘길 파일 경로 (DEFAULT_PATHS와 같은 키)
+    """
+    sources = sources if sources is not None else make_sources(**kwargs)
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+    for name, filename in SOURCE_FILES.items():
+        paths[name] = os.path.join(directory, filename)
+        _write_csv(sources[name], paths[name])
+    return paths
+
+
+def synthetic_base_datasets(orders=100_000, schools=12_000, seed=0):
+    """
+    합성 원본을 임시 디렉터리에 써서 build_base_datasets()로 가공한 기본 데이터셋
+
+    벤치마크/정합성 검사 스크립트가 실제 원본 CSV 대신 쓰는 입력입니다 (임시 파일은 지움).
+
+    Args:
+        orders / schools / seed: make_sources() 인자
+
+    Returns:
+        dict: build_base_datasets() 결과 (total_df, order_df, target_df, product_df, distributor_df 등)
+    """
+    work = tempfile.mkdtemp(prefix='synthetic_')
+    try:
+        return build_base_datasets(write_sources(work, orders=orders, schools=schools, seed=seed))
+    finally:
+        shutil.rmtree(work, ignore_errors=True)